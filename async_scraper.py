@@ -0,0 +1,326 @@
+"""
+Concurrent session scraper built on Playwright's async API.
+
+Keeps a fixed pool of pages open in one browser context and fetches many
+sessions at once, with a per-host rate limit so the conference site isn't
+hammered. Parsing and saving are passed in as callbacks, so scraper.py and
+scrape_working.py both feed results into their existing save logic.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from urllib.parse import urlparse
+
+from playwright.async_api import async_playwright
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from html_cache import RefreshPolicy
+
+
+# A session page is ready once its title heading has rendered
+DEFAULT_READY_CHECK = "document.querySelector('h1, h2') !== null"
+
+
+class HostRateLimiter:
+    """Space out requests to the same host by a minimum interval."""
+
+    def __init__(self, requests_per_second=4.0):
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self._next_request = {}
+
+    async def wait(self, url):
+        """Sleep until the next request to this URL's host is allowed."""
+        if not self.interval:
+            return
+
+        host = urlparse(url).netloc
+        now = asyncio.get_running_loop().time()
+
+        # Reserve the next free slot before sleeping so concurrent callers
+        # queue up behind each other instead of all waking at once
+        slot = max(now, self._next_request.get(host, now))
+        self._next_request[host] = slot + self.interval
+
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class PagePool:
+    """A fixed set of open pages, each lent to one fetch at a time."""
+
+    def __init__(self, context, size):
+        self.context = context
+        self.size = size
+        self._pages = asyncio.Queue()
+
+    async def open(self):
+        for _ in range(self.size):
+            self._pages.put_nowait(await self.context.new_page())
+
+    @asynccontextmanager
+    async def page(self):
+        """Borrow a page, replacing it if the fetch left it closed."""
+        page = await self._pages.get()
+        try:
+            yield page
+        finally:
+            if page.is_closed():
+                page = await self.context.new_page()
+            self._pages.put_nowait(page)
+
+    async def close(self):
+        while not self._pages.empty():
+            page = self._pages.get_nowait()
+            try:
+                await page.close()
+            except Exception:
+                pass
+
+
+class SessionQueue:
+    """
+    Session IDs waiting to be scraped, each queued at most once.
+
+    IDs can keep arriving while workers consume the queue, e.g. as calendar
+    pages are discovered; close() it once no more are coming.
+    """
+
+    def __init__(self, session_ids=()):
+        self._queue = asyncio.Queue()
+        self._seen = set()
+        self.session_ids = []  # Every ID ever queued, in order
+        self.closed = False
+        self.put(session_ids)
+
+    @property
+    def total(self):
+        return len(self.session_ids)
+
+    def unseen(self, session_ids):
+        """The IDs (deduplicated, in order) that haven't been queued yet."""
+        return list(dict.fromkeys(s for s in session_ids if s not in self._seen))
+
+    def put(self, session_ids):
+        for session_id in self.unseen(session_ids):
+            self._seen.add(session_id)
+            self.session_ids.append(session_id)
+            self._queue.put_nowait(session_id)
+
+    def close(self):
+        self.closed = True
+        self._queue.put_nowait(None)
+
+    async def get(self):
+        """The next ID, or None once the queue is closed and drained."""
+        session_id = await self._queue.get()
+        if session_id is None:
+            self._queue.put_nowait(None)  # Let the other workers see it too
+        return session_id
+
+
+class AsyncSessionScraper:
+    """
+    Scrape session pages concurrently through one shared browser context.
+
+    Use as an async context manager. `parse_session(session_id, html)` turns a
+    page into a session dict and `save_session(session_data)` persists it.
+    Both run on the event loop thread, so saves never overlap.
+
+    With an HTMLCache, pages the refresh policy considers fresh aren't
+    fetched, and pages whose content hash is unchanged aren't parsed or
+    saved again, unless the session is missing from `known_ids`.
+
+    With a ScrapeStatus, unchanged sessions are marked done and failures are
+    recorded as they happen; saved sessions are left for the save callback
+    to mark once they are actually written.
+    """
+
+    def __init__(self, session_url, parse_session, save_session, cookies=None,
+                 concurrency=8, requests_per_second=4.0,
+                 ready_check=DEFAULT_READY_CHECK, timeout_ms=30000,
+                 cache=None, refresh_policy=None, known_ids=None, status=None):
+        self.session_url = session_url
+        self.parse_session = parse_session
+        self.save_session = save_session
+        self.cookies = cookies
+        self.concurrency = max(1, concurrency)
+        self.rate_limiter = HostRateLimiter(requests_per_second)
+        self.ready_check = ready_check
+        self.timeout_ms = timeout_ms
+        self.cache = cache
+        self.refresh_policy = refresh_policy or RefreshPolicy('always')
+        self.known_ids = known_ids
+        self.status = status
+
+        self.pool = None
+        self._playwright = None
+        self._browser = None
+        self._context = None
+
+    async def __aenter__(self):
+        self._playwright = await async_playwright().start()
+        try:
+            self._browser = await self._playwright.chromium.launch(headless=True)
+            self._context = await self._browser.new_context()
+            if self.cookies:
+                await self._context.add_cookies(self.cookies)
+            self.pool = PagePool(self._context, self.concurrency)
+            await self.pool.open()
+        except Exception:
+            await self.close()
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self):
+        """Shut down pages, context, browser and Playwright in that order."""
+        if self.pool is not None:
+            await self.pool.close()
+        for resource in (self._context, self._browser):
+            if resource is not None:
+                try:
+                    await resource.close()
+                except Exception:
+                    pass
+        if self._playwright is not None:
+            try:
+                await self._playwright.stop()
+            except Exception:
+                pass
+
+        self.pool = None
+        self._playwright = None
+        self._browser = None
+        self._context = None
+
+    async def fetch(self, url, wait_until='load', ready_check=None):
+        """Fetch a page's HTML with a pooled page, honouring the rate limit."""
+        html, _ = await self.fetch_page(url, wait_until, ready_check)
+        return html
+
+    async def fetch_page(self, url, wait_until='load', ready_check=None):
+        """Like fetch, but returns (html, response headers)."""
+        await self.rate_limiter.wait(url)
+        async with self.pool.page() as page:
+            response = await page.goto(url, wait_until=wait_until, timeout=self.timeout_ms)
+            if ready_check:
+                try:
+                    await page.wait_for_function(ready_check, timeout=10000)
+                except PlaywrightTimeoutError:
+                    pass  # Parse whatever did load
+            headers = await response.all_headers() if response is not None else {}
+            return await page.content(), headers
+
+    def _is_known(self, session_id):
+        return self.known_ids is None or session_id in self.known_ids
+
+    async def fetch_session(self, session_id):
+        """A session page's HTML, from the cache or the site; None if it is unchanged."""
+        url = self.session_url(session_id)
+        entry = self.cache.lookup(session_id, url) if self.cache is not None else None
+
+        if entry is not None and not self.refresh_policy.needs_fetch(entry):
+            if self._is_known(session_id):
+                return None
+            return self.cache.read(entry['content_hash'])
+
+        html, headers = await self.fetch_page(url, ready_check=self.ready_check)
+        if self.cache is not None:
+            changed = self.cache.store(session_id, url, html, headers)
+            if not changed and self._is_known(session_id):
+                return None
+        return html
+
+    async def scrape_session(self, session_id):
+        """Fetch, parse and save one session; returns None if it was unchanged."""
+        html = await self.fetch_session(session_id)
+        if html is None:
+            return None
+
+        session_data = self.parse_session(session_id, html)
+        self.save_session(session_data)
+        return session_data
+
+    async def scrape_sessions(self, session_ids):
+        """
+        Scrape sessions with at most `concurrency` fetches in flight.
+
+        `session_ids` is a list, or a SessionQueue that may still be growing;
+        scraping finishes once the queue is closed and drained.
+
+        Returns {'saved': count, 'unchanged': count,
+        'errors': [(session_id, message), ...]}.
+        """
+        if isinstance(session_ids, SessionQueue):
+            queue = session_ids
+        else:
+            queue = SessionQueue(session_ids)
+            queue.close()
+
+        results = {'saved': 0, 'unchanged': 0, 'errors': []}
+        done = 0
+
+        async def worker():
+            nonlocal done
+            while True:
+                session_id = await queue.get()
+                if session_id is None:
+                    return
+
+                try:
+                    session_data = await self.scrape_session(session_id)
+                    done += 1
+                    if session_data is None:
+                        results['unchanged'] += 1
+                        if self.status is not None:
+                            self.status.record_success(session_id)
+                        continue
+                    results['saved'] += 1
+                    print(f"[{done}/{queue.total}] ✓ {session_data['title'][:70]}", flush=True)
+                except Exception as e:
+                    results['errors'].append((session_id, str(e)))
+                    if self.status is not None:
+                        self.status.record_failure(session_id, str(e))
+                    done += 1
+                    print(f"[{done}/{queue.total}] ✗ Error scraping session {session_id}: {str(e)[:80]}", flush=True)
+
+        workers = min(self.concurrency, queue.total) if queue.closed else self.concurrency
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        return results
+
+    async def scrape_with_retries(self, session_ids, max_attempts=3, before_retry=None, scrape=None):
+        """
+        scrape_sessions (from a list or SessionQueue), then retry failed
+        sessions with the status tracker's exponential backoff until each
+        has had max_attempts tries.
+
+        `before_retry` runs before each wait, e.g. to flush pending saves.
+        `scrape` replaces scrape_sessions, e.g. with SessionPipeline.run.
+        Requires a ScrapeStatus. The returned errors are the sessions that
+        were still failing after their last attempt.
+        """
+        scrape = scrape or self.scrape_sessions
+        results = await scrape(session_ids)
+        if isinstance(session_ids, SessionQueue):
+            session_ids = session_ids.session_ids
+        failed = dict(results['errors'])
+
+        # Successful saves may not be marked done until the writer flushes,
+        # so only sessions that failed in their latest round are retried
+        while (retry := self.status.next_retry([s for s in session_ids if s in failed],
+                                               max_attempts)) is not None:
+            wait, retry_ids = retry
+            if before_retry is not None:
+                before_retry()
+            print(f"\nRetrying {len(retry_ids)} failed sessions in {wait:.0f}s...", flush=True)
+            await asyncio.sleep(wait)
+            retried = await scrape(retry_ids)
+            for session_id in retry_ids:
+                del failed[session_id]
+            failed.update(retried['errors'])
+            results['saved'] += retried['saved']
+            results['unchanged'] += retried['unchanged']
+
+        results['errors'] = [(session_id, failed[session_id]) for session_id in session_ids if session_id in failed]
+        return results
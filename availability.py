@@ -0,0 +1,136 @@
+"""
+When each team member is at the conference, compiled once per run.
+
+Constraints are given per person, as in OptimalScheduler.availability:
+
+    {
+        'Max Ghenis': {
+            'start': ('2025-11-13', '11:30am'),   # arrives (None: from the start)
+            'end': None,                          # departs (None: through the end)
+            'away': [                             # breaks, off-site meetings...
+                (('2025-11-14', '12:00pm'), ('2025-11-14', '1:30pm')),
+            ],
+        },
+    }
+
+A person is away from their departure on, before their arrival, and from
+the start of each 'away' window until (not including) its end.
+Availability parses these once into sorted intervals of timestamps (see
+time_utils.py) and keeps a person x slot matrix (a bytearray per person)
+that is filled once per slot, so schedulers and exporters look
+availability up instead of re-parsing datetimes for every person and slot:
+
+    availability = Availability(people, constraints, slots)
+    availability.is_available('Max Ghenis', '2025-11-13', '9:00am')   # False
+    availability.available_people('2025-11-14', '10:15 AM')
+
+A slot whose date or time can't be parsed counts as everyone available,
+as before.
+"""
+from bisect import bisect_right
+
+from time_utils import timestamp
+
+
+def _constraint_timestamp(person, point):
+    parsed = timestamp(*point)
+    if parsed is None:
+        raise ValueError(f"Can't parse {person}'s availability time {point!r}")
+    return parsed
+
+
+def away_intervals(person, constraints):
+    """
+    Sorted, merged [from, until) intervals a person is away, from their
+    constraints dict; None bounds are open.
+    """
+    intervals = []
+    if constraints.get('start'):
+        intervals.append((None, _constraint_timestamp(person, constraints['start'])))
+    if constraints.get('end'):
+        intervals.append((_constraint_timestamp(person, constraints['end']), None))
+    for start, end in constraints.get('away', ()):
+        intervals.append((_constraint_timestamp(person, start), _constraint_timestamp(person, end)))
+
+    # None sorts first as a start (before everything) and last as an end
+    intervals.sort(key=lambda interval: -1 if interval[0] is None else interval[0])
+    merged = []
+    for start, end in intervals:
+        if merged and (merged[-1][1] is None or start is None or start <= merged[-1][1]):
+            previous_start, previous_end = merged[-1]
+            if previous_end is not None and (end is None or end > previous_end):
+                merged[-1] = (previous_start, end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+class Availability:
+    """The team's availability, as a person x slot matrix filled once per slot."""
+
+    def __init__(self, people, constraints=None, slots=()):
+        """
+        `constraints` is {person: {'start', 'end', 'away'}} (people without
+        an entry are always available); `slots` are dicts with date and
+        start_time to compile up front.
+        """
+        self.people = list(people)
+        self.constraints = {} if constraints is None else constraints
+        self._away = {person: away_intervals(person, self.constraints.get(person, {}))
+                      for person in self.people}
+        # Interval starts per person, for bisecting
+        self._starts = {person: [start for start, _ in intervals] for person, intervals in self._away.items()}
+
+        self.slots = []       # start timestamp (None: unparseable) per column
+        self._columns = {}    # start timestamp -> column
+        self._present = []    # available people per column
+        self.matrix = {person: bytearray() for person in self.people}
+        self.add_slots(slots)
+
+    def _free(self, person, point):
+        # Intervals don't overlap, so only the last one starting at or
+        # before the point can cover it (an open start comes first)
+        starts = self._starts[person]
+        i = bisect_right(starts, point, lo=1 if starts and starts[0] is None else 0) - 1
+        if i < 0:
+            return True
+        end = self._away[person][i][1]
+        return end is not None and point >= end
+
+    def _column(self, point):
+        column = self._columns.get(point)
+        if column is None:
+            column = len(self.slots)
+            self.slots.append(point)
+            self._columns[point] = column
+            for person in self.people:
+                self.matrix[person].append(point is None or self._free(person, point))
+            self._present.append([person for person in self.people if self.matrix[person][column]])
+        return column
+
+    def add_slots(self, slots):
+        """
+        Compile the columns for slots not seen yet, by their start_ts if
+        they have one (a snapshot Slot's attribute, or a row's key), else
+        by parsing date and start_time.
+        """
+        for slot in slots:
+            point = getattr(slot, 'start_ts', None)
+            if point is None and 'start_ts' in slot.keys():
+                point = slot['start_ts']
+            self._column(timestamp(slot['date'], slot['start_time']) if point is None else point)
+        return self
+
+    def is_available(self, person, date, start_time):
+        """Whether a person is there for a slot starting at this date and time."""
+        if person not in self.matrix:
+            # Not on the team this was compiled for (say, from the people table)
+            constraints = self.constraints.get(person)
+            if not constraints:
+                return True
+            return Availability([person], self.constraints).is_available(person, date, start_time)
+        return bool(self.matrix[person][self._column(timestamp(date, start_time))])
+
+    def available_people(self, date, start_time):
+        """The people there for a slot, in team order."""
+        return list(self._present[self._column(timestamp(date, start_time))])
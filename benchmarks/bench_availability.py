@@ -0,0 +1,66 @@
+"""
+Benchmark: availability lookups with strptime per call vs. the compiled matrix.
+
+Times checking every person for every slot of a synthetic conference
+(three times over, as calculate_slot_value, assign_slot_optimal and the
+exporter each did) with the previous strptime-based
+OptimalScheduler.is_available and with Availability.
+
+Usage:
+    uv run python benchmarks/bench_availability.py [num_slots] [team_size]
+"""
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from availability import Availability  # noqa: E402
+
+
+def legacy_is_available(availability, person, date, start_time):
+    """The previous OptimalScheduler.is_available."""
+    try:
+        session_dt = datetime.strptime(f"{date} {start_time}", "%Y-%m-%d %I:%M%p")
+    except ValueError:
+        return True
+    constraints = availability.get(person, {})
+    if constraints.get('start'):
+        arrival_date, arrival_time = constraints['start']
+        if session_dt < datetime.strptime(f"{arrival_date} {arrival_time}", "%Y-%m-%d %I:%M%p"):
+            return False
+    if constraints.get('end'):
+        depart_date, depart_time = constraints['end']
+        if session_dt >= datetime.strptime(f"{depart_date} {depart_time}", "%Y-%m-%d %I:%M%p"):
+            return False
+    return True
+
+
+def main():
+    num_slots = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    team_size = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    people = [f'Person {i}' for i in range(team_size)]
+    constraints = {
+        person: {'start': ('2025-11-13', f'{8 + i % 4}:00am'), 'end': ('2025-11-15', f'{1 + i % 5}:00pm')}
+        for i, person in enumerate(people)
+    }
+    slots = [{'date': f'2025-11-{13 + t % 3}', 'start_time': f'{1 + t % 12}:{t % 60:02d}{"am" if t % 2 else "pm"}'}
+             for t in range(num_slots)]
+    print(f"{num_slots} slots x {team_size} people, each checked 3 times\n")
+
+    start = time.perf_counter()
+    legacy = [[legacy_is_available(constraints, person, slot['date'], slot['start_time']) for person in people]
+              for _ in range(3) for slot in slots]
+    print(f"{'strptime per call':<28} {time.perf_counter() - start:8.3f}s")
+
+    start = time.perf_counter()
+    team = Availability(people, constraints, slots)
+    compiled = [[team.is_available(person, slot['date'], slot['start_time']) for person in people]
+                for _ in range(3) for slot in slots]
+    print(f"{'compiled matrix':<28} {time.perf_counter() - start:8.3f}s")
+    print(f"\nSame answers: {legacy == compiled}")
+
+
+if __name__ == '__main__':
+    main()
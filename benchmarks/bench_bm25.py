@@ -0,0 +1,63 @@
+"""
+Benchmark: building, updating and querying the BM25 index.
+
+Indexes synthetic sessions, reopens the index from its memory-mapped
+files, then times one BM25 query per team member's interest profile, and
+an incremental update after 1% of the sessions change.
+
+Usage:
+    uv run python benchmarks/bench_bm25.py [num_sessions]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from bench_keyword_scoring import synthetic_sessions  # noqa: E402
+from bm25_index import BM25Index  # noqa: E402
+from relevance_scorer import RelevanceScorer  # noqa: E402
+
+
+def documents(sessions):
+    return [
+        (s['session_id'], ' '.join([s['title'], s['description'], *json.loads(s['papers'])]))
+        for s in sessions
+    ]
+
+
+def main():
+    num_sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    scorer = RelevanceScorer(db_path=':memory:')
+    sessions = synthetic_sessions(num_sessions, list(scorer.keywords))
+
+    with tempfile.TemporaryDirectory() as path:
+        start = time.perf_counter()
+        BM25Index(path).update_documents(documents(sessions))
+        print(f"{'Build':<28} {(time.perf_counter() - start) * 1000:9.1f} ms")
+
+        start = time.perf_counter()
+        index = BM25Index(path)
+        print(f"{'Open (memory-mapped)':<28} {(time.perf_counter() - start) * 1000:9.1f} ms")
+
+        rounds = 20
+        for person, interests in scorer.person_interests.items():
+            start = time.perf_counter()
+            for _ in range(rounds):
+                index.top(interests, limit=10)
+            elapsed = (time.perf_counter() - start) / rounds
+            print(f"{'Top 10 for ' + person:<28} {elapsed * 1000:9.2f} ms")
+
+        for s in sessions[::100]:
+            s['description'] += ' poverty measurement update'
+        start = time.perf_counter()
+        changed = index.update_documents(documents(sessions))
+        print(f"{f'Update ({changed} changed)':<28} {(time.perf_counter() - start) * 1000:9.1f} ms")
+
+    print(f"\n{len(index)} sessions, {len(index.vocabulary)} terms, {len(index.docs)} postings")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark: per-session wall time with and without a shared browser.
+
+Serves synthetic session pages from a local HTTP server so the numbers
+measure browser overhead rather than the conference site. Requires the
+Playwright Chromium build (`uv run playwright install chromium`).
+
+Usage:
+    uv run python benchmarks/bench_browser_reuse.py [num_sessions]
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from scraper import APPAMScraper  # noqa: E402
+
+
+SESSION_PAGE = """<html><head><title>APPAM Fall Research Conference: Session {sid}</title></head>
+<body><div class="content">
+<h2>Benchmark Session {sid}: Tax Policy and Microsimulation</h2>
+<p>Thursday, November 13, 2025: 10:15 AM-11:45 AM</p>
+<p>Location: Hyatt Regency Seattle, 5th Floor, Room {sid}</p>
+<p>Chair: Jane Doe (University of Somewhere)</p>
+<p>This synthetic session exists only to exercise the scraper in benchmarks.</p>
+<ul><li>Alice Smith - Paper One on the Child Tax Credit</li>
+<li>Bob Jones - Paper Two on SNAP Take-up</li></ul>
+</div></body></html>"""
+
+
+class SessionPageHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        sid = query.get('selected_session_id', ['0'])[0]
+        body = SESSION_PAGE.format(sid=sid).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def time_sessions(scraper, session_ids):
+    """Return per-session wall times for scraping the given sessions."""
+    timings = []
+    for session_id in session_ids:
+        start = time.perf_counter()
+        scraper.scrape_session_detail(session_id)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def report(label, timings):
+    mean = sum(timings) / len(timings)
+    print(f"{label:<28} {mean * 1000:8.1f} ms/session  "
+          f"(min {min(timings) * 1000:.1f}, max {max(timings) * 1000:.1f})")
+    return mean
+
+
+def main():
+    num_sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    session_ids = [str(2260000 + i) for i in range(num_sessions)]
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SessionPageHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        scraper = APPAMScraper(db_path=os.path.join(tmp, 'bench.db'))
+        scraper.base_url = f"http://127.0.0.1:{server.server_port}/"
+
+        print(f"Scraping {num_sessions} synthetic sessions...\n")
+
+        # Before: every call launches and tears down its own browser
+        before = report("Browser per session", time_sessions(scraper, session_ids))
+
+        # After: one browser and context shared across all calls
+        with scraper.browser_session():
+            after = report("Shared browser", time_sessions(scraper, session_ids))
+
+    server.shutdown()
+    print(f"\nSpeedup: {before / after:.2f}x per session")
+
+
+if __name__ == '__main__':
+    main()
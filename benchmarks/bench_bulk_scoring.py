@@ -0,0 +1,57 @@
+"""
+Benchmark: rescoring a whole conference, per session vs. BulkScorer.
+
+Scores synthetic sessions for every person once with RelevanceScorer's
+per-session methods, then with BulkScorer: one indexing pass, followed by
+rescoring from the index as when trying weight changes. Reports wall time
+for each and how many scores differ (should be 0).
+
+Usage:
+    uv run python benchmarks/bench_bulk_scoring.py [num_sessions]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from bench_keyword_scoring import synthetic_sessions  # noqa: E402
+from bulk_scoring import BulkScorer  # noqa: E402
+from relevance_scorer import RelevanceScorer  # noqa: E402
+
+
+def main():
+    num_sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    scorer = RelevanceScorer(db_path=':memory:')
+    people = list(scorer.person_interests)
+    sessions = synthetic_sessions(num_sessions, list(scorer.keywords))
+
+    print(f"Scoring {num_sessions} synthetic sessions for {len(people)} people...\n")
+
+    start = time.perf_counter()
+    expected = {person: [scorer.score_for_person(s, person)['score'] for s in sessions] for person in people}
+    per_session = time.perf_counter() - start
+    print(f"{'Per-session scoring':<28} {per_session * 1000:9.1f} ms")
+
+    bulk = BulkScorer(scorer)
+    start = time.perf_counter()
+    index = bulk.index(sessions)
+    indexing = time.perf_counter() - start
+    print(f"{'BulkScorer indexing (once)':<28} {indexing * 1000:9.1f} ms")
+
+    start = time.perf_counter()
+    actual = bulk.all_person_scores(index)
+    rescoring = time.perf_counter() - start
+    print(f"{'BulkScorer rescoring':<28} {rescoring * 1000:9.1f} ms")
+
+    start = time.perf_counter()
+    bulk.raw_scores(index, {**scorer.keywords, 'poverty': 12})
+    raw = time.perf_counter() - start
+    print(f"{'  unrounded, new weights':<28} {raw * 1000:9.1f} ms")
+
+    mismatches = sum(a != e for person in people for a, e in zip(actual[person].tolist(), expected[person]))
+    print(f"\nRescoring speedup: {per_session / rescoring:.0f}x, {mismatches} scores differ")
+
+
+if __name__ == '__main__':
+    main()
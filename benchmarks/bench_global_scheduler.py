@@ -0,0 +1,74 @@
+"""
+Benchmark: per-slot greedy scheduling vs. the whole-conference MIP.
+
+Builds a synthetic conference (random person scores; everyone available)
+and reports each schedule's total value and solve time, unconstrained and
+with cross-slot limits the greedy scheduler can't express.
+
+Usage:
+    uv run python benchmarks/bench_global_scheduler.py [num_slots] [sessions_per_slot]
+"""
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from global_scheduler import solve  # noqa: E402
+from optimal_scheduler import OptimalScheduler  # noqa: E402
+
+
+def synthetic_slots(people, num_slots, sessions_per_slot, seed=0):
+    rng = random.Random(seed)
+    slots = []
+    for t in range(num_slots):
+        date = f'2025-11-{14 + t // 8}'
+        start_time = f'{8 + t % 8 - (12 if t % 8 >= 5 else 0)}:00{"pm" if t % 8 >= 4 else "am"}'
+        sessions = [{
+            'session_id': f'{t}.{i}',
+            'title': f'Session {t}.{i}',
+            'general_score': rng.randint(0, 100),
+            'person_scores': {person: rng.choice([0, 10, 20, 40, 60, 80, 95]) for person in people},
+        } for i in range(sessions_per_slot)]
+        slots.append(({'date': date, 'start_time': start_time, 'end_time': ''}, sessions))
+    return slots
+
+
+def total(all_assignments):
+    return sum(slot_data['value']['total'] for slot_data in all_assignments)
+
+
+def main():
+    num_slots = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    sessions_per_slot = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    scheduler = OptimalScheduler(db_path=None)
+    # Everyone is there for the whole synthetic conference
+    scheduler.availability = {}
+    slots = synthetic_slots(scheduler.people, num_slots, sessions_per_slot)
+    tracks = {session['session_id']: f'topic {i % 10}'
+              for _, sessions in slots for i, session in enumerate(sessions)}
+    print(f"{num_slots} slots x {sessions_per_slot} sessions, {len(scheduler.people)} people\n")
+
+    start = time.perf_counter()
+    greedy = scheduler.assign_each_slot(slots)
+    print(f"{'Per-slot greedy':<40} value {total(greedy):8.0f}  {time.perf_counter() - start:6.2f}s")
+
+    runs = [
+        ('MIP, same rules', {}),
+        # The booth needs someone every slot; share those shifts out evenly
+        ('MIP, booth shifts shared evenly', {'max_booth_shifts': -(-num_slots // len(scheduler.people))}),
+        ('MIP, <= 2 sessions per topic', {'max_per_track': 2, 'tracks': tracks}),
+        ('MIP, cover general score >= 90', {'must_cover_score': 90}),
+    ]
+    for label, options in runs:
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            best = solve(scheduler, slots, time_limit=60, **options)
+        print(f"{label:<40} value {total(best):8.0f}  {time.perf_counter() - start:6.2f}s")
+
+
+if __name__ == '__main__':
+    main()
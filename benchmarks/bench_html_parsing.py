@@ -0,0 +1,99 @@
+"""
+Benchmark: session extraction throughput for each HTML parsing backend.
+
+Parses the session pages stored in a scraped database, or synthetic session
+pages if there is none, with scraper.py's and scrape_working.py's
+extraction logic. Reports documents/second per backend and how many
+documents extract differently from the BeautifulSoup baseline.
+
+Usage:
+    uv run python benchmarks/bench_html_parsing.py [db_path] [max_docs]
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from html_parsing import available_backends  # noqa: E402
+from html_store import HtmlStore  # noqa: E402
+from scraper import APPAMScraper  # noqa: E402
+from scrape_working import parse_session_html as parse_working_html  # noqa: E402
+
+
+SESSION_PAGE = """<!DOCTYPE html>
+<html><head><title>APPAM Fall Research Conference: Session {sid}</title>
+<meta property="og:title" content="Session {sid}">
+<script>window.config = {{"session": "{sid}"}};</script>
+<style>.paper {{ margin: 0; }}</style></head>
+<body><div class="nav">{nav}</div>
+<div class="content">
+<h2>Benchmark Session {sid}: Tax Policy and Microsimulation</h2>
+<p>Thursday, November 13, 2025: 10:15 AM-11:45 AM</p>
+<p>Location: Hyatt Regency Seattle, 5th Floor, Room {sid}</p>
+<p>Chair: Jane Doe (University of Somewhere)</p>
+<p>{abstract}</p>
+<ul>{papers}</ul>
+<span class="AuthorName">Maria Garcia (Georgetown University)</span>
+</div></body></html>"""
+
+
+def synthetic_pages(count):
+    """Session pages roughly the size and shape of the conference site's."""
+    nav = ''.join(f'<a href="?selected_day=2025-11-{day}">Day {day}</a>' for day in range(12, 16)) * 10
+    abstract = 'This synthetic session studies the Child Tax Credit, SNAP and Medicaid. ' * 20
+    papers = ''.join(f'<li>Author {i} - Paper {i} on benefit take-up</li>' for i in range(5))
+    return [
+        (str(2260000 + i), SESSION_PAGE.format(sid=i, nav=nav, abstract=abstract, papers=papers))
+        for i in range(count)
+    ]
+
+
+def stored_pages(db_path, limit):
+    """(session_id, raw_html) rows from a scraped database."""
+    conn = sqlite3.connect(db_path)
+    store = HtmlStore(conn)
+    rows = next(store.iter_batches(limit), [])
+    conn.close()
+    return rows
+
+
+def run(parse, pages):
+    """Parse every page; returns (docs/second, results)."""
+    start = time.perf_counter()
+    results = [parse(session_id, html) for session_id, html in pages]
+    return len(pages) / (time.perf_counter() - start), results
+
+
+def main():
+    db_path = sys.argv[1] if len(sys.argv) > 1 else 'appam_sessions.db'
+    max_docs = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+
+    pages = stored_pages(db_path, max_docs) if os.path.exists(db_path) else []
+    if pages:
+        print(f"Parsing {len(pages)} stored pages from {db_path}\n")
+    else:
+        pages = synthetic_pages(max_docs)
+        print(f"No stored pages found; parsing {len(pages)} synthetic pages\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, make_parser in (
+            ('scraper.py', lambda backend: APPAMScraper(
+                db_path=os.path.join(tmp, 'bench.db'), html_parser=backend).parse_session_html),
+            ('scrape_working.py', lambda backend: (
+                lambda session_id, html: parse_working_html(session_id, html, backend))),
+        ):
+            print(label)
+            baseline_rate, baseline = run(make_parser('bs4'), pages)
+            for backend in available_backends():
+                rate, results = (baseline_rate, baseline) if backend == 'bs4' else run(make_parser(backend), pages)
+                mismatches = sum(a != b for a, b in zip(results, baseline))
+                print(f"  {backend:<12} {rate:9.1f} docs/s  {rate / baseline_rate:5.2f}x  "
+                      f"{mismatches} differ from bs4")
+            print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""
+Benchmark: RelevanceScorer keyword scoring, one regex per keyword vs. one pass.
+
+Scores synthetic sessions for every person, the way Scheduler does, twice:
+once with the previous implementation (a re.findall per keyword, then a
+substring scan of the title and of title + description for each person),
+and once with RelevanceScorer's compiled KeywordMatcher. Reports
+sessions/second and how many scores differ (should be 0).
+
+Usage:
+    uv run python benchmarks/bench_keyword_scoring.py [num_sessions]
+"""
+import json
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from relevance_scorer import RelevanceScorer  # noqa: E402
+
+
+FILLER = ('the of and in for with study evidence effects program state federal results '
+          'households families children workers academic first administration').split()
+
+
+def synthetic_sessions(count, keywords, seed=0):
+    """Sessions mixing scoring keywords, near misses and filler words."""
+    rng = random.Random(seed)
+    vocabulary = FILLER + keywords + ['Tax', 'Health', 'SNAP-Ed', 'snapshot', 'first-year']
+
+    def words(n):
+        return ' '.join(rng.choice(vocabulary) if rng.random() < 0.3 else rng.choice(FILLER) for _ in range(n))
+
+    return [{
+        'session_id': str(i),
+        'title': words(rng.randint(4, 12)).title(),
+        'description': words(rng.randint(80, 300)),
+        'chair': 'Jane Doe',
+        'papers': json.dumps([words(rng.randint(5, 12)) for _ in range(rng.randint(0, 5))]),
+    } for i in range(count)]
+
+
+def legacy_score_session(scorer, session_data):
+    """The previous RelevanceScorer.score_session."""
+    text_fields = [
+        session_data.get('title', ''),
+        session_data.get('description', ''),
+        session_data.get('chair', ''),
+    ]
+    papers = session_data.get('papers', '')
+    if papers:
+        try:
+            paper_list = json.loads(papers) if isinstance(papers, str) else papers
+            text_fields.extend(paper_list)
+        except ValueError:
+            text_fields.append(str(papers))
+    full_text = ' '.join(text_fields).lower()
+
+    score = 0
+    matched_keywords = []
+    for keyword, weight in scorer.keywords.items():
+        count = len(re.findall(r'\b' + re.escape(keyword.lower()) + r'\b', full_text))
+        if count > 0:
+            keyword_score = sum(weight / (i + 1) for i in range(min(count, 3)))
+            score += keyword_score
+            matched_keywords.append((keyword, count, keyword_score))
+
+    title = session_data.get('title', '').lower()
+    for keyword, weight in scorer.keywords.items():
+        if keyword.lower() in title:
+            score += weight * 0.5
+
+    return {'score': round(score, 2), 'matched_keywords': matched_keywords}
+
+
+def legacy_score_for_person(scorer, session_data, person_name):
+    """The previous RelevanceScorer.score_for_person."""
+    base_result = legacy_score_session(scorer, session_data)
+    base_score = base_result['score']
+    full_text = ' '.join([
+        session_data.get('title', ''),
+        session_data.get('description', ''),
+    ]).lower()
+
+    modifier = 1.0
+    for keyword, multiplier in scorer.person_interests[person_name].items():
+        if keyword.lower() in full_text:
+            modifier = max(modifier, multiplier)
+
+    return {
+        'score': round(base_score * modifier, 2),
+        'base_score': base_score,
+        'modifier': modifier,
+        'matched_keywords': base_result['matched_keywords']
+    }
+
+
+def run(score, sessions, people):
+    """Score every session for every person; returns (sessions/second, results)."""
+    start = time.perf_counter()
+    results = [[score(session, person) for person in people] for session in sessions]
+    return len(sessions) / (time.perf_counter() - start), results
+
+
+def main():
+    num_sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    scorer = RelevanceScorer(db_path=':memory:')
+    people = list(scorer.person_interests)
+    sessions = synthetic_sessions(num_sessions, list(scorer.keywords))
+
+    print(f"Scoring {num_sessions} synthetic sessions for {len(people)} people...\n")
+
+    before, expected = run(lambda s, p: legacy_score_for_person(scorer, s, p), sessions, people)
+    print(f"{'Regex per keyword':<24} {before:9.0f} sessions/s")
+
+    after, actual = run(scorer.score_for_person, sessions, people)
+    print(f"{'Single-pass matcher':<24} {after:9.0f} sessions/s")
+
+    mismatches = sum(a != e for a, e in zip(actual, expected))
+    print(f"\nSpeedup: {after / before:.1f}x, {mismatches} sessions scored differently")
+
+
+if __name__ == '__main__':
+    main()
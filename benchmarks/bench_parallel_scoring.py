@@ -0,0 +1,78 @@
+"""
+Benchmark: dual scoring a large database serially vs. across a process pool.
+
+Writes synthetic sessions to a temporary database, then scores copies of it
+with dual_scorer.score_all_sessions and with score_in_parallel at 1, 2, 4
+... workers up to the CPU count. Reports sessions/second for each and checks
+that every run wrote the same scores.
+
+Usage:
+    uv run python benchmarks/bench_parallel_scoring.py [num_sessions]
+"""
+import contextlib
+import io
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import dual_scorer  # noqa: E402
+from bench_keyword_scoring import synthetic_sessions  # noqa: E402
+from parallel_scoring import score_in_parallel  # noqa: E402
+from relevance_scorer import RelevanceScorer  # noqa: E402
+from scraper import APPAMScraper  # noqa: E402
+
+
+def build_database(path, num_sessions):
+    scraper = APPAMScraper(db_path=path)
+    scraper.init_database()
+    sessions = synthetic_sessions(num_sessions, list(RelevanceScorer(db_path=None).keywords))
+    for session in sessions:
+        session.update(date='2025-11-13', start_time='10:15 AM', end_time='11:45 AM', location='Room 1')
+    scraper.save_sessions(sessions)
+
+
+def scores(path):
+    conn = sqlite3.connect(path)
+    result = conn.execute('SELECT session_id, person_id, score FROM session_scores ORDER BY 1, 2').fetchall()
+    conn.close()
+    return result
+
+
+def main():
+    num_sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    cpus = os.cpu_count() or 1
+
+    with tempfile.TemporaryDirectory() as directory:
+        base = os.path.join(directory, 'base.db')
+        with contextlib.redirect_stdout(io.StringIO()):
+            build_database(base, num_sessions)
+        print(f"Dual scoring {num_sessions} synthetic sessions ({cpus} CPUs)...\n")
+
+        serial = os.path.join(directory, 'serial.db')
+        shutil.copy(base, serial)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            dual_scorer.score_all_sessions(serial)
+        elapsed = time.perf_counter() - start
+        print(f"{'score_all_sessions':<24} {num_sessions / elapsed:9.0f} sessions/s")
+        expected = scores(serial)
+
+        workers = 1
+        while True:
+            path = os.path.join(directory, f'parallel_{workers}.db')
+            shutil.copy(base, path)
+            results = score_in_parallel(path, 'dual', workers=workers)
+            same = 'same scores' if scores(path) == expected else 'SCORES DIFFER'
+            print(f"{f'{workers} worker(s)':<24} {num_sessions / results['elapsed']:9.0f} sessions/s  ({same})")
+            if workers >= cpus:
+                break
+            workers = min(workers * 2, cpus)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,351 @@
+"""
+Benchmark: the dual and smart scorers, if-chains vs. the compiled rule engine.
+
+Scores synthetic sessions with the previous hand-written rule functions
+(kept below) and with rules/dual.json and rules/smart.json compiled by
+RuleEngine, then reports time per session and how many scores differ
+(should be 0). The last line times re-evaluating rules from already
+extracted term hits, the cost of scoring another person or trying an
+edited rule.
+
+End to end, finding the hits dominates: splitting a text into its distinct
+words costs about as much as 15 `term in text` searches, which caps the
+dual speedup near 3x and the smart one (fewer searches to start with,
+since its rules stop early) near 1.2x in CPython. A combined regex or a C
+Aho-Corasick automaton over the same texts measured slower than the word
+pass.
+
+Usage:
+    uv run python benchmarks/bench_rule_engine.py [num_sessions]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import dual_scorer  # noqa: E402
+import intelligent_scorer  # noqa: E402
+
+
+FILLER = ('the of and in for with study evidence effects program federal results households '
+          'families children workers academic first we examine how local labor markets respond '
+          'using novel survey data across regions outcomes employment earnings').split()
+
+
+def synthetic_sessions(count, terms, seed=0):
+    """Sessions of filler text with a few rule terms mixed in."""
+    rng = random.Random(seed)
+
+    def words(n, density):
+        return ' '.join(rng.choice(terms) if rng.random() < density else rng.choice(FILLER) for _ in range(n))
+
+    return [{
+        'session_id': str(i),
+        'title': words(rng.randint(4, 12), 0.05).title(),
+        'description': words(rng.randint(80, 400), 0.01),
+        'papers': [words(rng.randint(5, 12), 0.05) for _ in range(rng.randint(0, 5))],
+    } for i in range(count)]
+
+
+def legacy_score_session_for_policyengine(session):
+    """The previous dual_scorer.score_session_for_policyengine."""
+    title = session['title'].lower()
+    desc = (session.get('description') or '').lower()[:2000]
+    text = f"{title} {desc}"
+
+    # MUST ATTEND (90-100)
+    if 'microsimulation' in text:
+        return (100, "Microsimulation methodology - core PolicyEngine work")
+
+    if ('ctc' in text or 'child tax credit' in text) and ('poverty' in text or 'eitc' in text):
+        return (95, "CTC/EITC analysis - PolicyEngine's primary policy area")
+
+    if 'poverty' in text and 'measurement' in text:
+        return (95, "Poverty measurement - critical for impact calculations")
+
+    # HIGHLY RELEVANT (75-89)
+    if 'snap' in text and ('work requirement' in text or 'eligibility' in text or 'take-up' in text):
+        return (85, "SNAP policy analysis - directly modeled in PolicyEngine")
+
+    if 'medicaid' in text and ('expansion' in text or 'eligibility' in text):
+        return (80, "Medicaid policy - modeled in PolicyEngine")
+
+    if 'universal basic income' in text or 'guaranteed income' in text:
+        return (85, "UBI/guaranteed income - Max's research focus")
+
+    if ('tax credit' in text or 'eitc' in text) and 'state' in text:
+        return (80, "State tax credits - PolicyEngine models these")
+
+    # RELEVANT (60-74)
+    if 'tax policy' in text or 'tax reform' in text:
+        return (70, "Tax policy - core PolicyEngine domain")
+
+    if ('snap' in text or 'wic' in text or 'tanf' in text):
+        return (70, "Benefit program analysis")
+
+    if 'medicaid' in text or 'medicare' in text:
+        return (65, "Health policy - PolicyEngine models health programs")
+
+    if 'distributional' in text or ('inequality' in text and 'income' in text):
+        return (65, "Distributional analysis - PolicyEngine's output focus")
+
+    # MODERATELY RELEVANT (40-59)
+    if 'administrative data' in text and ('benefit' in text or 'policy' in text):
+        return (55, "Administrative data for policy - useful methodology")
+
+    if 'poverty' in text:
+        return (50, "Poverty focus - relevant to PolicyEngine impact")
+
+    if 'housing' in text and ('subsidy' in text or 'voucher' in text):
+        return (50, "Housing assistance - adjacent policy")
+
+    if 'tax' in text:
+        return (45, "Tax-related topic")
+
+    # LOW RELEVANCE (0-39)
+    if 'policy' in text:
+        return (30, "General policy - tangentially relevant")
+
+    return (20, "Low PolicyEngine relevance")
+
+
+def legacy_score_for_person(session, person_name):
+    """The previous dual_scorer.score_for_person."""
+    general_score, _ = legacy_score_session_for_policyengine(session)
+    title = session['title'].lower()
+    desc = (session.get('description') or '').lower()[:2000]
+    text = f"{title} {desc}"
+
+    if person_name == 'Max Ghenis':
+        # Max: CEO, UBI focus, poverty reduction
+        if 'universal basic income' in text or 'guaranteed income' in text or 'cash transfer' in text:
+            return (100, "UBI/cash transfers - Max's research specialty")
+        if 'poverty' in text and ('measurement' in text or 'reduction' in text):
+            return (95, "Poverty measurement/reduction - critical for Max")
+        if 'ctc' in text or 'child tax credit' in text:
+            return (90, "CTC policy - highly relevant to Max")
+        if 'child allowance' in text:
+            return (90, "Child allowance - Max's research area")
+        # Otherwise base on general score with slight boost for tax/poverty
+        if 'tax' in text or 'poverty' in text:
+            return (min(100, general_score + 10), "Tax/poverty policy - relevant to CEO perspective")
+        return (general_score, "Standard relevance")
+
+    elif person_name == 'Pavel Makarchuk':
+        # Pavel: Director of Growth, microsimulation expert, tax-benefit modeling
+        # Focus on QUANTITATIVE/TECHNICAL policy analysis, not qualitative
+        if 'microsimulation' in text:
+            return (100, "Microsimulation - Pavel's core expertise")
+        if 'ctc' in text or 'eitc' in text or 'tax credit' in text:
+            return (95, "Tax credits - Pavel's modeling expertise")
+        if 'tax policy' in text and ('distributional' in text or 'reform' in text):
+            return (90, "Tax policy analysis - Pavel's expertise")
+        if 'policy modeling' in text or 'simulation' in text:
+            return (85, "Policy modeling - Pavel's domain")
+        if 'behavioral response' in text or 'labor supply' in text:
+            return (80, "Behavioral effects - key for microsimulation")
+        if 'data visualization' in text:
+            return (75, "Data viz - relevant to Pavel's growth role")
+
+        # Medicare/Medicaid with program evaluation or data focus
+        if ('medicare' in text or 'medicaid' in text) and ('policy' in text or 'evaluation' in text or 'administrative data' in text):
+            return (70, "Health program evaluation - relevant methodology")
+
+        # REDUCE score for qualitative/roundtable cash transfers without Max
+        if ('cash transfer' in text or 'unconditional' in text) and 'roundtable' in text:
+            return (max(10, general_score - 30), "Qualitative roundtable - better for Max's policy focus")
+
+        # Tax and benefit programs
+        if 'tax' in text:
+            return (min(100, general_score + 15), "Tax policy - Pavel's expertise")
+
+        return (general_score, "Standard relevance")
+
+    elif person_name == 'Daphne Hansell':
+        # Daphne: Health Policy Analyst
+        if 'medicaid' in text or 'medicare' in text:
+            return (95, "Medicaid/Medicare - Daphne's core focus")
+        if 'health policy' in text or 'health reform' in text or 'aca' in text:
+            return (95, "Health policy - Daphne's specialty")
+        if 'health insurance' in text or 'health coverage' in text:
+            return (90, "Health insurance - Daphne's expertise")
+        if 'health' in text and ('access' in text or 'equity' in text):
+            return (85, "Health access/equity - relevant to Daphne")
+        if 'housing policy' in text:
+            return (70, "Housing policy - Daphne's secondary interest")
+        # Health-adjacent
+        if 'health' in text:
+            return (min(100, general_score + 10), "Health topic - relevant to Daphne")
+        return (general_score, "Standard relevance")
+
+    return (general_score, "Standard relevance")
+
+
+def legacy_score_session_smart(session_data):
+    """The previous intelligent_scorer.score_session_smart."""
+    title = session_data['title']
+    description = session_data.get('description', '')[:2000]  # First 2000 chars
+    papers = session_data.get('papers', [])
+
+    # Combine text for analysis
+    full_text = f"Title: {title}\n\nDescription: {description}\n\nPapers: {', '.join(papers[:5]) if papers else 'None'}"
+
+    # VERY HIGH VALUE - Direct microsimulation/tax-benefit focus
+    if any(term in full_text.lower() for term in [
+        'microsimulation', 'microsimulating', 'microsimulated',
+        'policyengine', 'openfisca', 'taxsim', 'tax-benefit model'
+    ]):
+        return (95, "Direct microsimulation methodology or tool")
+
+    # Check for CTC/EITC focus
+    if ('ctc' in full_text.lower() or 'child tax credit' in full_text.lower() or
+        'eitc' in full_text.lower() or 'earned income' in full_text.lower()):
+        if 'poverty' in full_text.lower() or 'impact' in full_text.lower():
+            return (90, "CTC/EITC with poverty/impact analysis - core PolicyEngine topic")
+        return (75, "Tax credit policy - relevant to PolicyEngine")
+
+    # UBI/Guaranteed Income
+    if any(term in full_text.lower() for term in [
+        'universal basic income', 'guaranteed income', 'cash transfer',
+        'unconditional cash'
+    ]):
+        if 'randomized' in full_text.lower() or 'experiment' in full_text.lower():
+            return (85, "UBI/cash transfer RCT - highly relevant")
+        return (75, "UBI/guaranteed income policy")
+
+    # Poverty measurement
+    if 'poverty' in full_text.lower() and any(term in full_text.lower() for term in [
+        'measurement', 'measure', 'spm', 'supplemental poverty', 'census'
+    ]):
+        return (85, "Poverty measurement - core to PolicyEngine's impact calculations")
+
+    # SNAP/Medicaid policy analysis
+    snap_terms = ['snap', 'food stamp', 'supplemental nutrition']
+    medicaid_terms = ['medicaid', 'chip', 'health insurance']
+
+    if any(term in full_text.lower() for term in snap_terms):
+        if any(word in full_text.lower() for word in ['take-up', 'enrollment', 'eligibility', 'benefit', 'impact']):
+            return (80, "SNAP program analysis - directly models in PolicyEngine")
+        return (65, "SNAP related - relevant benefit program")
+
+    if any(term in full_text.lower() for term in medicaid_terms):
+        if any(word in full_text.lower() for word in ['expansion', 'eligibility', 'coverage', 'enrollment', 'aca']):
+            return (75, "Medicaid policy - modeled in PolicyEngine")
+        return (60, "Health insurance policy - relevant to PolicyEngine health modeling")
+
+    # Tax policy (general)
+    if 'tax' in full_text.lower() and any(term in full_text.lower() for term in [
+        'reform', 'policy', 'income tax', 'payroll', 'credit', 'deduction'
+    ]):
+        if 'distributional' in full_text.lower() or 'inequality' in full_text.lower():
+            return (75, "Tax policy with distributional analysis")
+        return (60, "Tax policy - core PolicyEngine domain")
+
+    # Distributional analysis
+    if any(term in full_text.lower() for term in [
+        'distributional', 'inequality', 'income distribution', 'wealth distribution'
+    ]):
+        if 'administrative data' in full_text.lower() or 'microdata' in full_text.lower():
+            return (70, "Distributional analysis with administrative data")
+        return (55, "Distributional/inequality focus")
+
+    # Methodology that would improve PolicyEngine
+    if any(term in full_text.lower() for term in [
+        'causal inference', 'difference-in-differences', 'regression discontinuity',
+        'synthetic control', 'propensity score'
+    ]):
+        if 'tax' in full_text.lower() or 'benefit' in full_text.lower() or 'policy' in full_text.lower():
+            return (65, "Causal methods for policy evaluation - applicable to PolicyEngine validation")
+        return (45, "Causal inference methodology")
+
+    # Machine learning for policy
+    if 'machine learning' in full_text.lower() or 'prediction' in full_text.lower():
+        if 'health' in full_text.lower() or 'benefit' in full_text.lower():
+            return (50, "ML for policy - potentially useful methodology")
+        return (35, "ML methods - tangentially relevant")
+
+    # Housing policy (relevant but not core)
+    if 'housing' in full_text.lower():
+        if 'voucher' in full_text.lower() or 'subsidy' in full_text.lower():
+            return (55, "Housing assistance - benefit program")
+        return (40, "Housing policy - adjacent to core work")
+
+    # Education policy
+    if 'education' in full_text.lower() or 'school' in full_text.lower():
+        if 'benefit' in full_text.lower() or 'subsidy' in full_text.lower():
+            return (45, "Education with benefit component")
+        return (30, "Education policy - low relevance")
+
+    # Child welfare
+    if 'child welfare' in full_text.lower():
+        return (40, "Child welfare - adjacent policy area")
+
+    # Default: check for any poverty/policy connection
+    if 'poverty' in full_text.lower():
+        return (50, "Poverty-related topic")
+
+    if 'policy' in full_text.lower() and ('welfare' in full_text.lower() or 'social' in full_text.lower()):
+        return (35, "Social policy - tangentially relevant")
+
+    return (20, "Low relevance to PolicyEngine core work")
+
+
+def timed(label, score, sessions):
+    start = time.perf_counter()
+    results = [score(session) for session in sessions]
+    elapsed = time.perf_counter() - start
+    print(f"{label:<36} {elapsed / len(sessions) * 1e6:8.1f} us/session")
+    return elapsed, results
+
+
+def main():
+    num_sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    dual, smart = dual_scorer.RULES, intelligent_scorer.RULES
+    people = list(dual.people)
+    sessions = synthetic_sessions(num_sessions, sorted(set(dual.terms) | set(smart.terms)))
+
+    print(f"Scoring {num_sessions} synthetic sessions (general + {len(people)} people, and smart)...\n")
+
+    def legacy_dual(session):
+        return [legacy_score_session_for_policyengine(session)] + [
+            legacy_score_for_person(session, person) for person in people
+        ]
+
+    def engine_dual(session):
+        hits = dual.hits(dual_scorer.rule_text(session))
+        general = dual.score(hits)
+        return [general] + [dual.score_for_person(hits, person, general) for person in people]
+
+    before, expected = timed('Dual, if-chains', legacy_dual, sessions)
+    after, actual = timed('Dual, rule engine', engine_dual, sessions)
+    dual_diffs = sum(a != e for a, e in zip(actual, expected))
+
+    smart_before, expected = timed('Smart, if-chains', legacy_score_session_smart, sessions)
+    smart_after, actual = timed('Smart, rule engine', intelligent_scorer.score_session_smart, sessions)
+    smart_diffs = sum(a != e for a, e in zip(actual, expected))
+
+    def evaluate(hits):
+        general = dual.score(hits)
+        return [general] + [dual.score_for_person(hits, person, general) for person in people]
+
+    # Every text's hits found and its decisions cached; evaluate again
+    all_hits = [dual.hits(dual_scorer.rule_text(session)) for session in sessions]
+    for hits in all_hits:
+        evaluate(hits)
+
+    start = time.perf_counter()
+    for hits in all_hits:
+        evaluate(hits)
+    evaluation = time.perf_counter() - start
+    print(f"{'Dual, rules over extracted hits':<36} {evaluation / num_sessions * 1e6:8.1f} us/session")
+
+    print(f"\nDual: {before / after:.1f}x, {dual_diffs} sessions scored differently")
+    print(f"Smart: {smart_before / smart_after:.1f}x, {smart_diffs} sessions scored differently")
+    print(f"Re-evaluating rules: {before / evaluation:.0f}x faster than the if-chains")
+    print("(End to end stays under 10x: finding the hits costs most of it; see the module docstring.)")
+
+
+if __name__ == '__main__':
+    main()
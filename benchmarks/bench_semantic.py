@@ -0,0 +1,57 @@
+"""
+Benchmark: semantic scoring cold, warm and after a profile edit.
+
+Scores synthetic sessions against the team's interest profiles with the
+default encoder (the local model if sentence-transformers is installed,
+else HashingEncoder): first with an empty embedding cache, then again from
+the memory-mapped cache, then after adding one phrase to a profile.
+
+Usage:
+    uv run python benchmarks/bench_semantic.py [num_sessions]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from bench_keyword_scoring import synthetic_sessions  # noqa: E402
+from relevance_scorer import RelevanceScorer  # noqa: E402
+from semantic_scorer import SemanticScorer  # noqa: E402
+
+
+def documents(sessions):
+    return [
+        (s['session_id'], ' '.join([s['title'], s['description'], *json.loads(s['papers'])]))
+        for s in sessions
+    ]
+
+
+def timed(label, scorer, docs):
+    start = time.perf_counter()
+    rows = scorer.score_documents(docs)
+    print(f"{label:<28} {(time.perf_counter() - start) * 1000:9.1f} ms  ({len(rows)} scores)")
+
+
+def main():
+    num_sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    profiles = RelevanceScorer(db_path=None).person_interests
+    docs = documents(synthetic_sessions(num_sessions, list(RelevanceScorer(db_path=None).keywords)))
+
+    with tempfile.TemporaryDirectory() as path:
+        scorer = SemanticScorer(db_path=None, cache_dir=path, profiles=profiles)
+        print(f"Scoring {num_sessions} sessions for {len(profiles)} profiles with {scorer.encoder.name}...\n")
+        timed('Cold (empty cache)', scorer, docs)
+
+        scorer = SemanticScorer(db_path=None, cache_dir=path, encoder=scorer.encoder, profiles=profiles)
+        timed('Warm (reopened cache)', scorer, docs)
+
+        person = next(iter(profiles))
+        scorer.profiles = {**profiles, person: {**profiles[person], 'refundable credits': 1.5}}
+        timed('After a profile edit', scorer, docs)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+Benchmark: session write throughput, per-session commits vs. batched writes.
+
+Writes a synthetic corpus of parsed sessions to a fresh database twice:
+once the way save_session used to (a connection and commit per session, a
+SELECT per presenter), and once through SessionWriter in batches.
+
+Usage:
+    uv run python benchmarks/bench_session_writer.py [num_sessions] [batch_size]
+"""
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from html_store import HtmlStore  # noqa: E402
+from scraper import APPAMScraper  # noqa: E402
+from session_writer import SESSION_UPSERT, SessionWriter  # noqa: E402
+
+
+def synthetic_sessions(count, seed=0):
+    """Parsed sessions with presenters drawn from a shared pool, as at a real conference."""
+    rng = random.Random(seed)
+    people = [f"Presenter {i}" for i in range(count // 2)]
+    sessions = []
+    for i in range(count):
+        presenters = rng.sample(people, 4)
+        sessions.append({
+            'session_id': str(2260000 + i),
+            'title': f'Session {i}: Tax Policy and Microsimulation',
+            'date': f'2025-11-{rng.randint(12, 15)}',
+            'start_time': rng.choice(['8:30 AM', '10:15 AM', '1:45 PM', '3:30 PM']),
+            'end_time': '11:45 AM',
+            'location': f'Room {rng.randint(1, 80)}',
+            'description': 'Synthetic session used to benchmark database writes. ' * 5,
+            'chair': presenters[0],
+            'papers': json.dumps([f'{name} - Paper on benefit take-up' for name in presenters]),
+            'presenters': json.dumps(presenters),
+            'raw_html': '<html>' + 'x' * 4000 + '</html>'
+        })
+    return sessions
+
+
+def legacy_save(db_path, s):
+    """The previous save_session: its own connection, commit and presenter SELECTs."""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.execute(SESSION_UPSERT, (
+        s['session_id'], s['title'], s['date'], s['start_time'], s['end_time'],
+        s['location'], s['description'], s['chair'], s['papers']
+    ))
+    HtmlStore(conn).put_many(cursor, [(s['session_id'], s['raw_html'])])
+    cursor.execute('INSERT OR IGNORE INTO locations (name) VALUES (?)', (s['location'],))
+    cursor.execute('INSERT OR IGNORE INTO time_slots (date, start_time, end_time) VALUES (?, ?, ?)',
+                   (s['date'], s['start_time'], s['end_time']))
+    cursor.execute('DELETE FROM session_presenters WHERE session_id = ?', (s['session_id'],))
+    for name in json.loads(s['presenters']):
+        cursor.execute('INSERT OR IGNORE INTO presenters (name) VALUES (?)', (name,))
+        cursor.execute('SELECT id FROM presenters WHERE name = ?', (name,))
+        cursor.execute('INSERT OR IGNORE INTO session_presenters (session_id, presenter_id) VALUES (?, ?)',
+                       (s['session_id'], cursor.fetchone()[0]))
+    cursor.execute('DELETE FROM papers WHERE session_id = ?', (s['session_id'],))
+    for title in json.loads(s['papers']):
+        cursor.execute('INSERT INTO papers (title, session_id) VALUES (?, ?)', (title, s['session_id']))
+    conn.commit()
+    conn.close()
+
+
+def fresh_db(tmp, name):
+    db_path = os.path.join(tmp, name)
+    APPAMScraper(db_path=db_path).init_database()
+    return db_path
+
+
+def main():
+    num_sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    sessions = synthetic_sessions(num_sessions)
+
+    print(f"Writing {num_sessions} synthetic sessions...\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = fresh_db(tmp, 'legacy.db')
+        start = time.perf_counter()
+        for session in sessions:
+            legacy_save(db_path, session)
+        before = num_sessions / (time.perf_counter() - start)
+        print(f"{'Per-session commits':<28} {before:9.0f} sessions/s")
+
+        conn = sqlite3.connect(fresh_db(tmp, 'batched.db'))
+        start = time.perf_counter()
+        with SessionWriter(conn, batch_size=batch_size) as writer:
+            for session in sessions:
+                writer.add(session)
+        after = num_sessions / (time.perf_counter() - start)
+        conn.close()
+        print(f"{f'SessionWriter (batch {batch_size})':<28} {after:9.0f} sessions/s")
+
+    print(f"\nSpeedup: {after / before:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark: exact per-slot assignment as team and program size grow.
+
+Times OptimalScheduler.assign_slot_optimal on synthetic slots (random
+person scores; everyone available):
+
+- snapshot: with the per-person score arrays a ConferenceSnapshot slot
+  keeps (how optimize_schedule calls it), solved by scipy
+- dicts: looking each score up in the session dicts instead, with scipy
+- python: snapshot arrays with the pure-Python Hungarian fallback
+
+The target is well under a millisecond per slot for 50 people and hundreds
+of sessions. The snapshot path meets it; the pure-Python fallback, at
+O(people^2 x sessions), doesn't and is there for installs without scipy.
+
+Usage:
+    uv run python benchmarks/bench_slot_matching.py [repeats]
+"""
+import os
+import random
+import sys
+import time
+from array import array
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import slot_matching  # noqa: E402
+from optimal_scheduler import OptimalScheduler  # noqa: E402
+
+
+def synthetic_slot(people, num_sessions, seed=0):
+    rng = random.Random(seed)
+    return [{
+        'session_id': str(i),
+        'general_score': rng.randint(0, 100),
+        'person_scores': {person: rng.choice([0, 10, 20, 40, 60, 80, 95]) for person in people},
+    } for i in range(num_sessions)]
+
+
+def time_slot(scheduler, sessions, repeats, scores=None):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        _, value = scheduler.assign_slot_optimal('2025-11-14', '9:00am', '10:30am', sessions, scores)
+    return (time.perf_counter() - start) / repeats * 1000, value['total']
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    scipy_solver = slot_matching.linear_sum_assignment
+    print(f"{'team':>5} {'sessions':>9} {'value':>8} {'snapshot ms':>12} {'dicts ms':>10} {'python ms':>10}")
+    for team, num_sessions in [(3, 20), (10, 50), (50, 100), (50, 300)]:
+        scheduler = OptimalScheduler(db_path=None)
+        scheduler.people = [f'Person {i}' for i in range(team)]
+        scheduler.availability = {}
+        sessions = synthetic_slot(scheduler.people, num_sessions)
+        scores = {person: array('d', [scheduler.person_score(session, person) for session in sessions])
+                  for person in scheduler.people}
+
+        slot_matching.linear_sum_assignment = scipy_solver
+        if scipy_solver:
+            snapshot, value = time_slot(scheduler, sessions, repeats, scores)
+            dicts, _ = time_slot(scheduler, sessions, repeats)
+        else:
+            snapshot = dicts = float('nan')
+        slot_matching.linear_sum_assignment = None
+        pure, pure_value = time_slot(scheduler, sessions, max(1, repeats // 10), scores)
+        slot_matching.linear_sum_assignment = scipy_solver
+        print(f"{team:>5} {num_sessions:>9} {pure_value:>8.0f} {snapshot:>12.3f} {dicts:>10.3f} {pure:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
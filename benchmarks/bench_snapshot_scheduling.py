@@ -0,0 +1,97 @@
+"""
+Benchmark: scheduling runs with a query per slot vs. one ConferenceSnapshot.
+
+Writes a synthetic conference (sessions spread over three days of time
+slots, with stored dual and relevance scores for the team) to a temporary
+database and
+times:
+- reading every slot with get_time_slots/get_sessions_for_slot, and the
+  per-session x person score_for_person calls ConferenceScheduler used
+  to make inside that loop;
+- loading the same data as a ConferenceSnapshot;
+- full ConferenceScheduler (personalized) and OptimalScheduler runs,
+  which now run against the snapshot.
+
+Usage:
+    uv run python benchmarks/bench_snapshot_scheduling.py [num_sessions]
+"""
+import contextlib
+import io
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from bench_keyword_scoring import synthetic_sessions  # noqa: E402
+from optimal_scheduler import OptimalScheduler  # noqa: E402
+from relevance_scorer import RelevanceScorer  # noqa: E402
+from scheduler import ConferenceScheduler  # noqa: E402
+from scraper import APPAMScraper  # noqa: E402
+from session_scores import SessionScores  # noqa: E402
+
+TIMES = ['8:00am', '9:45am', '11:30am', '1:15pm', '3:00pm', '4:45pm']
+
+
+def build_database(path, num_sessions, people, seed=0):
+    rng = random.Random(seed)
+    scraper = APPAMScraper(db_path=path)
+    scraper.init_database()
+    sessions = synthetic_sessions(num_sessions, list(RelevanceScorer(db_path=None).keywords))
+    for i, session in enumerate(sessions):
+        session.update(date=f'2025-11-{13 + i % 3}', start_time=TIMES[i % len(TIMES)], end_time='', location='Room 1')
+    scraper.save_sessions(sessions)
+
+    conn = sqlite3.connect(path)
+    conn.executemany('UPDATE sessions SET general_score = ?, relevance_score = ? WHERE session_id = ?',
+                     [(rng.randint(0, 100), rng.randint(0, 60), session['session_id']) for session in sessions])
+    for scorer in ('dual', 'relevance'):
+        SessionScores(conn).write(scorer, [(session['session_id'], person, rng.randint(0, 100), None)
+                                           for session in sessions for person in people])
+    conn.commit()
+    conn.close()
+
+
+def timed(label, function):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        function()
+    print(f"{label:<52} {time.perf_counter() - start:7.3f}s")
+
+
+def main():
+    num_sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'conference.db')
+        optimal = OptimalScheduler(path)
+        conference = ConferenceScheduler(path)
+        build_database(path, num_sessions, optimal.people)
+        print(f"{num_sessions} sessions in {3 * len(TIMES)} slots, {len(optimal.people)} people\n")
+
+        def slot_queries():
+            for slot in optimal.get_time_slots():
+                optimal.get_sessions_for_slot(slot['date'], slot['start_time'], slot['end_time'])
+
+        scorer = RelevanceScorer(db_path=path)
+
+        def slot_queries_and_rescoring():
+            for slot in conference.get_time_slots():
+                sessions = conference.get_sessions_for_slot(slot['date'], slot['start_time'], slot['end_time'])
+                for person in conference.people:
+                    for session in sessions:
+                        scorer.score_for_person(session, person)
+
+        timed('Per-slot queries (OptimalScheduler)', slot_queries)
+        timed('Snapshot load (stored scores)', optimal.load_snapshot)
+        timed('Per-slot queries + score_for_person (ConferenceScheduler)', slot_queries_and_rescoring)
+        timed('Snapshot load (stored relevance scores)', conference.load_snapshot)
+        print()
+        timed('ConferenceScheduler.assign_sessions(personalized)', lambda: conference.assign_sessions('personalized'))
+        timed('OptimalScheduler.optimize_schedule()', optimal.optimize_schedule)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,300 @@
+"""
+BM25 retrieval index over session titles, descriptions, paper titles and
+abstracts.
+
+The index is an inverted file kept as memory-mapped numpy arrays in a
+directory next to the database:
+
+    meta.json       vocabulary, session ids, the content hash of each
+                    session, and the generation of the arrays below
+    offsets.N.npy   postings of term t are docs[offsets[t]:offsets[t + 1]]
+    docs.N.npy      session row of each posting, sorted by term then row
+    tfs.N.npy       term frequency of each posting
+    lengths.N.npy   token count of each session
+
+Each save writes the arrays as a new generation N and then switches to it
+by replacing meta.json, so an interrupted save leaves the previous index
+whole. The previous generation is kept until the save after, for readers
+that read meta.json just before the switch; a reader that falls further
+behind reads meta.json again.
+
+A query is a text or a {term or phrase: weight} profile, e.g. a team
+member's interests; scoring one touches only the postings of its terms:
+
+    index = BM25Index('appam_bm25')
+    index.update('appam_sessions.db')      # tokenizes new/edited sessions only
+    index.top(RelevanceScorer().person_interests['Max Ghenis'])
+
+Needs numpy.
+"""
+import json
+import math
+import os
+import re
+import sqlite3
+from collections import Counter
+
+import numpy as np
+
+from score_hashes import content_hash
+
+
+DEFAULT_INDEX_DIR = 'appam_bm25'
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+STOPWORDS = frozenset('''
+    a an and are as at be by for from has have in into is it its of on or
+    that the their this to was were which with
+'''.split())
+
+ARRAYS = ('offsets', 'docs', 'tfs', 'lengths')
+
+# Times to reread meta.json when its arrays were removed by a newer save
+LOAD_ATTEMPTS = 3
+
+# One text per session: its own fields, then each paper's title and abstract
+DOCUMENTS_QUERY = '''
+    SELECT s.session_id, s.title, s.description,
+           (SELECT group_concat(coalesce(p.title, '') || ' ' || coalesce(p.abstract, ''), ' ')
+            FROM papers p WHERE p.session_id = s.session_id)
+    FROM sessions s
+    ORDER BY s.session_id
+'''
+
+
+def tokenize(text):
+    """Lowercased alphanumeric tokens, without stopwords."""
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+
+def query_weights(query):
+    """
+    {token: weight} for a query text or a {term or phrase: weight} profile;
+    a phrase's weight goes to each of its tokens.
+    """
+    if isinstance(query, str):
+        return dict(Counter(tokenize(query)))
+    weights = {}
+    for phrase, weight in query.items():
+        for token in tokenize(phrase):
+            weights[token] = weights.get(token, 0) + weight
+    return weights
+
+
+def session_documents(conn):
+    """(session_id, text) for every session in a database."""
+    for session_id, *fields in conn.execute(DOCUMENTS_QUERY):
+        yield session_id, ' '.join(field for field in fields if field)
+
+
+class BM25Index:
+    """
+    A BM25 index persisted in a directory; a missing directory is an empty
+    index. Changes are written by update(), which tokenizes only sessions
+    whose text changed since the last update.
+    """
+
+    def __init__(self, path=DEFAULT_INDEX_DIR, k1=1.2, b=0.75):
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self._load()
+
+    def _array_path(self, name, generation):
+        # Indexes saved before generations (version 1) have plain names
+        suffix = '' if generation is None else f'.{generation}'
+        return os.path.join(self.path, f'{name}{suffix}.npy')
+
+    def _read(self):
+        """meta.json and the arrays of the generation it names."""
+        meta_path = os.path.join(self.path, 'meta.json')
+        for attempt in range(LOAD_ATTEMPTS):
+            with open(meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+            try:
+                return meta, [np.load(self._array_path(name, meta.get('generation')), mmap_mode='r')
+                              for name in ARRAYS]
+            except FileNotFoundError:
+                # Saves in another process removed this generation after
+                # meta.json was read; the new meta.json names a newer one
+                if attempt == LOAD_ATTEMPTS - 1:
+                    raise
+
+    def _load(self):
+        if os.path.exists(os.path.join(self.path, 'meta.json')):
+            meta, arrays = self._read()
+            offsets, docs, tfs, lengths = arrays
+            if (len(offsets) != len(meta['vocabulary']) + 1 or len(lengths) != len(meta['session_ids'])
+                    or len(docs) != len(tfs) or offsets[-1] != len(docs)):
+                raise ValueError(f"BM25 index in {self.path} doesn't match its meta.json; rebuild it")
+        else:
+            meta = {'vocabulary': [], 'session_ids': [], 'hashes': []}
+            arrays = [np.zeros(1, np.int64), np.zeros(0, np.int32), np.zeros(0, np.int32), np.zeros(0, np.int32)]
+
+        # None for an index saved before generations
+        self._generation = meta.get('generation')
+        self.generation = self._generation or 0
+        self.vocabulary = meta['vocabulary']
+        self.session_ids = meta['session_ids']
+        self.hashes = meta['hashes']
+        self.offsets, self.docs, self.tfs, self.lengths = arrays
+        self._term_ids = {term: i for i, term in enumerate(self.vocabulary)}
+        self._rows = {session_id: row for row, session_id in enumerate(self.session_ids)}
+
+        # The length-normalized part of BM25's denominator, per session
+        average_length = self.lengths.mean() if len(self.lengths) else 0.0
+        if average_length:
+            self._norms = self.k1 * (1 - self.b + self.b * self.lengths / average_length)
+        else:
+            self._norms = np.full(len(self.lengths), self.k1)
+
+    def __len__(self):
+        return len(self.session_ids)
+
+    def update(self, db_path):
+        """
+        Bring the index in line with a database: add new sessions, reindex
+        edited ones and drop deleted ones. Returns how many sessions were
+        (re)tokenized.
+        """
+        conn = sqlite3.connect(db_path)
+        try:
+            return self.update_documents(session_documents(conn))
+        finally:
+            conn.close()
+
+    def update_documents(self, documents):
+        """update() from (session_id, text) pairs, which should cover every session."""
+        documents = [(session_id, text, content_hash(text)) for session_id, text in documents]
+        old_hashes = dict(zip(self.session_ids, self.hashes))
+        changed = [(session_id, text, digest) for session_id, text, digest in documents
+                   if old_hashes.get(session_id) != digest]
+        current = {session_id for session_id, _, _ in documents}
+        if not changed and current == set(self.session_ids):
+            return 0
+
+        # Unchanged sessions keep their postings, moved to their new rows
+        changed_ids = {session_id for session_id, _, _ in changed}
+        kept = [session_id for session_id in self.session_ids
+                if session_id in current and session_id not in changed_ids]
+        session_ids = kept + [session_id for session_id, _, _ in changed]
+        new_rows = np.full(len(self.session_ids), -1, dtype=np.int64)
+        for row, session_id in enumerate(kept):
+            new_rows[self._rows[session_id]] = row
+
+        old_terms = np.repeat(np.arange(len(self.vocabulary)), np.diff(self.offsets))
+        old_rows = new_rows[np.asarray(self.docs, dtype=np.int64)]
+        keep = old_rows >= 0
+
+        lengths = np.zeros(len(session_ids), dtype=np.int32)
+        lengths[:len(kept)] = np.asarray(self.lengths)[[self._rows[session_id] for session_id in kept]]
+
+        # New and edited sessions are tokenized into fresh postings
+        vocabulary = list(self.vocabulary)
+        term_ids = dict(self._term_ids)
+        postings = ([], [], [])
+        for row, (_, text, _) in enumerate(changed, start=len(kept)):
+            tokens = tokenize(text)
+            lengths[row] = len(tokens)
+            for token, tf in Counter(tokens).items():
+                term = term_ids.get(token)
+                if term is None:
+                    term = term_ids[token] = len(vocabulary)
+                    vocabulary.append(token)
+                postings[0].append(term)
+                postings[1].append(row)
+                postings[2].append(tf)
+
+        terms = np.concatenate([old_terms[keep], np.array(postings[0], dtype=np.int64)])
+        rows = np.concatenate([old_rows[keep], np.array(postings[1], dtype=np.int64)])
+        tfs = np.concatenate([np.asarray(self.tfs)[keep], np.array(postings[2], dtype=np.int32)])
+        order = np.lexsort((rows, terms))
+        offsets = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(terms, minlength=len(vocabulary)), out=offsets[1:])
+
+        digests = {session_id: digest for session_id, _, digest in documents}
+        self._save({
+            'vocabulary': vocabulary,
+            'session_ids': session_ids,
+            'hashes': [digests[session_id] for session_id in session_ids],
+        }, {
+            'offsets': offsets,
+            'docs': rows[order].astype(np.int32),
+            'tfs': tfs[order].astype(np.int32),
+            'lengths': lengths,
+        })
+        self._load()
+        return len(changed)
+
+    def _save(self, meta, arrays):
+        # A new generation of arrays first, then meta.json, replaced
+        # atomically, switches to it; files left by an interrupted save
+        # are overwritten by the next one. Older generations than the one
+        # replaced are removed, as no reader should still be opening them
+        os.makedirs(self.path, exist_ok=True)
+        generation = self.generation + 1
+        for name, array in arrays.items():
+            np.save(self._array_path(name, generation), array)
+        temporary = os.path.join(self.path, 'meta.json.tmp')
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump({'version': 2, 'generation': generation, **meta}, f)
+        os.replace(temporary, os.path.join(self.path, 'meta.json'))
+
+        kept = {os.path.basename(self._array_path(name, kept_generation))
+                for name in ARRAYS for kept_generation in (generation, self._generation)}
+        for filename in os.listdir(self.path):
+            if filename.endswith('.npy') and filename not in kept:
+                try:
+                    os.remove(os.path.join(self.path, filename))
+                except OSError:
+                    # Still memory-mapped (on Windows); the next save removes it
+                    pass
+
+    def idf(self, term_id):
+        df = self.offsets[term_id + 1] - self.offsets[term_id]
+        return math.log(1 + (len(self) - df + 0.5) / (df + 0.5))
+
+    def scores(self, query):
+        """BM25 score of every session for a query, in session_ids order."""
+        scores = np.zeros(len(self))
+        for token, weight in query_weights(query).items():
+            term_id = self._term_ids.get(token)
+            if term_id is None:
+                continue
+            start, end = self.offsets[term_id], self.offsets[term_id + 1]
+            rows = self.docs[start:end]
+            tfs = self.tfs[start:end]
+            # Rows are unique within a term's postings, so += doesn't drop any
+            scores[rows] += weight * self.idf(term_id) * tfs * (self.k1 + 1) / (tfs + self._norms[rows])
+        return scores
+
+    def top(self, query, limit=10):
+        """The best-matching (session_id, score) pairs, highest first."""
+        scores = self.scores(query)
+        limit = min(limit, int(np.count_nonzero(scores)))
+        if limit <= 0:
+            return []
+        best = np.argpartition(-scores, limit - 1)[:limit]
+        best = best[np.lexsort((best, -scores[best]))]
+        return [(self.session_ids[row], float(scores[row])) for row in best]
+
+    def profile_scores(self, profiles):
+        """{name: scores} for {name: query} profiles, e.g. one per team member."""
+        return {name: self.scores(query) for name, query in profiles.items()}
+
+
+if __name__ == '__main__':
+    from relevance_scorer import RelevanceScorer
+
+    index = BM25Index()
+    print(f"Indexed {index.update('appam_sessions.db')} new or changed sessions ({len(index)} total)")
+
+    conn = sqlite3.connect('appam_sessions.db')
+    titles = dict(conn.execute('SELECT session_id, title FROM sessions'))
+    conn.close()
+
+    for person, interests in RelevanceScorer().person_interests.items():
+        print(f"\nTop sessions for {person}:")
+        for session_id, score in index.top(interests, limit=5):
+            print(f"  [{score:5.1f}] {titles.get(session_id, session_id)[:70]}")
@@ -2,24 +2,13 @@
 Calculate booth value based on time of day and number of people.
 Booth traffic varies throughout the day.
 """
-from datetime import datetime
+from time_utils import clock_minutes
 
 
 def parse_time(time_str):
-    """Parse time string to hour."""
-    try:
-        match = time_str.match(/(\d+):(\d+)(am|pm)/i)
-        if not match:
-            return 12
-        hours = int(match.group(1))
-        period = match.group(3).lower()
-        if period == 'pm' and hours != 12:
-            hours += 12
-        if period == 'am' and hours == 12:
-            hours = 0
-        return hours
-    except:
-        return 12
+    """Parse time string to hour (12 if unparseable)."""
+    minutes = clock_minutes(time_str)
+    return 12 if minutes is None else minutes // 60
 
 
 def get_booth_traffic_multiplier(date, start_time):
@@ -31,43 +20,32 @@ def get_booth_traffic_multiplier(date, start_time):
     - Medium traffic: 1.0x (mid-morning, mid-afternoon)
     - Low traffic: 0.5x (early morning, evening)
     """
-    try:
-        hour = int(start_time.replace('am', '').replace('pm', '').split(':')[0])
-        is_pm = 'pm' in start_time.lower()
-
-        if not is_pm and hour != 12:
-            actual_hour = hour
-        elif is_pm and hour != 12:
-            actual_hour = hour + 12
-        elif hour == 12 and is_pm:
-            actual_hour = 12
-        else:
-            actual_hour = 0
-
-        # High traffic periods
-        if 8 <= actual_hour <= 9:  # Morning arrival
-            return 2.0
-        elif 12 <= actual_hour <= 13:  # Lunch time
-            return 2.5  # PEAK - people browsing
-        elif 15 <= actual_hour <= 17:  # Late afternoon
-            return 1.8
-
-        # Medium traffic
-        elif 10 <= actual_hour <= 11:  # Mid-morning
-            return 1.2
-        elif 14 <= actual_hour <= 15:  # Mid-afternoon
-            return 1.2
-
-        # Low traffic
-        elif actual_hour < 8:  # Very early
-            return 0.3
-        elif actual_hour >= 18:  # Evening
-            return 0.5
-
-        return 1.0
-
-    except:
+    minutes = clock_minutes(start_time)
+    if minutes is None:
         return 1.0
+    actual_hour = minutes // 60
+
+    # High traffic periods
+    if 8 <= actual_hour <= 9:  # Morning arrival
+        return 2.0
+    elif 12 <= actual_hour <= 13:  # Lunch time
+        return 2.5  # PEAK - people browsing
+    elif 15 <= actual_hour <= 17:  # Late afternoon
+        return 1.8
+
+    # Medium traffic
+    elif 10 <= actual_hour <= 11:  # Mid-morning
+        return 1.2
+    elif 14 <= actual_hour <= 15:  # Mid-afternoon
+        return 1.2
+
+    # Low traffic
+    elif actual_hour < 8:  # Very early
+        return 0.3
+    elif actual_hour >= 18:  # Evening
+        return 0.5
+
+    return 1.0
 
 
 def calculate_booth_value(num_people_at_booth, date, start_time):
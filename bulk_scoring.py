@@ -0,0 +1,247 @@
+"""
+Vectorized RelevanceScorer scoring for whole conferences at once.
+
+Each session's text is scanned once, with KeywordMatcher, into a sparse
+session x keyword matrix. Every score is then array arithmetic over that
+matrix:
+
+    base = (D @ w) + 0.5 * (T @ w)
+
+where D holds each count's diminishing-returns factor (1, 1.5, 1.83 for
+1, 2, 3+ occurrences), T flags keywords found in the title and w holds the
+keyword weights. Person modifiers are the row-wise max of the interest
+multipliers found in the title or description. Scores are identical to
+RelevanceScorer.score_session and score_for_person.
+
+Because scanning is done once per index, trying other weights or
+interests only costs a matrix-vector product:
+
+    bulk = BulkScorer(RelevanceScorer())
+    index = bulk.load('appam_sessions.db')
+    scores = bulk.scores(index, weights={**bulk.keywords, 'poverty': 12})
+
+Needs numpy; with scipy installed the matrices are sparse.
+"""
+import sqlite3
+
+import numpy as np
+
+try:
+    from scipy import sparse
+except ImportError:  # pragma: no cover - optional dependency
+    sparse = None
+
+from keyword_matcher import KeywordMatcher
+
+
+# Score multiplier for 0, 1, 2 and 3+ occurrences of a keyword
+DIMINISHING_FACTORS = np.array([0.0, 1.0, 1.0 + 1 / 2, 1.0 + 1 / 2 + 1 / 3])
+
+TITLE_BONUS = 0.5
+
+
+def _matrix(rows, cols, values, shape, dtype):
+    """A CSR matrix when scipy is installed, otherwise a dense array."""
+    if sparse is not None:
+        return sparse.csr_matrix((np.asarray(values, dtype=dtype), (rows, cols)), shape=shape)
+    dense = np.zeros(shape, dtype=dtype)
+    dense[rows, cols] = values
+    return dense
+
+
+def _round2(values):
+    # Python's round(), so scores match the per-session scorer exactly
+    return np.fromiter((round(value, 2) for value in values.tolist()), dtype=float, count=len(values))
+
+
+def _row_entries(matrix):
+    """(columns, values) of the nonzero entries of each row, columns ascending."""
+    if sparse is not None and sparse.issparse(matrix):
+        matrix = matrix.tocsr()
+        matrix.sort_indices()
+        for row in range(matrix.shape[0]):
+            start, end = matrix.indptr[row], matrix.indptr[row + 1]
+            yield matrix.indices[start:end].tolist(), matrix.data[start:end].tolist()
+    else:
+        for values in matrix:
+            columns = np.flatnonzero(values)
+            yield columns.tolist(), values[columns].tolist()
+
+
+class SessionKeywordIndex:
+    """
+    Keyword occurrences for a set of sessions, ready for bulk scoring.
+
+    `factors` holds each keyword count's diminishing-returns factor,
+    `title_hits` flags keywords in the title and `interest_hits` flags
+    person-interest keywords in the title or description; rows follow
+    `session_ids`.
+    """
+
+    def __init__(self, session_ids, counts, factors, title_hits, interest_hits):
+        self.session_ids = session_ids
+        self.counts = counts
+        self.factors = factors
+        self.title_hits = title_hits
+        self.interest_hits = interest_hits
+
+    def __len__(self):
+        return len(self.session_ids)
+
+
+class BulkScorer:
+    """
+    Score many sessions at once with a RelevanceScorer's keyword tables,
+    as they were when the BulkScorer was created.
+    """
+
+    def __init__(self, scorer):
+        self.scorer = scorer
+        self.keywords = dict(scorer.keywords)
+        self.person_interests = {person: dict(interests) for person, interests in scorer.person_interests.items()}
+
+        self.vocabulary = list(dict.fromkeys(keyword.lower() for keyword in self.keywords))
+        self.interest_vocabulary = list(dict.fromkeys(
+            keyword.lower() for interests in self.person_interests.values() for keyword in interests
+        ))
+        self._columns = {keyword: i for i, keyword in enumerate(self.vocabulary)}
+        self._interest_columns = {keyword: i for i, keyword in enumerate(self.interest_vocabulary)}
+        self.matcher = KeywordMatcher(self.vocabulary + self.interest_vocabulary)
+
+    def index(self, sessions):
+        """Scan session dicts (with session_id and text fields) into a SessionKeywordIndex."""
+        session_ids = []
+        count_cells = ([], [], [])
+        title_cells = ([], [])
+        interest_cells = ([], [])
+
+        for row, session_data in enumerate(sessions):
+            session_ids.append(session_data.get('session_id'))
+            matches = self.matcher.scan(self.scorer.session_text(session_data))
+            title_end = len(session_data.get('title', '').lower())
+            text_end = len(' '.join([
+                session_data.get('title', ''),
+                session_data.get('description', ''),
+            ]).lower())
+
+            for keyword, count in matches.counts.items():
+                column = self._columns.get(keyword)
+                if column is not None:
+                    count_cells[0].append(row)
+                    count_cells[1].append(column)
+                    count_cells[2].append(count)
+
+            for keyword, first_end in matches.first_ends.items():
+                column = self._columns.get(keyword)
+                if column is not None and first_end <= title_end:
+                    title_cells[0].append(row)
+                    title_cells[1].append(column)
+                column = self._interest_columns.get(keyword)
+                if column is not None and first_end <= text_end:
+                    interest_cells[0].append(row)
+                    interest_cells[1].append(column)
+
+        shape = (len(session_ids), len(self.vocabulary))
+        counts = np.array(count_cells[2], dtype=np.int32)
+        return SessionKeywordIndex(
+            session_ids,
+            _matrix(count_cells[0], count_cells[1], counts, shape, np.int32),
+            _matrix(count_cells[0], count_cells[1], DIMINISHING_FACTORS[np.minimum(counts, 3)], shape, float),
+            _matrix(title_cells[0], title_cells[1], np.ones(len(title_cells[0])), shape, float),
+            _matrix(interest_cells[0], interest_cells[1], np.ones(len(interest_cells[0])),
+                    (len(session_ids), len(self.interest_vocabulary)), float),
+        )
+
+    def load(self, db_path, session_ids=None):
+        """Index the sessions in a database (optionally just `session_ids`)."""
+        conn = sqlite3.connect(db_path)
+        conn.row_factory = sqlite3.Row
+        rows = conn.execute('''
+            SELECT session_id, title, description, chair, papers FROM sessions ORDER BY session_id
+        ''').fetchall()
+        conn.close()
+
+        if session_ids is not None:
+            wanted = set(session_ids)
+            rows = [row for row in rows if row['session_id'] in wanted]
+        return self.index(dict(row) for row in rows)
+
+    def _weight_vector(self, weights):
+        vector = np.zeros(len(self.vocabulary))
+        for keyword, weight in weights.items():
+            column = self._columns.get(keyword.lower())
+            if column is None:
+                raise KeyError(f"{keyword!r} isn't in the indexed vocabulary; rebuild the BulkScorer to add it")
+            vector[column] += weight
+        return vector
+
+    def raw_scores(self, index, weights=None):
+        """Unrounded base scores; `weights` replaces the keyword weights."""
+        w = self._weight_vector(self.keywords if weights is None else weights)
+        return np.asarray(index.factors @ w).ravel() + np.asarray(index.title_hits @ (TITLE_BONUS * w)).ravel()
+
+    def scores(self, index, weights=None):
+        """Base scores, as RelevanceScorer.score_session would give them."""
+        return _round2(self.raw_scores(index, weights))
+
+    def explanations(self, index):
+        """Each session's matched keywords, as RelevanceScorer.explanation gives them."""
+        return [
+            {'terms': {self.vocabulary[column]: int(count) for column, count in zip(*counts)},
+             'title': [self.vocabulary[column] for column in title[0]]}
+            for counts, title in zip(_row_entries(index.counts), _row_entries(index.title_hits))
+        ]
+
+    def modifiers(self, index, person, interests=None):
+        """Each session's interest multiplier for a person (1.0 if none apply)."""
+        interests = self.person_interests.get(person) if interests is None else interests
+        if interests is None:
+            return np.ones(len(index))
+
+        multipliers = np.zeros(len(self.interest_vocabulary))
+        for keyword, multiplier in interests.items():
+            column = self._interest_columns.get(keyword.lower())
+            if column is None:
+                raise KeyError(f"{keyword!r} isn't in the indexed vocabulary; rebuild the BulkScorer to add it")
+            multipliers[column] = max(multipliers[column], multiplier)
+
+        hits = index.interest_hits
+        if sparse is not None:
+            best = hits.multiply(multipliers).max(axis=1).toarray().ravel() if hits.shape[1] else np.zeros(len(index))
+        else:
+            best = (hits * multipliers).max(axis=1, initial=0.0)
+        return np.maximum(1.0, best)
+
+    def person_scores(self, index, person, weights=None, interests=None):
+        """Scores for one person, as RelevanceScorer.score_for_person would give them."""
+        base = self.scores(index, weights)
+        if interests is None and person not in self.person_interests:
+            return base
+        return _round2(base * self.modifiers(index, person, interests))
+
+    def person_explanations(self, index, person, base=None):
+        """
+        (score, rationale, explanation) per session for one person, as
+        RelevanceScorer.score_for_person and person_explanation give
+        them; pass `base` scores if they're already computed.
+        """
+        base = self.scores(index) if base is None else base
+        interests = self.person_interests.get(person)
+        if interests is None:
+            return [(score, None, {'base': score, 'modifier': 1.0, 'terms': []}) for score in base.tolist()]
+
+        modifiers = self.modifiers(index, person)
+        scores = _round2(base * modifiers)
+        # In the order of the person's interests, as score_for_person lists them
+        wanted = [(keyword.lower(), self._interest_columns[keyword.lower()]) for keyword in interests]
+        return [
+            (score, None, {'base': base_score, 'modifier': modifier,
+                           'terms': [keyword for keyword, column in wanted if column in found]})
+            for score, base_score, modifier, found in zip(
+                scores.tolist(), base.tolist(), modifiers.tolist(),
+                (set(columns) for columns, _ in _row_entries(index.interest_hits)))
+        ]
+
+    def all_person_scores(self, index, weights=None):
+        """{person: scores} for every person with interests."""
+        return {person: self.person_scores(index, person, weights) for person in self.person_interests}
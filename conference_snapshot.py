@@ -0,0 +1,154 @@
+"""
+Everything a scheduling run reads, loaded once and grouped by time slot.
+
+The schedulers used to open a connection and query SQLite for every time
+slot, and ConferenceScheduler rescored every session for every person
+inside that loop. ConferenceSnapshot.load() reads all scheduled sessions,
+with their stored per-person scores, in one query and groups them into
+slots keyed by their start_ts and end_ts (see time_utils.py), in
+chronological order:
+
+    snapshot = ConferenceSnapshot.load('appam_sessions.db', people)
+    for slot in snapshot.slots:
+        slot['date'], slot['start_time'], slot['end_time']   # as in get_time_slots()
+        slot.session_ids            # best first, by order_by
+        slot.sessions               # session dicts, with 'person_scores'
+        slot.scores['Max Ghenis']   # array('d') of scores in session order
+
+A person with no stored score for a session gets its general score, as
+OptimalScheduler.person_score does.
+"""
+import sqlite3
+from array import array
+
+from session_scores import DEFAULT_SCORER, ensure_schema
+from time_utils import ensure_time_columns, timestamp
+
+
+SESSION_COLUMNS = (
+    'session_id', 'title', 'date', 'start_time', 'end_time', 'start_ts', 'end_ts', 'location',
+    'general_score', 'relevance_score', 'assigned_to',
+)
+
+# Columns a slot's sessions can be ranked by
+ORDER_COLUMNS = ('general_score', 'relevance_score')
+
+def slot_key(session):
+    """
+    Grouping and sort key for a session's slot: its start_ts and end_ts,
+    or its text times when they don't parse (those slots sort last).
+    """
+    if session.get('start_ts') is None:
+        return (1, session['date'] or '', session['start_time'] or '', session['end_time'] or '')
+    end_ts = session.get('end_ts')
+    return (0, session['start_ts'], -1 if end_ts is None else end_ts)
+
+
+class Slot(dict):
+    """One time slot: a get_time_slots()-style dict plus its sessions and score arrays."""
+
+    def __init__(self, date, start_time, end_time, sessions, scores, start_ts=None, end_ts=None):
+        super().__init__(date=date, start_time=start_time, end_time=end_time)
+        self.start_ts = start_ts
+        self.end_ts = end_ts
+        self.sessions = sessions
+        self.session_ids = tuple(session['session_id'] for session in sessions)
+        self.scores = scores
+
+
+class ConferenceSnapshot:
+    """Sessions grouped into time slots, with per-person score arrays."""
+
+    def __init__(self, people, sessions, person_scores):
+        """
+        `sessions` are session dicts; person_scores is {person: scores},
+        aligned with them.
+        """
+        self.people = list(people)
+        groups = {}
+        for i, session in enumerate(sessions):
+            groups.setdefault(slot_key(session), []).append(i)
+
+        self._by_key = {}
+        for key in sorted(groups):
+            members = groups[key]
+            first = sessions[members[0]]
+            self._by_key[key] = Slot(
+                first['date'], first['start_time'], first['end_time'],
+                [sessions[i] for i in members],
+                {person: array('d', [person_scores[person][i] for i in members]) for person in self.people},
+                first.get('start_ts'), first.get('end_ts'),
+            )
+        self.slots = list(self._by_key.values())
+
+    @classmethod
+    def load(cls, db_path, people, scorer=DEFAULT_SCORER, order_by='general_score', columns=SESSION_COLUMNS,
+             fallback='general_score'):
+        """
+        Every session with a date and start time, from one query. Within
+        a slot, sessions are ranked by `order_by` (highest first). Session
+        dicts hold `columns` (SESSION_COLUMNS, or some of them). A
+        person without a stored score gets the session's `fallback` score.
+        """
+        for column in (order_by, fallback):
+            if column not in ORDER_COLUMNS:
+                raise ValueError(f"Can't rank sessions by {column!r}; expected one of {ORDER_COLUMNS}")
+        if fallback not in columns:
+            columns = tuple(columns) + (fallback,)
+        unknown = set(columns) - set(SESSION_COLUMNS)
+        if unknown or 'session_id' not in columns:
+            raise ValueError(f"Can't load columns {sorted(unknown) or columns}; expected session_id and "
+                             f"{SESSION_COLUMNS}")
+        # session_id first: a session's rows are grouped by it; slots are
+        # keyed by the times
+        required = ('session_id', 'date', 'start_time', 'end_time', 'start_ts', 'end_ts')
+        columns = required + tuple(column for column in columns if column not in required)
+        selected = ', '.join(f's.{column}' for column in columns)
+
+        conn = sqlite3.connect(db_path)
+        try:
+            ensure_time_columns(conn)
+            ensure_schema(conn.cursor())
+            # +ss.scorer: look scores up by session_id (the primary key);
+            # without statistics SQLite otherwise scans the scorer's rows
+            # in idx_session_scores_person for every session
+            rows = conn.execute(f'''
+                SELECT {selected}, ss.person_id, ss.score
+                FROM sessions s
+                LEFT JOIN session_scores ss ON ss.session_id = s.session_id AND +ss.scorer = ?
+                WHERE s.date != '' AND s.start_time != ''
+                ORDER BY s.{order_by} DESC, s.session_id
+            ''', (scorer,)).fetchall()
+        finally:
+            conn.close()
+
+        # One row per (session, scored person); a session's rows are adjacent
+        sessions = []
+        width = len(columns)
+        for row in rows:
+            if not sessions or sessions[-1]['session_id'] != row[0]:
+                session = dict(zip(columns, row[:width]))
+                session['person_scores'] = {}
+                sessions.append(session)
+            person, score = row[width], row[width + 1]
+            if person is not None:
+                sessions[-1]['person_scores'][person] = score
+
+        person_scores = {
+            person: [session['person_scores'].get(person, session.get(fallback) or 0) for session in sessions]
+            for person in people
+        }
+        return cls(people, sessions, person_scores)
+
+    def slot(self, date, start_time, end_time):
+        """The slot with these times, or None."""
+        return self._by_key.get(slot_key({
+            'date': date, 'start_time': start_time, 'end_time': end_time,
+            'start_ts': timestamp(date, start_time), 'end_ts': timestamp(date, end_time),
+        }))
+
+    def __len__(self):
+        return len(self.slots)
+
+    def __iter__(self):
+        return iter(self.slots)
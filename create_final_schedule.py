@@ -5,12 +5,15 @@ Manual curation of must-attend sessions.
 import sqlite3
 import json
 
+from time_utils import ensure_time_columns
+
 
 def create_final_schedule():
     """Create the final team schedule."""
     conn = sqlite3.connect('appam_sessions.db')
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
+    ensure_time_columns(conn)
 
     # Clear all assignments
     cursor.execute('UPDATE sessions SET assigned_to = NULL')
@@ -115,7 +118,7 @@ def create_final_schedule():
             WHERE s.assigned_to = ? OR s.session_id IN (
                 SELECT session_id FROM sessions WHERE assigned_to = ?
             )
-            ORDER BY s.date, s.start_time
+            ORDER BY s.start_ts IS NULL, s.start_ts, s.date, s.start_time
         ''', (person, person))
 
         sessions = cursor.fetchall()
@@ -3,16 +3,12 @@ Export schedule in proper format: time_slots -> person assignments
 """
 import sqlite3
 import json
-from datetime import datetime
 
+from session_scores import SessionScores
+from time_utils import TIME_SLOTS_QUERY, clock_minutes, ensure_time_columns, slot_condition
 
-def parse_time_for_sort(date_str, time_str):
-    """Parse time for sorting."""
-    try:
-        dt = datetime.strptime(f"{date_str} {time_str}", "%Y-%m-%d %I:%M%p")
-        return dt
-    except:
-        return datetime.min
+# The exhibit hall closes at 1:30pm on Saturday
+BOOTH_CLOSES = ('2025-11-15', 13 * 60 + 30)
 
 
 def export_slot_schedule():
@@ -20,54 +16,43 @@ def export_slot_schedule():
     conn = sqlite3.connect('appam_sessions.db')
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
+    ensure_time_columns(conn)
 
-    # Get all unique time slots
-    cursor.execute('''
-        SELECT DISTINCT date, start_time, end_time
-        FROM sessions
-        WHERE date != '' AND start_time != ''
-        ORDER BY date, start_time
-    ''')
+    # Get all unique time slots, in chronological order
+    cursor.execute(TIME_SLOTS_QUERY)
 
     time_slots = []
-    people = ['Max Ghenis', 'Pavel Makarchuk', 'Daphne Hansell']
+    scores = SessionScores(conn)
+    people = scores.people()
+    slot_rows = cursor.fetchall()
 
-    for slot_row in cursor.fetchall():
+    # Who is there when, compiled once for every slot
+    from optimal_scheduler import OptimalScheduler
+    availability = OptimalScheduler().team_availability(slot_rows)
+
+    for slot_row in slot_rows:
         date = slot_row['date']
         start_time = slot_row['start_time']
         end_time = slot_row['end_time']
 
         # Get all sessions for this time slot
-        cursor.execute('''
-            SELECT session_id, title, location, assigned_to,
-                   general_score, max_score, pavel_score, daphne_score
+        condition, params = slot_condition(date, start_time, end_time)
+        cursor.execute(f'''
+            SELECT session_id, title, location, assigned_to, general_score
             FROM sessions
-            WHERE date = ? AND start_time = ? AND end_time = ?
-        ''', (date, start_time, end_time))
+            WHERE {condition}
+        ''', params)
 
         sessions_at_slot = [dict(row) for row in cursor.fetchall()]
+        person_details = scores.details(s['session_id'] for s in sessions_at_slot)
+        person_scores = {
+            session_id: {person: detail['score'] for person, detail in details.items()}
+            for session_id, details in person_details.items()
+        }
 
         # Check if booth is open at this time
-        # Exhibit hall closes 1:30pm Saturday
-        booth_open = True
-        if date == '2025-11-15':
-            # Parse time to check if after 1:30pm
-            try:
-                hour = int(start_time.split(':')[0])
-                minute = int(start_time.split(':')[1][:2])
-                is_pm = 'pm' in start_time.lower()
-
-                if is_pm and hour != 12:
-                    hour += 12
-                elif not is_pm and hour == 12:
-                    hour = 0
-
-                # 1:30pm = 13:30 = 13*60 + 30 = 810 minutes
-                time_minutes = hour * 60 + minute
-                if time_minutes >= 810:  # After 1:30pm
-                    booth_open = False
-            except:
-                pass
+        closing_date, closing_minutes = BOOTH_CLOSES
+        booth_open = not (date == closing_date and (clock_minutes(start_time) or 0) >= closing_minutes)
 
         # Build assignments for this slot
         slot_data = {
@@ -94,17 +79,17 @@ def export_slot_schedule():
                         'title': session['title'],
                         'location': session['location'],
                         'general_score': session['general_score'] or 0,
-                        'person_score': session.get(f"{person.split(' ')[0].lower()}_score", 0) or 0
+                        'person_score': person_scores[session['session_id']].get(person, 0) or 0,
+                        # Why the person scored it so, as stored by the scorer
+                        'rationale': person_details[session['session_id']].get(person, {}).get('rationale'),
+                        'explanation': person_details[session['session_id']].get(person, {}).get('explanation'),
                     }
 
         # Check availability for each person
-        from optimal_scheduler import OptimalScheduler
-        scheduler = OptimalScheduler()
-
         for person in people:
             if person not in slot_data['assignments']:
                 # Check if person is available
-                if not scheduler.is_available(person, date, start_time):
+                if not availability.is_available(person, date, start_time):
                     slot_data['assignments'][person] = {'type': 'absent'}
                 elif not booth_open:
                     # Booth is closed - person is free
@@ -122,9 +107,8 @@ def export_slot_schedule():
                 'title': session['title'],
                 'general_score': session['general_score'] or 0,
                 'scores': {
-                    'max': session['max_score'] or 0,
-                    'pavel': session['pavel_score'] or 0,
-                    'daphne': session['daphne_score'] or 0
+                    person: person_scores[session['session_id']].get(person, 0) or 0
+                    for person in people
                 }
             })
 
@@ -137,9 +121,6 @@ def export_slot_schedule():
 
         time_slots.append(slot_data)
 
-    # Sort chronologically
-    time_slots.sort(key=lambda x: parse_time_for_sort(x['date'], x['start_time']))
-
     # Save to file
     with open('public/data/team_schedule.json', 'w') as f:
         json.dump(time_slots, f, indent=2)
@@ -5,6 +5,10 @@ import sqlite3
 import json
 from pathlib import Path
 
+from score_explanations import ensure_explanation_column, from_json
+from session_scores import SessionScores
+from time_utils import ensure_time_columns
+
 
 def export_database(db_path='appam_sessions.db', output_dir='public/data'):
     """Export all database tables to JSON files."""
@@ -16,6 +20,10 @@ def export_database(db_path='appam_sessions.db', output_dir='public/data'):
 
     # Export sessions with full details
     cursor = conn.cursor()
+    with conn:
+        for prefix in ('relevance', 'general'):
+            ensure_explanation_column(cursor, prefix)
+    ensure_time_columns(conn)
     cursor.execute('''
         SELECT
             s.session_id,
@@ -28,18 +36,29 @@ def export_database(db_path='appam_sessions.db', output_dir='public/data'):
             s.chair,
             s.papers,
             s.relevance_score,
+            s.relevance_explanation,
             s.assigned_to,
             s.general_score,
-            s.max_score,
-            s.pavel_score,
-            s.daphne_score
+            s.general_explanation
         FROM sessions s
-        ORDER BY s.date, s.start_time
+        ORDER BY s.start_ts IS NULL, s.start_ts, s.date, s.start_time
     ''')
 
+    rows = cursor.fetchall()
+    # Scores come with the explanations the scorers stored; nothing is rescored here
+    person_details = SessionScores(conn).details(row['session_id'] for row in rows)
+
     sessions = []
-    for row in cursor.fetchall():
+    for row in rows:
         session = dict(row)
+        details = person_details[session['session_id']]
+        session['person_scores'] = {person: detail['score'] for person, detail in details.items()}
+        session['person_explanations'] = {
+            person: {'rationale': detail['rationale'], **(detail['explanation'] or {})}
+            for person, detail in details.items()
+        }
+        session['relevance_explanation'] = from_json(session['relevance_explanation'])
+        session['general_explanation'] = from_json(session['general_explanation'])
 
         # Parse papers JSON
         if session['papers']:
@@ -49,14 +68,9 @@ def export_database(db_path='appam_sessions.db', output_dir='public/data'):
                 session['papers'] = []
 
         # Add recommended attendees based on person scores
-        recommended = []
-        if session.get('max_score', 0) >= 85:
-            recommended.append('Max Ghenis')
-        if session.get('pavel_score', 0) >= 85:
-            recommended.append('Pavel Makarchuk')
-        if session.get('daphne_score', 0) >= 85:
-            recommended.append('Daphne Hansell')
-        session['recommended_for'] = recommended
+        session['recommended_for'] = [
+            person for person, score in session['person_scores'].items() if score >= 85
+        ]
 
         # Get presenters for this session
         cursor.execute('''
@@ -122,7 +136,7 @@ def export_database(db_path='appam_sessions.db', output_dir='public/data'):
                 relevance_score
             FROM sessions
             WHERE assigned_to = ?
-            ORDER BY date, start_time
+            ORDER BY start_ts IS NULL, start_ts, date, start_time
         ''', (person,))
 
         schedule[person] = [dict(row) for row in cursor.fetchall()]
@@ -151,10 +165,11 @@ def export_database(db_path='appam_sessions.db', output_dir='public/data'):
 
     # Export time slots
     cursor.execute('''
-        SELECT DISTINCT date, start_time, end_time
+        SELECT date, start_time, end_time
         FROM sessions
         WHERE date != ''
-        ORDER BY date, start_time
+        GROUP BY date, start_time, end_time
+        ORDER BY MIN(start_ts) IS NULL, MIN(start_ts), MIN(end_ts), date, start_time
     ''')
 
     time_slots = [dict(row) for row in cursor.fetchall()]
@@ -3,7 +3,8 @@ Extract presenter names and affiliations from raw HTML.
 """
 import sqlite3
 import re
-from bs4 import BeautifulSoup
+from html_parsing import parse_html
+from html_store import HtmlStore
 
 
 def extract_presenters_from_html():
@@ -11,13 +12,15 @@ def extract_presenters_from_html():
     conn = sqlite3.connect('appam_sessions.db')
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
+    store = HtmlStore(conn)
 
-    # Get high-value sessions with raw HTML
+    # Get high-value sessions with stored HTML
     cursor.execute('''
-        SELECT session_id, title, raw_html, general_score
-        FROM sessions
-        WHERE general_score >= 60 AND raw_html IS NOT NULL AND raw_html != ''
-        ORDER BY general_score DESC
+        SELECT s.session_id, s.title, s.general_score, h.size
+        FROM sessions s
+        JOIN session_html h ON h.session_id = s.session_id
+        WHERE s.general_score >= 60
+        ORDER BY s.general_score DESC
     ''')
 
     presenters_found = []
@@ -25,14 +28,13 @@ def extract_presenters_from_html():
     for row in cursor.fetchall():
         session_id = row['session_id']
         title = row['title']
-        html = row['raw_html']
         score = row['general_score']
 
-        if not html or len(html) < 100:
+        if row['size'] < 100:
             continue
+        html = store.get(session_id)
 
-        soup = BeautifulSoup(html, 'html.parser')
-        text = soup.get_text()
+        text = parse_html(html).text
 
         # Extract presenters
         # Common patterns:
@@ -0,0 +1,181 @@
+"""
+Whole-conference scheduling as one mixed-integer program.
+
+OptimalScheduler.assign_slot_optimal looks at one slot at a time, so it
+can't trade a session now against one later. solve() puts every slot into
+one model, solved with PuLP (CBC by default):
+
+    x[p, s]  1 if person p attends session s (only in slots p is there for)
+    b[t, k]  1 if k people staff the booth in slot t
+
+and maximizes the same value OptimalScheduler.calculate_slot_value adds up:
+each attendee's person score plus booth_value_for(k, available) per slot.
+
+Constraints:
+- a person attends at most one session per slot, and a session gets at
+  most one of the team;
+- at least `min_booth` people at the booth whenever two or more are
+  available (with one, the booth may close for a session, as before);
+- optional per-person limits: `max_sessions`, `max_booth_shifts` (an int
+  for everyone or {person: limit}) and `max_per_track`, the most sessions
+  a person attends on one topic, where a session's topic is the dual rule
+  that scored it (its general_explanation);
+- with `must_cover_score`, every session scoring at least that much
+  should get someone; a session that can't is left uncovered at a
+  penalty, rather than making the whole model infeasible.
+
+The per-slot greedy schedule is the warm start, and `time_limit` caps the
+solve; the best schedule found by then is used. The result has the same
+all_assignments structure as OptimalScheduler.assign_each_slot.
+
+Needs pulp.
+"""
+import json
+import sqlite3
+import time
+
+import pulp
+
+
+# Objective cost of leaving a must-cover session uncovered
+UNCOVERED_PENALTY = 1000
+
+
+def _limit(limits, person):
+    """A per-person limit from an int (everyone) or a {person: limit} dict."""
+    if isinstance(limits, dict):
+        return limits.get(person)
+    return limits
+
+
+def session_tracks(db_path):
+    """{session_id: topic}: the dual rule that fired, for rules that matched terms."""
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = conn.execute('SELECT session_id, general_explanation FROM sessions').fetchall()
+    except sqlite3.OperationalError:
+        # Not scored since explanations were added
+        return {}
+    finally:
+        conn.close()
+    tracks = {}
+    for session_id, explanation in rows:
+        explanation = json.loads(explanation) if explanation else None
+        # The catch-all rules match no terms and say nothing about the topic
+        if explanation and explanation.get('terms'):
+            tracks[session_id] = explanation['rule']
+    return tracks
+
+
+def solve(scheduler, slots, time_limit=60, min_booth=1, max_sessions=None, max_booth_shifts=None,
+          max_per_track=None, tracks=None, must_cover_score=None, solver=None):
+    """
+    Assign the team across all (slot, sessions) pairs at once.
+
+    `scheduler` is an OptimalScheduler (people, availability, booth
+    values); `tracks` overrides session_tracks() as {session_id: topic}.
+    Returns all_assignments, one entry per slot, in slot order. Raises
+    ValueError if the limits can't all be met.
+    """
+    start = time.perf_counter()
+    people = scheduler.people
+    availability = scheduler.team_availability(slot for slot, _ in slots)
+    available = [availability.available_people(slot['date'], slot['start_time']) for slot, _ in slots]
+
+    # Minimizes the negated value: on maximization models CBC takes a MIP
+    # start's objective with the wrong sign and can stop at the start
+    model = pulp.LpProblem('conference_schedule', pulp.LpMinimize)
+    x = {}
+    booth = {}
+    objective = []
+    for t, ((slot, sessions), here) in enumerate(zip(slots, available)):
+        for i, session in enumerate(sessions):
+            for p in here:
+                x[t, i, p] = pulp.LpVariable(f'x_{t}_{i}_{people.index(p)}', cat='Binary')
+                objective.append(scheduler.person_score(session, p) * x[t, i, p])
+
+        # One-hot booth headcount, so any booth value table can be used
+        attending = pulp.lpSum(x[t, i, p] for i in range(len(sessions)) for p in here)
+        levels = range(len(here) + 1)
+        for k in levels:
+            booth[t, k] = pulp.LpVariable(f'booth_{t}_{k}', cat='Binary')
+            objective.append(scheduler.booth_value_for(k, len(here)) * booth[t, k])
+        model += pulp.lpSum(booth[t, k] for k in levels) == 1
+        model += pulp.lpSum(k * booth[t, k] for k in levels) == len(here) - attending
+        if len(here) >= 2:
+            model += len(here) - attending >= min(min_booth, len(here))
+
+        for p in here:
+            model += pulp.lpSum(x[t, i, p] for i in range(len(sessions))) <= 1
+        for i in range(len(sessions)):
+            model += pulp.lpSum(x[t, i, p] for p in here) <= 1
+
+    # Cross-slot limits
+    for p in people:
+        mine = [var for (t, i, person), var in x.items() if person == p]
+        cap = _limit(max_sessions, p)
+        if cap is not None:
+            model += pulp.lpSum(mine) <= cap
+        cap = _limit(max_booth_shifts, p)
+        if cap is not None:
+            shifts = sum(1 for here in available if p in here)
+            model += shifts - pulp.lpSum(mine) <= cap
+
+    if max_per_track is not None:
+        if tracks is None:
+            tracks = session_tracks(scheduler.db_path)
+        by_track = {}
+        for (t, i, p), var in x.items():
+            track = tracks.get(slots[t][1][i]['session_id'])
+            if track is not None:
+                by_track.setdefault((track, p), []).append(var)
+        for variables in by_track.values():
+            model += pulp.lpSum(variables) <= max_per_track
+
+    must_cover = []
+    if must_cover_score is not None:
+        for t, ((_, sessions), here) in enumerate(zip(slots, available)):
+            for i, session in enumerate(sessions):
+                if (session.get('general_score') or 0) >= must_cover_score:
+                    uncovered = pulp.LpVariable(f'uncovered_{t}_{i}', lowBound=0, upBound=1)
+                    must_cover.append((t, i, uncovered))
+                    model += pulp.lpSum(x[t, i, p] for p in here) + uncovered >= 1
+                    objective.append(-UNCOVERED_PENALTY * uncovered)
+
+    model += -pulp.lpSum(objective)
+
+    # Warm start from the per-slot greedy schedule
+    for t, slot_data in enumerate(scheduler.assign_each_slot(slots)):
+        sessions = slots[t][1]
+        chosen = {p: session for p, session in slot_data['assignment'].items() if session is not None}
+        for i, session in enumerate(sessions):
+            for p in available[t]:
+                x[t, i, p].setInitialValue(1 if chosen.get(p) is session else 0)
+        at_booth = len(available[t]) - len(chosen)
+        for k in range(len(available[t]) + 1):
+            booth[t, k].setInitialValue(1 if k == at_booth else 0)
+    for t, i, uncovered in must_cover:
+        covered = any(x[t, i, p].varValue for p in available[t])
+        uncovered.setInitialValue(0 if covered else 1)
+
+    solver = solver or pulp.PULP_CBC_CMD(msg=False, timeLimit=time_limit, warmStart=True)
+    model.solve(solver)
+    if model.sol_status not in (pulp.LpSolutionOptimal, pulp.LpSolutionIntegerFeasible):
+        raise ValueError(f"No schedule meets the limits ({pulp.LpStatus[model.status]}); relax them")
+
+    all_assignments = []
+    for t, ((slot, sessions), here) in enumerate(zip(slots, available)):
+        assignment = {p: None for p in people}
+        for i, session in enumerate(sessions):
+            for p in here:
+                if x[t, i, p].varValue is not None and x[t, i, p].varValue > 0.5:
+                    assignment[p] = session
+        all_assignments.append({
+            'slot': f"{slot['date']} {slot['start_time']}",
+            'assignment': assignment,
+            'value': scheduler.calculate_slot_value(assignment, slot['date'], slot['start_time']),
+        })
+
+    status = 'optimal' if model.sol_status == pulp.LpSolutionOptimal else 'best found within the time limit'
+    print(f"Global schedule: {status} ({len(x)} attendance variables, {time.perf_counter() - start:.1f}s)")
+    return all_assignments
@@ -0,0 +1,147 @@
+"""
+Content-addressed on-disk cache of fetched session pages.
+
+Each distinct page body is stored once under objects/, named by its
+SHA-256. A small SQLite index maps (session_id, url) to the current
+content hash, fetch time and response headers. A refresh policy decides
+whether a cached page can be reused without fetching, and comparing hashes
+tells the scraper whether a refetched page actually changed.
+"""
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import time
+
+
+class RefreshPolicy:
+    """
+    When a cached page has to be fetched again.
+
+    - 'always': fetch every page (changes are still detected by hash)
+    - 'never': only fetch pages that aren't cached yet
+    - 'max-age=SECONDS': fetch pages cached longer ago than SECONDS
+    """
+
+    def __init__(self, mode='max-age', max_age=86400):
+        if mode not in ('always', 'never', 'max-age'):
+            raise ValueError(f"Unknown refresh mode {mode!r}")
+        self.mode = mode
+        self.max_age = max_age
+
+    @classmethod
+    def parse(cls, spec):
+        """Build a policy from 'always', 'never' or 'max-age=SECONDS'."""
+        if spec in ('always', 'never'):
+            return cls(spec)
+        if spec.startswith('max-age='):
+            return cls('max-age', float(spec.split('=', 1)[1]))
+        raise ValueError(f"Invalid refresh policy {spec!r}; use always, never or max-age=SECONDS")
+
+    def needs_fetch(self, entry, now=None):
+        """Whether a page with this cache entry (or None) must be fetched."""
+        if entry is None or self.mode == 'always':
+            return True
+        if self.mode == 'never':
+            return False
+        now = time.time() if now is None else now
+        return now - entry['fetched_at'] > self.max_age
+
+    def __repr__(self):
+        if self.mode == 'max-age':
+            return f"RefreshPolicy('max-age={self.max_age:g}')"
+        return f"RefreshPolicy({self.mode!r})"
+
+
+def content_hash(html):
+    """SHA-256 hex digest of a page body."""
+    return hashlib.sha256(html.encode('utf-8')).hexdigest()
+
+
+class HTMLCache:
+    """Page bodies on disk, keyed by content hash, with an index by session."""
+
+    def __init__(self, cache_dir='.html_cache'):
+        self.cache_dir = cache_dir
+        self.objects_dir = os.path.join(cache_dir, 'objects')
+        os.makedirs(self.objects_dir, exist_ok=True)
+
+        self.conn = sqlite3.connect(os.path.join(cache_dir, 'index.db'))
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS html_cache (
+                session_id TEXT NOT NULL,
+                url TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                headers TEXT,
+                PRIMARY KEY (session_id, url)
+            )
+        ''')
+        self.conn.commit()
+
+    def _object_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], f"{digest}.html.gz")
+
+    def lookup(self, session_id, url):
+        """Return the index entry for a page, or None if it isn't cached."""
+        row = self.conn.execute('''
+            SELECT content_hash, fetched_at, headers
+            FROM html_cache
+            WHERE session_id = ? AND url = ?
+        ''', (session_id, url)).fetchone()
+
+        if row is None:
+            return None
+
+        # An entry whose object was deleted is as good as missing
+        if not os.path.exists(self._object_path(row[0])):
+            return None
+
+        return {
+            'content_hash': row[0],
+            'fetched_at': row[1],
+            'headers': json.loads(row[2]) if row[2] else {}
+        }
+
+    def read(self, digest):
+        """Return the page body stored under a content hash."""
+        with gzip.open(self._object_path(digest), 'rt', encoding='utf-8') as f:
+            return f.read()
+
+    def store(self, session_id, url, html, headers=None, fetched_at=None):
+        """
+        Record a freshly fetched page.
+
+        Returns True if the page is new or its content changed since the
+        last fetch, False if it is byte-for-byte the same.
+        """
+        digest = content_hash(html)
+        previous = self.lookup(session_id, url)
+
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temp file first so a crash never leaves a truncated object
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+            with os.fdopen(fd, 'wb') as raw, gzip.open(raw, 'wt', encoding='utf-8') as f:
+                f.write(html)
+            os.replace(tmp_path, path)
+
+        self.conn.execute('''
+            INSERT OR REPLACE INTO html_cache (session_id, url, content_hash, fetched_at, headers)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (
+            session_id,
+            url,
+            digest,
+            time.time() if fetched_at is None else fetched_at,
+            json.dumps(headers or {})
+        ))
+        self.conn.commit()
+
+        return previous is None or previous['content_hash'] != digest
+
+    def close(self):
+        self.conn.close()
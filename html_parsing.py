@@ -0,0 +1,247 @@
+"""
+Pluggable HTML parsing for session and calendar pages.
+
+Extraction code parses a page once with `parse_html` and queries the
+resulting ParsedDocument with a small BeautifulSoup-like API (find,
+find_all, get_text, get). The work is done by the fastest backend that is
+installed:
+
+- 'selectolax': selectolax's Lexbor parser (`pip install selectolax`)
+- 'lxml': lxml.html (`pip install lxml`)
+- 'bs4': BeautifulSoup with the stdlib html.parser (always available)
+
+Set APPAM_HTML_PARSER or pass `backend=` to pick one explicitly. Every
+backend leaves script, style and template contents and comments out of
+extracted text, as BeautifulSoup's get_text() does, so the regexes run over
+the page text see the same content whichever backend parsed it.
+"""
+import os
+import re
+from functools import cached_property
+
+
+# Fastest first
+BACKENDS = ('selectolax', 'lxml', 'bs4')
+
+# Elements whose contents never count as page text
+NON_TEXT_TAGS = ('script', 'style', 'template')
+
+
+def _matches(value, expected):
+    """Whether an attribute value satisfies a string or compiled regex filter."""
+    if value is None:
+        return False
+    if isinstance(expected, re.Pattern):
+        return expected.search(value) is not None
+    return value == expected
+
+
+def _class_matches(class_attr, expected):
+    """BeautifulSoup's class_ rule: match any single class or the whole attribute."""
+    if class_attr is None:
+        return False
+    return any(_matches(name, expected) for name in class_attr.split()) or _matches(class_attr, expected)
+
+
+def _names(name):
+    """Normalise a tag-name filter to a tuple of names (empty means any tag)."""
+    if name is None:
+        return ()
+    if isinstance(name, str):
+        return (name,)
+    return tuple(name)
+
+
+class Node:
+    """One element of a parsed page. Backends implement the element access."""
+
+    tag = None
+
+    def get(self, attr, default=None):
+        raise NotImplementedError
+
+    def get_text(self, strip=False):
+        """
+        Text of this element and its descendants.
+
+        With strip=True each text node is stripped and the non-empty pieces
+        are joined with no separator, like BeautifulSoup's get_text(strip=True).
+        """
+        raise NotImplementedError
+
+    def _descendants(self, names):
+        """Descendant elements in document order, limited to `names` if given."""
+        raise NotImplementedError
+
+    def find_all(self, name=None, class_=None, attrs=None):
+        """
+        Descendant elements matching a tag name (or list of names), a class
+        and exact or regex attribute values, in document order.
+        """
+        attrs = attrs or {}
+        found = []
+        for node in self._descendants(_names(name)):
+            if class_ is not None and not _class_matches(node.get('class'), class_):
+                continue
+            if any(not _matches(node.get(attr), expected) for attr, expected in attrs.items()):
+                continue
+            found.append(node)
+        return found
+
+    def find(self, name=None, class_=None, attrs=None):
+        """The first element find_all would return, or None."""
+        found = self.find_all(name, class_, attrs)
+        return found[0] if found else None
+
+
+class _SoupNode(Node):
+    def __init__(self, tag):
+        self._tag = tag
+        self.tag = tag.name
+
+    def get(self, attr, default=None):
+        value = self._tag.get(attr)
+        if value is None:
+            return default
+        # bs4 splits multi-valued attributes such as class into lists
+        return ' '.join(value) if isinstance(value, list) else value
+
+    def get_text(self, strip=False):
+        return self._tag.get_text(strip=strip)
+
+    def _descendants(self, names):
+        return (_SoupNode(tag) for tag in self._tag.find_all(list(names) or True))
+
+
+class _LxmlNode(Node):
+    def __init__(self, element):
+        self._element = element
+        self.tag = element.tag
+
+    def get(self, attr, default=None):
+        return self._element.get(attr, default)
+
+    def get_text(self, strip=False):
+        if strip:
+            return ''.join(piece.strip() for piece in self._element.itertext())
+        return str(self._element.text_content())
+
+    def _descendants(self, names):
+        for element in self._element.iterdescendants(*names):
+            # Skip comments and processing instructions
+            if isinstance(element.tag, str):
+                yield _LxmlNode(element)
+
+
+class _LexborNode(Node):
+    def __init__(self, node):
+        self._node = node
+        self.tag = node.tag
+
+    def get(self, attr, default=None):
+        value = self._node.attributes.get(attr)
+        return default if value is None else value
+
+    def get_text(self, strip=False):
+        return self._node.text(deep=True, separator='', strip=strip)
+
+    def _descendants(self, names):
+        nodes = self._node.traverse(include_text=False)
+        next(nodes, None)  # traverse() starts with the node itself
+        for node in nodes:
+            if not names or node.tag in names:
+                yield _LexborNode(node)
+
+
+def _parse_bs4(html):
+    from bs4 import BeautifulSoup
+    return _SoupNode(BeautifulSoup(html, 'html.parser'))
+
+
+def _parse_lxml(html):
+    import lxml.html
+    from lxml import etree
+
+    if not html.strip():
+        html = '<html></html>'
+    try:
+        root = lxml.html.document_fromstring(html)
+    except ValueError:
+        # lxml refuses str input that carries an XML encoding declaration
+        root = lxml.html.document_fromstring(html.encode('utf-8'))
+    etree.strip_elements(root, *NON_TEXT_TAGS, with_tail=False)
+    return _LxmlNode(root)
+
+
+def _parse_selectolax(html):
+    from selectolax.lexbor import LexborHTMLParser
+
+    tree = LexborHTMLParser(html)
+    tree.strip_tags(list(NON_TEXT_TAGS))
+    return _LexborNode(tree.root)
+
+
+_PARSE_FUNCTIONS = {
+    'selectolax': _parse_selectolax,
+    'lxml': _parse_lxml,
+    'bs4': _parse_bs4,
+}
+
+_IMPORT_NAMES = {
+    'selectolax': 'selectolax.lexbor',
+    'lxml': 'lxml.html',
+    'bs4': 'bs4',
+}
+
+
+def available_backends():
+    """Installed backends, fastest first."""
+    available = []
+    for backend in BACKENDS:
+        try:
+            __import__(_IMPORT_NAMES[backend])
+        except ImportError:
+            continue
+        available.append(backend)
+    return available
+
+
+def default_backend():
+    """APPAM_HTML_PARSER if set, otherwise the fastest installed backend."""
+    backend = os.environ.get('APPAM_HTML_PARSER')
+    if backend:
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown HTML parser {backend!r}; expected one of {BACKENDS}")
+        return backend
+    return available_backends()[0]
+
+
+class ParsedDocument:
+    """
+    A page parsed once, shared by every extraction step.
+
+    The full page text is extracted on first use and cached, so title,
+    time, location, paper and presenter extraction never re-walk the tree.
+    """
+
+    def __init__(self, html, backend=None):
+        self.backend = backend or default_backend()
+        if self.backend not in _PARSE_FUNCTIONS:
+            raise ValueError(f"Unknown HTML parser {self.backend!r}; expected one of {BACKENDS}")
+        self.root = _PARSE_FUNCTIONS[self.backend](html or '')
+
+    @cached_property
+    def text(self):
+        """The whole page's text, as BeautifulSoup's get_text() returns it."""
+        return self.root.get_text()
+
+    def find_all(self, name=None, class_=None, attrs=None):
+        return self.root.find_all(name, class_, attrs)
+
+    def find(self, name=None, class_=None, attrs=None):
+        return self.root.find(name, class_, attrs)
+
+
+def parse_html(html, backend=None):
+    """Parse a page with the given backend, or the default one."""
+    return ParsedDocument(html, backend)
@@ -0,0 +1,158 @@
+"""
+Compressed, out-of-row storage for scraped session pages.
+
+Raw HTML lives in the session_html table instead of the sessions row, so
+scoring and export queries never read it. Pages are compressed with zstd
+when the `zstandard` package is installed and zlib otherwise; each row
+records its codec, so databases written with either can be read as long
+as the codec is available.
+
+Pages are only decompressed when a caller asks for one through HtmlStore.
+"""
+import sqlite3
+import zlib
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+
+CODECS = ('zstd', 'zlib') if zstandard is not None else ('zlib',)
+
+SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS session_html (
+        session_id TEXT PRIMARY KEY,
+        codec TEXT NOT NULL,
+        size INTEGER NOT NULL,
+        html BLOB NOT NULL,
+        FOREIGN KEY (session_id) REFERENCES sessions(session_id)
+    )
+'''
+
+HTML_UPSERT = '''
+    INSERT INTO session_html (session_id, codec, size, html) VALUES (?, ?, ?, ?)
+    ON CONFLICT(session_id) DO UPDATE SET
+        codec = excluded.codec,
+        size = excluded.size,
+        html = excluded.html
+'''
+
+# Rows copied per transaction when migrating sessions.raw_html
+MIGRATION_BATCH_SIZE = 200
+
+
+def compress_html(html, codec=None):
+    """Compress a page; returns (codec, blob)."""
+    codec = codec or CODECS[0]
+    data = html.encode('utf-8')
+    if codec == 'zstd':
+        if zstandard is None:
+            raise ValueError("zstd compression needs the zstandard package")
+        return codec, zstandard.ZstdCompressor(level=10).compress(data)
+    if codec == 'zlib':
+        return codec, zlib.compress(data, 6)
+    raise ValueError(f"Unknown codec {codec!r}; expected one of {CODECS}")
+
+
+def decompress_html(codec, blob):
+    """Inverse of compress_html."""
+    if codec == 'zstd':
+        if zstandard is None:
+            raise ValueError("This page was stored with zstd; install the zstandard package to read it")
+        return zstandard.ZstdDecompressor().decompress(blob).decode('utf-8')
+    if codec == 'zlib':
+        return zlib.decompress(blob).decode('utf-8')
+    raise ValueError(f"Unknown codec {codec!r}")
+
+
+class HtmlStore:
+    """Read and write compressed session pages through an open connection."""
+
+    def __init__(self, conn, codec=None):
+        self.conn = conn
+        self.codec = codec or CODECS[0]
+        self.conn.execute(SCHEMA)
+
+    def put_many(self, cursor, pages):
+        """
+        Store (session_id, html) pairs using a cursor inside the caller's
+        transaction. Empty pages are skipped, keeping any stored HTML.
+        """
+        rows = []
+        for session_id, html in pages:
+            if html:
+                codec, blob = compress_html(html, self.codec)
+                rows.append((session_id, codec, len(html), blob))
+        cursor.executemany(HTML_UPSERT, rows)
+        return len(rows)
+
+    def put(self, session_id, html):
+        """Store one page in its own transaction."""
+        with self.conn:
+            self.put_many(self.conn.cursor(), [(session_id, html)])
+
+    def get(self, session_id):
+        """A session's decompressed HTML, or None if none is stored."""
+        row = self.conn.execute('SELECT codec, html FROM session_html WHERE session_id = ?',
+                                (session_id,)).fetchone()
+        return decompress_html(*row) if row else None
+
+    def session_ids(self):
+        """IDs of every session with stored HTML, in order."""
+        return [row[0] for row in self.conn.execute('SELECT session_id FROM session_html ORDER BY session_id')]
+
+    def iter_batches(self, batch_size, session_ids=None):
+        """
+        Yield lists of (session_id, html) pairs, decompressing one batch at
+        a time so only that batch's pages are ever in memory.
+        """
+        session_ids = self.session_ids() if session_ids is None else list(session_ids)
+        for i in range(0, len(session_ids), batch_size):
+            batch_ids = session_ids[i:i + batch_size]
+            placeholders = ','.join('?' * len(batch_ids))
+            yield [
+                (session_id, decompress_html(codec, blob))
+                for session_id, codec, blob in self.conn.execute(
+                    f'SELECT session_id, codec, html FROM session_html '
+                    f'WHERE session_id IN ({placeholders}) ORDER BY session_id',
+                    batch_ids
+                )
+            ]
+
+
+def migrate_raw_html(conn, codec=None):
+    """
+    Move sessions.raw_html from an older database into session_html and drop
+    the column. Returns how many pages were moved (0 if already migrated).
+    """
+    columns = [row[1] for row in conn.execute('PRAGMA table_info(sessions)')]
+    if 'raw_html' not in columns:
+        return 0
+
+    store = HtmlStore(conn, codec)
+    session_ids = [row[0] for row in conn.execute(
+        "SELECT session_id FROM sessions WHERE raw_html IS NOT NULL AND raw_html != '' ORDER BY session_id"
+    )]
+
+    moved = 0
+    for i in range(0, len(session_ids), MIGRATION_BATCH_SIZE):
+        batch_ids = session_ids[i:i + MIGRATION_BATCH_SIZE]
+        placeholders = ','.join('?' * len(batch_ids))
+        with conn:
+            pages = conn.execute(
+                f'SELECT session_id, raw_html FROM sessions WHERE session_id IN ({placeholders})', batch_ids
+            ).fetchall()
+            moved += store.put_many(conn.cursor(), pages)
+
+    with conn:
+        if sqlite3.sqlite_version_info >= (3, 35, 0):
+            conn.execute('ALTER TABLE sessions DROP COLUMN raw_html')
+        else:  # pragma: no cover - SQLite too old to drop columns
+            conn.execute('UPDATE sessions SET raw_html = NULL')
+
+    if moved:
+        # Give the space the inline pages took back to the filesystem
+        conn.execute('VACUUM')
+        print(f"Moved {moved} stored pages into compressed session_html")
+    return moved
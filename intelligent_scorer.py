@@ -2,11 +2,17 @@
 Intelligent scoring by actually reading session content.
 Uses Claude to understand session relevance beyond keyword matching.
 """
+import os
 import sqlite3
-import json
+
+from rule_engine import RULES_DIR, RuleEngine
 from smart_rescorer import get_top_sessions_for_review, save_smart_scores
 
 
+# score_session_smart's rules, as data; edit rules/smart.json to change them
+RULES = RuleEngine.load(os.path.join(RULES_DIR, 'smart.json'))
+
+
 # PolicyEngine relevance criteria
 SCORING_GUIDE = """
 Score 0-100 based on PolicyEngine's work:
@@ -50,110 +56,13 @@ def score_session_smart(session_data):
     Returns (score, rationale) where score is 0-100.
     """
     title = session_data['title']
-    description = session_data.get('description', '')[:2000]  # First 2000 chars
+    description = (session_data.get('description') or '')[:2000]  # First 2000 chars
     papers = session_data.get('papers', [])
 
     # Combine text for analysis
     full_text = f"Title: {title}\n\nDescription: {description}\n\nPapers: {', '.join(papers[:5]) if papers else 'None'}"
 
-    # VERY HIGH VALUE - Direct microsimulation/tax-benefit focus
-    if any(term in full_text.lower() for term in [
-        'microsimulation', 'microsimulating', 'microsimulated',
-        'policyengine', 'openfisca', 'taxsim', 'tax-benefit model'
-    ]):
-        return (95, "Direct microsimulation methodology or tool")
-
-    # Check for CTC/EITC focus
-    if ('ctc' in full_text.lower() or 'child tax credit' in full_text.lower() or
-        'eitc' in full_text.lower() or 'earned income' in full_text.lower()):
-        if 'poverty' in full_text.lower() or 'impact' in full_text.lower():
-            return (90, "CTC/EITC with poverty/impact analysis - core PolicyEngine topic")
-        return (75, "Tax credit policy - relevant to PolicyEngine")
-
-    # UBI/Guaranteed Income
-    if any(term in full_text.lower() for term in [
-        'universal basic income', 'guaranteed income', 'cash transfer',
-        'unconditional cash'
-    ]):
-        if 'randomized' in full_text.lower() or 'experiment' in full_text.lower():
-            return (85, "UBI/cash transfer RCT - highly relevant")
-        return (75, "UBI/guaranteed income policy")
-
-    # Poverty measurement
-    if 'poverty' in full_text.lower() and any(term in full_text.lower() for term in [
-        'measurement', 'measure', 'spm', 'supplemental poverty', 'census'
-    ]):
-        return (85, "Poverty measurement - core to PolicyEngine's impact calculations")
-
-    # SNAP/Medicaid policy analysis
-    snap_terms = ['snap', 'food stamp', 'supplemental nutrition']
-    medicaid_terms = ['medicaid', 'chip', 'health insurance']
-
-    if any(term in full_text.lower() for term in snap_terms):
-        if any(word in full_text.lower() for word in ['take-up', 'enrollment', 'eligibility', 'benefit', 'impact']):
-            return (80, "SNAP program analysis - directly models in PolicyEngine")
-        return (65, "SNAP related - relevant benefit program")
-
-    if any(term in full_text.lower() for term in medicaid_terms):
-        if any(word in full_text.lower() for word in ['expansion', 'eligibility', 'coverage', 'enrollment', 'aca']):
-            return (75, "Medicaid policy - modeled in PolicyEngine")
-        return (60, "Health insurance policy - relevant to PolicyEngine health modeling")
-
-    # Tax policy (general)
-    if 'tax' in full_text.lower() and any(term in full_text.lower() for term in [
-        'reform', 'policy', 'income tax', 'payroll', 'credit', 'deduction'
-    ]):
-        if 'distributional' in full_text.lower() or 'inequality' in full_text.lower():
-            return (75, "Tax policy with distributional analysis")
-        return (60, "Tax policy - core PolicyEngine domain")
-
-    # Distributional analysis
-    if any(term in full_text.lower() for term in [
-        'distributional', 'inequality', 'income distribution', 'wealth distribution'
-    ]):
-        if 'administrative data' in full_text.lower() or 'microdata' in full_text.lower():
-            return (70, "Distributional analysis with administrative data")
-        return (55, "Distributional/inequality focus")
-
-    # Methodology that would improve PolicyEngine
-    if any(term in full_text.lower() for term in [
-        'causal inference', 'difference-in-differences', 'regression discontinuity',
-        'synthetic control', 'propensity score'
-    ]):
-        if 'tax' in full_text.lower() or 'benefit' in full_text.lower() or 'policy' in full_text.lower():
-            return (65, "Causal methods for policy evaluation - applicable to PolicyEngine validation")
-        return (45, "Causal inference methodology")
-
-    # Machine learning for policy
-    if 'machine learning' in full_text.lower() or 'prediction' in full_text.lower():
-        if 'health' in full_text.lower() or 'benefit' in full_text.lower():
-            return (50, "ML for policy - potentially useful methodology")
-        return (35, "ML methods - tangentially relevant")
-
-    # Housing policy (relevant but not core)
-    if 'housing' in full_text.lower():
-        if 'voucher' in full_text.lower() or 'subsidy' in full_text.lower():
-            return (55, "Housing assistance - benefit program")
-        return (40, "Housing policy - adjacent to core work")
-
-    # Education policy
-    if 'education' in full_text.lower() or 'school' in full_text.lower():
-        if 'benefit' in full_text.lower() or 'subsidy' in full_text.lower():
-            return (45, "Education with benefit component")
-        return (30, "Education policy - low relevance")
-
-    # Child welfare
-    if 'child welfare' in full_text.lower():
-        return (40, "Child welfare - adjacent policy area")
-
-    # Default: check for any poverty/policy connection
-    if 'poverty' in full_text.lower():
-        return (50, "Poverty-related topic")
-
-    if 'policy' in full_text.lower() and ('welfare' in full_text.lower() or 'social' in full_text.lower()):
-        return (35, "Social policy - tangentially relevant")
-
-    return (20, "Low relevance to PolicyEngine core work")
+    return RULES.score(RULES.hits(full_text.lower()))
 
 
 def main():
@@ -0,0 +1,116 @@
+"""
+Find every keyword from a fixed table in one pass over a text.
+
+The keywords are compiled into a single regex shaped like a trie (shared
+prefixes are matched once, so each text position costs one branch rather
+than one attempt per keyword). Scanning a text once yields, for every
+keyword:
+
+- its word-bounded count, equal to len(re.findall(r'\\bkw\\b', text))
+- where it first occurs as a plain substring, so `kw in text[:end]` can
+  be answered for any prefix of the text (e.g. just the title)
+
+Keywords are matched as given; lowercase both sides for case-insensitive
+matching.
+"""
+import re
+
+
+def _is_word(char):
+    # Same definition of a word character as re's \b for str patterns
+    return char.isalnum() or char == '_'
+
+
+class _TrieNode:
+    __slots__ = ('children', 'keyword')
+
+    def __init__(self):
+        self.children = {}
+        self.keyword = None
+
+
+def _trie_pattern(node):
+    """Regex for the keywords below a trie node, longest alternatives first."""
+    branches = [re.escape(char) + _trie_pattern(child) for char, child in sorted(node.children.items())]
+    if node.keyword is not None:
+        # Stopping here is the last resort, so the longest keyword wins
+        branches.append('')
+    if len(branches) == 1:
+        return branches[0]
+    return '(?:' + '|'.join(branches) + ')'
+
+
+class KeywordMatches:
+    """The keyword occurrences found by one KeywordMatcher.scan()."""
+
+    __slots__ = ('counts', 'first_ends')
+
+    def __init__(self, counts, first_ends):
+        self.counts = counts
+        self.first_ends = first_ends
+
+    def count(self, keyword):
+        """Word-bounded, non-overlapping occurrences of a keyword."""
+        return self.counts.get(keyword, 0)
+
+    def occurs_before(self, keyword, end):
+        """Whether `keyword in text[:end]`."""
+        first_end = self.first_ends.get(keyword)
+        return first_end is not None and first_end <= end
+
+
+class KeywordMatcher:
+    """A keyword table compiled once for repeated single-pass scans."""
+
+    def __init__(self, keywords):
+        self.keywords = list(dict.fromkeys(keywords))
+        if not all(self.keywords):
+            raise ValueError("Keywords must be non-empty strings")
+
+        root = _TrieNode()
+        for keyword in self.keywords:
+            node = root
+            for char in keyword:
+                node = node.children.setdefault(char, _TrieNode())
+            node.keyword = keyword
+
+        # The regex reports the longest keyword starting at each position;
+        # every keyword that is a prefix of it matches there too
+        self._prefixes = {}
+        for keyword in self.keywords:
+            node = root
+            prefixes = []
+            for char in keyword:
+                node = node.children[char]
+                if node.keyword is not None:
+                    prefixes.append(node.keyword)
+            self._prefixes[keyword] = prefixes
+
+        # A zero-width lookahead, so overlapping occurrences are all found
+        self._pattern = re.compile('(?=(' + _trie_pattern(root) + '))')
+
+    def scan(self, text):
+        """Find every keyword occurrence in `text`; returns KeywordMatches."""
+        counts = {}
+        first_ends = {}
+        last_ends = {}
+        length = len(text)
+
+        for match in self._pattern.finditer(text):
+            start = match.start()
+            bounded_start = (start > 0 and _is_word(text[start - 1])) != _is_word(text[start])
+
+            for keyword in self._prefixes[match.group(1)]:
+                end = start + len(keyword)
+                if keyword not in first_ends:
+                    first_ends[keyword] = end
+
+                # re.findall doesn't count overlapping matches of one keyword
+                if not bounded_start or start < last_ends.get(keyword, 0):
+                    continue
+                if (end < length and _is_word(text[end])) == _is_word(text[end - 1]):
+                    continue
+                counts[keyword] = counts.get(keyword, 0) + 1
+                last_ends[keyword] = end
+
+        return KeywordMatches(counts, first_ends)
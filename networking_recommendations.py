@@ -5,6 +5,20 @@ Based on relevance to PolicyEngine work.
 import sqlite3
 import json
 
+from session_scores import SessionScores
+from session_search import SessionSearch, terms
+
+
+# Topic labels and the title words (or word prefixes) that earn them
+TOPICS = {
+    'Tax Policy': ['tax', 'ctc', 'eitc'],
+    'Poverty': ['poverty'],
+    'Benefit Programs': ['snap', 'wic'],
+    'Health Policy': ['medicaid', 'medicare'],
+    'Microsimulation': ['microsimulation', 'modeling'],
+    'Housing': ['housing'],
+}
+
 
 def get_networking_recommendations(db_path='appam_sessions.db'):
     """Get presenters worth connecting with, separate from session attendance."""
@@ -18,11 +32,9 @@ def get_networking_recommendations(db_path='appam_sessions.db'):
             p.name,
             p.email,
             p.affiliation,
+            s.session_id,
             s.title as session_title,
             s.general_score,
-            s.max_score,
-            s.pavel_score,
-            s.daphne_score,
             s.date,
             s.start_time
         FROM presenters p
@@ -32,8 +44,18 @@ def get_networking_recommendations(db_path='appam_sessions.db'):
         ORDER BY s.general_score DESC, p.name
     ''')
 
+    rows = cursor.fetchall()
+    person_scores = SessionScores(conn).for_sessions({row['session_id'] for row in rows})
+
+    # One full-text query per topic instead of substring checks on every title
+    search = SessionSearch(conn)
+    topic_sessions = {
+        topic: search.session_ids('title : ' + terms(words, prefix=True))
+        for topic, words in TOPICS.items()
+    }
+
     presenters_data = {}
-    for row in cursor.fetchall():
+    for row in rows:
         name = row['name']
         if name not in presenters_data:
             presenters_data[name] = {
@@ -50,9 +72,7 @@ def get_networking_recommendations(db_path='appam_sessions.db'):
             'date': row['date'],
             'time': row['start_time'],
             'general_score': row['general_score'],
-            'max_score': row['max_score'],
-            'pavel_score': row['pavel_score'],
-            'daphne_score': row['daphne_score']
+            'person_scores': person_scores[row['session_id']]
         }
 
         presenters_data[name]['sessions'].append(session_info)
@@ -61,20 +81,10 @@ def get_networking_recommendations(db_path='appam_sessions.db'):
             row['general_score']
         )
 
-        # Extract topics from title
-        title_lower = row['session_title'].lower()
-        if 'tax' in title_lower or 'ctc' in title_lower or 'eitc' in title_lower:
-            presenters_data[name]['topics'].add('Tax Policy')
-        if 'poverty' in title_lower:
-            presenters_data[name]['topics'].add('Poverty')
-        if 'snap' in title_lower or 'wic' in title_lower:
-            presenters_data[name]['topics'].add('Benefit Programs')
-        if 'medicaid' in title_lower or 'medicare' in title_lower:
-            presenters_data[name]['topics'].add('Health Policy')
-        if 'microsimulation' in title_lower or 'modeling' in title_lower:
-            presenters_data[name]['topics'].add('Microsimulation')
-        if 'housing' in title_lower:
-            presenters_data[name]['topics'].add('Housing')
+        # Topics from the session title
+        for topic, session_ids in topic_sessions.items():
+            if row['session_id'] in session_ids:
+                presenters_data[name]['topics'].add(topic)
 
     conn.close()
 
@@ -92,12 +102,12 @@ def generate_networking_report():
     """Generate networking recommendations by person."""
     presenters = get_networking_recommendations()
 
+    conn = sqlite3.connect('appam_sessions.db')
+    people = SessionScores(conn).people()
+    conn.close()
+
     # Categorize by person
-    for person_name, score_key in [
-        ('Max Ghenis', 'max_score'),
-        ('Pavel Makarchuk', 'pavel_score'),
-        ('Daphne Hansell', 'daphne_score')
-    ]:
+    for person_name in people:
         print(f"\n{'='*80}")
         print(f"NETWORKING RECOMMENDATIONS FOR {person_name.upper()}")
         print(f"{'='*80}\n")
@@ -105,7 +115,7 @@ def generate_networking_report():
         # Get presenters from sessions highly relevant to this person
         relevant_presenters = []
         for presenter in presenters:
-            max_person_score = max([s[score_key] for s in presenter['sessions']])
+            max_person_score = max([s['person_scores'].get(person_name, 0) for s in presenter['sessions']])
             if max_person_score >= 75:
                 presenter['person_score'] = max_person_score
                 relevant_presenters.append(presenter)
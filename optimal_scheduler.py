@@ -8,13 +8,20 @@ Maximizes total value considering:
 import sqlite3
 from collections import defaultdict
 
+from availability import Availability
+from conference_snapshot import ConferenceSnapshot
+from session_scores import SessionScores
+from slot_matching import match_slot
+from time_utils import TIME_SLOTS_QUERY, ensure_time_columns, slot_condition
+
 
 class OptimalScheduler:
     def __init__(self, db_path='appam_sessions.db'):
         self.db_path = db_path
         self.people = ['Max Ghenis', 'Pavel Makarchuk', 'Daphne Hansell']
 
-        # Availability constraints
+        # Availability constraints (see availability.py; 'away' lists breaks
+        # and off-site meetings as (from, until) pairs)
         # Max arrives 11:30am Thursday, only one there Saturday
         # Pavel & Daphne depart after Friday
         self.availability = {
@@ -53,32 +60,23 @@ class OptimalScheduler:
             3: 5       # No additional value - should be at sessions
         }
 
-    def is_available(self, person, date, start_time):
-        """Check if person is available for this date/time."""
-        from datetime import datetime
-
-        try:
-            session_dt = datetime.strptime(f"{date} {start_time}", "%Y-%m-%d %I:%M%p")
-        except:
-            return True
-
-        constraints = self.availability.get(person, {})
+        # Compiled by team_availability()
+        self._availability = None
 
-        # Check start constraint
-        if constraints.get('start'):
-            arrival_date, arrival_time = constraints['start']
-            arrival_dt = datetime.strptime(f"{arrival_date} {arrival_time}", "%Y-%m-%d %I:%M%p")
-            if session_dt < arrival_dt:
-                return False
-
-        # Check end constraint
-        if constraints.get('end'):
-            depart_date, depart_time = constraints['end']
-            depart_dt = datetime.strptime(f"{depart_date} {depart_time}", "%Y-%m-%d %I:%M%p")
-            if session_dt >= depart_dt:
-                return False
+    def team_availability(self, slots=()):
+        """
+        The team's availability compiled into a person x slot matrix, with
+        columns for `slots` filled up front. Kept across calls and rebuilt
+        when people or availability are reassigned.
+        """
+        compiled = self._availability
+        if compiled is None or compiled.constraints is not self.availability or compiled.people != self.people:
+            compiled = self._availability = Availability(self.people, self.availability)
+        return compiled.add_slots(slots)
 
-        return True
+    def is_available(self, person, date, start_time):
+        """Check if person is available for this date/time."""
+        return self.team_availability().is_available(person, date, start_time)
 
     def get_time_slots(self):
         """Get all unique time slots."""
@@ -86,54 +84,45 @@ class OptimalScheduler:
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
 
-        cursor.execute('''
-            SELECT DISTINCT date, start_time, end_time
-            FROM sessions
-            WHERE date != '' AND start_time != ''
-            ORDER BY date, start_time
-        ''')
+        ensure_time_columns(conn)
+        cursor.execute(TIME_SLOTS_QUERY)
 
         slots = [dict(row) for row in cursor.fetchall()]
         conn.close()
         return slots
 
     def get_sessions_for_slot(self, date, start_time, end_time):
-        """Get all sessions for a time slot with scores."""
+        """
+        Get all sessions for a time slot with scores; each session's
+        'person_scores' maps team members to their score.
+        """
         conn = sqlite3.connect(self.db_path)
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
 
-        cursor.execute('''
-            SELECT session_id, title, date, start_time, end_time, location,
-                   general_score, max_score, pavel_score, daphne_score
+        ensure_time_columns(conn)
+        condition, params = slot_condition(date, start_time, end_time)
+        cursor.execute(f'''
+            SELECT session_id, title, date, start_time, end_time, location, general_score
             FROM sessions
-            WHERE date = ? AND start_time = ? AND end_time = ?
+            WHERE {condition}
             ORDER BY general_score DESC
-        ''', (date, start_time, end_time))
+        ''', params)
 
         sessions = [dict(row) for row in cursor.fetchall()]
+        person_scores = SessionScores(conn).for_sessions(s['session_id'] for s in sessions)
+        for session in sessions:
+            session['person_scores'] = person_scores[session['session_id']]
         conn.close()
         return sessions
 
-    def calculate_slot_value(self, slot_assignment, date, start_time):
-        """
-        Calculate total value for a time slot assignment.
+    @staticmethod
+    def person_score(session, person):
+        """A person's score for a session, falling back to the general score."""
+        return session.get('person_scores', {}).get(person, session.get('general_score', 0))
 
-        slot_assignment = {
-            'Max Ghenis': session_dict or None,
-            'Pavel Makarchuk': session_dict or None,
-            'Daphne Hansell': session_dict or None
-        }
-        """
-        # Count how many people are actually available for this slot
-        available_people = [p for p in self.people if self.is_available(p, date, start_time)]
-        num_available = len(available_people)
-
-        # Count people at booth vs sessions
-        people_at_sessions = sum(1 for s in slot_assignment.values() if s is not None)
-        people_at_booth = num_available - people_at_sessions
-
-        # Booth value - context aware based on who's available
+    def booth_value_for(self, people_at_booth, num_available):
+        """Booth value - context aware based on who's available."""
         if num_available == 1:
             # Only one person available (e.g., Saturday - only Max)
             # Must choose: booth OR session
@@ -141,27 +130,46 @@ class OptimalScheduler:
                 0: -50,   # Empty booth - acceptable for high-value sessions
                 1: 0      # At booth - fine but missing sessions
             }
-            booth_val = booth_value_map.get(people_at_booth, 0)
-        elif num_available == 2:
+            return booth_value_map.get(people_at_booth, 0)
+        if num_available == 2:
             # 2 people available (e.g., Thursday morning before Max)
             booth_value_map = {
                 0: -500,  # Not ideal but less severe penalty
                 1: 0,     # Good - requirement met
                 2: 5      # Both at booth - fine but consider sessions
             }
-            booth_val = booth_value_map.get(people_at_booth, 0)
-        else:
-            # Normal operation - all 3 available
-            booth_val = self.booth_value.get(people_at_booth, 0)
+            return booth_value_map.get(people_at_booth, 0)
+        # Normal operation - all 3 available; a fourth person at the booth
+        # or more adds nothing for larger teams
+        return self.booth_value.get(people_at_booth, self.booth_value[max(self.booth_value)])
+
+    def calculate_slot_value(self, slot_assignment, date, start_time, num_available=None):
+        """
+        Calculate total value for a time slot assignment.
+
+        slot_assignment = {
+            'Max Ghenis': session_dict or None,
+            'Pavel Makarchuk': session_dict or None,
+            'Daphne Hansell': session_dict or None
+        }
+
+        num_available skips re-checking availability when the caller knows it.
+        """
+        # Count how many people are actually available for this slot
+        if num_available is None:
+            num_available = len(self.team_availability().available_people(date, start_time))
+
+        # Count people at booth vs sessions
+        people_at_sessions = sum(1 for s in slot_assignment.values() if s is not None)
+        people_at_booth = num_available - people_at_sessions
+        booth_val = self.booth_value_for(people_at_booth, num_available)
 
         # Session attendance value
         session_val = 0
         for person, session in slot_assignment.items():
             if session:
                 # Use person-specific score
-                person_key = f"{person.split(' ')[0].lower()}_score"
-                person_score = session.get(person_key, session.get('general_score', 0))
-                session_val += person_score
+                session_val += self.person_score(session, person)
 
         total_value = booth_val + session_val
 
@@ -174,80 +182,75 @@ class OptimalScheduler:
             'num_available': num_available
         }
 
-    def assign_slot_optimal(self, date, start_time, end_time, sessions):
+    def load_snapshot(self):
+        """Every slot's sessions and the team's scores, from one query."""
+        return ConferenceSnapshot.load(self.db_path, self.people)
+
+    def assign_slot_optimal(self, date, start_time, end_time, sessions, scores=None):
         """
         Find optimal assignment for one time slot.
 
+        Exact for any team size: people are matched to sessions and booth
+        seats as a max-weight bipartite matching (see slot_matching).
+        `scores` ({person: scores in session order}, as a snapshot Slot
+        keeps them) become the weight matrix in one numpy step; without
+        them each score is looked up in the session dicts, which costs
+        more than the matching for large teams.
+
         Returns best assignment and its value score.
         """
         # Get available people for this slot
-        available_people = [p for p in self.people if self.is_available(p, date, start_time)]
+        available_people = self.team_availability().available_people(date, start_time)
 
         if not available_people:
             # No one available - skip
             return {}, {'total': -1000}
 
-        # Try all possible assignments
-        best_assignment = {}
-        best_value = {'total': -1000}
-
-        # Generate all possible assignments
-        # For 3 people and N sessions, we try:
-        # - 0 people at sessions (all at booth)
-        # - 1 person at sessions (2 at booth)
-        # - 2 people at sessions (1 at booth)
-
-        from itertools import combinations
-
-        # Option 1: Everyone at booth (valid but low value if good sessions exist)
-        assignment = {p: None for p in self.people}
-        value = self.calculate_slot_value(assignment, date, start_time)
-        if value['total'] > best_value['total']:
-            best_assignment = assignment.copy()
-            best_value = value
-
-        # Option 2: Send 1 person to best session
-        if sessions:
-            for person in available_people:
-                # Find best session for this person
-                person_key = f"{person.split(' ')[0].lower()}_score"
-                best_session = max(sessions, key=lambda s: s.get(person_key, s.get('general_score', 0)))
-
-                assignment = {p: None for p in self.people}
-                assignment[person] = best_session
-
-                value = self.calculate_slot_value(assignment, date, start_time)
-                if value['total'] > best_value['total']:
-                    best_assignment = assignment.copy()
-                    best_value = value
-
-        # Option 3: Send 2 people to different sessions (if multiple good sessions)
-        if len(sessions) >= 2 and len(available_people) >= 2:
-            for person_pair in combinations(available_people, 2):
-                # Assign each person to their best session
-                assignment = {p: None for p in self.people}
-
-                for i, person in enumerate(person_pair):
-                    person_key = f"{person.split(' ')[0].lower()}_score"
-
-                    # Find best unassigned session
-                    assigned_sessions = [assignment[person_pair[j]] for j in range(i) if assignment.get(person_pair[j])]
-                    available_sessions = [s for s in sessions if s not in assigned_sessions]
-
-                    if available_sessions:
-                        best_session = max(available_sessions,
-                                         key=lambda s: s.get(person_key, s.get('general_score', 0)))
-                        assignment[person] = best_session
-
-                value = self.calculate_slot_value(assignment, date, start_time)
-                if value['total'] > best_value['total']:
-                    best_assignment = assignment.copy()
-                    best_value = value
-
-        return best_assignment, best_value
-
-    def optimize_schedule(self):
-        """Create optimal schedule for all time slots."""
+        if scores is not None:
+            rows = [scores[person] for person in available_people]
+        else:
+            # person_score() inlined: this is n x m lookups per slot
+            lookups = [(session.get('person_scores', {}), session.get('general_score', 0)) for session in sessions]
+            rows = [[person_scores.get(person, general) for person_scores, general in lookups]
+                    for person in available_people]
+        booth_values = [self.booth_value_for(k, len(available_people)) for k in range(len(available_people) + 1)]
+        chosen, _ = match_slot(rows, booth_values)
+
+        best_assignment = {p: None for p in self.people}
+        for person, index in zip(available_people, chosen):
+            if index is not None:
+                best_assignment[person] = sessions[index]
+
+        return best_assignment, self.calculate_slot_value(best_assignment, date, start_time, len(available_people))
+
+    def assign_each_slot(self, slots):
+        """
+        all_assignments for (slot, sessions) pairs, optimizing each slot
+        on its own with assign_slot_optimal. Snapshot slots bring their
+        score arrays.
+        """
+        all_assignments = []
+        for slot, sessions in slots:
+            assignment, value = self.assign_slot_optimal(slot['date'], slot['start_time'], slot['end_time'], sessions,
+                                                         getattr(slot, 'scores', None))
+            all_assignments.append({
+                'slot': f"{slot['date']} {slot['start_time']}",
+                'assignment': assignment,
+                'value': value
+            })
+        return all_assignments
+
+    def optimize_schedule(self, mode='slot', **options):
+        """
+        Create optimal schedule for all time slots.
+
+        mode='slot' optimizes one slot at a time; mode='global' solves the
+        whole conference as one MIP, with the options global_scheduler.solve
+        takes (time_limit, max_sessions, max_booth_shifts, ...).
+        """
+        if mode not in ('slot', 'global'):
+            raise ValueError(f"Unknown mode {mode!r}; expected 'slot' or 'global'")
+
         # Clear assignments first
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
@@ -255,10 +258,7 @@ class OptimalScheduler:
         conn.commit()
         conn.close()
 
-        time_slots = self.get_time_slots()
-
-        all_assignments = []
-        total_value = 0
+        snapshot = self.load_snapshot()
 
         print("="*80)
         print("OPTIMIZING SCHEDULE WITH BOOTH VALUE")
@@ -269,36 +269,28 @@ class OptimalScheduler:
         print(f"  2 people: +{self.booth_value[2]} bonus")
         print(f"  3 people: +{self.booth_value[3]} bonus\n")
 
-        for slot in time_slots:
-            date = slot['date']
-            start_time = slot['start_time']
-            end_time = slot['end_time']
-
-            sessions = self.get_sessions_for_slot(date, start_time, end_time)
-
-            if not sessions:
-                continue
+        slots = [(slot, slot.sessions) for slot in snapshot.slots]
+        self.team_availability(snapshot.slots)
 
-            # Find optimal assignment
-            assignment, value = self.assign_slot_optimal(date, start_time, end_time, sessions)
-
-            all_assignments.append({
-                'slot': f"{date} {start_time}",
-                'assignment': assignment,
-                'value': value
-            })
+        if mode == 'global':
+            from global_scheduler import solve
+            all_assignments = solve(self, slots, **options)
+        else:
+            all_assignments = self.assign_each_slot(slots)
 
+        total_value = 0
+        for (slot, _), slot_data in zip(slots, all_assignments):
+            assignment, value = slot_data['assignment'], slot_data['value']
             total_value += value['total']
 
             # Print high-value slots
-            if value['session_value'] > 150 or value['people_at_sessions'] >= 2:
-                print(f"{date} {start_time}-{end_time}")
+            if value.get('session_value', 0) > 150 or value.get('people_at_sessions', 0) >= 2:
+                print(f"{slot['date']} {slot['start_time']}-{slot['end_time']}")
                 print(f"  Value: {value['total']:.0f} (Booth: {value['booth_value']:+.0f}, Sessions: {value['session_value']:.0f})")
                 print(f"  Booth: {value['people_at_booth']} person(s), Sessions: {value['people_at_sessions']}")
                 for person, session in assignment.items():
                     if session:
-                        person_key = f"{person.split(' ')[0].lower()}_score"
-                        score = session.get(person_key, 0)
+                        score = session['person_scores'].get(person, 0)
                         print(f"    {person.split(' ')[0]}: {session['title'][:50]}... (score: {score:.0f})")
                 print()
 
@@ -306,14 +298,12 @@ class OptimalScheduler:
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
 
-        for slot_data in all_assignments:
-            for person, session in slot_data['assignment'].items():
-                if session:
-                    cursor.execute('''
-                        UPDATE sessions
-                        SET assigned_to = ?
-                        WHERE session_id = ?
-                    ''', (person, session['session_id']))
+        cursor.executemany('''
+            UPDATE sessions
+            SET assigned_to = ?
+            WHERE session_id = ?
+        ''', [(person, session['session_id']) for slot_data in all_assignments
+              for person, session in slot_data['assignment'].items() if session])
 
         conn.commit()
         conn.close()
@@ -335,8 +325,29 @@ class OptimalScheduler:
 
 
 if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Assign the team to sessions and the booth.')
+    parser.add_argument('--global', dest='mode', action='store_const', const='global', default='slot',
+                        help='solve the whole conference as one MIP (needs pulp)')
+    parser.add_argument('--time-limit', type=float, default=60, help='MIP time budget in seconds')
+    parser.add_argument('--max-sessions', type=int, help='most sessions per person')
+    parser.add_argument('--max-booth-shifts', type=int, help='most booth shifts per person')
+    parser.add_argument('--max-per-track', type=int, help='most sessions per person on one topic')
+    parser.add_argument('--must-cover', type=float, help='cover every session with a general score this high')
+    args = parser.parse_args()
+
     scheduler = OptimalScheduler()
-    assignments = scheduler.optimize_schedule()
+    options = {}
+    if args.mode == 'global':
+        options = {
+            'time_limit': args.time_limit,
+            'max_sessions': args.max_sessions,
+            'max_booth_shifts': args.max_booth_shifts,
+            'max_per_track': args.max_per_track,
+            'must_cover_score': args.must_cover,
+        }
+    assignments = scheduler.optimize_schedule(args.mode, **options)
 
     print("\n" + "="*80)
     print("OPTIMIZATION COMPLETE")
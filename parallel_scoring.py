@@ -0,0 +1,182 @@
+"""
+Score large databases across a process pool.
+
+Session ids are sorted and cut into fixed-size shards. Each worker process
+opens its own read-only connection and builds its scorer (with its compiled
+matcher or rules) once, then scores whole shards: it reads the shard's rows,
+skips sessions whose content and config hashes are unchanged, and sends
+back the new scores. The parent process is the only writer, committing one
+transaction per shard in shard order, so the results and the order they
+are written in don't depend on the number of workers.
+
+    uv run python parallel_scoring.py --scorer dual --workers 8
+"""
+import argparse
+import os
+import sqlite3
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from urllib.request import pathname2url
+
+import dual_scorer
+from relevance_scorer import SCORE_UPDATE, SCORED_FIELDS as RELEVANCE_FIELDS, RelevanceScorer
+from score_explanations import ensure_explanation_column, to_json
+from score_hashes import ensure_hash_columns, stale_rows
+from session_scores import SessionScores
+
+
+SCORERS = ('relevance', 'dual')
+
+# Shards in flight per worker; bounds the results held in memory
+SHARDS_PER_WORKER = 2
+
+_worker = None
+
+
+def read_only_connection(db_path):
+    """A connection that can't write, so workers never contend for the write lock."""
+    conn = sqlite3.connect(f'file:{pathname2url(os.path.abspath(db_path))}?mode=ro', uri=True)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+class RelevanceWorker:
+    """RelevanceScorer's base score and explanation, and one personalized score per person."""
+
+    prefix = 'relevance'
+    fields = RELEVANCE_FIELDS
+
+    def __init__(self, people):
+        self.people = people
+        self.scorer = RelevanceScorer(db_path=None)
+
+    def score(self, sessions):
+        return self.scorer.team_scores(sessions, self.people)
+
+
+class DualWorker:
+    """dual_scorer's general score and explanation, and one score per person."""
+
+    prefix = 'dual'
+    fields = dual_scorer.SCORED_FIELDS
+
+    def __init__(self, people):
+        self.people = people
+
+    def score(self, sessions):
+        results = []
+        for session in sessions:
+            (general_score, _, explanation), session_scores = dual_scorer.score_for_team(session, self.people)
+            results.append((general_score, explanation, session_scores))
+        return results
+
+
+WORKERS = {'relevance': RelevanceWorker, 'dual': DualWorker}
+
+
+def init_score_worker(db_path, scorer, people, config, force):
+    """Open the worker's connection and build its scorer, once per process."""
+    global _worker
+    _worker = (read_only_connection(db_path), WORKERS[scorer](people), config, force)
+
+
+def score_shard(session_ids):
+    """
+    Score one shard; returns (updates, person_scores) with updates as
+    (score, explanation, content hash, session_id) rows, for the stale
+    sessions only.
+    """
+    conn, worker, config, force = _worker
+    placeholders = ','.join('?' * len(session_ids))
+    rows = conn.execute(f'''
+        SELECT session_id, {', '.join(worker.fields)},
+               {worker.prefix}_content_hash, {worker.prefix}_config_hash
+        FROM sessions WHERE session_id IN ({placeholders})
+        ORDER BY session_id
+    ''', session_ids).fetchall()
+
+    stale = stale_rows(rows, worker.prefix, config, worker.fields, force)
+    scores = worker.score([dict(row) for row, _ in stale])
+
+    updates = []
+    person_scores = []
+    for (row, digest), (score, explanation, session_scores) in zip(stale, scores):
+        updates.append((score, to_json(explanation), digest, row['session_id']))
+        person_scores.extend((row['session_id'], person, *result) for person, result in session_scores.items())
+    return updates, person_scores
+
+
+def _prepare(conn, db_path, scorer):
+    """Add the scorer's columns and work out its config hash; returns (people, config)."""
+    if scorer == 'dual':
+        dual_scorer.add_score_columns(db_path)
+        people = SessionScores(conn).people()
+        return people, dual_scorer.scoring_config_hash(people)
+    with conn:
+        ensure_hash_columns(conn.cursor(), 'relevance')
+        ensure_explanation_column(conn.cursor(), 'relevance')
+    people = SessionScores(conn).people()
+    return people, RelevanceScorer(db_path=db_path).scoring_config_hash(people)
+
+
+def score_in_parallel(db_path='appam_sessions.db', scorer='dual', workers=None, shard_size=500, force=False):
+    """
+    Rescore every stale session with `scorer` ('relevance' or 'dual')
+    across `workers` processes (default: CPU count).
+
+    Returns {'scored': count, 'shards': count, 'elapsed': seconds}.
+    """
+    if scorer not in SCORERS:
+        raise ValueError(f"Unknown scorer {scorer!r}; expected one of {SCORERS}")
+
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+
+    conn = sqlite3.connect(db_path)
+    people, config = _prepare(conn, db_path, scorer)
+    session_ids = [row[0] for row in conn.execute('SELECT session_id FROM sessions ORDER BY session_id')]
+    shards = [session_ids[i:i + shard_size] for i in range(0, len(session_ids), shard_size)]
+
+    update_sql = SCORE_UPDATE if scorer == 'relevance' else dual_scorer.GENERAL_UPDATE
+    scores = SessionScores(conn)
+    results = {'scored': 0, 'shards': len(shards)}
+
+    def write(shard_result):
+        updates, person_scores = shard_result
+        with conn:
+            cursor = conn.cursor()
+            cursor.executemany(update_sql, [(score, explanation, digest, config, session_id)
+                                            for score, explanation, digest, session_id in updates])
+            if person_scores:
+                scores.write(scorer, person_scores, cursor)
+        results['scored'] += len(updates)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_score_worker,
+                             initargs=(db_path, scorer, people, config, force)) as executor:
+        # Written strictly in shard order, with a bounded number of shards in flight
+        pending = deque()
+        for shard in shards:
+            pending.append(executor.submit(score_shard, shard))
+            if len(pending) >= workers * SHARDS_PER_WORKER:
+                write(pending.popleft().result())
+        while pending:
+            write(pending.popleft().result())
+
+    conn.close()
+    results['elapsed'] = time.perf_counter() - start
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Score sessions across a process pool.')
+    parser.add_argument('--db', default='appam_sessions.db', help='database to score')
+    parser.add_argument('--scorer', choices=SCORERS, default='dual', help='scorer to run')
+    parser.add_argument('--workers', type=int, help='scoring processes (default: CPU count)')
+    parser.add_argument('--shard-size', type=int, default=500, help='sessions per shard')
+    parser.add_argument('--force', action='store_true', help='rescore unchanged sessions too')
+    args = parser.parse_args()
+
+    results = score_in_parallel(args.db, args.scorer, args.workers, args.shard_size, args.force)
+    print(f"✓ Scored {results['scored']} sessions in {results['shards']} shards "
+          f"({results['elapsed']:.1f}s)")
@@ -0,0 +1,210 @@
+"""
+Staged scraping pipeline: fetch -> parse -> write.
+
+Each stage runs on its own so a slow stage only backs up its input queue:
+
+- fetch: the async engine's workers load pages into a bounded queue
+- parse: a process pool turns HTML into session dicts
+- write: one thread owns a SQLite connection and writes sessions in
+  batches through SessionWriter
+
+Queue depths and per-stage throughput are printed while the pipeline runs
+and returned with the results.
+"""
+import asyncio
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from async_scraper import SessionQueue
+from reparse import PARSERS, init_parse_worker, parse_row
+from scrape_status import ScrapeStatus
+from session_writer import SessionWriter
+
+
+class StageStats:
+    """Items through one pipeline stage, for throughput reports."""
+
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+        self.started = time.perf_counter()
+
+    @property
+    def rate(self):
+        elapsed = time.perf_counter() - self.started
+        return self.count / elapsed if elapsed > 0 else 0.0
+
+    def summary(self):
+        return {'count': self.count, 'per_second': self.rate}
+
+
+class SessionPipeline:
+    """
+    Scrape sessions through separate fetch, parse and write stages.
+
+    `engine` is an open AsyncSessionScraper with a ScrapeStatus; its cache
+    and known_ids decide which pages are unchanged. `parser` names the
+    extraction logic ('scraper' or 'working', as in reparse.py) and
+    `validate(session_data)` may raise to reject a parsed page.
+    """
+
+    def __init__(self, engine, db_path, parser='scraper', html_parser=None, parse_workers=2,
+                 queue_size=100, batch_size=50, validate=None, report_interval=10.0):
+        if parser not in PARSERS:
+            raise ValueError(f"Unknown parser {parser!r}; expected one of {PARSERS}")
+        self.engine = engine
+        self.db_path = db_path
+        self.parser = parser
+        self.html_parser = html_parser
+        self.parse_workers = max(1, parse_workers)
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.validate = validate
+        self.report_interval = report_interval
+
+    def _fail(self, results, session_id, error):
+        results['errors'].append((session_id, error))
+        self.engine.status.record_failure(session_id, error)
+        print(f"✗ Error scraping session {session_id}: {error[:80]}", flush=True)
+
+    def _write_loop(self, write_queue, results, stats):
+        """Writer thread: batch parsed sessions into the database until None arrives."""
+        conn = sqlite3.connect(self.db_path)
+        status = ScrapeStatus(conn)
+        writer = SessionWriter(conn, batch_size=self.batch_size, status=status)
+
+        finished = False
+        while not finished:
+            batch = [write_queue.get()]
+            # Take whatever else is already waiting, up to a full batch
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(write_queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in batch:
+                finished = True
+                batch = [session_data for session_data in batch if session_data is not None]
+            if not batch:
+                continue
+
+            try:
+                writer.write_batch(batch)
+            except Exception as e:
+                for session_data in batch:
+                    results['errors'].append((session_data['session_id'], str(e)))
+                    status.record_failure(session_data['session_id'], str(e))
+                print(f"✗ Could not write {len(batch)} sessions: {e}", flush=True)
+                continue
+
+            results['saved'] += len(batch)
+            stats.count += len(batch)
+            for session_data in batch:
+                print(f"[{stats.count}] ✓ {session_data['title'][:70]}", flush=True)
+
+        conn.close()
+
+    async def run(self, session_ids):
+        """
+        Scrape a list or SessionQueue of IDs through all three stages.
+
+        Returns {'saved', 'unchanged', 'errors'} like
+        AsyncSessionScraper.scrape_sessions, plus 'stages' with each
+        stage's count and items/second. If a stage dies (not a page
+        failing, but say the parse pool breaking), the other stages are
+        stopped and its error is raised.
+        """
+        if isinstance(session_ids, SessionQueue):
+            ids = session_ids
+        else:
+            ids = SessionQueue(session_ids)
+            ids.close()
+
+        loop = asyncio.get_running_loop()
+        results = {'saved': 0, 'unchanged': 0, 'errors': []}
+        stats = {name: StageStats(name) for name in ('fetch', 'parse', 'write')}
+        parse_queue = asyncio.Queue(maxsize=self.queue_size)
+        write_queue = queue.Queue(maxsize=self.queue_size)
+
+        writer_thread = threading.Thread(target=self._write_loop, args=(write_queue, results, stats['write']),
+                                         name='session-writer', daemon=True)
+        writer_thread.start()
+
+        async def fetcher():
+            while (session_id := await ids.get()) is not None:
+                try:
+                    html = await self.engine.fetch_session(session_id)
+                except Exception as e:
+                    self._fail(results, session_id, str(e))
+                    continue
+                stats['fetch'].count += 1
+                if html is None:
+                    results['unchanged'] += 1
+                    self.engine.status.record_success(session_id)
+                    continue
+                # Waits here when the parsers fall behind
+                await parse_queue.put((session_id, html))
+
+        async def parser(executor):
+            while (item := await parse_queue.get()) is not None:
+                session_id, html = item
+                _, session_data, error = await loop.run_in_executor(executor, parse_row, item)
+                if error is None and self.validate is not None:
+                    try:
+                        self.validate(session_data)
+                    except Exception as e:
+                        error = str(e)
+                if error is not None:
+                    self._fail(results, session_id, error)
+                    continue
+                stats['parse'].count += 1
+                session_data['raw_html'] = html
+                # A full write queue blocks a helper thread, not the event loop
+                await loop.run_in_executor(None, write_queue.put, session_data)
+
+        async def report():
+            while True:
+                await asyncio.sleep(self.report_interval)
+                print(self.progress(stats, parse_queue.qsize(), write_queue.qsize()), flush=True)
+
+        reporter = asyncio.create_task(report())
+        try:
+            with ProcessPoolExecutor(max_workers=self.parse_workers, initializer=init_parse_worker,
+                                     initargs=(self.parser, self.html_parser)) as executor:
+                parsers = [asyncio.create_task(parser(executor)) for _ in range(self.parse_workers)]
+
+                async def fetch_all():
+                    await asyncio.gather(*(fetcher() for _ in range(self.engine.concurrency)))
+                    for _ in parsers:
+                        await parse_queue.put(None)
+
+                # A parser that dies (say, with BrokenProcessPool) would leave
+                # the fetchers waiting on a full parse queue forever, so stop
+                # every stage at the first error and raise it
+                tasks = [asyncio.create_task(fetch_all()), *parsers]
+                done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+                for task in done:
+                    if task.exception() is not None:
+                        raise task.exception()
+        finally:
+            reporter.cancel()
+            await loop.run_in_executor(None, write_queue.put, None)
+            await loop.run_in_executor(None, writer_thread.join)
+
+        print(self.progress(stats, parse_queue.qsize(), write_queue.qsize()), flush=True)
+        results['stages'] = {name: stage.summary() for name, stage in stats.items()}
+        return results
+
+    @staticmethod
+    def progress(stats, parse_depth, write_depth):
+        """One line of per-stage throughput and queue depth."""
+        fetch, parse, write = stats['fetch'], stats['parse'], stats['write']
+        return (f"  fetched {fetch.count} ({fetch.rate:.1f}/s) -> parse queue {parse_depth} -> "
+                f"parsed {parse.count} ({parse.rate:.1f}/s) -> write queue {write_depth} -> "
+                f"written {write.count} ({write.rate:.1f}/s)")
@@ -1,10 +1,34 @@
 """
 Session Relevance Scoring
 Scores conference sessions based on relevance to PolicyEngine's work.
+
+Each score is stored with an explanation (the keywords matched, with
+counts, and those in the title) in relevance_explanation. Each team
+member's personalized score goes to session_scores (scorer 'relevance'),
+explained by the base score, the interest modifier applied and the
+interest terms that matched.
 """
 import sqlite3
 import json
-import re
+from functools import lru_cache
+
+from keyword_matcher import KeywordMatcher
+from score_explanations import ensure_explanation_column, to_json
+from score_hashes import config_hash, ensure_hash_columns, stale_rows
+from session_scores import SessionScores
+
+
+# session_scores.scorer for personalized relevance scores
+RELEVANCE_SCORER = 'relevance'
+
+# Session fields a relevance score depends on
+SCORED_FIELDS = ('title', 'description', 'chair', 'papers')
+
+SCORE_UPDATE = '''
+    UPDATE sessions
+    SET relevance_score = ?, relevance_explanation = ?, relevance_content_hash = ?, relevance_config_hash = ?
+    WHERE session_id = ?
+'''
 
 
 class RelevanceScorer:
@@ -135,9 +159,22 @@ class RelevanceScorer:
             }
         }
 
-    def score_session(self, session_data):
-        """Calculate relevance score for a session."""
-        # Combine all text fields
+        # Compiled on first use from the keyword tables above
+        self._matcher = None
+        self._scan = None
+
+    def _keyword_matches(self, full_text):
+        """Scan text for every scoring and interest keyword at once."""
+        keywords = [keyword.lower() for keyword in self.keywords]
+        keywords += [keyword.lower() for interests in self.person_interests.values() for keyword in interests]
+        # Recompile only if the keyword tables were edited
+        if self._matcher is None or self._matcher.keywords != list(dict.fromkeys(keywords)):
+            self._matcher = KeywordMatcher(keywords)
+            self._scan = lru_cache(maxsize=256)(self._matcher.scan)
+        return self._scan(full_text)
+
+    def session_text(self, session_data):
+        """All of a session's text, lowercased; the title comes first."""
         text_fields = [
             session_data.get('title', ''),
             session_data.get('description', ''),
@@ -154,7 +191,13 @@ class RelevanceScorer:
                 text_fields.append(str(papers))
 
         # Combine and lowercase all text
-        full_text = ' '.join(text_fields).lower()
+        return ' '.join(text_fields).lower()
+
+    def score_session(self, session_data):
+        """Calculate relevance score for a session."""
+        full_text = self.session_text(session_data)
+        matches = self._keyword_matches(full_text)
+        title_end = len(session_data.get('title', '').lower())
 
         # Calculate base score
         score = 0
@@ -162,7 +205,7 @@ class RelevanceScorer:
 
         for keyword, weight in self.keywords.items():
             # Count occurrences (with diminishing returns)
-            count = len(re.findall(r'\b' + re.escape(keyword.lower()) + r'\b', full_text))
+            count = matches.count(keyword.lower())
             if count > 0:
                 # Diminishing returns: 1st occurrence full weight, 2nd half, 3rd third, etc.
                 keyword_score = sum(weight / (i + 1) for i in range(min(count, 3)))
@@ -170,14 +213,24 @@ class RelevanceScorer:
                 matched_keywords.append((keyword, count, keyword_score))
 
         # Bonus for title matches (title is more important)
-        title = session_data.get('title', '').lower()
+        title_keywords = []
         for keyword, weight in self.keywords.items():
-            if keyword.lower() in title:
+            if matches.occurs_before(keyword.lower(), title_end):
                 score += weight * 0.5  # 50% bonus for title appearance
+                title_keywords.append(keyword.lower())
 
         return {
             'score': round(score, 2),
-            'matched_keywords': matched_keywords
+            'matched_keywords': matched_keywords,
+            'title_keywords': title_keywords,
+        }
+
+    @staticmethod
+    def explanation(result):
+        """The compact explanation stored for a score_session result."""
+        return {
+            'terms': {keyword.lower(): count for keyword, count, _ in result['matched_keywords']},
+            'title': result['title_keywords'],
         }
 
     def score_for_person(self, session_data, person_name):
@@ -189,15 +242,20 @@ class RelevanceScorer:
         if person_name not in self.person_interests:
             return base_result
 
-        full_text = ' '.join([
+        # Title and description lead the session text, so the interests
+        # are looked up in the scan score_session already made (and cached)
+        matches = self._keyword_matches(self.session_text(session_data))
+        text_end = len(' '.join([
             session_data.get('title', ''),
             session_data.get('description', ''),
-        ]).lower()
+        ]).lower())
 
         modifier = 1.0
+        interest_keywords = []
         for keyword, multiplier in self.person_interests[person_name].items():
-            if keyword.lower() in full_text:
+            if matches.occurs_before(keyword.lower(), text_end):
                 modifier = max(modifier, multiplier)
+                interest_keywords.append(keyword.lower())
 
         personalized_score = base_score * modifier
 
@@ -205,36 +263,134 @@ class RelevanceScorer:
             'score': round(personalized_score, 2),
             'base_score': base_score,
             'modifier': modifier,
-            'matched_keywords': base_result['matched_keywords']
+            'matched_keywords': base_result['matched_keywords'],
+            'interest_keywords': interest_keywords,
         }
 
-    def score_all_sessions(self):
-        """Score all sessions in the database."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-
-        cursor.execute('SELECT * FROM sessions')
-        sessions = cursor.fetchall()
+    @staticmethod
+    def person_explanation(result):
+        """The compact explanation stored for a score_for_person result."""
+        return {
+            'base': result.get('base_score', result['score']),
+            'modifier': result.get('modifier', 1.0),
+            'terms': result.get('interest_keywords', []),
+        }
 
-        print(f"Scoring {len(sessions)} sessions...")
+    def scoring_config_hash(self, people=()):
+        """
+        Version of the scoring config: keyword weights, interests, the team
+        scored for, and the scoring and explanation code, including
+        bulk_scoring's when numpy is installed.
+        """
+        try:
+            import bulk_scoring
+        except ImportError:
+            # numpy isn't installed; only the methods below score
+            bulk_scoring = None
+        return config_hash(list(self.keywords.items()), self.person_interests, list(people),
+                           self.score_session, self.score_for_person, self.session_text,
+                           self.explanation, self.person_explanation, bulk_scoring)
+
+    def score_many(self, sessions):
+        """Base scores for a list of session dicts, all at once when numpy is installed."""
+        if not sessions:
+            return []
+        try:
+            from bulk_scoring import BulkScorer
+        except ImportError:
+            # numpy isn't installed; score one session at a time
+            return [self.score_session(session)['score'] for session in sessions]
+        bulk = BulkScorer(self)
+        return bulk.scores(bulk.index(sessions)).tolist()
+
+    def explained_scores(self, sessions):
+        """(score, explanation) for a list of session dicts, like score_many."""
+        if not sessions:
+            return []
+        try:
+            from bulk_scoring import BulkScorer
+        except ImportError:
+            results = [self.score_session(session) for session in sessions]
+            return [(result['score'], self.explanation(result)) for result in results]
+        bulk = BulkScorer(self)
+        index = bulk.index(sessions)
+        return list(zip(bulk.scores(index).tolist(), bulk.explanations(index)))
+
+    def team_scores(self, sessions, people):
+        """
+        (score, explanation, {person: (score, rationale, explanation)}) for
+        a list of session dicts: the base score and each person's
+        personalized one, all at once when numpy is installed.
+        """
+        if not sessions:
+            return []
+        try:
+            from bulk_scoring import BulkScorer
+        except ImportError:
+            results = []
+            for session in sessions:
+                base = self.score_session(session)
+                personal = {person: self.score_for_person(session, person) for person in people}
+                results.append((base['score'], self.explanation(base), {
+                    person: (result['score'], None, self.person_explanation(result))
+                    for person, result in personal.items()
+                }))
+            return results
+        bulk = BulkScorer(self)
+        index = bulk.index(sessions)
+        base = bulk.scores(index)
+        personal = {person: bulk.person_explanations(index, person, base) for person in people}
+        return [
+            (score, explanation, {person: personal[person][i] for person in people})
+            for i, (score, explanation) in enumerate(zip(base.tolist(), bulk.explanations(index)))
+        ]
 
-        for session in sessions:
-            session_dict = dict(session)
-            result = self.score_session(session_dict)
+    def score_all_sessions(self, force=False):
+        """
+        Score the sessions in the database whose text or scoring config
+        changed since they were last scored (all of them with force=True).
 
-            cursor.execute('''
-                UPDATE sessions
-                SET relevance_score = ?
-                WHERE session_id = ?
-            ''', (result['score'], session['session_id']))
+        Returns how many sessions were rescored.
+        """
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        ensure_hash_columns(cursor, 'relevance')
+        ensure_explanation_column(cursor, 'relevance')
+        scores = SessionScores(conn)
+        people = scores.people()
 
-            if result['score'] > 10:  # Show high-scoring sessions
-                print(f"  High score ({result['score']}): {session['title'][:60]}...")
+        # Only the fields score_session reads, and the hashes of the last scoring
+        cursor.execute('''
+            SELECT session_id, title, description, chair, papers,
+                   relevance_content_hash, relevance_config_hash
+            FROM sessions
+        ''')
+        rows = cursor.fetchall()
+        config = self.scoring_config_hash(people)
+        stale = stale_rows(rows, 'relevance', config, SCORED_FIELDS, force)
+        sessions = [dict(row) for row, _ in stale]
+
+        print(f"Scoring {len(sessions)} sessions ({len(rows) - len(sessions)} unchanged, skipped)...")
+        results = self.team_scores(sessions, people)
+
+        cursor.executemany(SCORE_UPDATE, [
+            (score, to_json(explanation), digest, config, row['session_id'])
+            for (row, digest), (score, explanation, _) in zip(stale, results)
+        ])
+        scores.write(RELEVANCE_SCORER, [
+            (row['session_id'], person, *result)
+            for (row, _), (_, _, person_scores) in zip(stale, results) for person, result in person_scores.items()
+        ], cursor)
+
+        for session, (score, _, _) in zip(sessions, results):
+            if score > 10:  # Show high-scoring sessions
+                print(f"  High score ({score}): {session['title'][:60]}...")
 
         conn.commit()
         conn.close()
         print("✓ Scoring complete!")
+        return len(sessions)
 
     def get_top_sessions(self, limit=20, person=None):
         """Get top-scored sessions, optionally filtered by person."""
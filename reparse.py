@@ -0,0 +1,124 @@
+"""
+Rebuild parsed session data from the session pages stored in the database.
+
+Applies parser changes to the whole corpus without a browser or network:
+stored pages are parsed across a process pool and the results written
+back in batched transactions. Scores and assignments are left untouched.
+"""
+import argparse
+import os
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from html_parsing import BACKENDS
+from html_store import HtmlStore
+from scraper import APPAMScraper
+from session_writer import SessionWriter
+
+
+# Parser used by each scraper; pick the one that produced the stored HTML
+PARSERS = ('scraper', 'working')
+
+_parse_html = None
+
+
+def init_parse_worker(parser_name, html_parser=None):
+    """Set up the parse function once per worker process (also used by pipeline.py)."""
+    global _parse_html
+    if parser_name == 'working':
+        from scrape_working import parse_session_html
+        _parse_html = partial(parse_session_html, backend=html_parser)
+    else:
+        _parse_html = APPAMScraper(html_parser=html_parser).parse_session_html
+
+
+def parse_row(row):
+    """Parse one (session_id, raw_html) row; returns (session_id, data, error)."""
+    session_id, html = row
+    try:
+        session_data = _parse_html(session_id, html)
+    except Exception as e:
+        return session_id, None, str(e)
+
+    # The caller already has the HTML; don't ship it back across processes
+    session_data['raw_html'] = None
+    return session_id, session_data, None
+
+
+def iter_html_batches(conn, batch_size):
+    """Yield lists of (session_id, raw_html) rows, one batch in memory at a time."""
+    return HtmlStore(conn).iter_batches(batch_size)
+
+
+def reparse_database(db_path='appam_sessions.db', parser='scraper', workers=None, batch_size=200,
+                     html_parser=None):
+    """
+    Re-run the extraction logic over every stored page.
+
+    `html_parser` picks the HTML parsing backend (default: fastest installed).
+
+    Returns {'parsed': count, 'skipped': count, 'errors': [(session_id, message), ...]}.
+    Pages that parse without a title are skipped so a bad parse never
+    blanks out an existing row.
+    """
+    if parser not in PARSERS:
+        raise ValueError(f"Unknown parser {parser!r}; expected one of {PARSERS}")
+
+    # Make sure related tables exist for older databases
+    APPAMScraper(db_path=db_path).init_database()
+
+    workers = workers or os.cpu_count() or 1
+    results = {'parsed': 0, 'skipped': 0, 'errors': []}
+    start = time.perf_counter()
+
+    conn = sqlite3.connect(db_path)
+    writer = SessionWriter(conn)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_parse_worker,
+                             initargs=(parser, html_parser)) as executor:
+        for rows in iter_html_batches(conn, batch_size):
+            chunksize = max(1, len(rows) // (workers * 4))
+            parsed = list(executor.map(parse_row, rows, chunksize=chunksize))
+
+            sessions = []
+            for session_id, session_data, error in parsed:
+                if error:
+                    results['errors'].append((session_id, error))
+                elif not session_data['title']:
+                    results['skipped'] += 1
+                else:
+                    sessions.append(session_data)
+
+            # One transaction per batch
+            writer.write_batch(sessions)
+            results['parsed'] += len(sessions)
+
+            print(f"  Re-parsed {results['parsed'] + results['skipped'] + len(results['errors'])} pages...",
+                  flush=True)
+
+    conn.close()
+
+    results['elapsed'] = time.perf_counter() - start
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Re-parse stored session HTML without scraping.')
+    parser.add_argument('--db', default='appam_sessions.db', help='database to re-parse')
+    parser.add_argument('--parser', choices=PARSERS, default='scraper',
+                        help='extraction logic to apply (scraper.py or scrape_working.py)')
+    parser.add_argument('--workers', type=int, help='parser processes (default: CPU count)')
+    parser.add_argument('--batch-size', type=int, default=200, help='sessions per write transaction')
+    parser.add_argument('--html-parser', choices=BACKENDS,
+                        help='HTML parsing backend (default: fastest installed)')
+    args = parser.parse_args()
+
+    print(f"Re-parsing stored HTML in {args.db} with the {args.parser} parser...")
+    results = reparse_database(args.db, args.parser, args.workers, args.batch_size, args.html_parser)
+
+    print(f"\n✓ Re-parsed {results['parsed']} sessions in {results['elapsed']:.1f}s "
+          f"({results['skipped']} without a title, {len(results['errors'])} errors)")
+    for session_id, error in results['errors'][:10]:
+        print(f"  ✗ {session_id}: {error[:80]}")
@@ -0,0 +1,258 @@
+"""
+Declarative scoring rules, compiled into one evaluator.
+
+A rule file (see rules/) lists rules in priority order, and the first rule
+whose conditions hold gives the score:
+
+    {"when": ["snap", ["work requirement", "eligibility"]],
+     "score": 85, "rationale": "SNAP policy analysis"}
+
+`when` holds conditions that must all be true. Each condition is a term, or
+a list of terms of which any one will do. `unless` lists terms that rule the
+match out. A term is found when it occurs anywhere in the text, as
+`term in text` would find it. A rule without `when` always matches.
+
+Person rules may adjust the general score instead of replacing it:
+`"add": 10, "max": 100` gives min(100, general + 10), and `"min"` clamps
+from below.
+
+A file has a `general` rule list and, optionally, a `people` mapping with one
+rule list per team member. When none of a person's rules match, their
+`default` rules apply, or else the general score. To add a team member or a
+rule, edit the file; no Python changes are needed.
+
+Compiling gives every distinct term one bit, and hits() finds them all in
+one pass: the text is split on whitespace, and a term without whitespace
+occurs in the text exactly when it occurs within one of its words. Each
+distinct word's bits are worked out the first time it is seen and cached,
+so texts cost a split and a dictionary lookup per distinct word. Terms with
+spaces are confirmed with `term in text`, and only when each of their words
+was found. Rules are then mask tests on the hits bitset, and the rule that
+decides each (hits, person) is remembered.
+"""
+import json
+import os
+from functools import reduce
+from operator import or_
+
+
+RULES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'rules')
+
+RULE_KEYS = {'when', 'unless', 'score', 'add', 'min', 'max', 'rationale'}
+
+# Bounds on the word and decision caches, which otherwise grow with the text seen
+MAX_CACHED_WORDS = 200_000
+MAX_CACHED_DECISIONS = 100_000
+
+
+class WordBits(dict):
+    """
+    word -> bits of the whitespace-free terms it contains, worked out the
+    first time a word is looked up.
+    """
+
+    __slots__ = ('terms',)
+
+    def __init__(self, terms):
+        super().__init__()
+        self.terms = terms  # (term, bit) pairs
+
+    def __missing__(self, word):
+        mask = 0
+        for term, bit in self.terms:
+            if term in word:
+                mask |= bit
+        if len(self) < MAX_CACHED_WORDS:
+            self[word] = mask
+        return mask
+
+
+class Rule:
+    """One compiled rule: its conditions as term bits, and what it scores."""
+
+    __slots__ = ('conditions', 'excluded', 'score', 'add', 'floor', 'ceiling', 'rationale')
+
+    def __init__(self, spec, bits):
+        unknown = set(spec) - RULE_KEYS
+        if unknown:
+            raise ValueError(f"Unknown rule keys {sorted(unknown)} in {spec!r}")
+        if ('score' in spec) == ('add' in spec):
+            raise ValueError(f"A rule needs exactly one of 'score' or 'add': {spec!r}")
+
+        self.conditions = [_compile_terms(_as_list(condition), bits) for condition in spec.get('when', [])]
+        self.excluded = _compile_terms(_as_list(spec.get('unless', [])), bits)[1]
+
+        self.score = spec.get('score')
+        self.add = spec.get('add')
+        self.floor = spec.get('min')
+        self.ceiling = spec.get('max')
+        self.rationale = spec.get('rationale', '')
+
+    @property
+    def always(self):
+        return not (self.conditions or self.excluded)
+
+    def matches(self, hits):
+        for _, mask in self.conditions:
+            if not hits & mask:
+                return False
+        return not hits & self.excluded
+
+    def found(self, hits):
+        """The rule's `when` terms found in the text (those that made it match)."""
+        return [term for terms, _ in self.conditions for term, bit in terms if hits & bit]
+
+    def result(self, general):
+        if self.score is not None:
+            return (self.score, self.rationale)
+        score = general + self.add
+        if self.floor is not None:
+            score = max(self.floor, score)
+        if self.ceiling is not None:
+            score = min(self.ceiling, score)
+        return (score, self.rationale)
+
+
+def _terms(spec):
+    for condition in spec.get('when', []):
+        yield from _as_list(condition)
+    yield from _as_list(spec.get('unless', []))
+
+
+def _as_list(terms):
+    return [terms] if isinstance(terms, str) else terms
+
+
+def _compile_terms(terms, bits):
+    pairs = tuple((term, bits[term]) for term in terms)
+    mask = 0
+    for _, bit in pairs:
+        mask |= bit
+    return pairs, mask
+
+
+class RuleEngine:
+    """A rule file compiled for scoring many texts."""
+
+    def __init__(self, spec):
+        self.spec = spec
+        rule_lists = [spec.get('general', []), spec.get('default', []), *spec.get('people', {}).values()]
+
+        self.terms = list(dict.fromkeys(term for rules in rule_lists for rule in rules for term in _terms(rule)))
+        if not all(isinstance(term, str) and term for term in self.terms):
+            raise ValueError("Rule terms must be non-empty strings")
+        bits = {term: 1 << i for i, term in enumerate(self.terms)}
+
+        # Terms with whitespace are checked when all their words are found;
+        # those words get bits of their own after the rule terms'
+        word_bits = {term: bit for term, bit in bits.items() if term.split() == [term]}
+        next_bit = 1 << len(self.terms)
+        self._phrases = []
+        for term in self.terms:
+            if term in word_bits:
+                continue
+            words = 0
+            for word in term.split():
+                if word not in word_bits:
+                    word_bits[word] = next_bit
+                    next_bit <<= 1
+                words |= word_bits[word]
+            self._phrases.append((term, bits[term], words))
+        self._term_mask = (1 << len(self.terms)) - 1
+        self._word_bits = WordBits(list(word_bits.items()))
+        self._decisions = {}
+
+        self.general = [Rule(rule, bits) for rule in spec.get('general', [])]
+        if not self.general or not self.general[-1].always:
+            raise ValueError("General rules must end with a rule that always matches")
+        if any(rule.add is not None for rule in self.general):
+            raise ValueError("General rules must give a score, not adjust one")
+
+        self.default = [Rule(rule, bits) for rule in spec.get('default', [])]
+        if self.default and not self.default[-1].always:
+            raise ValueError("Default rules must end with a rule that always matches")
+        self.people = {
+            person: [Rule(rule, bits) for rule in rules]
+            for person, rules in spec.get('people', {}).items()
+        }
+
+    @classmethod
+    def load(cls, path):
+        """Compile a JSON rule file."""
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def hits(self, text):
+        """
+        The bitset of rule terms that occur in a text, shared by the general
+        and all person scores.
+        """
+        hits = reduce(or_, map(self._word_bits.__getitem__, set(text.split())), 0)
+        for term, bit, words in self._phrases:
+            if hits & words == words and term in text:
+                hits |= bit
+        return hits & self._term_mask
+
+    def _match(self, hits, person=None):
+        """
+        (rule list, position, rule) of the rule that decides a score: the
+        first general rule, or a person's first rule then the default
+        rules; None if a person falls back to the general score.
+        """
+        key = (hits, person)
+        try:
+            return self._decisions[key]
+        except KeyError:
+            pass
+        lists = [('general', self.general)] if person is None else [
+            (person, self.people.get(person, ())), ('default', self.default),
+        ]
+        match = None
+        for name, rules in lists:
+            for position, rule in enumerate(rules):
+                for _, mask in rule.conditions:
+                    if not hits & mask:
+                        break
+                else:
+                    if not hits & rule.excluded:
+                        match = (name, position, rule)
+                        break
+            if match:
+                break
+        if len(self._decisions) < MAX_CACHED_DECISIONS:
+            self._decisions[key] = match
+        return match
+
+    def score(self, hits):
+        """(score, rationale) from the general rules, given hits()."""
+        return self._match(hits)[2].result(None)
+
+    def score_for_person(self, hits, person, general=None):
+        """
+        (score, rationale) from a person's rules, then the default rules;
+        pass the general (score, rationale) if it's already known.
+        """
+        if general is None:
+            general = self.score(hits)
+        match = self._match(hits, person)
+        return general if match is None else match[2].result(general[0])
+
+    def explain(self, hits, person=None, general=None):
+        """
+        score() or, given a person, score_for_person(), as (score,
+        rationale, explanation): the rule that fired ('list/position'),
+        the terms it matched and, for rules that adjust the general
+        score, that score and the adjustment. Pass the general
+        (score, rationale, explanation) if it's already known.
+        """
+        if person is not None and general is None:
+            general = self.explain(hits)
+        match = self._match(hits, person)
+        if match is None:
+            return general
+        name, position, rule = match
+        score, rationale = rule.result(None if general is None else general[0])
+        explanation = {'rule': f'{name}/{position}', 'terms': rule.found(hits)}
+        if rule.add is not None:
+            explanation.update(base=general[0], modifier=rule.add)
+        return score, rationale, explanation
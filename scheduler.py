@@ -3,48 +3,43 @@ Conference Scheduler
 Assigns people to sessions while ensuring booth coverage.
 """
 import sqlite3
-from datetime import datetime, timedelta
 from collections import defaultdict
-from relevance_scorer import RelevanceScorer
+from availability import Availability
+from conference_snapshot import ConferenceSnapshot
+from relevance_scorer import RELEVANCE_SCORER
+from time_utils import TIME_SLOTS_QUERY, ensure_time_columns, slot_condition, timestamp, to_datetime
 
 
 class ConferenceScheduler:
     def __init__(self, db_path='appam_sessions.db'):
         self.db_path = db_path
-        self.scorer = RelevanceScorer(db_path)
         self.people = ['Max Ghenis', 'Pavel Makarchuk', 'Daphne Hansell']
 
-        # Arrival times (None means available from start)
-        self.arrival_times = {
-            'Max Ghenis': ('2025-11-13', '11:30am'),  # Arrives 11:30am Thursday
-            'Pavel Makarchuk': None,  # Available from start
-            'Daphne Hansell': None    # Available from start
+        # Availability constraints, as in OptimalScheduler (see availability.py)
+        self.availability = {
+            'Max Ghenis': {'start': ('2025-11-13', '11:30am')},  # Arrives 11:30am Thursday
+            # Pavel and Daphne are available from the start
         }
+        self._availability = None
+
+    def team_availability(self, slots=()):
+        """The team's availability as a person x slot matrix (see OptimalScheduler.team_availability)."""
+        compiled = self._availability
+        if compiled is None or compiled.constraints is not self.availability or compiled.people != self.people:
+            compiled = self._availability = Availability(self.people, self.availability)
+        return compiled.add_slots(slots)
 
     def is_available(self, person, date, start_time):
         """Check if a person is available for a session at given date/time."""
-        if self.arrival_times.get(person) is None:
-            return True
-
-        arrival_date, arrival_time = self.arrival_times[person]
-
-        # Convert to datetime for comparison
-        try:
-            session_dt = datetime.strptime(f"{date} {start_time}", "%Y-%m-%d %I:%M%p")
-            arrival_dt = datetime.strptime(f"{arrival_date} {arrival_time}", "%Y-%m-%d %I:%M%p")
-            return session_dt >= arrival_dt
-        except:
-            return True  # If parsing fails, assume available
+        return self.team_availability().is_available(person, date, start_time)
 
     def parse_time(self, date_str, time_str):
         """Parse date and time strings into datetime object."""
-        try:
-            # Combine date and time
-            datetime_str = f"{date_str} {time_str}"
-            return datetime.strptime(datetime_str, "%Y-%m-%d %I:%M %p")
-        except Exception as e:
-            print(f"Error parsing time: {date_str} {time_str} - {e}")
+        ts = timestamp(date_str, time_str)
+        if ts is None:
+            print(f"Error parsing time: {date_str} {time_str}")
             return None
+        return to_datetime(ts)
 
     def get_time_slots(self):
         """Get all unique time slots from sessions."""
@@ -52,12 +47,8 @@ class ConferenceScheduler:
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
 
-        cursor.execute('''
-            SELECT DISTINCT date, start_time, end_time
-            FROM sessions
-            WHERE date != '' AND start_time != ''
-            ORDER BY date, start_time
-        ''')
+        ensure_time_columns(conn)
+        cursor.execute(TIME_SLOTS_QUERY)
 
         slots = [dict(row) for row in cursor.fetchall()]
         conn.close()
@@ -70,18 +61,30 @@ class ConferenceScheduler:
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
 
-        cursor.execute('''
-            SELECT *
+        ensure_time_columns(conn)
+        condition, params = slot_condition(date, start_time, end_time)
+        cursor.execute(f'''
+            SELECT session_id, title, date, start_time, end_time, location,
+                   description, chair, papers, relevance_score, assigned_to
             FROM sessions
-            WHERE date = ? AND start_time = ? AND end_time = ?
+            WHERE {condition}
             ORDER BY relevance_score DESC
-        ''', (date, start_time, end_time))
+        ''', params)
 
         sessions = [dict(row) for row in cursor.fetchall()]
         conn.close()
 
         return sessions
 
+    def load_snapshot(self):
+        """
+        Every slot's sessions, by relevance, with each person's stored
+        personalized relevance score (see RelevanceScorer.score_all_sessions),
+        from one query. Unscored people get the session's relevance score.
+        """
+        return ConferenceSnapshot.load(self.db_path, self.people, scorer=RELEVANCE_SCORER, order_by='relevance_score',
+                                       fallback='relevance_score')
+
     def assign_sessions(self, strategy='greedy'):
         """
         Assign people to sessions using specified strategy.
@@ -98,43 +101,25 @@ class ConferenceScheduler:
         cursor.execute('UPDATE sessions SET assigned_to = NULL')
         conn.commit()
 
-        # Get all time slots
-        time_slots = self.get_time_slots()
+        # All time slots and their sessions, and who is there for each
+        snapshot = self.load_snapshot()
+        availability = self.team_availability(snapshot.slots)
 
         assignments = defaultdict(list)  # person -> list of sessions
         booth_coverage = {}  # time_slot -> person at booth
+        saved = []  # (person, session_id)
 
-        for slot in time_slots:
+        for slot in snapshot.slots:
             date = slot['date']
             start_time = slot['start_time']
-            end_time = slot['end_time']
             slot_key = f"{date} {start_time}"
-
-            sessions = self.get_sessions_for_slot(date, start_time, end_time)
-
-            if not sessions:
-                continue
+            sessions = slot.sessions
 
             # Determine who attends which session
             # We need to ensure at least one person is at the booth
             session_assignments = {}  # session_id -> person
 
             if strategy == 'personalized':
-                # Score each session for each person
-                person_session_scores = {}
-                for person in self.people:
-                    person_session_scores[person] = []
-                    for session in sessions:
-                        score_result = self.scorer.score_for_person(session, person)
-                        person_session_scores[person].append({
-                            'session_id': session['session_id'],
-                            'title': session['title'],
-                            'score': score_result['score'],
-                            'session': session
-                        })
-                    # Sort by score
-                    person_session_scores[person].sort(key=lambda x: x['score'], reverse=True)
-
                 # Assign top session for each person, ensuring booth coverage
                 # With 3 people, we can send up to 2 to sessions (1 at booth)
                 num_to_assign = min(len(sessions), 2)  # At most 2 people to sessions
@@ -146,16 +131,13 @@ class ConferenceScheduler:
                 potential_assignments = []
                 for person in self.people:
                     # Check if person is available for this time slot
-                    if not self.is_available(person, date, start_time):
+                    if not availability.is_available(person, date, start_time):
                         continue
 
-                    if person_session_scores[person]:
-                        top_session = person_session_scores[person][0]
-                        potential_assignments.append((
-                            person,
-                            top_session['session'],
-                            top_session['score']
-                        ))
+                    # Their top-scoring session (the first of equals, by relevance)
+                    scores = slot.scores[person]
+                    top = max(range(len(scores)), key=scores.__getitem__)
+                    potential_assignments.append((person, sessions[top], scores[top]))
 
                 # Sort by score and assign
                 potential_assignments.sort(key=lambda x: x[2], reverse=True)
@@ -188,14 +170,14 @@ class ConferenceScheduler:
                 booth_person = [p for p in self.people if p not in assigned][0]
                 booth_coverage[slot_key] = booth_person
 
-            # Save assignments to database
-            for session_id, person in session_assignments.items():
-                cursor.execute('''
-                    UPDATE sessions
-                    SET assigned_to = ?
-                    WHERE session_id = ?
-                ''', (person, session_id))
+            saved.extend((person, session_id) for session_id, person in session_assignments.items())
 
+        # Save assignments to database
+        cursor.executemany('''
+            UPDATE sessions
+            SET assigned_to = ?
+            WHERE session_id = ?
+        ''', saved)
         conn.commit()
         conn.close()
 
@@ -211,11 +193,12 @@ class ConferenceScheduler:
         cursor = conn.cursor()
 
         # Get all assigned sessions
+        ensure_time_columns(conn)
         cursor.execute('''
-            SELECT assigned_to, date, start_time, end_time, title, location, relevance_score
+            SELECT assigned_to, date, start_time, end_time, start_ts, title, location, relevance_score
             FROM sessions
             WHERE assigned_to IS NOT NULL
-            ORDER BY date, start_time, assigned_to
+            ORDER BY start_ts IS NULL, start_ts, date, start_time, assigned_to
         ''')
 
         sessions = [dict(row) for row in cursor.fetchall()]
@@ -252,7 +235,7 @@ class ConferenceScheduler:
                 print(f"\n  {date}")
                 print(f"  {'-' * 76}")
 
-                sessions = sorted(person_schedule[date], key=lambda x: x['start_time'])
+                sessions = person_schedule[date]  # already in start_ts order
                 for session in sessions:
                     print(f"  {session['start_time']:>10} - {session['end_time']:<10}  [{session['relevance_score']:>5.1f}]")
                     print(f"    {session['title']}")
@@ -0,0 +1,41 @@
+"""
+Compact explanations stored next to scores.
+
+Every scorer writes, in the same statement as the score, a small JSON
+record of why the session got it, so reports and the web app never rerun
+scoring to explain one:
+
+    relevance  {"terms": {"poverty": 2, "snap": 1}, "title": ["poverty"]}
+    relevance  {"base": 12.5, "modifier": 2.0, "terms": ["medicaid"]}  (per person)
+    dual       {"rule": "Max Ghenis/0", "terms": ["ubi"], "base": 70, "modifier": 10}
+    semantic   {"interest": "medicaid expansion", "similarity": 0.62}
+
+`terms` are the keywords or rule terms that matched (with counts for
+relevance), `rule` the rule list and position that fired, and `modifier`
+what a person rule added to the `base` (general) score; for per-person
+relevance, `modifier` is the interest multiplier and `terms` the person's
+interests that matched.
+
+General and relevance explanations are {prefix}_explanation columns on
+sessions; per-person ones are session_scores.explanation.
+"""
+import json
+
+
+def to_json(explanation):
+    """An explanation dict as compact JSON (None stays None)."""
+    if explanation is None:
+        return None
+    return json.dumps(explanation, separators=(',', ':'), ensure_ascii=False)
+
+
+def from_json(text):
+    """A stored explanation as a dict (None or empty stays None)."""
+    return json.loads(text) if text else None
+
+
+def ensure_explanation_column(cursor, prefix):
+    """Add {prefix}_explanation to sessions if missing."""
+    columns = {row[1] for row in cursor.execute('PRAGMA table_info(sessions)')}
+    if f'{prefix}_explanation' not in columns:
+        cursor.execute(f'ALTER TABLE sessions ADD COLUMN {prefix}_explanation TEXT')
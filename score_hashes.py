@@ -0,0 +1,58 @@
+"""
+Content and config hashes for incremental rescoring.
+
+Each scorer stores, next to its scores, a hash of the text it scored and
+a hash of the scoring configuration it used. A later run recomputes only
+the rows where either hash changed: new or edited sessions, or every
+session once the keyword tables or rules change.
+"""
+import hashlib
+import inspect
+import json
+
+
+# Separates fields so ('ab', 'c') and ('a', 'bc') hash differently
+FIELD_SEPARATOR = '\x1f'
+
+
+def content_hash(*fields):
+    """Hash of the fields a score was computed from (None counts as empty)."""
+    text = FIELD_SEPARATOR.join('' if field is None else str(field) for field in fields)
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def config_hash(*parts):
+    """
+    Hash of a scoring configuration: keyword tables, constants, and the
+    source of any scoring functions, classes or modules passed in (so rule
+    and code edits count too).
+    """
+    normalized = [
+        inspect.getsource(part) if inspect.isroutine(part) or inspect.isclass(part) or inspect.ismodule(part)
+        else part
+        for part in parts
+    ]
+    return hashlib.sha1(json.dumps(normalized, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def ensure_hash_columns(cursor, prefix):
+    """Add {prefix}_content_hash and {prefix}_config_hash to sessions if missing."""
+    columns = {row[1] for row in cursor.execute('PRAGMA table_info(sessions)')}
+    for column in (f'{prefix}_content_hash', f'{prefix}_config_hash'):
+        if column not in columns:
+            cursor.execute(f'ALTER TABLE sessions ADD COLUMN {column} TEXT')
+
+
+def stale_rows(rows, prefix, config, fields, force=False):
+    """
+    The rows whose stored hashes don't match, as (row, content hash) pairs.
+
+    `rows` are sqlite3.Row (or dict) rows with the `fields` used for
+    scoring and the stored {prefix}_*_hash columns.
+    """
+    stale = []
+    for row in rows:
+        digest = content_hash(*(row[field] for field in fields))
+        if force or row[f'{prefix}_content_hash'] != digest or row[f'{prefix}_config_hash'] != config:
+            stale.append((row, digest))
+    return stale
@@ -0,0 +1,168 @@
+"""
+Per-session scrape progress, so long scrapes can be resumed.
+
+The scrape_status table records each session's state ('done' or 'failed'),
+how many attempts it took, the last error and when it was last fetched.
+A resumed scrape skips finished sessions and retries failed ones once
+their exponential backoff has passed.
+
+Successful saves are marked done by SessionWriter in the same transaction
+that writes the session, so a crash never leaves a session marked done
+that wasn't saved.
+"""
+import time
+
+
+SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS scrape_status (
+        session_id TEXT PRIMARY KEY,
+        state TEXT NOT NULL,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        last_error TEXT,
+        last_fetch_at REAL,
+        next_attempt_at REAL
+    )
+'''
+
+DONE_UPSERT = '''
+    INSERT INTO scrape_status (session_id, state, attempts, last_error, last_fetch_at, next_attempt_at)
+    VALUES (?, 'done', 1, NULL, ?, NULL)
+    ON CONFLICT(session_id) DO UPDATE SET
+        state = 'done',
+        attempts = scrape_status.attempts + 1,
+        last_error = NULL,
+        last_fetch_at = excluded.last_fetch_at,
+        next_attempt_at = NULL
+'''
+
+
+class ScrapeStatus:
+    """
+    Read and update scrape_status through an open connection.
+
+    A session that has failed n times waits base_delay * 2**(n-1) seconds,
+    capped at max_delay, before it is due for another attempt.
+    """
+
+    def __init__(self, conn, base_delay=5.0, max_delay=600.0):
+        self.conn = conn
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.conn.execute(SCHEMA)
+
+    def backoff(self, attempts):
+        """Seconds to wait after a session's `attempts`-th failure."""
+        return min(self.max_delay, self.base_delay * 2 ** max(0, attempts - 1))
+
+    def get(self, session_id):
+        """A session's status row as a dict, or None if it was never tried."""
+        row = self.conn.execute('''
+            SELECT state, attempts, last_error, last_fetch_at, next_attempt_at
+            FROM scrape_status WHERE session_id = ?
+        ''', (session_id,)).fetchone()
+        if row is None:
+            return None
+        return dict(zip(('state', 'attempts', 'last_error', 'last_fetch_at', 'next_attempt_at'), row))
+
+    def _rows(self, session_ids):
+        return {row[0]: row[1:] for row in self.conn.execute(
+            'SELECT session_id, state, attempts, next_attempt_at FROM scrape_status'
+        ) if row[0] in session_ids}
+
+    def mark_done(self, cursor, session_ids, now=None):
+        """Mark sessions done using a cursor inside the caller's transaction."""
+        now = time.time() if now is None else now
+        cursor.executemany(DONE_UPSERT, [(session_id, now) for session_id in session_ids])
+
+    def record_success(self, session_id, now=None):
+        """Mark a session done that needed no write, e.g. an unchanged page."""
+        with self.conn:
+            self.mark_done(self.conn.cursor(), [session_id], now)
+
+    def record_failure(self, session_id, error, now=None):
+        """Record a failed attempt and schedule the next one."""
+        now = time.time() if now is None else now
+        with self.conn:
+            row = self.conn.execute('SELECT attempts FROM scrape_status WHERE session_id = ?',
+                                    (session_id,)).fetchone()
+            attempts = (row[0] if row else 0) + 1
+            self.conn.execute('''
+                INSERT OR REPLACE INTO scrape_status
+                (session_id, state, attempts, last_error, last_fetch_at, next_attempt_at)
+                VALUES (?, 'failed', ?, ?, ?, ?)
+            ''', (session_id, attempts, error, now, now + self.backoff(attempts)))
+
+    def reset(self, session_ids):
+        """Forget the status of these sessions, for a scrape that starts over."""
+        with self.conn:
+            self.conn.executemany('DELETE FROM scrape_status WHERE session_id = ?',
+                                  [(session_id,) for session_id in session_ids])
+
+    def start(self, session_ids, resume=False):
+        """
+        The sessions a scrape should fetch. Without resume every session
+        starts over; with it, finished and backing-off sessions are skipped.
+        """
+        if not resume:
+            self.reset(session_ids)
+            return list(session_ids)
+
+        todo = self.to_scrape(session_ids)
+        print(f"Resuming: {len(todo)} sessions to scrape, "
+              f"{len(session_ids) - len(todo)} already done or waiting to retry")
+        return todo
+
+    def to_scrape(self, session_ids, now=None):
+        """
+        Sessions a resumed scrape should fetch now, in the given order:
+        those never tried, and failed ones whose backoff has passed.
+        """
+        now = time.time() if now is None else now
+        rows = self._rows(set(session_ids))
+        return [
+            session_id for session_id in session_ids
+            if session_id not in rows
+            or (rows[session_id][0] == 'failed' and (rows[session_id][2] or 0) <= now)
+        ]
+
+    def next_retry(self, session_ids, max_attempts, now=None):
+        """
+        The next round of in-run retries as (seconds to wait, session IDs),
+        or None once no failed session has attempts left.
+        """
+        now = time.time() if now is None else now
+        rows = self._rows(set(session_ids))
+        failed = {
+            session_id: next_attempt_at or now
+            for session_id, (state, attempts, next_attempt_at) in rows.items()
+            if state == 'failed' and attempts < max_attempts
+        }
+        if not failed:
+            return None
+
+        retry_at = min(failed.values())
+        due = [session_id for session_id in session_ids
+               if session_id in failed and failed[session_id] <= retry_at]
+        return max(0.0, retry_at - now), due
+
+    def failures(self, session_ids=None):
+        """Every failed session as (session_id, attempts, last_error)."""
+        return [
+            row for row in self.conn.execute('''
+                SELECT session_id, attempts, last_error FROM scrape_status
+                WHERE state = 'failed' ORDER BY session_id
+            ''')
+            if session_ids is None or row[0] in session_ids
+        ]
+
+
+def print_failures(status, session_ids=None, limit=10):
+    """Summarise the sessions that are still failing."""
+    failures = status.failures(session_ids)
+    if not failures:
+        return
+    print(f"\n✗ {len(failures)} sessions failed (all recorded in scrape_status; rerun with --resume):")
+    for session_id, attempts, error in failures[:limit]:
+        print(f"  {session_id} ({attempts} attempts): {(error or '')[:80]}")
+    if len(failures) > limit:
+        print(f"  ... and {len(failures) - limit} more")
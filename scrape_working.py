@@ -1,16 +1,25 @@
 """Working scraper using page title."""
+import argparse
+import asyncio
 import json
 import re
 import sqlite3
+import time
 from datetime import datetime
 from playwright.sync_api import sync_playwright
-from bs4 import BeautifulSoup
+from html_parsing import parse_html
+from scrape_status import ScrapeStatus, print_failures
+from session_writer import SessionWriter
 
 
 def extract_session_data(page, session_id):
     """Extract session data from loaded page."""
-    html = page.content()
-    soup = BeautifulSoup(html, 'html.parser')
+    return parse_session_html(session_id, page.content())
+
+
+def parse_session_html(session_id, html, backend=None):
+    """Extract session data from a session page's HTML."""
+    doc = parse_html(html, backend)
 
     session_data = {
         'session_id': session_id,
@@ -27,7 +36,7 @@ def extract_session_data(page, session_id):
     }
 
     # Get title from page title tag or og:title meta
-    title_tag = soup.find('title')
+    title_tag = doc.find('title')
     if title_tag:
         title_text = title_tag.get_text()
         # Remove "APPAM Fall Research Conference: " prefix
@@ -36,11 +45,11 @@ def extract_session_data(page, session_id):
 
     # Fallback to og:title
     if not session_data['title']:
-        og_title = soup.find('meta', property='og:title')
+        og_title = doc.find('meta', attrs={'property': 'og:title'})
         if og_title:
             session_data['title'] = og_title.get('content', '')
 
-    text_content = soup.get_text()
+    text_content = doc.text
 
     # Date/time
     date_pattern = r'(Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday),\s+([A-Za-z]+\s+\d+),\s+(\d+:\d+)\s*to\s*(\d+:\d+)(am|pm)'
@@ -93,42 +102,120 @@ def extract_session_data(page, session_id):
 
 def save_to_db(session_data, conn):
     """Save to database."""
-    cursor = conn.cursor()
+    SessionWriter(conn).write_batch([session_data])
+
+
+# Session pages render their body text client-side
+READY_CHECK = "document.body.innerText.length > 500"
+
+
+def has_title(session_data):
+    """Whether the page yielded a real session title."""
+    return bool(session_data['title']) and len(session_data['title']) > 10
+
+
+def scrape_sequentially(session_ids, cookies, conn, status, max_attempts=3):
+    """Scrape sessions one at a time with the sync API, retrying failures with backoff."""
+    found = 0
+    printed_errors = 0
+
+    with sync_playwright() as p, SessionWriter(conn, batch_size=50, status=status) as writer:
+        browser = p.chromium.launch(headless=True)
+        context = browser.new_context()
+        context.add_cookies(cookies)
+        page = context.new_page()
+
+        def scrape_round(round_ids):
+            """Scrape one pass over round_ids; returns the IDs that failed."""
+            nonlocal found, printed_errors
+            failed = set()
+            for i, session_id in enumerate(round_ids, 1):
+                try:
+                    url = f"http://convention2.allacademic.com/one/appam/appam25/index.php?program_focus=view_session&selected_session_id={session_id}&cmd=online_program_direct_link&sub_action=online_program"
+
+                    page.goto(url, timeout=30000)
+                    page.wait_for_function(READY_CHECK, timeout=10000)
+
+                    session_data = extract_session_data(page, session_id)
+
+                    if has_title(session_data):
+                        writer.add(session_data)
+                        found += 1
+                        if found <= 30 or found % 50 == 0:
+                            print(f"[{i}/{len(round_ids)}] ✓ {session_data['title'][:70]}", flush=True)
+                        elif i % 20 == 0:
+                            print(f"[{i}/{len(round_ids)}] Progress: {found} found", flush=True)
+                    else:
+                        status.record_failure(session_id, "No session title found")
+                        failed.add(session_id)
+
+                except Exception as e:
+                    # Every failure is recorded; only the first few are printed
+                    status.record_failure(session_id, str(e))
+                    failed.add(session_id)
+                    printed_errors += 1
+                    if printed_errors <= 10:
+                        print(f"[{i}/{len(round_ids)}] ✗ {str(e)[:80]}", flush=True)
+            return failed
+
+        failed = scrape_round(session_ids)
+
+        while (retry := status.next_retry([s for s in session_ids if s in failed],
+                                          max_attempts)) is not None:
+            wait, retry_ids = retry
+            writer.flush()
+            print(f"\nRetrying {len(retry_ids)} failed sessions in {wait:.0f}s...", flush=True)
+            time.sleep(wait)
+            failed = (failed - set(retry_ids)) | scrape_round(retry_ids)
+
+        browser.close()
+
+    return found, len(failed)
+
 
-    cursor.execute('''
-        INSERT OR REPLACE INTO sessions
-        (session_id, title, date, start_time, end_time, location, description, chair, papers, raw_html)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (
-        session_data['session_id'], session_data['title'], session_data['date'],
-        session_data['start_time'], session_data['end_time'], session_data['location'],
-        session_data['description'], session_data['chair'], session_data['papers'],
-        session_data['raw_html']
-    ))
-
-    # Save location
-    if session_data['location']:
-        cursor.execute('INSERT OR IGNORE INTO locations (name) VALUES (?)', (session_data['location'],))
-
-    # Save presenters
-    if session_data['presenters']:
-        presenters = json.loads(session_data['presenters'])
-        cursor.execute('DELETE FROM session_presenters WHERE session_id = ?', (session_data['session_id'],))
-        for presenter_name in presenters:
-            cursor.execute('INSERT OR IGNORE INTO presenters (name) VALUES (?)', (presenter_name,))
-            cursor.execute('SELECT id FROM presenters WHERE name = ?', (presenter_name,))
-            result = cursor.fetchone()
-            if result:
-                presenter_id = result[0]
-                cursor.execute('''
-                    INSERT OR IGNORE INTO session_presenters (session_id, presenter_id)
-                    VALUES (?, ?)
-                ''', (session_data['session_id'], presenter_id))
-
-    conn.commit()
+def require_title(session_data):
+    """Reject pages without a real session title."""
+    if not has_title(session_data):
+        raise ValueError("No session title found")
+
+
+async def scrape_concurrently(session_ids, cookies, status, concurrency, requests_per_second,
+                              max_attempts=3, parse_workers=2, db_path='appam_sessions.db'):
+    """Scrape sessions through the fetch -> parse -> write pipeline."""
+    from async_scraper import AsyncSessionScraper
+    from pipeline import SessionPipeline
+    from scraper import APPAMScraper
+
+    engine = AsyncSessionScraper(
+        APPAMScraper().session_url,
+        parse_session_html,
+        lambda session_data: save_to_db(session_data, status.conn),
+        cookies=cookies,
+        concurrency=concurrency,
+        requests_per_second=requests_per_second,
+        ready_check=READY_CHECK,
+        status=status,
+    )
+    pipeline = SessionPipeline(engine, db_path, parser='working', parse_workers=parse_workers,
+                               validate=require_title)
+    async with engine:
+        return await engine.scrape_with_retries(session_ids, max_attempts, scrape=pipeline.run)
 
 
 def main():
+    parser = argparse.ArgumentParser(description='Scrape every session in session_ids_all.txt.')
+    parser.add_argument('--concurrency', type=int,
+                        help='scrape this many pages at once with the async engine')
+    parser.add_argument('--rate-limit', type=float, default=4.0,
+                        help='max requests per second per host in async mode (default: 4)')
+    parser.add_argument('--parse-workers', type=int, default=2,
+                        help='parser processes in async mode (default: 2)')
+    parser.add_argument('--resume', action='store_true',
+                        help='skip sessions already scraped and retry failed ones whose backoff has passed')
+    parser.add_argument('--max-attempts', type=int, default=3,
+                        help='tries per session before giving up for this run (default: 3)')
+    args = parser.parse_args()
+
     # Load session IDs
     with open('session_ids_all.txt', 'r') as f:
         session_ids = [line.strip() for line in f if line.strip()]
@@ -145,44 +232,22 @@ def main():
     scraper = APPAMScraper()
     scraper.init_database()
 
-    found = 0
-    errors = 0
-
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        context = browser.new_context()
-        context.add_cookies(cookies)
-        page = context.new_page()
-
-        for i, session_id in enumerate(session_ids, 1):
-            try:
-                url = f"http://convention2.allacademic.com/one/appam/appam25/index.php?program_focus=view_session&selected_session_id={session_id}&cmd=online_program_direct_link&sub_action=online_program"
-
-                page.goto(url, timeout=30000)
-                page.wait_for_function("document.body.innerText.length > 500", timeout=10000)
-
-                session_data = extract_session_data(page, session_id)
-
-                if session_data['title'] and len(session_data['title']) > 10:
-                    save_to_db(session_data, conn)
-                    found += 1
-                    if found <= 30 or found % 50 == 0:
-                        print(f"[{i}/{len(session_ids)}] ✓ {session_data['title'][:70]}", flush=True)
-                    elif i % 20 == 0:
-                        print(f"[{i}/{len(session_ids)}] Progress: {found} found", flush=True)
-                else:
-                    errors += 1
+    status = ScrapeStatus(conn)
+    session_ids = status.start(session_ids, args.resume)
 
-            except Exception as e:
-                errors += 1
-                if errors <= 10:
-                    print(f"[{i}/{len(session_ids)}] ✗ {str(e)[:80]}", flush=True)
-
-        browser.close()
-
-    conn.close()
+    if args.concurrency:
+        results = asyncio.run(scrape_concurrently(
+            session_ids, cookies, status, args.concurrency, args.rate_limit, args.max_attempts,
+            args.parse_workers
+        ))
+        found = results['saved']
+        errors = len(results['errors'])
+    else:
+        found, errors = scrape_sequentially(session_ids, cookies, conn, status, args.max_attempts)
 
     print(f"\n✓ Complete! Scraped {found} sessions ({errors} errors)", flush=True)
+    print_failures(status, set(session_ids))
+    conn.close()
 
     # Stats
     conn = sqlite3.connect('appam_sessions.db')
@@ -2,22 +2,131 @@
 APPAM Conference Session Scraper
 Scrapes session data from the APPAM conference website.
 """
+import asyncio
 import json
 import sqlite3
 import re
 import os
+import time
+from contextlib import closing, contextmanager
 from datetime import datetime
 from playwright.sync_api import sync_playwright
-from bs4 import BeautifulSoup
+from html_cache import HTMLCache, RefreshPolicy
+from html_parsing import BACKENDS, parse_html
+from html_store import SCHEMA as HTML_SCHEMA, migrate_raw_html
+from scrape_status import ScrapeStatus, print_failures
+from score_explanations import ensure_explanation_column
+from session_scores import ensure_schema as ensure_score_schema, migrate_person_columns
+from session_search import ensure_schema as ensure_search_schema
+from session_writer import SessionWriter
+from time_utils import ensure_time_columns
+
+
+# APPAM 2025 dates (including pre-conference)
+DEFAULT_CONFERENCE_DATES = [
+    '2025-11-12',  # Wednesday (pre-conference)
+    '2025-11-13',  # Thursday
+    '2025-11-14',  # Friday
+    '2025-11-15',  # Saturday
+]
 
 
 class APPAMScraper:
-    def __init__(self, db_path='appam_sessions.db', cookies_file=None):
+    def __init__(self, db_path='appam_sessions.db', cookies_file=None,
+                 cache_dir=None, refresh='max-age=86400', html_parser=None, days=None):
         self.db_path = db_path
         self.base_url = "http://convention2.allacademic.com/one/appam/appam25/"
         self.session_ids = set()
         self.cookies_file = cookies_file
 
+        # Optional on-disk cache of session pages
+        self.cache = HTMLCache(cache_dir) if cache_dir else None
+        self.refresh_policy = RefreshPolicy.parse(refresh) if isinstance(refresh, str) else refresh
+
+        # HTML parsing backend; None picks the fastest one installed
+        self.html_parser = html_parser
+
+        # Days to discover sessions on. Without an explicit list, the defaults
+        # are a starting point and the calendar's own day links are followed.
+        self.conference_dates = list(days) if days else list(DEFAULT_CONFERENCE_DATES)
+        self.follow_day_links = not days
+
+        # Shared browser state, populated by open_browser()
+        self._playwright = None
+        self._browser = None
+        self._context = None
+        self._page = None
+
+    def _read_cookies(self):
+        """Read cookies from the cookies file, or None if there isn't one."""
+        if self.cookies_file and os.path.exists(self.cookies_file):
+            with open(self.cookies_file, 'r') as f:
+                return json.load(f)
+        return None
+
+    def _load_cookies(self, context):
+        """Add cookies from the cookies file to a browser context."""
+        cookies = self._read_cookies()
+        if cookies:
+            context.add_cookies(cookies)
+
+    def open_browser(self):
+        """Launch one browser and context to be shared by every fetch."""
+        if self._context is not None:
+            return
+
+        self._playwright = sync_playwright().start()
+        try:
+            self._browser = self._playwright.chromium.launch(headless=True)
+            self._context = self._browser.new_context()
+            self._load_cookies(self._context)
+        except Exception:
+            self.close_browser()
+            raise
+
+    def close_browser(self):
+        """Shut down the shared browser, ignoring errors from a dead browser."""
+        for resource in (self._page, self._context, self._browser):
+            if resource is not None:
+                try:
+                    resource.close()
+                except Exception:
+                    pass
+
+        if self._playwright is not None:
+            try:
+                self._playwright.stop()
+            except Exception:
+                pass
+
+        self._playwright = None
+        self._browser = None
+        self._context = None
+        self._page = None
+
+    @contextmanager
+    def browser_session(self):
+        """
+        Keep the shared browser open for the duration of the block.
+
+        Nested uses reuse the already open browser, so only the outermost
+        block launches and shuts it down.
+        """
+        owns_browser = self._context is None
+        if owns_browser:
+            self.open_browser()
+        try:
+            yield self._context
+        finally:
+            if owns_browser:
+                self.close_browser()
+
+    def _get_page(self):
+        """Return the shared page, replacing it if a previous fetch closed it."""
+        if self._page is None or self._page.is_closed():
+            self._page = self._context.new_page()
+        return self._page
+
     def init_database(self):
         """Initialize the SQLite database with schema."""
         conn = sqlite3.connect(self.db_path)
@@ -30,16 +139,24 @@ class APPAMScraper:
                 date TEXT NOT NULL,
                 start_time TEXT NOT NULL,
                 end_time TEXT NOT NULL,
+                start_ts INTEGER,
+                end_ts INTEGER,
                 location TEXT,
                 description TEXT,
                 chair TEXT,
                 papers TEXT,
                 relevance_score REAL DEFAULT 0,
+                general_score REAL DEFAULT 0,
                 assigned_to TEXT,
-                raw_html TEXT
+                relevance_explanation TEXT,
+                general_explanation TEXT
             )
         ''')
 
+        # Score explanations, for databases created before they were stored
+        for prefix in ('relevance', 'general'):
+            ensure_explanation_column(cursor, prefix)
+
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS people (
                 name TEXT PRIMARY KEY,
@@ -78,6 +195,9 @@ class APPAMScraper:
             )
         ''')
 
+        # Papers are replaced per session on every save
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_papers_session ON papers(session_id)')
+
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS paper_authors (
                 paper_id INTEGER NOT NULL,
@@ -109,6 +229,16 @@ class APPAMScraper:
             )
         ''')
 
+        # Session IDs found on the calendar, so a resumed scrape can start
+        # on details before discovery finishes
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS discovered_sessions (
+                session_id TEXT PRIMARY KEY,
+                day TEXT,
+                discovered_at REAL
+            )
+        ''')
+
         # Insert the three people
         people = [
             ('Max Ghenis', 'CEO'),
@@ -117,81 +247,152 @@ class APPAMScraper:
         ]
         cursor.executemany('INSERT OR IGNORE INTO people (name, role) VALUES (?, ?)', people)
 
+        # Scraped pages are stored compressed, outside the sessions row
+        cursor.execute(HTML_SCHEMA)
+
+        # Per-person scores, one row per session, person and scorer
+        ensure_score_schema(cursor)
+
         conn.commit()
+        migrate_raw_html(conn)
+        migrate_person_columns(conn)
+
+        # Times as minutes since the epoch, for databases created before them
+        ensure_time_columns(conn)
+
+        # Full-text mirrors, created after the migrations above have vacuumed
+        with conn:
+            ensure_search_schema(conn.cursor())
         conn.close()
 
-    def scrape_calendar_page(self, date_str='2025-11-13'):
-        """Scrape the calendar page to get all session IDs for a given date."""
+    def calendar_url(self, date_str):
+        """URL of the program calendar for one conference day."""
+        return f"{self.base_url}index.php?cmd=Online+Program+Load+Focus&program_focus=program_calendar&selected_day={date_str}"
+
+    def session_url(self, session_id):
+        """URL of the detail page for one session."""
+        return f"{self.base_url}index.php?program_focus=view_session&selected_session_id={session_id}&cmd=online_program_direct_link&sub_action=online_program"
+
+    def parse_calendar_html(self, content):
+        """Extract session IDs, in page order, from a calendar page's HTML."""
         session_ids = []
+        doc = parse_html(content, self.html_parser)
+
+        # Find all session links
+        links = doc.find_all('a', attrs={'href': re.compile(r'selected_session_id=\d+')})
+        for link in links:
+            match = re.search(r'selected_session_id=(\d+)', link.get('href'))
+            if match:
+                session_ids.append(match.group(1))
+
+        return session_ids
 
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            context = browser.new_context()
+    def parse_calendar_days(self, content):
+        """Conference days linked from a calendar page's day navigation."""
+        doc = parse_html(content, self.html_parser)
+        days = set()
+        for link in doc.find_all('a', attrs={'href': re.compile(r'selected_day=\d{4}-\d{2}-\d{2}')}):
+            days.add(re.search(r'selected_day=(\d{4}-\d{2}-\d{2})', link.get('href')).group(1))
+        return sorted(days)
+
+    def record_calendar(self, date_str, content):
+        """
+        Take the session IDs from one day's calendar page, persist them to
+        discovered_sessions and follow any new day links. Returns the IDs.
+        """
+        session_ids = self.parse_calendar_html(content)
+        self.session_ids.update(session_ids)
+        self.save_discovered(date_str, session_ids)
+
+        if self.follow_day_links:
+            new_days = [day for day in self.parse_calendar_days(content) if day not in self.conference_dates]
+            if new_days:
+                print(f"Found more conference days in the calendar: {', '.join(new_days)}")
+                self.conference_dates.extend(new_days)
 
-            # Load cookies if provided
-            if self.cookies_file and os.path.exists(self.cookies_file):
-                with open(self.cookies_file, 'r') as f:
-                    cookies = json.load(f)
-                    context.add_cookies(cookies)
+        print(f"Found {len(session_ids)} sessions for {date_str}")
+        return session_ids
+
+    def save_discovered(self, date_str, session_ids):
+        """Persist session IDs found on one day's calendar."""
+        conn = sqlite3.connect(self.db_path)
+        with conn:
+            conn.executemany('''
+                INSERT INTO discovered_sessions (session_id, day, discovered_at)
+                VALUES (?, ?, ?)
+                ON CONFLICT(session_id) DO UPDATE SET
+                    day = excluded.day,
+                    discovered_at = excluded.discovered_at
+            ''', [(session_id, date_str, time.time()) for session_id in session_ids])
+        conn.close()
 
-            page = context.new_page()
+    def discovered_session_ids(self):
+        """Session IDs found by earlier calendar scrapes, in ID order."""
+        conn = sqlite3.connect(self.db_path)
+        session_ids = [row[0] for row in conn.execute(
+            'SELECT session_id FROM discovered_sessions ORDER BY session_id'
+        )]
+        conn.close()
+        return session_ids
 
-            url = f"{self.base_url}index.php?cmd=Online+Program+Load+Focus&program_focus=program_calendar&selected_day={date_str}"
+    def scrape_calendar_page(self, date_str='2025-11-13'):
+        """Scrape the calendar page to get all session IDs for a given date."""
+        with self.browser_session():
+            page = self._get_page()
+
+            url = self.calendar_url(date_str)
             print(f"Scraping calendar for {date_str}...")
             page.goto(url, wait_until='networkidle')
 
             # Get the page content
             content = page.content()
-            soup = BeautifulSoup(content, 'html.parser')
 
-            # Find all session links
-            links = soup.find_all('a', href=re.compile(r'selected_session_id=\d+'))
-            for link in links:
-                match = re.search(r'selected_session_id=(\d+)', link['href'])
-                if match:
-                    session_id = match.group(1)
-                    session_ids.append(session_id)
-                    self.session_ids.add(session_id)
-
-            browser.close()
-
-        print(f"Found {len(session_ids)} sessions for {date_str}")
-        return session_ids
+        return self.record_calendar(date_str, content)
 
     def scrape_all_calendar_dates(self):
-        """Scrape all conference dates."""
-        # APPAM 2025 dates (including pre-conference)
-        dates = [
-            '2025-11-12',  # Wednesday (pre-conference)
-            '2025-11-13',  # Thursday
-            '2025-11-14',  # Friday
-            '2025-11-15',  # Saturday
-        ]
-
-        all_session_ids = []
-        for date in dates:
-            session_ids = self.scrape_calendar_page(date)
-            all_session_ids.extend(session_ids)
+        """Scrape all conference dates, including any the calendar links to."""
+        # conference_dates can grow as day links are followed
+        i = 0
+        while i < len(self.conference_dates):
+            self.scrape_calendar_page(self.conference_dates[i])
+            i += 1
 
         return list(self.session_ids)
 
     def scrape_session_detail(self, session_id):
         """Scrape detailed information for a specific session."""
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            context = browser.new_context()
+        content, _ = self.fetch_session_page(session_id)
+        return self.parse_session_html(session_id, content)
 
-            # Load cookies if provided
-            if self.cookies_file and os.path.exists(self.cookies_file):
-                with open(self.cookies_file, 'r') as f:
-                    cookies = json.load(f)
-                    context.add_cookies(cookies)
+    def fetch_session_page(self, session_id):
+        """
+        Return (html, changed) for a session's detail page.
 
-            page = context.new_page()
+        With a cache configured, a page the refresh policy considers fresh is
+        served from disk, and changed is False unless the fetched content
+        differs from the cached copy. Without a cache every fetch is changed.
+        """
+        url = self.session_url(session_id)
 
-            url = f"{self.base_url}index.php?program_focus=view_session&selected_session_id={session_id}&cmd=online_program_direct_link&sub_action=online_program"
+        if self.cache is not None:
+            entry = self.cache.lookup(session_id, url)
+            if not self.refresh_policy.needs_fetch(entry):
+                return self.cache.read(entry['content_hash']), False
+
+        content, headers = self._fetch_session_html(session_id)
+
+        if self.cache is None:
+            return content, True
+        return content, self.cache.store(session_id, url, content, headers)
+
+    def _fetch_session_html(self, session_id):
+        """Load a session page in the shared browser; returns (html, response headers)."""
+        with self.browser_session():
+            page = self._get_page()
+
+            url = self.session_url(session_id)
             print(f"Scraping session {session_id}...")
-            page.goto(url, wait_until='load')
+            response = page.goto(url, wait_until='load')
 
             # Wait for the session title to load (h1 or h2 element)
             try:
@@ -202,263 +403,336 @@ class APPAMScraper:
             # Additional wait to ensure all content is loaded
             page.wait_for_timeout(1000)
 
-            content = page.content()
-            soup = BeautifulSoup(content, 'html.parser')
-
-            # Extract session information
-            session_data = {
-                'session_id': session_id,
-                'title': '',
-                'date': '',
-                'start_time': '',
-                'end_time': '',
-                'location': '',
-                'description': '',
-                'chair': '',
-                'papers': '',
-                'presenters': '',
-                'raw_html': content
-            }
-
-            # Extract title
-            title_elem = soup.find('h2') or soup.find('h1')
-            if title_elem:
-                session_data['title'] = title_elem.get_text(strip=True)
-
-            # Extract time and location information
-            # Look for patterns like "Thursday, November 13, 2025: 10:00 AM-11:30 AM"
-            text_content = soup.get_text()
-
-            # Extract date and time
-            date_pattern = r'(Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday),\s+([A-Za-z]+\s+\d+,\s+\d{4}):\s+(\d+:\d+\s+[AP]M)\s*-\s*(\d+:\d+\s+[AP]M)'
-            date_match = re.search(date_pattern, text_content)
-            if date_match:
-                date_str = date_match.group(2)
-                session_data['date'] = datetime.strptime(date_str, '%B %d, %Y').strftime('%Y-%m-%d')
-                session_data['start_time'] = date_match.group(3)
-                session_data['end_time'] = date_match.group(4)
-
-            # Extract location
-            location_pattern = r'Location:\s*([^\n]+)'
-            location_match = re.search(location_pattern, text_content)
-            if location_match:
-                session_data['location'] = location_match.group(1).strip()
-
-            # Extract chair
-            chair_pattern = r'Chair:\s*([^\n]+)'
-            chair_match = re.search(chair_pattern, text_content)
-            if chair_match:
-                session_data['chair'] = chair_match.group(1).strip()
-
-            # Extract description and papers
-            # Find all text in the main content area
-            main_content = soup.find('div', class_='content') or soup.find('body')
-            if main_content:
-                paragraphs = main_content.find_all('p')
-                description_parts = []
-                for p in paragraphs:
-                    text = p.get_text(strip=True)
-                    if text and len(text) > 20:
-                        description_parts.append(text)
-                session_data['description'] = '\n\n'.join(description_parts)
-
-            # Extract paper titles and authors
-            papers = []
-            paper_divs = soup.find_all('div', class_='paper') if soup.find_all('div', class_='paper') else []
-
-            # Alternative: look for common patterns in session pages
-            if not paper_divs:
-                # Look for bullet points or numbered lists that might contain papers
-                lists = soup.find_all(['ul', 'ol'])
-                for lst in lists:
-                    items = lst.find_all('li')
-                    for item in items:
-                        text = item.get_text(strip=True)
-                        if text:
-                            papers.append(text)
-            else:
-                for paper_div in paper_divs:
-                    paper_text = paper_div.get_text(strip=True)
-                    papers.append(paper_text)
-
-            session_data['papers'] = json.dumps(papers)
-
-            # Extract presenters/authors from the page
-            presenters = set()  # Use set to avoid duplicates
-
-            # Look for author names in various patterns
-            # Common patterns: "Author:", "Presenter:", "Authors:", followed by names
-            author_patterns = [
-                r'Author[s]?:\s*([^\n]+)',
-                r'Presenter[s]?:\s*([^\n]+)',
-                r'Paper by:\s*([^\n]+)',
-                r'By:\s*([^\n]+)'
-            ]
-
-            for pattern in author_patterns:
-                matches = re.finditer(pattern, text_content, re.IGNORECASE)
-                for match in matches:
-                    author_text = match.group(1).strip()
-                    # Split by common delimiters
-                    authors = re.split(r'[;,]|\band\b', author_text)
-                    for author in authors:
-                        author = author.strip()
-                        if author and len(author) > 3:  # Filter out very short strings
-                            # Remove common suffixes like (University of X)
-                            author = re.sub(r'\([^)]+\)', '', author).strip()
-                            if author:
-                                presenters.add(author)
-
-            # Also extract from paper strings if they follow "Name - Title" pattern
-            for paper in papers:
-                # Look for pattern: "Name(s) - Paper Title" or "Name(s): Paper Title"
-                name_match = re.match(r'^([^-:]+)[-:]', paper)
-                if name_match:
-                    potential_names = name_match.group(1).strip()
-                    # Check if it looks like names (has common name patterns)
-                    if re.search(r'\b[A-Z][a-z]+\b', potential_names):
-                        names = re.split(r'[;,]|\band\b', potential_names)
-                        for name in names:
-                            name = name.strip()
-                            if name and len(name) > 3:
-                                name = re.sub(r'\([^)]+\)', '', name).strip()
-                                if name:
-                                    presenters.add(name)
-
-            # Look for specific HTML elements that might contain author info
-            # Check for divs or spans with class names containing 'author', 'presenter', etc.
-            author_elements = soup.find_all(class_=re.compile(r'author|presenter|speaker', re.IGNORECASE))
-            for elem in author_elements:
-                text = elem.get_text(strip=True)
-                if text and len(text) > 3 and len(text) < 100:  # Reasonable length for a name
-                    text = re.sub(r'\([^)]+\)', '', text).strip()
+            headers = response.all_headers() if response is not None else {}
+            return page.content(), headers
+
+    def parse_session_html(self, session_id, content):
+        """Extract session fields from a session detail page's HTML."""
+        doc = parse_html(content, self.html_parser)
+
+        # Extract session information
+        session_data = {
+            'session_id': session_id,
+            'title': '',
+            'date': '',
+            'start_time': '',
+            'end_time': '',
+            'location': '',
+            'description': '',
+            'chair': '',
+            'papers': '',
+            'presenters': '',
+            'raw_html': content
+        }
+
+        # Extract title
+        title_elem = doc.find('h2') or doc.find('h1')
+        if title_elem:
+            session_data['title'] = title_elem.get_text(strip=True)
+
+        # Extract time and location information
+        # Look for patterns like "Thursday, November 13, 2025: 10:00 AM-11:30 AM"
+        text_content = doc.text
+
+        # Extract date and time
+        date_pattern = r'(Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday),\s+([A-Za-z]+\s+\d+,\s+\d{4}):\s+(\d+:\d+\s+[AP]M)\s*-\s*(\d+:\d+\s+[AP]M)'
+        date_match = re.search(date_pattern, text_content)
+        if date_match:
+            date_str = date_match.group(2)
+            session_data['date'] = datetime.strptime(date_str, '%B %d, %Y').strftime('%Y-%m-%d')
+            session_data['start_time'] = date_match.group(3)
+            session_data['end_time'] = date_match.group(4)
+
+        # Extract location
+        location_pattern = r'Location:\s*([^\n]+)'
+        location_match = re.search(location_pattern, text_content)
+        if location_match:
+            session_data['location'] = location_match.group(1).strip()
+
+        # Extract chair
+        chair_pattern = r'Chair:\s*([^\n]+)'
+        chair_match = re.search(chair_pattern, text_content)
+        if chair_match:
+            session_data['chair'] = chair_match.group(1).strip()
+
+        # Extract description and papers
+        # Find all text in the main content area
+        main_content = doc.find('div', class_='content') or doc.find('body')
+        if main_content:
+            paragraphs = main_content.find_all('p')
+            description_parts = []
+            for p in paragraphs:
+                text = p.get_text(strip=True)
+                if text and len(text) > 20:
+                    description_parts.append(text)
+            session_data['description'] = '\n\n'.join(description_parts)
+
+        # Extract paper titles and authors
+        papers = []
+        paper_divs = doc.find_all('div', class_='paper')
+
+        # Alternative: look for common patterns in session pages
+        if not paper_divs:
+            # Look for bullet points or numbered lists that might contain papers
+            lists = doc.find_all(['ul', 'ol'])
+            for lst in lists:
+                items = lst.find_all('li')
+                for item in items:
+                    text = item.get_text(strip=True)
                     if text:
-                        presenters.add(text)
-
-            session_data['presenters'] = json.dumps(sorted(list(presenters)))
-
-            browser.close()
+                        papers.append(text)
+        else:
+            for paper_div in paper_divs:
+                paper_text = paper_div.get_text(strip=True)
+                papers.append(paper_text)
+
+        session_data['papers'] = json.dumps(papers)
+
+        # Extract presenters/authors from the page
+        presenters = set()  # Use set to avoid duplicates
+
+        # Look for author names in various patterns
+        # Common patterns: "Author:", "Presenter:", "Authors:", followed by names
+        author_patterns = [
+            r'Author[s]?:\s*([^\n]+)',
+            r'Presenter[s]?:\s*([^\n]+)',
+            r'Paper by:\s*([^\n]+)',
+            r'By:\s*([^\n]+)'
+        ]
 
-            return session_data
+        for pattern in author_patterns:
+            matches = re.finditer(pattern, text_content, re.IGNORECASE)
+            for match in matches:
+                author_text = match.group(1).strip()
+                # Split by common delimiters
+                authors = re.split(r'[;,]|\band\b', author_text)
+                for author in authors:
+                    author = author.strip()
+                    if author and len(author) > 3:  # Filter out very short strings
+                        # Remove common suffixes like (University of X)
+                        author = re.sub(r'\([^)]+\)', '', author).strip()
+                        if author:
+                            presenters.add(author)
+
+        # Also extract from paper strings if they follow "Name - Title" pattern
+        for paper in papers:
+            # Look for pattern: "Name(s) - Paper Title" or "Name(s): Paper Title"
+            name_match = re.match(r'^([^-:]+)[-:]', paper)
+            if name_match:
+                potential_names = name_match.group(1).strip()
+                # Check if it looks like names (has common name patterns)
+                if re.search(r'\b[A-Z][a-z]+\b', potential_names):
+                    names = re.split(r'[;,]|\band\b', potential_names)
+                    for name in names:
+                        name = name.strip()
+                        if name and len(name) > 3:
+                            name = re.sub(r'\([^)]+\)', '', name).strip()
+                            if name:
+                                presenters.add(name)
+
+        # Look for specific HTML elements that might contain author info
+        # Check for divs or spans with class names containing 'author', 'presenter', etc.
+        author_elements = doc.find_all(class_=re.compile(r'author|presenter|speaker', re.IGNORECASE))
+        for elem in author_elements:
+            text = elem.get_text(strip=True)
+            if text and len(text) > 3 and len(text) < 100:  # Reasonable length for a name
+                text = re.sub(r'\([^)]+\)', '', text).strip()
+                if text:
+                    presenters.add(text)
+
+        session_data['presenters'] = json.dumps(sorted(list(presenters)))
+
+        return session_data
+
+    def saved_session_ids(self):
+        """IDs of the sessions already in the database."""
+        conn = sqlite3.connect(self.db_path)
+        session_ids = {row[0] for row in conn.execute('SELECT session_id FROM sessions')}
+        conn.close()
+        return session_ids
 
     def save_session(self, session_data):
         """Save session data to database."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        self.save_sessions([session_data])
 
-        # Save session
-        cursor.execute('''
-            INSERT OR REPLACE INTO sessions
-            (session_id, title, date, start_time, end_time, location, description, chair, papers, raw_html)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            session_data['session_id'],
-            session_data['title'],
-            session_data['date'],
-            session_data['start_time'],
-            session_data['end_time'],
-            session_data['location'],
-            session_data['description'],
-            session_data['chair'],
-            session_data['papers'],
-            session_data['raw_html']
-        ))
-
-        # Save location
-        if session_data.get('location'):
-            cursor.execute('''
-                INSERT OR IGNORE INTO locations (name)
-                VALUES (?)
-            ''', (session_data['location'],))
-
-        # Save time slot
-        if session_data.get('date') and session_data.get('start_time') and session_data.get('end_time'):
-            cursor.execute('''
-                INSERT OR IGNORE INTO time_slots (date, start_time, end_time)
-                VALUES (?, ?, ?)
-            ''', (session_data['date'], session_data['start_time'], session_data['end_time']))
-
-        # Save presenters and link to session
-        if session_data.get('presenters'):
-            try:
-                presenters = json.loads(session_data['presenters']) if isinstance(session_data['presenters'], str) else session_data['presenters']
-
-                # Delete existing presenter relationships for this session
-                cursor.execute('DELETE FROM session_presenters WHERE session_id = ?', (session_data['session_id'],))
-
-                for presenter_name in presenters:
-                    # Insert presenter (or ignore if exists)
-                    cursor.execute('''
-                        INSERT OR IGNORE INTO presenters (name)
-                        VALUES (?)
-                    ''', (presenter_name,))
-
-                    # Get presenter ID
-                    cursor.execute('SELECT id FROM presenters WHERE name = ?', (presenter_name,))
-                    presenter_id = cursor.fetchone()[0]
-
-                    # Link presenter to session
-                    cursor.execute('''
-                        INSERT OR IGNORE INTO session_presenters (session_id, presenter_id)
-                        VALUES (?, ?)
-                    ''', (session_data['session_id'], presenter_id))
-            except Exception as e:
-                print(f"  Warning: Could not save presenters: {e}")
+    def save_sessions(self, sessions):
+        """Save a batch of sessions in one transaction."""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            SessionWriter(conn).write_batch(sessions)
+        finally:
+            conn.close()
+
+    def scrape_all(self, resume=False, max_attempts=3):
+        """
+        Main method to scrape all sessions.
+
+        Progress is checkpointed in scrape_status. With resume=True, sessions
+        that are already done are skipped. Failed sessions are retried with
+        exponential backoff until they have had max_attempts tries.
+        """
+        print("Initializing database...")
+        self.init_database()
 
-        # Save papers
-        if session_data.get('papers'):
-            try:
-                papers_list = json.loads(session_data['papers']) if isinstance(session_data['papers'], str) else session_data['papers']
+        # One browser and context serve every calendar and detail fetch;
+        # browser_session() shuts it down even if the scrape raises. Sessions
+        # are written in batches, and whatever is queued is written on exit.
+        with closing(sqlite3.connect(self.db_path)) as conn, self.browser_session():
+            status = ScrapeStatus(conn)
+            with SessionWriter(conn, batch_size=50, status=status) as writer:
+                print("Scraping calendar pages...")
+                session_ids = status.start(self.scrape_all_calendar_dates(), resume)
 
-                # Delete existing papers for this session
-                cursor.execute('DELETE FROM papers WHERE session_id = ?', (session_data['session_id'],))
+                saved_ids = self.saved_session_ids()
 
-                for paper_text in papers_list:
-                    if paper_text and len(paper_text) > 3:
-                        cursor.execute('''
-                            INSERT INTO papers (title, session_id)
-                            VALUES (?, ?)
-                        ''', (paper_text, session_data['session_id']))
-            except Exception as e:
-                print(f"  Warning: Could not save papers: {e}")
+                print(f"\nFound {len(session_ids)} sessions to scrape. Scraping details...")
+                failed = self._scrape_details(session_ids, saved_ids, writer, status)
 
-        conn.commit()
-        conn.close()
+                while (retry := status.next_retry([s for s in session_ids if s in failed],
+                                                  max_attempts)) is not None:
+                    wait, retry_ids = retry
+                    writer.flush()
+                    print(f"\nRetrying {len(retry_ids)} failed sessions in {wait:.0f}s...")
+                    time.sleep(wait)
+                    failed = (failed - set(retry_ids)) | self._scrape_details(retry_ids, saved_ids, writer, status)
 
-    def scrape_all(self):
-        """Main method to scrape all sessions."""
-        print("Initializing database...")
-        self.init_database()
+            print_failures(status, failed)
 
-        print("Scraping calendar pages...")
-        session_ids = self.scrape_all_calendar_dates()
+        print("\n✓ Scraping complete!")
 
-        print(f"\nFound {len(session_ids)} total sessions. Scraping details...")
+    def _scrape_details(self, session_ids, saved_ids, writer, status):
+        """Fetch, parse and queue each session; returns the IDs that failed."""
+        failed = set()
         for i, session_id in enumerate(session_ids, 1):
             try:
                 print(f"[{i}/{len(session_ids)}] Scraping session {session_id}...")
-                session_data = self.scrape_session_detail(session_id)
-                self.save_session(session_data)
+                content, changed = self.fetch_session_page(session_id)
+                if not changed and session_id in saved_ids:
+                    status.record_success(session_id)
+                    print("  = Unchanged since last fetch")
+                    continue
+                session_data = self.parse_session_html(session_id, content)
+                writer.add(session_data)
                 print(f"  ✓ Saved: {session_data['title'][:60]}...")
             except Exception as e:
+                status.record_failure(session_id, str(e))
+                failed.add(session_id)
                 print(f"  ✗ Error scraping session {session_id}: {e}")
-                continue
+        return failed
+
+    def scrape_all_async(self, concurrency=8, requests_per_second=4.0, resume=False, max_attempts=3,
+                         parse_workers=2):
+        """
+        Scrape all sessions concurrently: async fetchers, a parser process
+        pool and a single writer thread, connected by bounded queues.
+        """
+        print("Initializing database...")
+        self.init_database()
 
-        print("\n✓ Scraping complete!")
+        results = asyncio.run(self._scrape_all_async(concurrency, requests_per_second, resume, max_attempts,
+                                                     parse_workers))
 
+        print(f"\n✓ Scraping complete! Saved {results['saved']} sessions, "
+              f"{results['unchanged']} unchanged ({len(results['errors'])} errors)")
+        return results
 
-if __name__ == '__main__':
-    import sys
+    async def _scrape_all_async(self, concurrency, requests_per_second, resume=False, max_attempts=3,
+                                parse_workers=2):
+        from async_scraper import AsyncSessionScraper, SessionQueue
+        from pipeline import SessionPipeline
 
-    cookies_file = None
-    if len(sys.argv) > 1 and sys.argv[1] == '--cookies':
-        if len(sys.argv) > 2:
-            cookies_file = sys.argv[2]
-            print(f"Using cookies from: {cookies_file}")
-        else:
-            print("Error: --cookies requires a file path")
-            print("Usage: python scraper.py --cookies cookies.json")
-            sys.exit(1)
+        conn = sqlite3.connect(self.db_path)
+        status = ScrapeStatus(conn)
+        engine = AsyncSessionScraper(
+            self.session_url,
+            self.parse_session_html,
+            self.save_session,
+            cookies=self._read_cookies(),
+            concurrency=concurrency,
+            requests_per_second=requests_per_second,
+            cache=self.cache,
+            refresh_policy=self.refresh_policy,
+            known_ids=self.saved_session_ids(),
+            status=status,
+        )
+        pipeline = SessionPipeline(engine, self.db_path, parser='scraper', html_parser=self.html_parser,
+                                   parse_workers=parse_workers)
+
+        # Detail scraping consumes this queue while discovery is still filling it.
+        # A resumed scrape can start straight away on sessions found last time.
+        queue = SessionQueue()
+        if resume:
+            queue.put(status.start(self.discovered_session_ids(), resume))
+
+        try:
+            async with engine:
+                print(f"Scraping calendar pages and session details with {engine.concurrency} pages...")
+                discovery = asyncio.create_task(self._discover_sessions(engine, queue, status, resume))
+                results = await engine.scrape_with_retries(queue, max_attempts, scrape=pipeline.run)
+                await discovery
+
+            print_failures(status, {session_id for session_id, _ in results['errors']})
+            return results
+        finally:
+            conn.close()
+
+    async def _discover_sessions(self, engine, queue, status, resume):
+        """Fetch the calendar days concurrently, queueing new session IDs as each day loads."""
+        async def discover_day(date_str):
+            try:
+                content = await engine.fetch(self.calendar_url(date_str), wait_until='networkidle')
+            except Exception as e:
+                print(f"✗ Could not load the calendar for {date_str}: {e}")
+                return
+            session_ids = self.record_calendar(date_str, content)
+            queue.put(status.start(queue.unseen(session_ids), resume))
+
+        try:
+            days = list(self.conference_dates)
+            if self.follow_day_links:
+                # The first day's navigation tells us which other days exist
+                await discover_day(days[0])
+                days = self.conference_dates[1:]
+            await asyncio.gather(*(discover_day(date_str) for date_str in days))
+            print(f"\nDiscovered {len(self.session_ids)} sessions across {len(self.conference_dates)} days")
+        finally:
+            # Let the workers finish even if discovery fails
+            queue.close()
 
-    scraper = APPAMScraper(cookies_file=cookies_file)
-    scraper.scrape_all()
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Scrape APPAM conference sessions.')
+    parser.add_argument('--cookies', help='cookies.json exported from a logged-in browser')
+    parser.add_argument('--concurrency', type=int,
+                        help='scrape this many pages at once with the async engine')
+    parser.add_argument('--rate-limit', type=float, default=4.0,
+                        help='max requests per second per host in async mode (default: 4)')
+    parser.add_argument('--cache-dir',
+                        help='cache session pages here and only re-parse pages that changed')
+    parser.add_argument('--refresh', default='max-age=86400',
+                        help='when to refetch cached pages: always, never or max-age=SECONDS '
+                             '(default: max-age=86400)')
+    parser.add_argument('--html-parser', choices=BACKENDS,
+                        help='HTML parsing backend (default: fastest installed)')
+    parser.add_argument('--resume', action='store_true',
+                        help='skip sessions already scraped and retry failed ones whose backoff has passed')
+    parser.add_argument('--max-attempts', type=int, default=3,
+                        help='tries per session before giving up for this run (default: 3)')
+    parser.add_argument('--parse-workers', type=int, default=2,
+                        help='parser processes in async mode (default: 2)')
+    parser.add_argument('--days', type=lambda value: [day.strip() for day in value.split(',') if day.strip()],
+                        help='comma-separated conference days (YYYY-MM-DD) to discover sessions on '
+                             '(default: follow the calendar\'s own day links)')
+    args = parser.parse_args()
+
+    if args.cookies:
+        print(f"Using cookies from: {args.cookies}")
+
+    scraper = APPAMScraper(cookies_file=args.cookies, cache_dir=args.cache_dir, refresh=args.refresh,
+                           html_parser=args.html_parser, days=args.days)
+    if args.concurrency:
+        scraper.scrape_all_async(args.concurrency, args.rate_limit, args.resume, args.max_attempts,
+                                 args.parse_workers)
+    else:
+        scraper.scrape_all(args.resume, args.max_attempts)
@@ -0,0 +1,288 @@
+"""
+Semantic relevance: sessions and team members' interests as embeddings.
+
+Session texts (title, description, paper titles and abstracts) and each
+interest phrase are embedded once and cached by content hash in a
+memory-mapped float32 matrix:
+
+    appam_embeddings/<encoder>/meta.json     content hash of each row
+    appam_embeddings/<encoder>/vectors.f32   row-major float32, one row per text
+
+A person's profile is the weighted sum of their interest phrases, so every
+session × person similarity comes out of matrix multiplies over the cached
+rows. The first run embeds the whole conference; after that only new or
+edited sessions are encoded, and editing a profile encodes at most its new
+phrases.
+
+The encoder is pluggable: anything with a `name`, a `dim` and an
+encode(texts) returning unit-length float32 rows. With sentence-transformers
+installed a small local CPU model is used; otherwise HashingEncoder, a
+hashed bag of words and bigrams that needs only numpy.
+
+    scorer = SemanticScorer()
+    scorer.score_all_sessions()            # writes session_scores (scorer 'semantic')
+    scorer.top('Daphne Hansell', limit=10)
+
+Needs numpy.
+"""
+import hashlib
+import json
+import math
+import os
+import re
+import sqlite3
+from collections import Counter
+from functools import lru_cache
+
+import numpy as np
+
+from bm25_index import session_documents, tokenize
+from score_hashes import content_hash
+from session_scores import SessionScores
+
+
+DEFAULT_CACHE_DIR = 'appam_embeddings'
+
+DEFAULT_MODEL = 'sentence-transformers/all-MiniLM-L6-v2'
+
+SCORER = 'semantic'
+
+# Texts encoded per call; the cache is extended after each batch, so an
+# interrupted first run keeps what it has embedded
+BATCH_SIZE = 256
+
+
+@lru_cache(maxsize=1 << 16)
+def _feature_bucket(feature, dim):
+    """(bucket, sign) of a feature, stable across processes and runs."""
+    digest = int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'little')
+    return digest % dim, 1.0 if digest >> 63 else -1.0
+
+
+class HashingEncoder:
+    """
+    Words and word bigrams hashed into `dim` signed buckets, with sublinear
+    term frequencies. No model to download; similar wording, not meaning.
+    """
+
+    def __init__(self, dim=1024):
+        self.dim = dim
+        self.name = f'hashing-v1-{dim}'
+
+    def encode(self, texts):
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            tokens = tokenize(text)
+            features = tokens + [f'{first} {second}' for first, second in zip(tokens, tokens[1:])]
+            for feature, count in Counter(features).items():
+                bucket, sign = _feature_bucket(feature, self.dim)
+                vectors[row, bucket] += sign * (1 + math.log(count))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms > 0, norms, 1)
+
+
+class SentenceTransformerEncoder:
+    """A local sentence-transformers model, run on the CPU."""
+
+    def __init__(self, model=DEFAULT_MODEL):
+        from sentence_transformers import SentenceTransformer
+
+        self.model = SentenceTransformer(model, device='cpu')
+        self.dim = self.model.get_sentence_embedding_dimension()
+        self.name = f'st-{model}'
+
+    def encode(self, texts):
+        vectors = self.model.encode(list(texts), batch_size=64, normalize_embeddings=True,
+                                    convert_to_numpy=True, show_progress_bar=False)
+        return np.asarray(vectors, dtype=np.float32)
+
+
+def default_encoder():
+    """The local model if sentence-transformers is installed, else HashingEncoder."""
+    try:
+        return SentenceTransformerEncoder()
+    except (ImportError, OSError):
+        # Not installed, or the model isn't downloaded and can't be fetched
+        return HashingEncoder()
+
+
+class EmbeddingCache:
+    """
+    Embeddings by content hash, appended to a memory-mapped float32 matrix.
+    Each encoder gets its own directory, so switching encoders back and
+    forth doesn't throw either cache away.
+    """
+
+    def __init__(self, path, encoder):
+        self.encoder = encoder
+        self.path = os.path.join(path, re.sub(r'[^A-Za-z0-9_.-]+', '_', encoder.name))
+        self._load()
+
+    def _load(self):
+        meta_path = os.path.join(self.path, 'meta.json')
+        hashes = []
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta['dim'] == self.encoder.dim:
+                hashes = meta['hashes']
+        self.hashes = hashes
+        self._rows = {digest: row for row, digest in enumerate(hashes)}
+        if hashes:
+            self.vectors = np.memmap(os.path.join(self.path, 'vectors.f32'), dtype=np.float32,
+                                     mode='r', shape=(len(hashes), self.encoder.dim))
+        else:
+            self.vectors = np.zeros((0, self.encoder.dim), dtype=np.float32)
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def rows(self, texts):
+        """
+        Cache rows of `texts`, encoding (in batches) only those not seen
+        before. Returns how many were encoded too, as (rows, encoded).
+        """
+        digests = [content_hash(text) for text in texts]
+        missing = {}
+        for digest, text in zip(digests, texts):
+            if digest not in self._rows:
+                missing.setdefault(digest, text)
+        missing = list(missing.items())
+        for start in range(0, len(missing), BATCH_SIZE):
+            batch = missing[start:start + BATCH_SIZE]
+            self._append([digest for digest, _ in batch],
+                         self.encoder.encode([text for _, text in batch]))
+        return np.array([self._rows[digest] for digest in digests], dtype=np.int64), len(missing)
+
+    def embed(self, texts):
+        """A (len(texts), dim) float32 matrix of unit-length embeddings."""
+        rows, _ = self.rows(texts)
+        return np.asarray(self.vectors[rows])
+
+    def _append(self, digests, vectors):
+        # Vectors first, meta.json last (replaced atomically); rows past the
+        # count in meta.json, left by an interrupted append, are cut off
+        os.makedirs(self.path, exist_ok=True)
+        vectors_path = os.path.join(self.path, 'vectors.f32')
+        row_bytes = self.encoder.dim * np.dtype(np.float32).itemsize
+        with open(vectors_path, 'ab') as f:
+            f.truncate(len(self.hashes) * row_bytes)
+            f.write(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+
+        temporary = os.path.join(self.path, 'meta.json.tmp')
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump({'version': 1, 'encoder': self.encoder.name, 'dim': self.encoder.dim,
+                       'hashes': self.hashes + digests}, f)
+        os.replace(temporary, os.path.join(self.path, 'meta.json'))
+        self._load()
+
+
+def profile_weights(profile):
+    """{phrase: weight} for a free-text profile or a {phrase: weight} profile."""
+    return {profile: 1.0} if isinstance(profile, str) else dict(profile)
+
+
+class SemanticScorer:
+    """
+    Scores every session for every profile by embedding similarity.
+    Profiles default to RelevanceScorer's person_interests.
+    """
+
+    def __init__(self, db_path='appam_sessions.db', cache_dir=DEFAULT_CACHE_DIR, encoder=None, profiles=None):
+        self.db_path = db_path
+        self.encoder = encoder or default_encoder()
+        self.cache = EmbeddingCache(cache_dir, self.encoder)
+        if profiles is None:
+            from relevance_scorer import RelevanceScorer
+            profiles = RelevanceScorer(db_path=None).person_interests
+        self.profiles = profiles
+
+    def similarities(self, texts):
+        """
+        (names, phrases, similarity, phrase_similarity): the cosine
+        similarity of each text to each profile, (len(texts), len(names)),
+        and to each interest phrase, (len(texts), len(phrases)).
+        """
+        names = list(self.profiles)
+        weights = {name: profile_weights(profile) for name, profile in self.profiles.items()}
+        phrases = list(dict.fromkeys(phrase for name in names for phrase in weights[name]))
+        phrase_vectors = self.cache.embed(phrases)
+
+        # Profile j is sum_k W[k, j] * phrase_vectors[k], scaled to unit length
+        W = np.zeros((len(phrases), len(names)), dtype=np.float32)
+        column = {phrase: k for k, phrase in enumerate(phrases)}
+        for j, name in enumerate(names):
+            for phrase, weight in weights[name].items():
+                W[column[phrase], j] = weight
+        norms = np.linalg.norm(phrase_vectors.T @ W, axis=0)
+        W /= np.where(norms > 0, norms, 1)
+
+        text_rows, _ = self.cache.rows(texts)
+        phrase_similarity = self.cache.vectors[text_rows] @ phrase_vectors.T
+        return names, phrases, phrase_similarity @ W, phrase_similarity
+
+    def score_documents(self, documents):
+        """
+        [(session_id, person, score, rationale, explanation)] for
+        (session_id, text) documents; scores are cosine similarities scaled
+        to 0-100, explained by the closest interest phrase.
+        """
+        documents = list(documents)
+        if not documents:
+            return []
+        names, phrases, similarity, phrase_similarity = self.similarities([text for _, text in documents])
+        scores = np.clip(similarity, 0, 1) * 100
+
+        rows = []
+        for j, name in enumerate(names):
+            mine = [k for k, phrase in enumerate(phrases) if phrase in profile_weights(self.profiles[name])]
+            if not mine:
+                continue
+            closest = np.asarray(mine)[np.argmax(phrase_similarity[:, mine], axis=1)]
+            for i, (session_id, _) in enumerate(documents):
+                k = closest[i]
+                similarity = round(float(phrase_similarity[i, k]), 2)
+                rows.append((session_id, name, round(float(scores[i, j]), 2),
+                             f"Closest interest: {phrases[k]} ({similarity:.2f})",
+                             {'interest': phrases[k], 'similarity': similarity}))
+        return rows
+
+    def score_all_sessions(self):
+        """
+        Score every session for everyone in the people table who has a
+        profile; returns how many sessions were scored.
+        """
+        conn = sqlite3.connect(self.db_path)
+        try:
+            session_scores = SessionScores(conn)
+            people = set(session_scores.people())
+            documents = list(session_documents(conn))
+            _, encoded = self.cache.rows([text for _, text in documents])
+            print(f"Embedded {encoded} new or changed sessions ({len(documents) - encoded} cached)")
+
+            rows = [row for row in self.score_documents(documents) if row[1] in people]
+            session_scores.write(SCORER, rows)
+        finally:
+            conn.close()
+        print("✓ Semantic scoring complete!")
+        return len(documents)
+
+    def top(self, person, limit=10):
+        """A person's best sessions by semantic score, as session_scores dicts."""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return SessionScores(conn).top_sessions(person, scorer=SCORER, limit=limit)
+        finally:
+            conn.close()
+
+
+if __name__ == '__main__':
+    scorer = SemanticScorer()
+    print(f"Encoder: {scorer.encoder.name}")
+    scorer.score_all_sessions()
+
+    for person in scorer.profiles:
+        print(f"\nTop sessions for {person}:")
+        for session in scorer.top(person, limit=5):
+            print(f"  [{session['score']:5.1f}] {session['title'][:70]}")
+            print(f"          {session['rationale']}")
@@ -0,0 +1,179 @@
+"""
+Per-person session scores, one row per (session, person, scorer).
+
+Scores used to live in one column per team member (max_score,
+pavel_score, daphne_score). session_scores replaces them, so the team can
+grow without schema changes:
+
+    session_scores(session_id, person_id, scorer, score, rationale, explanation)
+
+person_id is a name from the people table and scorer names what produced
+the score (e.g. 'dual'). explanation is the scorer's compact JSON record
+of why (see score_explanations.py). A covering index on (scorer, person_id, score)
+answers a person's top-N sessions without scanning sessions.
+"""
+import sqlite3
+
+from score_explanations import from_json, to_json
+
+
+DEFAULT_SCORER = 'dual'
+
+SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS session_scores (
+        session_id TEXT NOT NULL,
+        person_id TEXT NOT NULL,
+        scorer TEXT NOT NULL,
+        score REAL NOT NULL,
+        rationale TEXT,
+        explanation TEXT,
+        PRIMARY KEY (session_id, person_id, scorer),
+        FOREIGN KEY (session_id) REFERENCES sessions(session_id),
+        FOREIGN KEY (person_id) REFERENCES people(name)
+    ) WITHOUT ROWID
+'''
+
+INDEXES = (
+    # A person's sessions by score, without touching the table
+    '''CREATE INDEX IF NOT EXISTS idx_session_scores_person
+       ON session_scores(scorer, person_id, score DESC, session_id)''',
+)
+
+SCORE_UPSERT = '''
+    INSERT INTO session_scores (session_id, person_id, scorer, score, rationale, explanation)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(session_id, person_id, scorer) DO UPDATE SET
+        score = excluded.score,
+        rationale = excluded.rationale,
+        explanation = excluded.explanation
+'''
+
+# The per-person columns older databases kept on sessions
+LEGACY_COLUMNS = {
+    'max_score': 'Max Ghenis',
+    'pavel_score': 'Pavel Makarchuk',
+    'daphne_score': 'Daphne Hansell',
+}
+
+# Stay well under SQLite's bound-parameter limit in IN (...) lookups
+LOOKUP_CHUNK_SIZE = 500
+
+
+def ensure_schema(cursor):
+    cursor.execute(SCHEMA)
+    # Tables created before explanations were stored
+    columns = {row[1] for row in cursor.execute('PRAGMA table_info(session_scores)')}
+    if 'explanation' not in columns:
+        cursor.execute('ALTER TABLE session_scores ADD COLUMN explanation TEXT')
+    for index in INDEXES:
+        cursor.execute(index)
+
+
+def migrate_person_columns(conn):
+    """
+    Copy max_score/pavel_score/daphne_score from an older database into
+    session_scores (as the 'dual' scorer) and drop the columns. Returns
+    how many scores were moved.
+    """
+    columns = {row[1] for row in conn.execute('PRAGMA table_info(sessions)')}
+    legacy = [column for column in LEGACY_COLUMNS if column in columns]
+    if not legacy:
+        return 0
+
+    with conn:
+        ensure_schema(conn.cursor())
+        moved = 0
+        for column in legacy:
+            moved += conn.execute(f'''
+                INSERT OR IGNORE INTO session_scores (session_id, person_id, scorer, score)
+                SELECT session_id, ?, ?, {column} FROM sessions WHERE {column} IS NOT NULL
+            ''', (LEGACY_COLUMNS[column], DEFAULT_SCORER)).rowcount
+
+    with conn:
+        if sqlite3.sqlite_version_info >= (3, 35, 0):
+            for column in legacy:
+                conn.execute(f'ALTER TABLE sessions DROP COLUMN {column}')
+
+    if moved:
+        print(f"Moved {moved} per-person scores into session_scores")
+    return moved
+
+
+class SessionScores:
+    """Read and write session_scores through an open connection."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        ensure_schema(conn.cursor())
+
+    def people(self):
+        """Everyone on the team, from the people table."""
+        return [row[0] for row in self.conn.execute('SELECT name FROM people ORDER BY rowid')]
+
+    def write(self, scorer, rows, cursor=None):
+        """
+        Upsert (session_id, person_id, score, rationale[, explanation]) rows
+        for a scorer with one executemany; explanations are dicts. Pass a
+        cursor to join the caller's transaction.
+        """
+        params = [(session_id, person_id, scorer, score, rationale, to_json(explanation[0] if explanation else None))
+                  for session_id, person_id, score, rationale, *explanation in rows]
+        if cursor is not None:
+            cursor.executemany(SCORE_UPSERT, params)
+        else:
+            with self.conn:
+                self.conn.executemany(SCORE_UPSERT, params)
+        return len(params)
+
+    def for_sessions(self, session_ids, scorer=DEFAULT_SCORER):
+        """{session_id: {person: score}} for the given sessions."""
+        session_ids = list(session_ids)
+        scores = {session_id: {} for session_id in session_ids}
+        for i in range(0, len(session_ids), LOOKUP_CHUNK_SIZE):
+            chunk = session_ids[i:i + LOOKUP_CHUNK_SIZE]
+            placeholders = ','.join('?' * len(chunk))
+            for session_id, person, score in self.conn.execute(f'''
+                SELECT session_id, person_id, score FROM session_scores
+                WHERE scorer = ? AND session_id IN ({placeholders})
+            ''', [scorer, *chunk]):
+                scores[session_id][person] = score
+        return scores
+
+    def details(self, session_ids, scorer=DEFAULT_SCORER):
+        """
+        {session_id: {person: {'score', 'rationale', 'explanation'}}} for
+        the given sessions, explanations as dicts.
+        """
+        session_ids = list(session_ids)
+        details = {session_id: {} for session_id in session_ids}
+        for i in range(0, len(session_ids), LOOKUP_CHUNK_SIZE):
+            chunk = session_ids[i:i + LOOKUP_CHUNK_SIZE]
+            placeholders = ','.join('?' * len(chunk))
+            for session_id, person, score, rationale, explanation in self.conn.execute(f'''
+                SELECT session_id, person_id, score, rationale, explanation FROM session_scores
+                WHERE scorer = ? AND session_id IN ({placeholders})
+            ''', [scorer, *chunk]):
+                details[session_id][person] = {
+                    'score': score, 'rationale': rationale, 'explanation': from_json(explanation),
+                }
+        return details
+
+    def top_sessions(self, person, scorer=DEFAULT_SCORER, limit=10, min_score=None):
+        """
+        A person's best-scored sessions as dicts (with explanations),
+        highest first; equal scores go to the higher general score.
+        """
+        rows = self.conn.execute('''
+            SELECT ss.session_id, ss.score, ss.rationale, ss.explanation,
+                   s.title, s.date, s.start_time, s.general_score
+            FROM session_scores ss
+            JOIN sessions s ON s.session_id = ss.session_id
+            WHERE ss.scorer = ? AND ss.person_id = ? AND ss.score >= ?
+            ORDER BY ss.score DESC, s.general_score DESC, ss.session_id
+            LIMIT ?
+        ''', (scorer, person, float('-inf') if min_score is None else min_score, limit))
+        columns = ('session_id', 'score', 'rationale', 'explanation', 'title', 'date', 'start_time', 'general_score')
+        sessions = [dict(zip(columns, row)) for row in rows]
+        for session in sessions:
+            session['explanation'] = from_json(session['explanation'])
+        return sessions
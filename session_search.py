@@ -0,0 +1,201 @@
+"""
+Full-text search over sessions, papers and presenters with SQLite FTS5.
+
+Each table has an external-content FTS5 mirror, so the text is not stored
+twice. Triggers keep the mirror in sync as rows are inserted, deleted or
+have their text columns updated:
+
+    sessions_fts(title, description, chair)    rowid = sessions.rowid
+    papers_fts(title, abstract)                 rowid = papers.id
+    presenters_fts(name, affiliation)           rowid = presenters.id
+
+sessions has no INTEGER PRIMARY KEY, and SQLite doesn't promise to keep
+its rowids through a VACUUM; call rebuild() after vacuuming by hand.
+
+Queries use FTS5 syntax ('"child tax credit" OR eitc', 'medic*',
+'title : poverty'); terms() builds one from plain terms, quoted so that
+user input can't break the syntax:
+
+    search = SessionSearch(conn)
+    search.sessions(terms(['snap', 'take-up'], prefix=True))
+    search.session_ids('title : ' + terms(['medicaid']))
+"""
+import sqlite3
+
+
+# (table, content table, rowid column, indexed columns)
+MIRRORS = (
+    ('sessions_fts', 'sessions', 'rowid', ('title', 'description', 'chair')),
+    ('papers_fts', 'papers', 'id', ('title', 'abstract')),
+    ('presenters_fts', 'presenters', 'id', ('name', 'affiliation')),
+)
+
+# Title matches count most when ranking sessions (bm25 column weights)
+SESSION_WEIGHTS = (5.0, 1.0, 0.5)
+
+SNIPPET_TOKENS = 12
+
+
+def _mirror_schema(table, content, rowid, columns):
+    names = ', '.join(columns)
+    new = ', '.join(f'new.{column}' for column in columns)
+    old = ', '.join(f'old.{column}' for column in columns)
+    changed = ' OR '.join(f'old.{column} IS NOT new.{column}' for column in columns)
+    delete = f"INSERT INTO {table}({table}, rowid, {names}) VALUES ('delete', old.{rowid}, {old});"
+    insert = f"INSERT INTO {table}(rowid, {names}) VALUES (new.{rowid}, {new});"
+    return (
+        f'''CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5(
+                {names}, content='{content}', content_rowid='{rowid}', prefix='2 3'
+            )''',
+        f'''CREATE TRIGGER IF NOT EXISTS {table}_insert AFTER INSERT ON {content} BEGIN
+                {insert}
+            END''',
+        f'''CREATE TRIGGER IF NOT EXISTS {table}_delete AFTER DELETE ON {content} BEGIN
+                {delete}
+            END''',
+        # Only text edits touch the index; score updates and unchanged upserts don't
+        f'''CREATE TRIGGER IF NOT EXISTS {table}_update AFTER UPDATE OF {names} ON {content}
+            WHEN {changed} BEGIN
+                {delete}
+                {insert}
+            END''',
+    )
+
+
+def fts5_available(conn):
+    """Whether this SQLite build has FTS5."""
+    try:
+        conn.execute('CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x)')
+    except sqlite3.OperationalError:
+        return False
+    conn.execute('DROP TABLE temp.fts5_probe')
+    return True
+
+
+def ensure_schema(cursor):
+    """
+    Create the FTS5 mirrors and their triggers, indexing existing rows the
+    first time (commit afterwards). Returns False, and does nothing,
+    without FTS5.
+    """
+    if not fts5_available(cursor.connection):
+        return False
+    existing = {row[0] for row in cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    for table, content, rowid, columns in MIRRORS:
+        for statement in _mirror_schema(table, content, rowid, columns):
+            cursor.execute(statement)
+        if table not in existing:
+            cursor.execute(f"INSERT INTO {table}({table}) VALUES ('rebuild')")
+    return True
+
+
+def rebuild(conn):
+    """Reindex every mirror from its table."""
+    with conn:
+        for table, _, _, _ in MIRRORS:
+            conn.execute(f"INSERT INTO {table}({table}) VALUES ('rebuild')")
+
+
+def terms(words, prefix=False):
+    """
+    An FTS5 query matching any of `words` (terms or phrases), each quoted;
+    with prefix=True, each also matches as a prefix ('tax' finds 'taxes').
+    """
+    star = '*' if prefix else ''
+    phrases = ['"' + word.replace('"', '""') + '"' + star for word in words if word.strip()]
+    if not phrases:
+        raise ValueError("No search terms given")
+    return '(' + ' OR '.join(phrases) + ')'
+
+
+class SessionSearch:
+    """Ranked full-text queries through an open connection."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        with conn:
+            ensure_schema(conn.cursor())
+
+    def _rows(self, sql, params):
+        cursor = self.conn.execute(sql, params)
+        columns = [description[0] for description in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor]
+
+    def sessions(self, query, limit=20):
+        """Best-matching sessions, with a highlighted snippet, best first."""
+        weights = ', '.join(str(weight) for weight in SESSION_WEIGHTS)
+        return self._rows(f'''
+            SELECT s.session_id, s.title, s.date, s.start_time,
+                   snippet(sessions_fts, -1, '[', ']', '…', {SNIPPET_TOKENS}) AS snippet,
+                   bm25(sessions_fts, {weights}) AS rank
+            FROM sessions_fts
+            JOIN sessions s ON s.rowid = sessions_fts.rowid
+            WHERE sessions_fts MATCH ?
+            ORDER BY rank
+            LIMIT ?
+        ''', (query, limit))
+
+    def papers(self, query, limit=20):
+        """Best-matching papers with their session, best first."""
+        return self._rows(f'''
+            SELECT p.id AS paper_id, p.session_id, p.title,
+                   snippet(papers_fts, -1, '[', ']', '…', {SNIPPET_TOKENS}) AS snippet,
+                   bm25(papers_fts) AS rank
+            FROM papers_fts
+            JOIN papers p ON p.id = papers_fts.rowid
+            WHERE papers_fts MATCH ?
+            ORDER BY rank
+            LIMIT ?
+        ''', (query, limit))
+
+    def presenters(self, query, limit=20):
+        """Best-matching presenters by name or affiliation, best first."""
+        return self._rows('''
+            SELECT pr.id AS presenter_id, pr.name, pr.email, pr.affiliation,
+                   bm25(presenters_fts) AS rank
+            FROM presenters_fts
+            JOIN presenters pr ON pr.id = presenters_fts.rowid
+            WHERE presenters_fts MATCH ?
+            ORDER BY rank
+            LIMIT ?
+        ''', (query, limit))
+
+    def session_ids(self, query, include_papers=False):
+        """
+        Ids of every session whose text matches, unranked, for filtering
+        in SQL or Python; include_papers also counts its papers' text.
+        """
+        sql = '''
+            SELECT s.session_id FROM sessions_fts
+            JOIN sessions s ON s.rowid = sessions_fts.rowid
+            WHERE sessions_fts MATCH ?
+        '''
+        params = (query,)
+        if include_papers:
+            sql += '''
+                UNION
+                SELECT p.session_id FROM papers_fts
+                JOIN papers p ON p.id = papers_fts.rowid
+                WHERE papers_fts MATCH ? AND p.session_id IS NOT NULL
+            '''
+            params = (query, query)
+        return {row[0] for row in self.conn.execute(sql, params)}
+
+
+if __name__ == '__main__':
+    import sys
+
+    conn = sqlite3.connect('appam_sessions.db')
+    search = SessionSearch(conn)
+    query = ' '.join(sys.argv[1:]) or 'microsimulation'
+
+    print(f"Sessions matching {query!r}:\n")
+    for row in search.sessions(query, limit=10):
+        print(f"  {row['session_id']}  {row['title'][:70]}")
+        print(f"      {row['snippet']}")
+
+    print(f"\nPapers matching {query!r}:\n")
+    for row in search.papers(query, limit=10):
+        print(f"  {row['session_id']}  {row['snippet']}")
+
+    conn.close()
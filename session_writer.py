@@ -0,0 +1,183 @@
+"""
+Batched persistence for parsed sessions.
+
+SessionWriter upserts a batch of session dicts (as produced by the
+scrapers' parse functions) with one executemany per table inside a single
+transaction. Presenter IDs come from an in-memory name -> id map, loaded
+once per writer; names not in it are inserted and looked up together
+instead of one SELECT per presenter. Each session's raw_html is compressed
+into session_html rather than stored in the sessions row, and its start
+and end times are stored as start_ts/end_ts (see time_utils.py) too.
+"""
+import json
+
+from html_store import HtmlStore
+from time_utils import ensure_time_columns, timestamp
+
+
+# Stay well under SQLite's bound-parameter limit in IN (...) lookups
+LOOKUP_CHUNK_SIZE = 500
+
+SESSION_UPSERT = '''
+    INSERT INTO sessions
+    (session_id, title, date, start_time, end_time, start_ts, end_ts, location, description, chair, papers)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(session_id) DO UPDATE SET
+        title = excluded.title,
+        date = excluded.date,
+        start_time = excluded.start_time,
+        end_time = excluded.end_time,
+        start_ts = excluded.start_ts,
+        end_ts = excluded.end_ts,
+        location = excluded.location,
+        description = excluded.description,
+        chair = excluded.chair,
+        papers = excluded.papers
+'''
+
+
+def _json_list(value, label):
+    """Decode a JSON list field, or None (with a warning) if it's malformed."""
+    if not isinstance(value, str):
+        return list(value)
+    try:
+        return json.loads(value)
+    except ValueError as e:
+        print(f"  Warning: Could not save {label}: {e}")
+        return None
+
+
+class SessionWriter:
+    """
+    Write parsed sessions to SQLite in batches.
+
+    Either call write_batch() with a list of sessions, or add() them one at
+    a time and let the writer flush every `batch_size` sessions; call
+    flush() (or use the writer as a context manager) to write the rest.
+
+    Scores and assignments on existing rows are kept, and an empty or None
+    raw_html keeps the stored HTML. With a ScrapeStatus, written sessions are
+    marked done in the same transaction.
+    """
+
+    def __init__(self, conn, batch_size=100, status=None):
+        self.conn = conn
+        self.batch_size = batch_size
+        self.status = status
+        self.pending = []
+        self.html_store = HtmlStore(conn)
+        ensure_time_columns(conn)
+        self._presenter_ids = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
+
+    def add(self, session_data):
+        """Queue a session, writing the queue once it reaches batch_size."""
+        self.pending.append(session_data)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Write every queued session; returns how many were written."""
+        batch, self.pending = self.pending, []
+        return self.write_batch(batch) if batch else 0
+
+    def presenter_ids(self, cursor, names):
+        """Map presenter names to IDs, inserting the ones not seen before."""
+        if self._presenter_ids is None:
+            self._presenter_ids = dict(cursor.execute('SELECT name, id FROM presenters'))
+
+        # Another connection may have added some since the map was loaded,
+        # so insert-or-ignore and then read back every missing name
+        missing = sorted(set(names) - self._presenter_ids.keys())
+        if missing:
+            cursor.executemany('INSERT OR IGNORE INTO presenters (name) VALUES (?)',
+                               [(name,) for name in missing])
+            for i in range(0, len(missing), LOOKUP_CHUNK_SIZE):
+                chunk = missing[i:i + LOOKUP_CHUNK_SIZE]
+                placeholders = ','.join('?' * len(chunk))
+                self._presenter_ids.update(cursor.execute(
+                    f'SELECT name, id FROM presenters WHERE name IN ({placeholders})', chunk
+                ))
+
+        return self._presenter_ids
+
+    def write_batch(self, sessions):
+        """Upsert sessions and their related rows in one transaction."""
+        # A session that appears twice in a batch keeps its last version
+        sessions = list({s['session_id']: s for s in sessions}.values())
+        try:
+            with self.conn:
+                self._write(self.conn.cursor(), sessions)
+        except Exception:
+            # IDs inserted in the rolled-back transaction no longer exist
+            self._presenter_ids = None
+            raise
+        return len(sessions)
+
+    def _write(self, cursor, sessions):
+        cursor.executemany(SESSION_UPSERT, [(
+            s['session_id'],
+            s['title'],
+            s['date'],
+            s['start_time'],
+            s['end_time'],
+            timestamp(s['date'], s['start_time']),
+            timestamp(s['date'], s['end_time']),
+            s['location'],
+            s['description'],
+            s['chair'],
+            s['papers']
+        ) for s in sessions])
+
+        self.html_store.put_many(cursor, [(s['session_id'], s.get('raw_html')) for s in sessions])
+
+        cursor.executemany('INSERT OR IGNORE INTO locations (name) VALUES (?)',
+                           [(s['location'],) for s in sessions if s.get('location')])
+
+        cursor.executemany('INSERT OR IGNORE INTO time_slots (date, start_time, end_time) VALUES (?, ?, ?)', [
+            (s['date'], s['start_time'], s['end_time'])
+            for s in sessions
+            if s.get('date') and s.get('start_time') and s.get('end_time')
+        ])
+
+        # Presenter links and papers are replaced wholesale for each session
+        # that has them
+        presenters = {}
+        papers = {}
+        for s in sessions:
+            if s.get('presenters'):
+                names = _json_list(s['presenters'], 'presenters')
+                if names is not None:
+                    presenters[s['session_id']] = names
+            if s.get('papers'):
+                titles = _json_list(s['papers'], 'papers')
+                if titles is not None:
+                    papers[s['session_id']] = titles
+
+        if presenters:
+            ids = self.presenter_ids(cursor, [name for names in presenters.values() for name in names])
+            cursor.executemany('DELETE FROM session_presenters WHERE session_id = ?',
+                               [(session_id,) for session_id in presenters])
+            cursor.executemany('INSERT OR IGNORE INTO session_presenters (session_id, presenter_id) VALUES (?, ?)', [
+                (session_id, ids[name])
+                for session_id, names in presenters.items()
+                for name in names
+            ])
+
+        if papers:
+            cursor.executemany('DELETE FROM papers WHERE session_id = ?',
+                               [(session_id,) for session_id in papers])
+            cursor.executemany('INSERT INTO papers (title, session_id) VALUES (?, ?)', [
+                (title, session_id)
+                for session_id, titles in papers.items()
+                for title in titles
+                if title and len(title) > 3
+            ])
+
+        if self.status is not None:
+            self.status.mark_done(cursor, [s['session_id'] for s in sessions])
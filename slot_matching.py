@@ -0,0 +1,149 @@
+"""
+Exact assignment of people to one slot's sessions and the booth.
+
+Every available person either attends one session or staffs the booth, a
+session gets at most one person, and the slot is worth the attendees'
+scores plus booth_values[k] for k people at the booth. match_slot() finds
+the best such assignment as a max-weight bipartite matching: one row per
+person, one column per session, and one column per booth seat, where seat
+j is worth the marginal value of a j-th person at the booth
+(booth_values[j] - booth_values[j - 1]).
+
+When those marginals never increase (each extra person at the booth adds
+no more than the last, as in OptimalScheduler's table), the best matching
+fills the seats in order and one assignment solve is exact. Otherwise each
+booth headcount is solved separately, on column slices of one weight
+matrix.
+
+Uses scipy.optimize.linear_sum_assignment when scipy is installed, and a
+pure-Python Hungarian algorithm otherwise.
+"""
+try:
+    import numpy as np
+    from scipy.optimize import linear_sum_assignment
+except ImportError:  # pragma: no cover - optional dependency
+    linear_sum_assignment = None
+
+
+def hungarian(weights):
+    """
+    Max-weight assignment of every row of a rows <= columns weight
+    matrix (lists); returns the column of each row. O(rows^2 * columns).
+    """
+    n = len(weights)
+    m = len(weights[0]) if n else 0
+    if n > m:
+        raise ValueError("hungarian() needs at least as many columns as rows")
+    # Shortest augmenting paths on costs -weights, 1-indexed with column
+    # 0 as the free end (the e-maxx formulation)
+    inf = float('inf')
+    u = [0.0] * (n + 1)
+    v = [0.0] * (m + 1)
+    owner = [0] * (m + 1)
+    way = [0] * (m + 1)
+    for row in range(1, n + 1):
+        owner[0] = row
+        column = 0
+        minimum = [inf] * (m + 1)
+        used = [False] * (m + 1)
+        while True:
+            used[column] = True
+            current = owner[column]
+            costs = weights[current - 1]
+            delta = inf
+            best = 0
+            for j in range(1, m + 1):
+                if not used[j]:
+                    reduced = -costs[j - 1] - u[current] - v[j]
+                    if reduced < minimum[j]:
+                        minimum[j] = reduced
+                        way[j] = column
+                    if minimum[j] < delta:
+                        delta = minimum[j]
+                        best = j
+            for j in range(m + 1):
+                if used[j]:
+                    u[owner[j]] += delta
+                    v[j] -= delta
+                else:
+                    minimum[j] -= delta
+            column = best
+            if owner[column] == 0:
+                break
+        while column:
+            previous = way[column]
+            owner[column] = owner[previous]
+            column = previous
+
+    assignment = [0] * n
+    for j in range(1, m + 1):
+        if owner[j]:
+            assignment[owner[j] - 1] = j - 1
+    return assignment
+
+
+def max_weight_assignment(weights):
+    """
+    The column of each row in a max-weight assignment (rows <= columns);
+    `weights` is a list of lists or, with scipy, an array.
+    """
+    if len(weights) == 0:
+        return []
+    if linear_sum_assignment is None:
+        return hungarian(weights)
+    rows, columns = linear_sum_assignment(np.asarray(weights, dtype=float), maximize=True)
+    assignment = [0] * len(weights)
+    for row, column in zip(rows.tolist(), columns.tolist()):
+        assignment[row] = column
+    return assignment
+
+
+def match_slot(scores, booth_values):
+    """
+    Best assignment for one slot.
+
+    `scores[p][s]` is person p's value for session s, and booth_values[k]
+    the booth's value with k people there (k = 0 .. len(scores)). Returns
+    (sessions, value): the session index each person attends, or None for
+    the booth, and the slot's total value.
+    """
+    n = len(scores)
+    m = len(scores[0]) if n else 0
+    marginals = [booth_values[k] - booth_values[k - 1] for k in range(1, n + 1)]
+    monotone = all(later <= earlier for earlier, later in zip(marginals, marginals[1:]))
+
+    # Seat j is worth the j-th marginal when seats are filled in order;
+    # otherwise every seat is worth more than any session, so that all the
+    # seats offered are taken
+    seats = marginals if monotone else [max((value for row in scores for value in row), default=0) + 1] * n
+    if linear_sum_assignment is None:
+        weights = [list(row) + seats for row in scores]
+    else:
+        weights = np.empty((n, m + n))
+        weights[:, :m] = np.asarray(scores, dtype=float).reshape(n, m)
+        weights[:, m:] = seats
+
+    if monotone:
+        columns = max_weight_assignment(weights)
+        sessions = [column if column < m else None for column in columns]
+        return sessions, _value(scores, sessions, booth_values)
+
+    # Any booth value table: solve for each headcount k, offering the first
+    # k seats of the one weight matrix
+    best = None
+    for k in range(max(0, n - m), n + 1):
+        if linear_sum_assignment is None:
+            offered = [row[:m + k] for row in weights]
+        else:
+            offered = weights[:, :m + k]
+        columns = max_weight_assignment(offered)
+        sessions = [column if column < m else None for column in columns]
+        candidate = (sessions, _value(scores, sessions, booth_values))
+        if best is None or candidate[1] > best[1]:
+            best = candidate
+    return best
+
+
+def _value(scores, sessions, booth_values):
+    at_booth = sum(1 for session in sessions if session is None)
+    return booth_values[at_booth] + sum(float(scores[p][s]) for p, s in enumerate(sessions) if s is not None)
@@ -5,21 +5,34 @@ Takes top sessions from keyword scoring and re-scores based on actual relevance.
 import sqlite3
 import json
 
+from session_search import ensure_schema as ensure_search_schema
 
-def get_top_sessions_for_review(db_path='appam_sessions.db', limit=100):
-    """Get top sessions from keyword scoring for manual review."""
+
+def get_top_sessions_for_review(db_path='appam_sessions.db', limit=100, query=None):
+    """
+    Get top sessions from keyword scoring for manual review, optionally
+    only those matching an FTS5 full-text query (see session_search.py).
+    """
     conn = sqlite3.connect(db_path)
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
 
-    cursor.execute('''
+    match = ''
+    params = [limit]
+    if query is not None:
+        with conn:
+            ensure_search_schema(cursor)
+        match = 'AND rowid IN (SELECT rowid FROM sessions_fts WHERE sessions_fts MATCH ?)'
+        params.insert(0, query)
+
+    cursor.execute(f'''
         SELECT session_id, title, description, date, start_time, end_time,
                location, chair, papers, relevance_score
         FROM sessions
-        WHERE relevance_score > 5
+        WHERE relevance_score > 5 {match}
         ORDER BY relevance_score DESC
         LIMIT ?
-    ''', (limit,))
+    ''', params)
 
     sessions = []
     for row in cursor.fetchall():
@@ -0,0 +1,52 @@
+"""
+Shared test helpers: session rows, and a database seeded with them.
+
+A module seeds `db_path` with its own sessions by overriding the `sessions`
+fixture (or parametrizing it); without one the database is empty. `conn`
+is a connection to it.
+"""
+import json
+import sqlite3
+import pytest
+from scraper import APPAMScraper
+
+
+def make_session(session_id, presenters=(), papers=(), **fields):
+    session = {
+        'session_id': session_id,
+        'title': f'Session {session_id}',
+        'date': '2025-11-13',
+        'start_time': '10:15 AM',
+        'end_time': '11:45 AM',
+        'location': 'Room 101',
+        'description': '',
+        'chair': '',
+        'papers': json.dumps(list(papers)),
+        'presenters': json.dumps(list(presenters)),
+        'raw_html': f'<html>{session_id}</html>'
+    }
+    session.update(fields)
+    return session
+
+
+@pytest.fixture
+def sessions():
+    """The sessions db_path is seeded with."""
+    return []
+
+
+@pytest.fixture
+def db_path(tmp_path, sessions):
+    db_path = str(tmp_path / 'test.db')
+    scraper = APPAMScraper(db_path=db_path)
+    scraper.init_database()
+    if sessions:
+        scraper.save_sessions(sessions)
+    return db_path
+
+
+@pytest.fixture
+def conn(db_path):
+    conn = sqlite3.connect(db_path)
+    yield conn
+    conn.close()
@@ -0,0 +1,96 @@
+"""
+Tests for the async scraping engine.
+"""
+import asyncio
+import time
+from async_scraper import AsyncSessionScraper, HostRateLimiter
+
+
+class FakeFetchScraper(AsyncSessionScraper):
+    """Engine whose fetch returns canned HTML instead of driving a browser."""
+
+    def __init__(self, *args, delay=0.01, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def fetch_page(self, url, wait_until='load', ready_check=None):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        if 'bad' in url:
+            raise RuntimeError('page failed to load')
+        return f'<html>{url}</html>', {}
+
+
+def make_engine(saved, concurrency=3, **kwargs):
+    return FakeFetchScraper(
+        lambda session_id: f'http://example.test/{session_id}',
+        lambda session_id, html: {'session_id': session_id, 'title': f'Session {session_id}', 'raw_html': html},
+        saved.append,
+        concurrency=concurrency,
+        requests_per_second=0,
+        **kwargs
+    )
+
+
+def test_scrape_sessions_saves_every_session():
+    """Test that every session is parsed and handed to the save callback."""
+    saved = []
+    engine = make_engine(saved)
+
+    results = asyncio.run(engine.scrape_sessions([str(i) for i in range(10)]))
+
+    assert results['saved'] == 10
+    assert results['errors'] == []
+    assert sorted(s['session_id'] for s in saved) == sorted(str(i) for i in range(10))
+
+
+def test_scrape_sessions_respects_concurrency_limit():
+    """Test that no more than `concurrency` fetches run at once."""
+    saved = []
+    engine = make_engine(saved, concurrency=3)
+
+    asyncio.run(engine.scrape_sessions([str(i) for i in range(12)]))
+
+    assert engine.max_in_flight == 3
+
+
+def test_scrape_sessions_collects_errors():
+    """Test that failed sessions are reported without stopping the others."""
+    saved = []
+    engine = make_engine(saved)
+
+    results = asyncio.run(engine.scrape_sessions(['1', 'bad', '2']))
+
+    assert results['saved'] == 2
+    assert [session_id for session_id, _ in results['errors']] == ['bad']
+
+
+def test_host_rate_limiter_spaces_requests():
+    """Test that requests to one host are spaced by the configured interval."""
+    limiter = HostRateLimiter(requests_per_second=50)
+
+    async def hit(n):
+        start = time.perf_counter()
+        await asyncio.gather(*(limiter.wait('http://example.test/page') for _ in range(n)))
+        return time.perf_counter() - start
+
+    elapsed = asyncio.run(hit(6))
+
+    # Six requests at 50/s need at least five 20ms gaps
+    assert elapsed >= 0.09
+
+
+def test_host_rate_limiter_is_per_host():
+    """Test that different hosts don't wait on each other."""
+    limiter = HostRateLimiter(requests_per_second=1)
+
+    async def hit():
+        start = time.perf_counter()
+        await asyncio.gather(*(limiter.wait(f'http://host{i}.test/') for i in range(5)))
+        return time.perf_counter() - start
+
+    assert asyncio.run(hit()) < 0.5
@@ -0,0 +1,103 @@
+"""
+Tests for the compiled team availability matrix.
+"""
+import pytest
+
+import availability as availability_module
+from availability import Availability, away_intervals
+from conference_snapshot import Slot
+from time_utils import timestamp
+from optimal_scheduler import OptimalScheduler
+from scheduler import ConferenceScheduler
+
+
+CONSTRAINTS = {
+    'Max Ghenis': {
+        'start': ('2025-11-13', '11:30am'),
+        'away': [
+            # A lunch meeting, and an overlapping off-site visit
+            (('2025-11-14', '12:00pm'), ('2025-11-14', '1:30 PM')),
+            (('2025-11-14', '1:00pm'), ('2025-11-14', '2:00pm')),
+        ],
+    },
+    'Pavel Makarchuk': {'end': ('2025-11-15', '7:00am')},
+}
+PEOPLE = ['Max Ghenis', 'Pavel Makarchuk', 'Daphne Hansell']
+
+
+def test_away_intervals_are_merged():
+    """Test arrival, departure and overlapping windows as sorted [from, until) intervals."""
+    assert away_intervals('Max Ghenis', CONSTRAINTS['Max Ghenis']) == [
+        (None, timestamp('2025-11-13', '11:30am')),
+        (timestamp('2025-11-14', '12:00pm'), timestamp('2025-11-14', '2:00pm')),
+    ]
+    assert away_intervals('Pavel Makarchuk', CONSTRAINTS['Pavel Makarchuk']) == [
+        (timestamp('2025-11-15', '7:00am'), None)]
+    assert away_intervals('Daphne Hansell', {}) == []
+    with pytest.raises(ValueError):
+        away_intervals('Max Ghenis', {'start': ('2025-11-13', 'lunchtime')})
+
+
+@pytest.mark.parametrize('date, start_time, expected', [
+    ('2025-11-13', '9:00am', ['Pavel Makarchuk', 'Daphne Hansell']),
+    ('2025-11-13', '11:30 AM', PEOPLE),
+    ('2025-11-14', '12:15pm', ['Pavel Makarchuk', 'Daphne Hansell']),
+    ('2025-11-14', '1:45pm', ['Pavel Makarchuk', 'Daphne Hansell']),
+    ('2025-11-14', '2:00pm', PEOPLE),
+    ('2025-11-15', '6:59am', PEOPLE),
+    ('2025-11-15', '7:00am', ['Max Ghenis', 'Daphne Hansell']),
+    # Unparseable slots count as everyone available
+    ('2025-11-15', 'TBA', PEOPLE),
+])
+def test_available_people(date, start_time, expected):
+    team = Availability(PEOPLE, CONSTRAINTS)
+    assert team.available_people(date, start_time) == expected
+    assert [team.is_available(person, date, start_time) for person in PEOPLE] == [p in expected for p in PEOPLE]
+
+
+def test_matrix_is_compiled_once_per_slot(monkeypatch):
+    """Test that lookups after compiling don't parse times again."""
+    slots = [{'date': '2025-11-13', 'start_time': '9:00am'}, {'date': '2025-11-14', 'start_time': '12:15pm'}]
+    team = Availability(PEOPLE, CONSTRAINTS, slots)
+    assert team.slots == [timestamp('2025-11-13', '9:00am'), timestamp('2025-11-14', '12:15pm')]
+    assert list(team.matrix['Max Ghenis']) == [0, 0]
+    assert list(team.matrix['Daphne Hansell']) == [1, 1]
+
+    monkeypatch.setattr(availability_module, '_constraint_timestamp', None)
+    for _ in range(3):
+        assert not team.is_available('Max Ghenis', '2025-11-13', '9:00am')
+        assert team.available_people('2025-11-14', '12:15pm') == ['Pavel Makarchuk', 'Daphne Hansell']
+
+    # Someone outside the compiled team (e.g. from the people table) is checked directly
+    assert team.is_available('New Hire', '2025-11-13', '9:00am')
+
+
+def test_snapshot_slots_compile_by_start_ts(monkeypatch):
+    """Test that snapshot Slots, whose start_ts is an attribute, aren't parsed again."""
+    start_ts = timestamp('2025-11-13', '9:00am')
+    team = Availability(PEOPLE, CONSTRAINTS)
+    monkeypatch.setattr(availability_module, 'timestamp', None)
+    team.add_slots([Slot('2025-11-13', '9:00am', '', [], {}, start_ts=start_ts)])
+    assert team.slots == [start_ts]
+
+
+def test_schedulers_share_the_compiled_availability():
+    """Test both schedulers, including 'away' windows and reassigned constraints."""
+    optimal = OptimalScheduler(db_path=None)
+    # Space-separated times were treated as everyone available before
+    assert not optimal.is_available('Max Ghenis', '2025-11-13', '10:15 AM')
+    assert not optimal.is_available('Pavel Makarchuk', '2025-11-15', '8:00 AM')
+    compiled = optimal.team_availability()
+    assert optimal.team_availability() is compiled
+
+    optimal.availability = {'Max Ghenis': {'away': [(('2025-11-14', '9:00am'), ('2025-11-14', '10:00am'))]}}
+    assert optimal.team_availability() is not compiled
+    assert optimal.team_availability().available_people('2025-11-14', '9:30am') == [
+        'Pavel Makarchuk', 'Daphne Hansell']
+    value = optimal.calculate_slot_value({p: None for p in optimal.people}, '2025-11-14', '9:30am')
+    assert value['num_available'] == 2
+
+    conference = ConferenceScheduler(db_path=None)
+    assert not conference.is_available('Max Ghenis', '2025-11-13', '11:00am')
+    assert conference.is_available('Max Ghenis', '2025-11-13', '11:30am')
+    assert conference.is_available('Pavel Makarchuk', '2025-11-16', '9:00am')
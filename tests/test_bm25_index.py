@@ -0,0 +1,148 @@
+"""
+Tests for the persisted BM25 index.
+"""
+import json
+import math
+import os
+import sqlite3
+import pytest
+from tests.conftest import make_session
+
+pytest.importorskip('numpy')
+
+import bm25_index  # noqa: E402
+from bm25_index import BM25Index, query_weights, tokenize  # noqa: E402
+from scraper import APPAMScraper  # noqa: E402
+
+
+@pytest.fixture
+def sessions():
+    return [
+        make_session('S1', title='Child Tax Credit Expansion', description='Poverty effects of the CTC'),
+        make_session('S2', title='Medicaid Expansion', description='Health insurance coverage',
+                     papers=['Medicaid and poverty']),
+        make_session('S3', title='Urban Planning', description='Zoning and housing supply'),
+    ]
+
+
+def execute(db_path, sql, *params):
+    conn = sqlite3.connect(db_path)
+    conn.execute(sql, params)
+    conn.commit()
+    conn.close()
+
+
+def as_dict(index, query):
+    return dict(zip(index.session_ids, index.scores(query).tolist()))
+
+
+def test_tokenize_and_profiles():
+    """Test tokenizing and spreading phrase weights over their tokens."""
+    assert tokenize('The SNAP take-up of 2025') == ['snap', 'take', 'up', '2025']
+    assert query_weights('tax tax credit') == {'tax': 2, 'credit': 1}
+    assert query_weights({'tax credit': 1.5, 'tax': 2.0}) == {'tax': 3.5, 'credit': 1.5}
+
+
+def test_bm25_scores(db_path, tmp_path):
+    """Test scores against BM25 computed by hand, and ranking with paper text."""
+    index = BM25Index(str(tmp_path / 'bm25'))
+    assert index.update(db_path) == 3
+
+    lengths = dict(zip(index.session_ids, index.lengths.tolist()))
+    average = sum(lengths.values()) / 3
+    idf = math.log(1 + (3 - 2 + 0.5) / (2 + 0.5))  # 'poverty' is in S1 and in S2's paper
+    expected = idf * 2.2 / (1 + 1.2 * (1 - 0.75 + 0.75 * lengths['S1'] / average))
+    assert as_dict(index, 'poverty')['S1'] == pytest.approx(expected)
+    assert as_dict(index, 'poverty')['S3'] == 0
+
+    assert [session_id for session_id, _ in index.top({'medicaid': 2.0, 'expansion': 1.0})] == ['S2', 'S1']
+    assert index.top('unknown words') == []
+
+
+def test_index_is_persisted_and_memory_mapped(db_path, tmp_path):
+    """Test that a reopened index scores the same from memory-mapped arrays."""
+    path = str(tmp_path / 'bm25')
+    index = BM25Index(path)
+    index.update(db_path)
+
+    reopened = BM25Index(path)
+    assert reopened.session_ids == index.session_ids
+    assert type(reopened.docs).__name__ == 'memmap'
+    assert as_dict(reopened, 'health insurance poverty') == as_dict(index, 'health insurance poverty')
+    assert reopened.update(db_path) == 0
+
+
+def test_incremental_update_matches_rebuild(db_path, tmp_path):
+    """Test that edits, additions and deletions match a fresh build."""
+    index = BM25Index(str(tmp_path / 'bm25'))
+    index.update(db_path)
+
+    execute(db_path, "UPDATE sessions SET description = 'Housing vouchers and poverty' WHERE session_id = 'S3'")
+    execute(db_path, "DELETE FROM sessions WHERE session_id = 'S1'")
+    execute(db_path, "UPDATE papers SET abstract = 'Abstract on vouchers' WHERE session_id = 'S2'")
+    APPAMScraper(db_path=db_path).save_sessions([make_session('S4', title='SNAP Take-Up')])
+
+    assert index.update(db_path) == 3
+    assert sorted(index.session_ids) == ['S2', 'S3', 'S4']
+
+    rebuilt = BM25Index(str(tmp_path / 'rebuilt'))
+    rebuilt.update(db_path)
+    for query in ['poverty', 'vouchers', 'snap take up', 'child tax credit']:
+        assert as_dict(index, query) == pytest.approx(as_dict(rebuilt, query)), query
+
+
+def test_interrupted_save_keeps_the_previous_index(db_path, tmp_path, monkeypatch):
+    """Test that a save that dies before switching meta.json leaves the last index whole."""
+    path = str(tmp_path / 'bm25')
+    index = BM25Index(path)
+    index.update(db_path)
+    before = as_dict(index, 'medicaid poverty')
+
+    replace = os.replace
+
+    def crash(source, destination):
+        # Dies just before meta.json is switched, after every array is written
+        if destination.endswith('meta.json'):
+            raise OSError('disk full')
+        replace(source, destination)
+
+    APPAMScraper(db_path=db_path).save_sessions([make_session('S4', title='Medicaid Work Requirements')])
+    monkeypatch.setattr(bm25_index.os, 'replace', crash)
+    with pytest.raises(OSError):
+        BM25Index(path).update(db_path)
+    monkeypatch.undo()
+
+    reopened = BM25Index(path)
+    assert as_dict(reopened, 'medicaid poverty') == before
+    assert reopened.update(db_path) == 1
+    assert 'S4' in as_dict(BM25Index(path), 'medicaid')
+    # The generation replaced is kept for readers that just read meta.json
+    assert sorted(name for name in os.listdir(path) if name.endswith('.npy')) == [
+        'docs.1.npy', 'docs.2.npy', 'lengths.1.npy', 'lengths.2.npy',
+        'offsets.1.npy', 'offsets.2.npy', 'tfs.1.npy', 'tfs.2.npy']
+
+
+def test_reader_behind_two_saves_rereads_meta(db_path, tmp_path, monkeypatch):
+    """Test that a reader whose meta.json names removed arrays reads meta.json again."""
+    path = str(tmp_path / 'bm25')
+    BM25Index(path).update(db_path)
+    with open(os.path.join(path, 'meta.json'), encoding='utf-8') as f:
+        stale = json.load(f)
+
+    # Two saves later the first generation is gone
+    for session_id in ('S4', 'S5'):
+        APPAMScraper(db_path=db_path).save_sessions([make_session(session_id, title='Medicaid Work Requirements')])
+        BM25Index(path).update(db_path)
+    assert not os.path.exists(os.path.join(path, 'docs.1.npy'))
+
+    reads = []
+    load = json.load
+
+    def read_stale_first(f):
+        reads.append(f)
+        return stale if len(reads) == 1 else load(f)
+
+    monkeypatch.setattr(bm25_index.json, 'load', read_stale_first)
+    reader = BM25Index(path)
+    assert len(reads) == 2 and reader.generation == 3
+    assert {'S4', 'S5'} <= set(reader.session_ids)
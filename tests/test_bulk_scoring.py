@@ -0,0 +1,128 @@
+"""
+Tests for vectorized bulk scoring.
+"""
+import json
+import random
+import sqlite3
+import pytest
+
+pytest.importorskip('numpy')
+
+from bulk_scoring import BulkScorer  # noqa: E402
+from relevance_scorer import RelevanceScorer  # noqa: E402
+from scraper import APPAMScraper  # noqa: E402
+
+
+def synthetic_sessions(count, keywords, seed=0):
+    """Sessions mixing scoring keywords with filler and near misses."""
+    rng = random.Random(seed)
+    vocabulary = keywords + ['the', 'study', 'of', 'academic', 'first', 'snapshot', 'Tax', 'SNAP-Ed']
+
+    def words(n):
+        return ' '.join(rng.choice(vocabulary) for _ in range(n))
+
+    return [{
+        'session_id': str(i),
+        'title': words(rng.randint(2, 8)).title(),
+        'description': words(rng.randint(0, 40)),
+        'chair': 'Jane Doe',
+        'papers': json.dumps([words(5) for _ in range(rng.randint(0, 3))]),
+    } for i in range(count)]
+
+
+@pytest.fixture
+def scorer():
+    return RelevanceScorer(db_path=':memory:')
+
+
+@pytest.fixture
+def sessions(scorer):
+    return synthetic_sessions(300, list(scorer.keywords), seed=3)
+
+
+def test_scores_match_per_session_scorer(scorer, sessions):
+    """Test that bulk base scores equal score_session for every session."""
+    bulk = BulkScorer(scorer)
+    scores = bulk.scores(bulk.index(sessions))
+
+    assert scores.tolist() == [scorer.score_session(s)['score'] for s in sessions]
+
+
+def test_explanations_match_per_session_scorer(scorer, sessions):
+    """Test that bulk explanations equal the per-session scorer's."""
+    bulk = BulkScorer(scorer)
+    expected = [scorer.explanation(scorer.score_session(s)) for s in sessions]
+    assert bulk.explanations(bulk.index(sessions)) == expected
+    assert scorer.explained_scores(sessions[:5]) == [
+        (scorer.score_session(s)['score'], explanation) for s, explanation in zip(sessions[:5], expected)
+    ]
+
+
+def test_person_scores_match_per_session_scorer(scorer, sessions):
+    """Test that bulk person scores equal score_for_person for every person."""
+    bulk = BulkScorer(scorer)
+    index = bulk.index(sessions)
+
+    for person, scores in bulk.all_person_scores(index).items():
+        assert scores.tolist() == [scorer.score_for_person(s, person)['score'] for s in sessions], person
+    assert bulk.person_scores(index, 'Nobody').tolist() == bulk.scores(index).tolist()
+
+
+def test_person_explanations_match_per_session_scorer(scorer, sessions):
+    """Test the stored per-person results: score, base, modifier and interest terms."""
+    bulk = BulkScorer(scorer)
+    index = bulk.index(sessions)
+
+    for person in [*scorer.person_interests, 'Nobody']:
+        expected = [scorer.score_for_person(s, person) for s in sessions]
+        assert bulk.person_explanations(index, person) == [
+            (result['score'], None, scorer.person_explanation(result)) for result in expected
+        ], person
+    assert any(explanation['terms'] for _, _, explanation in bulk.person_explanations(index, 'Daphne Hansell'))
+
+
+def test_weight_changes_reuse_the_index(scorer, sessions):
+    """Test that new weights rescore without rescanning, matching an edited scorer."""
+    bulk = BulkScorer(scorer)
+    index = bulk.index(sessions)
+    weights = {**scorer.keywords, 'poverty': 20, 'snap': 0}
+
+    rescored = bulk.scores(index, weights)
+
+    scorer.keywords = weights
+    assert rescored.tolist() == [scorer.score_session(s)['score'] for s in sessions]
+    with pytest.raises(KeyError):
+        bulk.scores(index, {'zoning': 3})
+
+
+def test_counts_matrix(scorer):
+    """Test the session x keyword count matrix."""
+    bulk = BulkScorer(scorer)
+    index = bulk.index([
+        {'session_id': 'S1', 'title': 'Poverty', 'description': 'poverty and SNAP', 'chair': '', 'papers': ''},
+        {'session_id': 'S2', 'title': 'Nothing here', 'description': '', 'chair': '', 'papers': ''},
+    ])
+    counts = index.counts.toarray() if hasattr(index.counts, 'toarray') else index.counts
+
+    assert index.session_ids == ['S1', 'S2']
+    assert counts[0, bulk.vocabulary.index('poverty')] == 2
+    assert counts[0, bulk.vocabulary.index('snap')] == 1
+    assert counts[1].sum() == 0
+
+
+def test_score_all_sessions_uses_bulk_scores(tmp_path, scorer, sessions):
+    """Test that the database rescoring writes the same scores."""
+    db_path = str(tmp_path / 'test.db')
+    APPAMScraper(db_path=db_path).init_database()
+    conn = sqlite3.connect(db_path)
+    conn.executemany('''
+        INSERT INTO sessions (session_id, title, date, start_time, end_time, description, chair, papers)
+        VALUES (?, ?, '2025-11-13', '10:15 AM', '11:45 AM', ?, ?, ?)
+    ''', [(s['session_id'], s['title'], s['description'], s['chair'], s['papers']) for s in sessions[:50]])
+    conn.commit()
+
+    RelevanceScorer(db_path=db_path).score_all_sessions()
+
+    stored = dict(conn.execute('SELECT session_id, relevance_score FROM sessions'))
+    conn.close()
+    assert stored == {s['session_id']: scorer.score_session(s)['score'] for s in sessions[:50]}
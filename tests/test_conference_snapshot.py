@@ -0,0 +1,105 @@
+"""
+Tests for the one-query conference snapshot the schedulers run against.
+"""
+import sqlite3
+import pytest
+from conference_snapshot import ConferenceSnapshot
+from optimal_scheduler import OptimalScheduler
+from relevance_scorer import RelevanceScorer
+from scheduler import ConferenceScheduler
+from session_scores import SessionScores
+from tests.conftest import make_session
+
+
+PEOPLE = ['Max Ghenis', 'Pavel Makarchuk', 'Daphne Hansell']
+
+
+@pytest.fixture
+def sessions():
+    return [
+        make_session('S1', date='2025-11-14', start_time='10:15 AM',
+                     description='Microsimulation of the child tax credit'),
+        make_session('S2', date='2025-11-14', start_time='10:15am', end_time='11:45am',
+                     description='Medicaid expansion and health insurance'),
+        make_session('S3', date='2025-11-14', start_time='9:00 AM', description='Urban planning methods'),
+        make_session('S4', date='2025-11-14', start_time='1:45 PM', description='SNAP and poverty'),
+        make_session('S5', date='', description='Not scheduled yet'),
+    ]
+
+
+@pytest.fixture
+def db_path(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.executemany('UPDATE sessions SET general_score = ? WHERE session_id = ?',
+                     [(40, 'S1'), (60, 'S2'), (20, 'S3'), (80, 'S4')])
+    conn.commit()
+    SessionScores(conn).write('dual', [('S1', 'Max Ghenis', 95, None), ('S2', 'Daphne Hansell', 90, None),
+                                       ('S1', 'Pavel Makarchuk', 10, None)])
+    SessionScores(conn).write('semantic', [('S1', 'Max Ghenis', 1, None)])
+    conn.close()
+    return db_path
+
+
+def test_slots_grouped_by_parsed_times(db_path):
+    """Test slot grouping, chronological order, ranking and score arrays."""
+    snapshot = ConferenceSnapshot.load(db_path, PEOPLE)
+
+    # '10:15 AM' and '10:15am' are one slot; unscheduled sessions are left out
+    assert [(slot['start_time'], slot.session_ids) for slot in snapshot] == [
+        ('9:00 AM', ('S3',)),
+        ('10:15am', ('S2', 'S1')),
+        ('1:45 PM', ('S4',)),
+    ]
+    slot = snapshot.slot('2025-11-14', '10:15 AM', '11:45 AM')
+    assert slot is snapshot.slots[1]
+    assert slot == {'date': '2025-11-14', 'start_time': '10:15am', 'end_time': '11:45am'}
+    # Stored scores, falling back to the general score
+    assert list(slot.scores['Max Ghenis']) == [60, 95]
+    assert list(slot.scores['Daphne Hansell']) == [90, 40]
+    assert list(slot.scores['Pavel Makarchuk']) == [60, 10]
+    assert slot.sessions[1]['person_scores'] == {'Max Ghenis': 95, 'Pavel Makarchuk': 10}
+    assert snapshot.slot('2025-11-15', '9:00am', '10:00am') is None
+
+    semantic = ConferenceSnapshot.load(db_path, PEOPLE, scorer='semantic')
+    assert list(semantic.slots[1].scores['Max Ghenis']) == [60, 1]
+
+    # Only the columns asked for
+    assert 'description' not in slot.sessions[0]
+    with pytest.raises(ValueError):
+        ConferenceSnapshot.load(db_path, PEOPLE, order_by='title; DROP TABLE sessions')
+    with pytest.raises(ValueError):
+        ConferenceSnapshot.load(db_path, PEOPLE, columns=('session_id', 'raw_html'))
+
+
+def test_schedulers_run_against_the_snapshot(db_path, monkeypatch):
+    """Test both schedulers without a query per slot."""
+    def no_slot_queries(*args):
+        raise AssertionError('queried a slot')
+
+    conference = ConferenceScheduler(db_path)
+    optimal = OptimalScheduler(db_path)
+    for scheduler in (conference, optimal):
+        monkeypatch.setattr(scheduler, 'get_sessions_for_slot', no_slot_queries)
+        monkeypatch.setattr(scheduler, 'get_time_slots', no_slot_queries)
+
+    # Personalized relevance scores are stored once and read, never recomputed
+    RelevanceScorer(db_path=db_path).score_all_sessions()
+    monkeypatch.setattr(RelevanceScorer, 'score_for_person', no_slot_queries)
+    conn = sqlite3.connect(db_path)
+    explanation = SessionScores(conn).details(['S2'], 'relevance')['S2']['Daphne Hansell']['explanation']
+    conn.close()
+    assert explanation['modifier'] == 2.0 and explanation['terms'] == ['health insurance', 'medicaid']
+
+    result = conference.assign_sessions('personalized')
+    # Daphne's health interest makes the Medicaid session hers
+    assert [s['session_id'] for s in result['assignments']['Daphne Hansell']] == ['S2']
+    assert set(result['booth_coverage']) == {'2025-11-14 9:00 AM', '2025-11-14 10:15 AM', '2025-11-14 1:45 PM'}
+
+    all_assignments = optimal.optimize_schedule()
+    assignment = all_assignments[1]['assignment']
+    assert assignment['Max Ghenis']['session_id'] == 'S1'
+    assert assignment['Daphne Hansell']['session_id'] == 'S2'
+    conn = sqlite3.connect(db_path)
+    assigned = dict(conn.execute('SELECT session_id, assigned_to FROM sessions WHERE assigned_to IS NOT NULL'))
+    conn.close()
+    assert assigned['S1'] == 'Max Ghenis' and assigned['S2'] == 'Daphne Hansell'
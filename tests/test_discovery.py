@@ -0,0 +1,136 @@
+"""
+Tests for calendar discovery and streaming detail scraping.
+"""
+import asyncio
+import sqlite3
+import pytest
+import async_scraper
+from async_scraper import AsyncSessionScraper, SessionQueue
+from scraper import APPAMScraper
+
+
+def calendar_page(days, session_ids):
+    nav = ''.join(f'<a href="index.php?selected_day={day}">{day}</a>' for day in days)
+    links = ''.join(f'<a href="index.php?selected_session_id={sid}">Session {sid}</a>' for sid in session_ids)
+    return f'<html><body><nav>{nav}</nav>{links}</body></html>'
+
+
+class FakeSiteScraper(AsyncSessionScraper):
+    """Engine serving canned calendar and session pages without a browser."""
+
+    calendars = {}
+    calendar_delays = {}
+    events = []
+
+    async def __aenter__(self):
+        return self
+
+    async def close(self):
+        pass
+
+    async def fetch_page(self, url, wait_until='load', ready_check=None):
+        if 'selected_day=' in url:
+            day = url.split('selected_day=')[1]
+            await asyncio.sleep(self.calendar_delays.get(day, 0.01))
+            self.events.append(('calendar', day))
+            return calendar_page(*self.calendars[day]), {}
+
+        session_id = url.split('selected_session_id=')[1].split('&')[0]
+        await asyncio.sleep(0.01)
+        self.events.append(('session', session_id))
+        return f'<html><body><h2>Session number {session_id}</h2></body></html>', {}
+
+
+@pytest.fixture
+def fake_site(monkeypatch):
+    FakeSiteScraper.events = []
+    FakeSiteScraper.calendar_delays = {}
+    monkeypatch.setattr(async_scraper, 'AsyncSessionScraper', FakeSiteScraper)
+    return FakeSiteScraper
+
+
+@pytest.fixture
+def scraper(tmp_path):
+    scraper = APPAMScraper(db_path=str(tmp_path / 'test.db'))
+    scraper.init_database()
+    return scraper
+
+
+def test_parse_calendar_days(scraper):
+    """Test that the calendar's day navigation is read."""
+    html = calendar_page(['2025-11-13', '2025-11-12', '2025-11-13'], [])
+    assert scraper.parse_calendar_days(html) == ['2025-11-12', '2025-11-13']
+
+
+def test_record_calendar_persists_and_follows_days(scraper):
+    """Test that discovered IDs are saved and new days are queued for discovery."""
+    scraper.conference_dates = ['2025-11-12']
+    session_ids = scraper.record_calendar('2025-11-12', calendar_page(['2025-11-12', '2025-11-13'], ['1', '2']))
+
+    assert session_ids == ['1', '2']
+    assert scraper.conference_dates == ['2025-11-12', '2025-11-13']
+    assert scraper.discovered_session_ids() == ['1', '2']
+
+
+def test_configured_days_are_not_extended(tmp_path):
+    """Test that an explicit day list is used as given."""
+    scraper = APPAMScraper(db_path=str(tmp_path / 'test.db'), days=['2025-11-14'])
+    scraper.init_database()
+    scraper.record_calendar('2025-11-14', calendar_page(['2025-11-14', '2025-11-15'], ['1']))
+
+    assert scraper.conference_dates == ['2025-11-14']
+
+
+def test_session_queue_dedupes_and_closes():
+    """Test that the queue hands out each ID once and then None."""
+    async def drain():
+        queue = SessionQueue(['1', '2'])
+        queue.put(['2', '3', '3'])
+        queue.close()
+        return [await queue.get() for _ in range(5)], queue.session_ids
+
+    received, queued = asyncio.run(drain())
+    assert received == ['1', '2', '3', None, None]
+    assert queued == ['1', '2', '3']
+
+
+def test_discovery_runs_concurrently_and_streams(scraper, fake_site):
+    """Test that days load concurrently and details start before discovery ends."""
+    scraper.conference_dates = ['2025-11-12']
+    days = ['2025-11-12', '2025-11-13', '2025-11-14']
+    fake_site.calendars = {
+        '2025-11-12': (days, ['1', '2']),
+        '2025-11-13': (days, ['2', '3']),
+        '2025-11-14': (days, ['4']),
+    }
+    fake_site.calendar_delays = {'2025-11-14': 0.3}
+
+    results = asyncio.run(scraper._scrape_all_async(concurrency=4, requests_per_second=0))
+
+    assert results['saved'] == 4
+    assert results['errors'] == []
+
+    events = fake_site.events
+    assert sorted(day for kind, day in events if kind == 'calendar') == days
+    # Sessions from the fast days were scraped while the slow day was loading
+    assert events.index(('session', '1')) < events.index(('calendar', '2025-11-14'))
+    assert sorted(sid for kind, sid in events if kind == 'session') == ['1', '2', '3', '4']
+
+    conn = sqlite3.connect(scraper.db_path)
+    assert conn.execute('SELECT COUNT(*) FROM sessions').fetchone()[0] == 4
+    assert conn.execute('SELECT day FROM discovered_sessions WHERE session_id = ?', ('4',)).fetchone()[0] == '2025-11-14'
+    conn.close()
+
+
+def test_resume_starts_from_persisted_discovery(scraper, fake_site):
+    """Test that a resumed scrape only fetches sessions that aren't done."""
+    scraper.conference_dates = ['2025-11-12']
+    fake_site.calendars = {'2025-11-12': (['2025-11-12'], ['1', '2'])}
+    asyncio.run(scraper._scrape_all_async(concurrency=2, requests_per_second=0))
+
+    fake_site.events = []
+    fake_site.calendars = {'2025-11-12': (['2025-11-12'], ['1', '2', '3'])}
+    results = asyncio.run(scraper._scrape_all_async(concurrency=2, requests_per_second=0, resume=True))
+
+    assert results['saved'] == 1
+    assert [sid for kind, sid in fake_site.events if kind == 'session'] == ['3']
@@ -0,0 +1,119 @@
+"""
+Tests for the whole-conference MIP scheduler.
+"""
+import random
+import sqlite3
+import pytest
+from tests.conftest import make_session
+
+pytest.importorskip('pulp')
+
+import dual_scorer  # noqa: E402
+from global_scheduler import solve  # noqa: E402
+from optimal_scheduler import OptimalScheduler  # noqa: E402
+
+
+PEOPLE = ['Max Ghenis', 'Pavel Makarchuk', 'Daphne Hansell']
+
+# Everyone is there on Friday; Max arrives Thursday at 11:30am
+FRIDAY = [('2025-11-14', f'{hour}:00am') for hour in (8, 9, 10, 11)]
+
+
+def make_slots(times, sessions_per_slot=4, seed=0):
+    rng = random.Random(seed)
+    slots = []
+    for t, (date, start_time) in enumerate(times):
+        sessions = [{
+            'session_id': f'T{t}S{i}',
+            'title': f'Session {t}.{i}',
+            'general_score': rng.randint(0, 100),
+            'person_scores': {person: rng.randint(0, 100) for person in PEOPLE},
+        } for i in range(sessions_per_slot)]
+        slots.append(({'date': date, 'start_time': start_time, 'end_time': ''}, sessions))
+    return slots
+
+
+def total(all_assignments):
+    return sum(slot_data['value']['total'] for slot_data in all_assignments)
+
+
+def attended(all_assignments, person):
+    return [slot_data['assignment'][person] for slot_data in all_assignments
+            if slot_data['assignment'].get(person) is not None]
+
+
+@pytest.fixture
+def scheduler():
+    return OptimalScheduler(db_path=None)
+
+
+def test_global_schedule_beats_or_matches_greedy(scheduler):
+    """Test that the MIP is at least as good as the greedy warm start, within the rules."""
+    slots = make_slots(FRIDAY + [('2025-11-13', '9:00am')], seed=1)
+    greedy = scheduler.assign_each_slot(slots)
+    best = solve(scheduler, slots, time_limit=30)
+
+    assert [slot_data['slot'] for slot_data in best] == [slot_data['slot'] for slot_data in greedy]
+    assert total(best) >= total(greedy)
+    for slot_data in best:
+        value = slot_data['value']
+        assert value['num_available'] < 2 or value['people_at_booth'] >= 1
+        chosen = [s['session_id'] for s in slot_data['assignment'].values() if s is not None]
+        assert len(chosen) == len(set(chosen))
+    # Max hasn't arrived for the Thursday 9am slot
+    assert best[-1]['assignment']['Max Ghenis'] is None
+
+
+def test_per_person_limits(scheduler):
+    """Test session and booth-shift caps across the whole conference."""
+    slots = make_slots(FRIDAY, seed=2)
+    best = solve(scheduler, slots, max_sessions={'Max Ghenis': 1})
+    assert len(attended(best, 'Max Ghenis')) == 1
+
+    # Two of three can attend per slot, so each person can be held to two booth shifts
+    best = solve(scheduler, slots, max_booth_shifts=2)
+    for person in PEOPLE:
+        assert len(FRIDAY) - len(attended(best, person)) <= 2
+
+    with pytest.raises(ValueError):
+        solve(scheduler, slots, max_booth_shifts=0)
+
+
+def test_track_limit_and_must_cover(scheduler):
+    """Test one session per topic per person, and covering high-value sessions."""
+    slots = make_slots(FRIDAY, seed=3)
+    tracks = {session['session_id']: 'snap' for _, sessions in slots for session in sessions}
+    best = solve(scheduler, slots, max_per_track=1, tracks=tracks)
+    for person in PEOPLE:
+        assert len(attended(best, person)) <= 1
+
+    # A session nobody scores highly is still covered once its general score counts
+    slots[0][1][0].update(general_score=99, person_scores={person: 0 for person in PEOPLE})
+    best = solve(scheduler, slots, must_cover_score=99)
+    assert any(session is slots[0][1][0] for session in best[0]['assignment'].values())
+
+
+@pytest.mark.parametrize('sessions', [[
+    make_session('S1', description='Microsimulation of the child tax credit', date='2025-11-14',
+                 start_time='9:00am'),
+    make_session('S2', description='Medicaid expansion and health insurance', date='2025-11-14',
+                 start_time='9:00am'),
+    make_session('S3', description='SNAP eligibility', date='2025-11-14', start_time='10:00am'),
+]])
+def test_optimize_schedule_global_mode(db_path):
+    """Test the global mode end to end: assignments are saved like the per-slot mode's."""
+    dual_scorer.score_all_sessions(db_path)
+
+    scheduler = OptimalScheduler(db_path)
+    all_assignments = scheduler.optimize_schedule('global', time_limit=10)
+    assert [slot_data['slot'] for slot_data in all_assignments] == ['2025-11-14 9:00am', '2025-11-14 10:00am']
+
+    conn = sqlite3.connect(db_path)
+    assigned = dict(conn.execute('SELECT session_id, assigned_to FROM sessions WHERE assigned_to IS NOT NULL'))
+    conn.close()
+    expected = {session['session_id']: person for slot_data in all_assignments
+                for person, session in slot_data['assignment'].items() if session}
+    assert assigned == expected and len(assigned) >= 2
+
+    with pytest.raises(ValueError):
+        scheduler.optimize_schedule('everything')
@@ -0,0 +1,123 @@
+"""
+Tests for the on-disk HTML cache and its use by the scrapers.
+"""
+import asyncio
+import pytest
+from html_cache import HTMLCache, RefreshPolicy, content_hash
+from scraper import APPAMScraper
+from tests.test_async_scraper import make_engine
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = HTMLCache(str(tmp_path / 'cache'))
+    yield cache
+    cache.close()
+
+
+def test_refresh_policy_parse():
+    """Test parsing refresh policy specs."""
+    assert RefreshPolicy.parse('always').mode == 'always'
+    assert RefreshPolicy.parse('never').mode == 'never'
+    policy = RefreshPolicy.parse('max-age=3600')
+    assert policy.mode == 'max-age'
+    assert policy.max_age == 3600
+
+    with pytest.raises(ValueError):
+        RefreshPolicy.parse('sometimes')
+
+
+def test_refresh_policy_needs_fetch():
+    """Test which cache entries each policy refetches."""
+    entry = {'content_hash': 'abc', 'fetched_at': 1000.0, 'headers': {}}
+
+    assert RefreshPolicy('always').needs_fetch(entry, now=1001)
+    assert not RefreshPolicy('never').needs_fetch(entry, now=10 ** 9)
+    assert RefreshPolicy('never').needs_fetch(None)
+
+    max_age = RefreshPolicy('max-age', 60)
+    assert not max_age.needs_fetch(entry, now=1030)
+    assert max_age.needs_fetch(entry, now=1061)
+
+
+def test_store_and_lookup(cache):
+    """Test that stored pages can be looked up and read back."""
+    html = '<html><h2>Session</h2></html>'
+    changed = cache.store('S1', 'http://x/S1', html, {'etag': '"v1"'}, fetched_at=123.0)
+
+    assert changed
+    entry = cache.lookup('S1', 'http://x/S1')
+    assert entry['content_hash'] == content_hash(html)
+    assert entry['fetched_at'] == 123.0
+    assert entry['headers'] == {'etag': '"v1"'}
+    assert cache.read(entry['content_hash']) == html
+    assert cache.lookup('S1', 'http://x/other') is None
+
+
+def test_store_detects_changes(cache):
+    """Test that only a different body counts as a change."""
+    assert cache.store('S1', 'http://x/S1', '<html>v1</html>')
+    assert not cache.store('S1', 'http://x/S1', '<html>v1</html>')
+    assert cache.store('S1', 'http://x/S1', '<html>v2</html>')
+
+
+def test_identical_pages_share_one_object(cache, tmp_path):
+    """Test that the cache is content-addressed."""
+    cache.store('S1', 'http://x/S1', '<html>same</html>')
+    cache.store('S2', 'http://x/S2', '<html>same</html>')
+
+    objects = list((tmp_path / 'cache' / 'objects').rglob('*.html.gz'))
+    assert len(objects) == 1
+
+
+def test_scraper_serves_fresh_pages_from_cache(tmp_path, monkeypatch):
+    """Test that a fresh cached page isn't fetched again."""
+    scraper = APPAMScraper(db_path=str(tmp_path / 'test.db'), cache_dir=str(tmp_path / 'cache'),
+                           refresh='max-age=3600')
+    fetches = []
+
+    def fake_fetch(session_id):
+        fetches.append(session_id)
+        return '<html>page</html>', {}
+
+    monkeypatch.setattr(scraper, '_fetch_session_html', fake_fetch)
+
+    assert scraper.fetch_session_page('S1') == ('<html>page</html>', True)
+    assert scraper.fetch_session_page('S1') == ('<html>page</html>', False)
+    assert fetches == ['S1']
+
+
+def test_scraper_refetch_reports_unchanged(tmp_path, monkeypatch):
+    """Test that a refetched but identical page is reported unchanged."""
+    scraper = APPAMScraper(db_path=str(tmp_path / 'test.db'), cache_dir=str(tmp_path / 'cache'),
+                           refresh='always')
+    monkeypatch.setattr(scraper, '_fetch_session_html', lambda session_id: ('<html>page</html>', {}))
+
+    assert scraper.fetch_session_page('S1')[1]
+    assert not scraper.fetch_session_page('S1')[1]
+
+
+def test_async_engine_skips_unchanged_sessions(cache):
+    """Test that the async engine only saves sessions whose page changed."""
+    saved = []
+    engine = make_engine(saved, cache=cache, refresh_policy=RefreshPolicy('always'))
+
+    first = asyncio.run(engine.scrape_sessions(['1', '2']))
+    second = asyncio.run(engine.scrape_sessions(['1', '2']))
+
+    assert first['saved'] == 2
+    assert second['saved'] == 0
+    assert second['unchanged'] == 2
+    assert len(saved) == 2
+
+
+def test_async_engine_saves_cached_sessions_missing_from_db(cache):
+    """Test that cached pages are still saved for sessions not in the database."""
+    saved = []
+    asyncio.run(make_engine(saved, cache=cache).scrape_sessions(['1']))
+
+    engine = make_engine(saved, cache=cache, refresh_policy=RefreshPolicy('never'), known_ids=set())
+    results = asyncio.run(engine.scrape_sessions(['1']))
+
+    assert results['saved'] == 1
+    assert engine.max_in_flight == 0  # Served from the cache, not fetched
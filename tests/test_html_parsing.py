@@ -0,0 +1,139 @@
+"""
+Tests for the pluggable HTML parsing layer.
+"""
+import re
+import pytest
+from html_parsing import BACKENDS, ParsedDocument, available_backends, default_backend, parse_html
+from scraper import APPAMScraper
+from scrape_working import parse_session_html as parse_working_html
+
+
+SESSION_HTML = """<!DOCTYPE html>
+<html>
+<head>
+<title>APPAM Fall Research Conference: Taxes &amp; Transfers</title>
+<meta property="og:title" content="Taxes and Transfers">
+<script>var note = "Location: Not A Room";</script>
+<style>.paper { color: red; }</style>
+</head>
+<body>
+<!-- Chair: Commented Out -->
+<div class="content main">
+<h2>Taxes &amp; Transfers in  Practice</h2>
+<p>Thursday, November 13, 2025: 10:15 AM-11:45 AM</p>
+<p>Location: Hyatt Regency, Room&nbsp;101</p>
+<p>Chair: Jane Smith, Urban Institute</p>
+<p>This session examines how tax credits interact with benefit programs.</p>
+<ul>
+<li>Alex Doe - Effects of the <b>Child Tax Credit</b> on poverty
+<ul><li>Discussant: Pat Lee</li></ul>
+</li>
+<li>Sam Roe: SNAP take-up after reform</li>
+</ul>
+<span class="AuthorName">Maria Garcia (Georgetown University)</span>
+<div class="presenter-info">Presenters: Kim Park; Lee Chan</div>
+</div>
+</body>
+</html>"""
+
+WORKING_HTML = """<html><head><title>APPAM Fall Research Conference: Medicaid Unwinding</title></head>
+<body><div>Thursday, November 13, 10:15 to 11:45am</div>
+<div>Property: Hyatt Regency, Floor: Second, Room: Salon A</div>
+<div>Robert Johnson (Harvard University)</div>
+<div>Abstract
+Coverage losses after the end of continuous enrollment.</div>
+</body></html>"""
+
+backends = pytest.mark.parametrize('backend', available_backends())
+
+
+def test_bs4_is_always_available():
+    """Test that the stdlib-backed parser is always a fallback."""
+    assert 'bs4' in available_backends()
+    assert default_backend() == available_backends()[0]
+
+
+def test_default_backend_from_environment(monkeypatch):
+    """Test that APPAM_HTML_PARSER overrides the default."""
+    monkeypatch.setenv('APPAM_HTML_PARSER', 'bs4')
+    assert ParsedDocument('<p>x</p>').backend == 'bs4'
+
+    monkeypatch.setenv('APPAM_HTML_PARSER', 'regex')
+    with pytest.raises(ValueError):
+        default_backend()
+
+
+@backends
+def test_text_matches_beautifulsoup(backend):
+    """Test that every backend sees the same page text, minus layout whitespace."""
+    def normalise(text):
+        return re.sub(r'\s*\n\s*', '\n', text).strip()
+
+    expected = normalise(parse_html(SESSION_HTML, 'bs4').text)
+    text = normalise(parse_html(SESSION_HTML, backend).text)
+
+    assert text == expected
+    assert 'Not A Room' not in text
+    assert 'Commented Out' not in text
+
+
+@backends
+def test_find_and_find_all(backend):
+    """Test tag, class and attribute lookups."""
+    doc = parse_html(SESSION_HTML, backend)
+
+    assert doc.find('h2').get_text(strip=True) == 'Taxes & Transfers in  Practice'
+    assert doc.find('h1') is None
+    assert doc.find('div', class_='content') is not None
+    assert doc.find('meta', attrs={'property': 'og:title'}).get('content') == 'Taxes and Transfers'
+
+    assert [node.tag for node in doc.find_all(['ul', 'ol'])] == ['ul', 'ul']
+    assert len(doc.find_all('ul')[0].find_all('li')) == 3
+
+    authors = doc.find_all(class_=re.compile(r'author|presenter', re.IGNORECASE))
+    assert [node.get_text(strip=True) for node in authors] == [
+        'Maria Garcia (Georgetown University)',
+        'Presenters: Kim Park; Lee Chan',
+    ]
+
+
+@backends
+def test_scraper_extraction_matches_across_backends(backend, tmp_path):
+    """Test that scraper.py extracts the same session with every backend."""
+    expected = APPAMScraper(db_path=str(tmp_path / 'a.db'), html_parser='bs4').parse_session_html('1', SESSION_HTML)
+    data = APPAMScraper(db_path=str(tmp_path / 'b.db'), html_parser=backend).parse_session_html('1', SESSION_HTML)
+
+    assert data == expected
+    assert data['location'] == 'Hyatt Regency, Room\xa0101'
+    assert data['start_time'] == '10:15 AM'
+
+
+@backends
+def test_working_extraction_matches_across_backends(backend):
+    """Test that scrape_working.py extracts the same session with every backend."""
+    expected = parse_working_html('1', WORKING_HTML, backend='bs4')
+    data = parse_working_html('1', WORKING_HTML, backend=backend)
+
+    assert data == expected
+    assert data['title'] == 'Medicaid Unwinding'
+    assert data['location'] == 'Hyatt Regency, Second, Salon A'
+
+
+@backends
+def test_calendar_links(backend, tmp_path):
+    """Test that calendar pages yield session IDs in page order."""
+    html = ('<a href="?selected_session_id=42">A</a><a href="/other">B</a>'
+            '<a href="?cmd=x&selected_session_id=7">C</a>')
+    scraper = APPAMScraper(db_path=str(tmp_path / 'test.db'), html_parser=backend)
+
+    assert scraper.parse_calendar_html(html) == ['42', '7']
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_empty_page(backend):
+    """Test that an empty body parses to an empty document."""
+    if backend not in available_backends():
+        pytest.skip(f'{backend} not installed')
+    doc = parse_html('', backend)
+    assert doc.text.strip() == ''
+    assert doc.find('h2') is None
@@ -0,0 +1,75 @@
+"""
+Tests for compressed session page storage.
+"""
+import sqlite3
+import pytest
+from html_store import HtmlStore, compress_html, decompress_html, migrate_raw_html
+from scraper import APPAMScraper
+
+
+PAGE = '<html><body>' + '<p>Child Tax Credit take-up and SNAP</p>' * 200 + '</body></html>'
+
+
+def test_compress_round_trip():
+    """Test that pages decompress to exactly what was stored, and shrink."""
+    codec, blob = compress_html(PAGE, 'zlib')
+    assert decompress_html(codec, blob) == PAGE
+    assert len(blob) < len(PAGE) / 10
+
+    with pytest.raises(ValueError):
+        compress_html(PAGE, 'brotli')
+
+
+def test_store_put_and_get(conn):
+    """Test that pages are stored per session and empty pages keep the old one."""
+    store = HtmlStore(conn)
+    store.put('S1', PAGE)
+    store.put('S1', '')
+
+    assert store.get('S1') == PAGE
+    assert store.get('S2') is None
+    assert conn.execute('SELECT size FROM session_html').fetchone()[0] == len(PAGE)
+
+
+def test_sessions_row_has_no_html(conn):
+    """Test that the sessions table no longer carries the page."""
+    columns = [row[1] for row in conn.execute('PRAGMA table_info(sessions)')]
+    assert 'raw_html' not in columns
+
+
+def test_iter_batches(conn):
+    """Test that stored pages come back in ID order, one batch at a time."""
+    store = HtmlStore(conn)
+    for session_id in ['3', '1', '2']:
+        store.put(session_id, f'<html>{session_id}</html>')
+
+    batches = list(store.iter_batches(2))
+    assert batches == [[('1', '<html>1</html>'), ('2', '<html>2</html>')], [('3', '<html>3</html>')]]
+
+
+def test_migrate_legacy_database(tmp_path):
+    """Test that inline raw_html is moved into session_html and the column dropped."""
+    db_path = str(tmp_path / 'legacy.db')
+    conn = sqlite3.connect(db_path)
+    conn.execute('''
+        CREATE TABLE sessions (
+            session_id TEXT PRIMARY KEY, title TEXT NOT NULL, date TEXT NOT NULL,
+            start_time TEXT NOT NULL, end_time TEXT NOT NULL, location TEXT,
+            description TEXT, chair TEXT, papers TEXT, relevance_score REAL DEFAULT 0,
+            assigned_to TEXT, raw_html TEXT
+        )
+    ''')
+    conn.executemany("INSERT INTO sessions VALUES (?, 'T', 'd', 's', 'e', NULL, NULL, NULL, NULL, 7, NULL, ?)",
+                     [('S1', PAGE), ('S2', ''), ('S3', None)])
+    conn.commit()
+    conn.close()
+
+    APPAMScraper(db_path=db_path).init_database()
+
+    conn = sqlite3.connect(db_path)
+    store = HtmlStore(conn)
+    assert store.get('S1') == PAGE
+    assert store.session_ids() == ['S1']
+    assert conn.execute("SELECT relevance_score FROM sessions WHERE session_id = 'S1'").fetchone() == (7,)
+    assert migrate_raw_html(conn) == 0
+    conn.close()
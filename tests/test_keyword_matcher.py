@@ -0,0 +1,69 @@
+"""
+Tests for the single-pass keyword matcher.
+"""
+import random
+import re
+import pytest
+from keyword_matcher import KeywordMatcher
+from relevance_scorer import RelevanceScorer
+
+
+KEYWORDS = ['tax', 'tax credit', 'child tax credit', 'credit', 'aca', 'cost-benefit', 'benefit', 'ab ab']
+
+
+def findall_count(keyword, text):
+    return len(re.findall(r'\b' + re.escape(keyword) + r'\b', text))
+
+
+@pytest.mark.parametrize('text', [
+    'the child tax credit and the tax credit',
+    'academic aca, aca-based taxes',
+    'cost-benefit benefits benefit_',
+    'ab ab ab ab',
+    'tax',
+    '',
+])
+def test_counts_match_findall(text):
+    """Test that counts equal one re.findall per keyword, overlaps included."""
+    matches = KeywordMatcher(KEYWORDS).scan(text)
+    for keyword in KEYWORDS:
+        assert matches.count(keyword) == findall_count(keyword, text), keyword
+
+
+def test_occurs_before_is_prefix_substring_test():
+    """Test that substring lookups can be limited to a prefix of the text."""
+    text = 'academic panel on the child tax credit'
+    matches = KeywordMatcher(KEYWORDS).scan(text)
+
+    for end in (0, 3, 8, 30, len(text)):
+        for keyword in KEYWORDS:
+            assert matches.occurs_before(keyword, end) == (keyword in text[:end]), (keyword, end)
+
+
+def test_random_texts_match_findall():
+    """Test the matcher against re.findall on random keyword soup."""
+    rng = random.Random(1)
+    pieces = KEYWORDS + ['x', '-', ' ', '_', 'é', 'taxes', 'abab']
+    matcher = KeywordMatcher(KEYWORDS)
+    for _ in range(300):
+        text = ''.join(rng.choice(pieces) + rng.choice(['', ' ']) for _ in range(rng.randint(0, 15)))
+        matches = matcher.scan(text)
+        for keyword in KEYWORDS:
+            assert matches.count(keyword) == findall_count(keyword, text), (keyword, text)
+            assert matches.occurs_before(keyword, len(text)) == (keyword in text)
+
+
+def test_scorer_recompiles_after_keyword_edit():
+    """Test that edits to the keyword table are picked up."""
+    scorer = RelevanceScorer(db_path=':memory:')
+    session = {'title': 'Zoning and land use', 'description': '', 'chair': '', 'papers': ''}
+    assert scorer.score_session(session)['score'] == 0
+
+    scorer.keywords['zoning'] = 4
+    assert scorer.score_session(session)['score'] == 6
+
+
+def test_empty_keyword_is_rejected():
+    """Test that an empty keyword, which would match everywhere, is refused."""
+    with pytest.raises(ValueError):
+        KeywordMatcher(['tax', ''])
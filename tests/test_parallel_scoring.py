@@ -0,0 +1,86 @@
+"""
+Tests for process-pool scoring.
+"""
+import shutil
+import sqlite3
+import pytest
+import dual_scorer
+from parallel_scoring import score_in_parallel
+from relevance_scorer import RelevanceScorer
+from tests.conftest import make_session
+
+
+DESCRIPTIONS = [
+    'Microsimulation of the child tax credit',
+    'Medicaid expansion and health insurance',
+    'Urban planning methods',
+    'SNAP take-up and eligibility',
+    'Cash transfer roundtable on poverty',
+    'Housing vouchers',
+    'Tax reform and inequality',
+]
+
+
+@pytest.fixture
+def sessions():
+    return [
+        make_session(f'S{i}', description=description, papers=[f'Paper on {description}'])
+        for i, description in enumerate(DESCRIPTIONS)
+    ]
+
+
+def snapshot(db_path):
+    """Every score, explanation and hash the scorers write."""
+    conn = sqlite3.connect(db_path)
+    sessions = conn.execute('''
+        SELECT session_id, relevance_score, relevance_explanation, relevance_content_hash,
+               relevance_config_hash, general_score, general_explanation, dual_content_hash,
+               dual_config_hash
+        FROM sessions ORDER BY session_id
+    ''').fetchall()
+    scores = conn.execute('SELECT * FROM session_scores ORDER BY session_id, person_id, scorer').fetchall()
+    conn.close()
+    return sessions, scores
+
+
+def test_parallel_matches_serial_scoring(db_path, tmp_path):
+    """Test that pooled dual and relevance scoring write what the serial scorers write."""
+    serial_path = str(tmp_path / 'serial.db')
+    shutil.copy(db_path, serial_path)
+    dual_scorer.score_all_sessions(serial_path)
+    RelevanceScorer(db_path=serial_path).score_all_sessions()
+
+    assert score_in_parallel(db_path, 'dual', workers=2, shard_size=2)['scored'] == len(DESCRIPTIONS)
+    assert score_in_parallel(db_path, 'relevance', workers=2, shard_size=3)['shards'] == 3
+    assert snapshot(db_path) == snapshot(serial_path)
+
+
+def test_results_do_not_depend_on_workers(db_path, tmp_path):
+    """Test that the shard layout and worker count don't change the results."""
+    other_path = str(tmp_path / 'other.db')
+    shutil.copy(db_path, other_path)
+
+    for scorer in ('dual', 'relevance'):
+        score_in_parallel(db_path, scorer, workers=1, shard_size=100)
+        score_in_parallel(other_path, scorer, workers=3, shard_size=1)
+    assert snapshot(db_path) == snapshot(other_path)
+
+
+def test_parallel_scoring_is_incremental(db_path):
+    """Test that unchanged sessions are skipped unless forced."""
+    assert score_in_parallel(db_path, 'dual', workers=2, shard_size=2)['scored'] == len(DESCRIPTIONS)
+    assert score_in_parallel(db_path, 'dual', workers=2, shard_size=2)['scored'] == 0
+
+    conn = sqlite3.connect(db_path)
+    conn.execute("UPDATE sessions SET description = 'Poverty measurement' WHERE session_id = 'S2'")
+    conn.commit()
+    conn.close()
+
+    assert score_in_parallel(db_path, 'dual', workers=2, shard_size=2)['scored'] == 1
+    assert score_in_parallel(db_path, 'dual', workers=2, force=True)['scored'] == len(DESCRIPTIONS)
+
+
+def test_unknown_scorer(db_path):
+    """Test that only the registered scorers can run."""
+    with pytest.raises(ValueError):
+        score_in_parallel(db_path, 'smart')
@@ -0,0 +1,104 @@
+"""
+Tests for the fetch -> parse -> write pipeline.
+"""
+import asyncio
+import os
+import sqlite3
+from concurrent.futures.process import BrokenProcessPool
+import pytest
+from async_scraper import SessionQueue
+from html_store import HtmlStore
+import pipeline as pipeline_module
+from pipeline import SessionPipeline
+from scrape_status import ScrapeStatus
+from tests.test_async_scraper import FakeFetchScraper
+
+
+def session_page(session_id):
+    return (f'<html><body><h2>Session number {session_id}</h2>'
+            f'<h3>Pipeline session {session_id}</h3></body></html>')
+
+
+class FakeSessionSite(FakeFetchScraper):
+    """Engine serving parseable session pages."""
+
+    async def fetch_page(self, url, wait_until='load', ready_check=None):
+        await super().fetch_page(url, wait_until, ready_check)
+        return session_page(url.rsplit('/', 1)[1]), {}
+
+
+def run_pipeline(conn, db_path, session_ids, max_attempts=1, **kwargs):
+    status = ScrapeStatus(conn, base_delay=0)
+    engine = FakeSessionSite(
+        lambda session_id: f'http://example.test/{session_id}',
+        None, None,
+        concurrency=3,
+        requests_per_second=0,
+        status=status,
+    )
+    pipeline = SessionPipeline(engine, db_path, report_interval=60, **kwargs)
+    return asyncio.run(engine.scrape_with_retries(session_ids, max_attempts, scrape=pipeline.run)), status
+
+
+def test_pipeline_writes_every_session(conn, db_path):
+    """Test that sessions pass through every stage into the database."""
+    results, status = run_pipeline(conn, db_path, [str(i) for i in range(12)], queue_size=2, batch_size=5)
+
+    assert results['saved'] == 12
+    assert results['errors'] == []
+    assert {stage: counts['count'] for stage, counts in results['stages'].items()} == \
+        {'fetch': 12, 'parse': 12, 'write': 12}
+
+    assert len(HtmlStore(conn).session_ids()) == 12
+    assert conn.execute("SELECT COUNT(*) FROM scrape_status WHERE state = 'done'").fetchone()[0] == 12
+
+
+def test_pipeline_records_fetch_and_validation_failures(conn, db_path):
+    """Test that rejected pages are recorded as failures and not written."""
+    def reject_odd(session_data):
+        if int(session_data['session_id'][-1]) % 2:
+            raise ValueError('No session title found')
+
+    results, status = run_pipeline(conn, db_path, ['0', '1', '2', 'bad'], validate=reject_odd)
+
+    assert results['saved'] == 2
+    assert sorted(session_id for session_id, _ in results['errors']) == ['1', 'bad']
+    assert status.get('1')['last_error'] == 'No session title found'
+    assert status.get('bad')['state'] == 'failed'
+
+
+def crash_parse_worker(item):
+    os._exit(1)
+
+
+def test_pipeline_raises_when_a_parser_dies(conn, db_path, monkeypatch):
+    """Test that a broken parse pool stops the fetchers instead of leaving them blocked."""
+    monkeypatch.setattr(pipeline_module, 'parse_row', crash_parse_worker)
+    with pytest.raises(BrokenProcessPool):
+        run_pipeline(conn, db_path, [str(i) for i in range(20)], queue_size=1, parse_workers=1)
+
+
+def test_pipeline_accepts_streamed_ids(db_path):
+    """Test that the pipeline drains a SessionQueue that is filled later."""
+    async def scrape():
+        conn = sqlite3.connect(db_path)
+        engine = FakeSessionSite(lambda session_id: f'http://example.test/{session_id}', None, None,
+                                 concurrency=2, requests_per_second=0, status=ScrapeStatus(conn))
+        queue = SessionQueue()
+        pipeline = SessionPipeline(engine, db_path, parse_workers=1, report_interval=60)
+        task = asyncio.create_task(pipeline.run(queue))
+        queue.put(['1', '2'])
+        await asyncio.sleep(0.05)
+        queue.put(['3'])
+        queue.close()
+        results = await task
+        conn.close()
+        return results
+
+    assert asyncio.run(scrape())['saved'] == 3
+
+
+def test_unknown_parser_is_rejected(db_path):
+    """Test that the parser name is checked up front."""
+    with pytest.raises(ValueError):
+        SessionPipeline(None, db_path, parser='regex')
@@ -194,13 +194,21 @@ def test_score_all_sessions(scorer, temp_db):
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
 
-    cursor.execute('SELECT session_id, title, relevance_score FROM sessions ORDER BY relevance_score DESC')
+    cursor.execute('''
+        SELECT session_id, title, relevance_score, relevance_explanation
+        FROM sessions ORDER BY relevance_score DESC
+    ''')
     results = [dict(row) for row in cursor.fetchall()]
 
     # First session should have higher score
     assert results[0]['session_id'] == 'TEST001'
     assert results[0]['relevance_score'] > results[1]['relevance_score']
 
+    # The matched keywords are stored with the score
+    explanation = json.loads(results[0]['relevance_explanation'])
+    assert explanation['terms']['microsimulation'] == 2
+    assert explanation['title'] == ['microsimulation', 'tax policy']
+
     conn.close()
 
 
@@ -0,0 +1,110 @@
+"""
+Tests for offline re-parsing of stored session HTML.
+"""
+import pytest
+import sqlite3
+import os
+import tempfile
+from html_store import HtmlStore
+from scraper import APPAMScraper
+from reparse import reparse_database
+
+
+SESSION_HTML = """<html><body><div class="content">
+<h2>{title}</h2>
+<p>Thursday, November 13, 2025: 10:15 AM-11:45 AM</p>
+<p>Location: Grand Ballroom A</p>
+<p>This session covers microsimulation of tax and benefit policy reforms.</p>
+<ul><li>Alice Smith - Modeling the Child Tax Credit</li></ul>
+</div></body></html>"""
+
+
+@pytest.fixture
+def temp_db():
+    """Create a temporary database for testing."""
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    yield path
+    os.unlink(path)
+
+
+def save_stale_session(db_path, session_id, html):
+    """Save a session whose parsed fields are out of date with its HTML."""
+    scraper = APPAMScraper(db_path=db_path)
+    scraper.init_database()
+    scraper.save_session({
+        'session_id': session_id,
+        'title': 'Stale title',
+        'date': '',
+        'start_time': '',
+        'end_time': '',
+        'location': '',
+        'description': '',
+        'chair': '',
+        'papers': '',
+        'presenters': '',
+        'raw_html': html
+    })
+
+
+def test_reparse_rebuilds_fields_from_raw_html(temp_db):
+    """Test that parsed fields are rebuilt from stored HTML."""
+    save_stale_session(temp_db, 'S1', SESSION_HTML.format(title='Microsimulation Panel'))
+
+    results = reparse_database(temp_db, workers=1)
+
+    assert results['parsed'] == 1
+    conn = sqlite3.connect(temp_db)
+    conn.row_factory = sqlite3.Row
+    session = dict(conn.execute('SELECT * FROM sessions WHERE session_id = ?', ('S1',)).fetchone())
+    assert session['title'] == 'Microsimulation Panel'
+    assert session['date'] == '2025-11-13'
+    assert session['start_time'] == '10:15 AM'
+    assert session['location'] == 'Grand Ballroom A'
+    assert HtmlStore(conn).get('S1').startswith('<html>')
+
+    papers = conn.execute('SELECT COUNT(*) FROM papers WHERE session_id = ?', ('S1',)).fetchone()[0]
+    assert papers == 1
+    conn.close()
+
+
+def test_reparse_keeps_scores_and_assignments(temp_db):
+    """Test that re-parsing doesn't wipe scoring or scheduling columns."""
+    save_stale_session(temp_db, 'S1', SESSION_HTML.format(title='Microsimulation Panel'))
+    conn = sqlite3.connect(temp_db)
+    conn.execute("UPDATE sessions SET relevance_score = 42, assigned_to = 'Max Ghenis'")
+    conn.commit()
+    conn.close()
+
+    reparse_database(temp_db, workers=1)
+
+    conn = sqlite3.connect(temp_db)
+    row = conn.execute('SELECT relevance_score, assigned_to FROM sessions').fetchone()
+    conn.close()
+    assert row == (42, 'Max Ghenis')
+
+
+def test_reparse_skips_pages_without_title(temp_db):
+    """Test that a page that no longer parses doesn't blank out the row."""
+    save_stale_session(temp_db, 'S1', '<html><body><p>Session not found</p></body></html>')
+
+    results = reparse_database(temp_db, workers=1)
+
+    assert results['skipped'] == 1
+    conn = sqlite3.connect(temp_db)
+    assert conn.execute('SELECT title FROM sessions').fetchone()[0] == 'Stale title'
+    conn.close()
+
+
+def test_reparse_batches_across_processes(temp_db):
+    """Test that many sessions are re-parsed across workers and batches."""
+    for i in range(25):
+        save_stale_session(temp_db, f'S{i:02d}', SESSION_HTML.format(title=f'Tax Policy Session {i}'))
+
+    results = reparse_database(temp_db, workers=2, batch_size=10)
+
+    assert results['parsed'] == 25
+    conn = sqlite3.connect(temp_db)
+    titles = {row[0] for row in conn.execute('SELECT title FROM sessions')}
+    conn.close()
+    assert titles == {f'Tax Policy Session {i}' for i in range(25)}
@@ -0,0 +1,136 @@
+"""
+Tests for the declarative rule engine and the dual/smart rule files.
+"""
+import pytest
+import dual_scorer
+import intelligent_scorer
+from rule_engine import RuleEngine
+
+
+SPEC = {
+    'general': [
+        {'when': ['snap', ['work requirement', 'eligibility']], 'score': 85, 'rationale': 'SNAP'},
+        {'when': ['tax'], 'unless': 'syntax', 'score': 45, 'rationale': 'Tax'},
+        {'score': 20, 'rationale': 'Low'},
+    ],
+    'people': {
+        'Ada': [
+            {'when': [['snap', 'wic']], 'score': 99, 'rationale': 'Benefits'},
+            {'when': ['tax'], 'add': 60, 'max': 100, 'rationale': 'Tax boost'},
+        ],
+    },
+    'default': [{'add': 0, 'rationale': 'Standard relevance'}],
+}
+
+
+def score(engine, text, person=None):
+    hits = engine.hits(text)
+    return engine.score(hits) if person is None else engine.score_for_person(hits, person)
+
+
+def test_first_matching_rule_wins():
+    """Test all/any conditions, unless, and the catch-all rule."""
+    engine = RuleEngine(SPEC)
+    assert score(engine, 'snap eligibility and tax') == (85, 'SNAP')
+    assert score(engine, 'snap and tax') == (45, 'Tax')
+    assert score(engine, 'syntax of tax law') == (20, 'Low')
+    assert score(engine, 'urban planning') == (20, 'Low')
+
+
+def test_terms_match_as_substrings():
+    """Test that terms match anywhere, as `term in text` would."""
+    engine = RuleEngine(SPEC)
+    assert score(engine, 'taxation') == (45, 'Tax')
+    assert score(engine, 'snapshot eligibility') == (85, 'SNAP')
+
+
+def test_person_rules_adjust_and_fall_back():
+    """Test person rules, general-score adjustments and the default rules."""
+    engine = RuleEngine(SPEC)
+    assert score(engine, 'wic', 'Ada') == (99, 'Benefits')
+    assert score(engine, 'tax', 'Ada') == (100, 'Tax boost')
+    assert score(engine, 'urban planning', 'Ada') == (20, 'Standard relevance')
+    assert score(engine, 'tax', 'Someone New') == (45, 'Standard relevance')
+
+
+@pytest.mark.parametrize('text', [
+    'snap eligibility and tax', 'taxation', 'snap work requirement', 'snap work\nrequirement',
+    'snap workrequirement', 'wic', '', '  ',
+])
+def test_hits_match_term_in_text(text):
+    """Test that one pass finds exactly the terms `term in text` finds, including terms with spaces."""
+    engine = RuleEngine(SPEC)
+    hits = engine.hits(text)
+    assert hits == sum(1 << i for i, term in enumerate(engine.terms) if term in text)
+    # Cached words and decisions give the same answers the second time
+    assert engine.hits(text) == hits
+    assert engine.score(hits) == engine.score(engine.hits(text))
+
+
+def test_explanations_name_the_rule_and_terms():
+    """Test that explain() gives the scores of score() with the rule that fired."""
+    engine = RuleEngine(SPEC)
+    hits = engine.hits('snap eligibility and tax')
+    general = engine.explain(hits)
+    assert general == (85, 'SNAP', {'rule': 'general/0', 'terms': ['snap', 'eligibility']})
+    assert engine.explain(hits, 'Ada', general) == (99, 'Benefits', {'rule': 'Ada/0', 'terms': ['snap']})
+
+    hits = engine.hits('tax')
+    assert engine.explain(hits, 'Ada') == (
+        100, 'Tax boost', {'rule': 'Ada/1', 'terms': ['tax'], 'base': 45, 'modifier': 60})
+    assert engine.explain(hits, 'Someone New') == (
+        45, 'Standard relevance', {'rule': 'default/0', 'terms': [], 'base': 45, 'modifier': 0})
+
+
+@pytest.mark.parametrize('spec, message', [
+    ({'general': [{'when': ['tax'], 'score': 1}]}, 'always matches'),
+    ({'general': [{'add': 5}]}, 'not adjust'),
+    ({'general': [{'score': 1, 'weight': 2}]}, 'Unknown rule keys'),
+    ({'general': [{'when': ['tax']}, {'score': 1}]}, "exactly one of 'score' or 'add'"),
+    ({'general': [{'when': [''], 'score': 2}, {'score': 1}]}, 'non-empty'),
+])
+def test_invalid_rules_are_rejected(spec, message):
+    """Test that malformed rule files fail when compiled, not when scoring."""
+    with pytest.raises(ValueError, match=message):
+        RuleEngine(spec)
+
+
+def test_dual_rules():
+    """Test the dual rule file against the scores of the old if-chains."""
+    session = {'title': 'Microsimulation of the Child Tax Credit', 'description': 'Poverty effects'}
+    assert dual_scorer.score_session_for_policyengine(session) == (
+        100, "Microsimulation methodology - core PolicyEngine work")
+    assert dual_scorer.score_for_person(session, 'Max Ghenis') == (90, "CTC policy - highly relevant to Max")
+    assert dual_scorer.score_for_person(session, 'Pavel Makarchuk')[0] == 100
+
+    roundtable = {'title': 'Cash Transfer Roundtable', 'description': None}
+    assert dual_scorer.score_session_for_policyengine(roundtable) == (20, "Low PolicyEngine relevance")
+    assert dual_scorer.score_for_person(roundtable, 'Pavel Makarchuk') == (
+        10, "Qualitative roundtable - better for Max's policy focus")
+    assert dual_scorer.score_for_person(roundtable, 'Max Ghenis')[0] == 100
+
+    health = {'title': 'Rural Health Access', 'description': 'State tax policy'}
+    assert dual_scorer.score_for_person(health, 'Daphne Hansell') == (85, "Health access/equity - relevant to Daphne")
+    assert dual_scorer.score_for_person(health, 'Someone New') == (70, "Standard relevance")
+
+
+def test_smart_rules():
+    """Test the smart rule file, including rules split from nested ifs."""
+    def smart(title, description='', papers=()):
+        return intelligent_scorer.score_session_smart(
+            {'title': title, 'description': description, 'papers': list(papers)})
+
+    assert smart('TAXSIM at 40') == (95, "Direct microsimulation methodology or tool")
+    assert smart('The EITC', 'Poverty effects') == (90, "CTC/EITC with poverty/impact analysis - core PolicyEngine topic")
+    assert smart('The EITC') == (75, "Tax credit policy - relevant to PolicyEngine")
+    assert smart('Vouchers', papers=['Housing voucher take-up']) == (55, "Housing assistance - benefit program")
+    assert smart('Urban planning') == (20, "Low relevance to PolicyEngine core work")
+
+
+def test_dual_config_hash_tracks_rules(monkeypatch):
+    """Test that editing the rule file invalidates stored dual scores."""
+    people = ['Max Ghenis']
+    before = dual_scorer.scoring_config_hash(people)
+    spec = {**dual_scorer.RULES.spec, 'general': [{'score': 50, 'rationale': 'Flat'}]}
+    monkeypatch.setattr(dual_scorer, 'RULES', RuleEngine(spec))
+    assert dual_scorer.scoring_config_hash(people) != before
@@ -0,0 +1,84 @@
+"""
+Tests for incremental rescoring keyed on content and config hashes.
+"""
+import inspect
+import sqlite3
+import pytest
+import dual_scorer
+from relevance_scorer import RelevanceScorer
+from score_hashes import config_hash, content_hash
+from tests.conftest import make_session
+
+
+@pytest.fixture
+def sessions():
+    return [
+        make_session('S1', description='Microsimulation of the child tax credit'),
+        make_session('S2', description='Urban planning methods'),
+        make_session('S3', description='Medicaid expansion and poverty'),
+    ]
+
+
+def edit_description(db_path, session_id, description):
+    conn = sqlite3.connect(db_path)
+    conn.execute('UPDATE sessions SET description = ? WHERE session_id = ?', (description, session_id))
+    conn.commit()
+    conn.close()
+
+
+def scores(db_path, column):
+    conn = sqlite3.connect(db_path)
+    result = dict(conn.execute(f'SELECT session_id, {column} FROM sessions'))
+    conn.close()
+    return result
+
+
+def test_content_hash_separates_fields():
+    """Test that field boundaries and None are part of the hash."""
+    assert content_hash('ab', 'c') != content_hash('a', 'bc')
+    assert content_hash(None, 'x') == content_hash('', 'x')
+
+
+def test_config_hash_tracks_function_source():
+    """Test that scoring functions are hashed by their source."""
+    assert config_hash(dual_scorer.score_for_person) == config_hash(dual_scorer.score_for_person)
+    assert config_hash(dual_scorer.score_for_person) != config_hash(dual_scorer.score_session_for_policyengine)
+
+
+def test_relevance_config_hash_covers_bulk_scoring(monkeypatch):
+    """Test that editing the bulk scoring code changes the relevance config hash."""
+    bulk_scoring = pytest.importorskip('bulk_scoring')
+    scorer = RelevanceScorer(db_path=None)
+    before = scorer.scoring_config_hash(['Max Ghenis'])
+    getsource = inspect.getsource
+    monkeypatch.setattr(inspect, 'getsource',
+                        lambda part: getsource(part) + ('# edited' if part is bulk_scoring else ''))
+    assert scorer.scoring_config_hash(['Max Ghenis']) != before
+
+
+def test_relevance_rescoring_skips_unchanged_rows(db_path):
+    """Test that only edited sessions, or all after a weight change, are rescored."""
+    scorer = RelevanceScorer(db_path=db_path)
+    assert scorer.score_all_sessions() == 3
+    assert scorer.score_all_sessions() == 0
+
+    edit_description(db_path, 'S2', 'Poverty and SNAP take-up')
+    assert scorer.score_all_sessions() == 1
+    assert scores(db_path, 'relevance_score')['S2'] == scorer.score_session(
+        {'title': 'Session S2', 'description': 'Poverty and SNAP take-up', 'chair': '', 'papers': '[]'}
+    )['score']
+
+    scorer.keywords['urban'] = 3
+    assert scorer.score_all_sessions() == 3
+    assert scorer.score_all_sessions(force=True) == 3
+
+
+def test_dual_rescoring_skips_unchanged_rows(db_path):
+    """Test that the dual scorer only rescores sessions whose text changed."""
+    assert dual_scorer.score_all_sessions(db_path) == 3
+    assert dual_scorer.score_all_sessions(db_path) == 0
+    assert scores(db_path, 'general_score')['S1'] == 100
+
+    edit_description(db_path, 'S1', 'Urban planning methods')
+    assert dual_scorer.score_all_sessions(db_path) == 1
+    assert scores(db_path, 'general_score')['S1'] < 100
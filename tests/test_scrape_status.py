@@ -0,0 +1,137 @@
+"""
+Tests for scrape checkpoints and resumable scrapes.
+"""
+import asyncio
+import contextlib
+import sqlite3
+import pytest
+from scrape_status import ScrapeStatus
+from scraper import APPAMScraper
+from session_writer import SessionWriter
+from tests.test_async_scraper import make_engine
+from tests.conftest import make_session
+
+
+def test_backoff_doubles_up_to_cap(conn):
+    """Test the exponential backoff schedule."""
+    status = ScrapeStatus(conn, base_delay=5, max_delay=30)
+    assert [status.backoff(n) for n in range(1, 6)] == [5, 10, 20, 30, 30]
+
+
+def test_record_failure_tracks_attempts(conn):
+    """Test that every failure is recorded with its error and next attempt time."""
+    status = ScrapeStatus(conn, base_delay=10)
+    status.record_failure('S1', 'timeout', now=100)
+    status.record_failure('S1', 'cookie expired', now=200)
+
+    row = status.get('S1')
+    assert row['state'] == 'failed'
+    assert row['attempts'] == 2
+    assert row['last_error'] == 'cookie expired'
+    assert row['last_fetch_at'] == 200
+    assert row['next_attempt_at'] == 220
+
+
+def test_to_scrape_skips_done_and_backing_off(conn):
+    """Test which sessions a resumed scrape fetches."""
+    status = ScrapeStatus(conn, base_delay=10)
+    status.record_success('done', now=0)
+    status.record_failure('due', 'error', now=0)
+    status.record_failure('waiting', 'error', now=95)
+
+    assert status.to_scrape(['new', 'done', 'due', 'waiting'], now=100) == ['new', 'due']
+
+
+def test_start_without_resume_starts_over(conn):
+    """Test that a fresh scrape forgets earlier progress."""
+    status = ScrapeStatus(conn)
+    status.record_success('S1')
+
+    assert status.start(['S1', 'S2']) == ['S1', 'S2']
+    assert status.get('S1') is None
+    assert ScrapeStatus(conn).start(['S1', 'S2'], resume=True) == ['S1', 'S2']
+
+
+def test_next_retry_waits_for_earliest_failure(conn):
+    """Test that retry rounds follow the backoff and stop at max_attempts."""
+    status = ScrapeStatus(conn, base_delay=10)
+    status.record_failure('S1', 'error', now=100)
+    status.record_failure('S2', 'error', now=100)
+    status.record_failure('S2', 'error', now=100)
+
+    assert status.next_retry(['S1', 'S2'], max_attempts=3, now=100) == (10, ['S1'])
+    assert status.next_retry(['S1', 'S2'], max_attempts=2, now=100) == (10, ['S1'])
+    assert status.next_retry(['S1', 'S2'], max_attempts=1, now=100) is None
+
+
+def test_writer_marks_sessions_done_in_its_transaction(conn):
+    """Test that sessions are only marked done once they are saved."""
+    status = ScrapeStatus(conn)
+    writer = SessionWriter(conn, batch_size=10, status=status)
+
+    writer.add(make_session('S1'))
+    assert status.get('S1') is None
+
+    writer.flush()
+    assert status.get('S1')['state'] == 'done'
+
+    with pytest.raises(sqlite3.IntegrityError):
+        writer.write_batch([make_session('S2'), make_session('S3', title=None)])
+    assert status.get('S2') is None
+
+
+def test_async_engine_retries_failures(conn):
+    """Test that failed sessions are retried until they succeed."""
+    status = ScrapeStatus(conn, base_delay=0)
+    saved = []
+    engine = make_engine(saved, status=status)
+    failures = {'2': 1}
+
+    original = engine.fetch_page
+
+    async def flaky_fetch(url, wait_until='load', ready_check=None):
+        session_id = url.rsplit('/', 1)[1]
+        if failures.get(session_id):
+            failures[session_id] -= 1
+            raise RuntimeError('page failed to load')
+        return await original(url, wait_until, ready_check)
+
+    engine.fetch_page = flaky_fetch
+    results = asyncio.run(engine.scrape_with_retries(['1', '2', 'bad'], max_attempts=3))
+
+    assert results['saved'] == 2
+    assert [session_id for session_id, _ in results['errors']] == ['bad']
+    assert sorted(session['session_id'] for session in saved) == ['1', '2']
+    assert status.get('bad')['attempts'] == 3
+
+
+def test_scrape_all_resume_skips_finished_sessions(tmp_path, monkeypatch):
+    """Test that a resumed scrape only fetches the sessions that failed."""
+    scraper = APPAMScraper(db_path=str(tmp_path / 'test.db'))
+    monkeypatch.setattr(scraper, 'browser_session', contextlib.nullcontext)
+    monkeypatch.setattr(scraper, 'scrape_all_calendar_dates', lambda: ['1', '2', '3'])
+    monkeypatch.setattr(ScrapeStatus, 'backoff', lambda self, attempts: 0)
+
+    fetched = []
+    broken = {'2'}
+
+    def fake_fetch(session_id):
+        fetched.append(session_id)
+        if session_id in broken:
+            raise RuntimeError('cookie expired')
+        return f'<html><body><h2>Session number {session_id}</h2></body></html>', True
+
+    monkeypatch.setattr(scraper, 'fetch_session_page', fake_fetch)
+
+    scraper.scrape_all(max_attempts=2)
+    assert sorted(fetched) == ['1', '2', '2', '3']
+
+    fetched.clear()
+    broken.clear()
+    scraper.scrape_all(resume=True)
+
+    assert fetched == ['2']
+    conn = sqlite3.connect(scraper.db_path)
+    assert conn.execute('SELECT COUNT(*) FROM sessions').fetchone()[0] == 3
+    assert conn.execute("SELECT COUNT(*) FROM scrape_status WHERE state = 'done'").fetchone()[0] == 3
+    conn.close()
@@ -291,3 +291,83 @@ def test_location_deduplication(scraper):
     assert cursor.fetchone()[0] == 1
 
     conn.close()
+
+
+class FakeBrowserResource:
+    """Stand-in for Playwright browser, context and page objects."""
+
+    def __init__(self, log, name):
+        self.log = log
+        self.name = name
+        self.closed = False
+
+    def new_context(self):
+        self.log.append('new_context')
+        return FakeBrowserResource(self.log, 'context')
+
+    def new_page(self):
+        self.log.append('new_page')
+        return FakeBrowserResource(self.log, 'page')
+
+    def add_cookies(self, cookies):
+        self.log.append('add_cookies')
+
+    def is_closed(self):
+        return self.closed
+
+    def close(self):
+        self.closed = True
+        self.log.append(f'close_{self.name}')
+
+
+class FakePlaywright:
+    def __init__(self, log):
+        self.log = log
+        self.chromium = self
+
+    def start(self):
+        self.log.append('start')
+        return self
+
+    def launch(self, headless=True):
+        self.log.append('launch')
+        return FakeBrowserResource(self.log, 'browser')
+
+    def stop(self):
+        self.log.append('stop')
+
+
+def test_browser_session_launches_once(scraper, monkeypatch, tmp_path):
+    """Test that nested browser sessions share one browser and cookie load."""
+    log = []
+    monkeypatch.setattr('scraper.sync_playwright', lambda: FakePlaywright(log))
+
+    cookies_file = tmp_path / 'cookies.json'
+    cookies_file.write_text(json.dumps([{'name': 'a', 'value': 'b', 'domain': '.x', 'path': '/'}]))
+    scraper.cookies_file = str(cookies_file)
+
+    with scraper.browser_session():
+        first_page = scraper._get_page()
+        with scraper.browser_session():
+            assert scraper._get_page() is first_page
+
+    assert log.count('launch') == 1
+    assert log.count('add_cookies') == 1
+    assert log.count('new_page') == 1
+    assert log[-1] == 'stop'
+    assert scraper._context is None
+
+
+def test_browser_session_closes_on_error(scraper, monkeypatch):
+    """Test that the shared browser is shut down when the block raises."""
+    log = []
+    monkeypatch.setattr('scraper.sync_playwright', lambda: FakePlaywright(log))
+
+    with pytest.raises(RuntimeError):
+        with scraper.browser_session():
+            scraper._get_page()
+            raise RuntimeError('boom')
+
+    assert 'close_browser' in log
+    assert log[-1] == 'stop'
+    assert scraper._browser is None
@@ -0,0 +1,106 @@
+"""
+Tests for the embedding cache and semantic scorer.
+"""
+import sqlite3
+import pytest
+from tests.conftest import make_session
+
+np = pytest.importorskip('numpy')
+
+from semantic_scorer import EmbeddingCache, HashingEncoder, SemanticScorer  # noqa: E402
+from session_scores import SessionScores  # noqa: E402
+
+
+class CountingEncoder(HashingEncoder):
+    """HashingEncoder that records every text it encodes."""
+
+    def __init__(self, dim=256):
+        super().__init__(dim)
+        self.encoded = []
+
+    def encode(self, texts):
+        self.encoded.extend(texts)
+        return super().encode(texts)
+
+
+PROFILES = {
+    'Max Ghenis': {'guaranteed income': 2.0, 'poverty': 1.5},
+    'Daphne Hansell': {'medicaid expansion': 2.0, 'health insurance': 1.5},
+}
+
+
+@pytest.fixture
+def sessions():
+    return [
+        make_session('S1', title='Guaranteed Income Pilots', description='Cash transfers and poverty'),
+        make_session('S2', title='Medicaid Expansion', description='Health insurance coverage',
+                     papers=['Medicaid expansion and uninsurance']),
+        make_session('S3', title='Urban Planning', description='Zoning and housing supply'),
+    ]
+
+
+def test_hashing_encoder():
+    """Test that embeddings are unit length, deterministic and closer for shared wording."""
+    encoder = HashingEncoder(dim=256)
+    vectors = encoder.encode(['child tax credit', 'the child tax credit expansion', 'zoning reform', ''])
+    assert vectors.dtype == np.float32
+    assert np.allclose(np.linalg.norm(vectors[:3], axis=1), 1)
+    assert not vectors[3].any()
+    assert np.array_equal(vectors, encoder.encode(['child tax credit', 'the child tax credit expansion',
+                                                   'zoning reform', '']))
+    assert vectors[0] @ vectors[1] > vectors[0] @ vectors[2]
+
+
+def test_cache_encodes_each_text_once(tmp_path):
+    """Test that texts are encoded once, and cached rows survive reopening."""
+    encoder = CountingEncoder()
+    cache = EmbeddingCache(str(tmp_path / 'cache'), encoder)
+    first = cache.embed(['a b', 'c d', 'a b'])
+    assert encoder.encoded == ['a b', 'c d']
+    assert np.array_equal(first[0], first[2])
+
+    reopened = EmbeddingCache(str(tmp_path / 'cache'), CountingEncoder())
+    assert len(reopened) == 2
+    assert np.array_equal(reopened.embed(['c d']), first[1:2])
+    assert reopened.encoder.encoded == []
+
+    rows, encoded = reopened.rows(['e f', 'a b'])
+    assert encoded == 1 and rows.tolist() == [2, 0]
+    assert np.array_equal(reopened.vectors[:2], first[:2])
+
+
+def test_scores_are_profile_cosine_similarities(tmp_path):
+    """Test scores against cosine similarity with the weighted profile vectors."""
+    encoder = HashingEncoder(dim=256)
+    scorer = SemanticScorer(db_path=None, cache_dir=str(tmp_path / 'cache'), encoder=encoder, profiles=PROFILES)
+    documents = [('S1', 'guaranteed income pilots and poverty'), ('S2', 'medicaid expansion')]
+    rows = {(session_id, person): (score, rationale, explanation)
+            for session_id, person, score, rationale, explanation in scorer.score_documents(documents)}
+
+    daphne = 2.0 * encoder.encode(['medicaid expansion'])[0] + 1.5 * encoder.encode(['health insurance'])[0]
+    expected = encoder.encode(['medicaid expansion'])[0] @ (daphne / np.linalg.norm(daphne)) * 100
+    assert rows['S2', 'Daphne Hansell'][0] == pytest.approx(expected, abs=0.01)
+    assert rows['S2', 'Daphne Hansell'][1] == 'Closest interest: medicaid expansion (1.00)'
+    assert rows['S2', 'Daphne Hansell'][2] == {'interest': 'medicaid expansion', 'similarity': 1.0}
+    assert rows['S1', 'Max Ghenis'][0] > rows['S2', 'Max Ghenis'][0]
+
+
+def test_score_all_sessions_and_profile_edits(db_path, tmp_path):
+    """Test stored scores, and that a profile edit encodes only its new phrase."""
+    encoder = CountingEncoder()
+    scorer = SemanticScorer(db_path, cache_dir=str(tmp_path / 'cache'), encoder=encoder,
+                            profiles={**PROFILES, 'Someone Else': {'poverty': 1.0}})
+    assert scorer.score_all_sessions() == 3
+    assert [session['session_id'] for session in scorer.top('Daphne Hansell', limit=1)] == ['S2']
+    assert [session['session_id'] for session in scorer.top('Max Ghenis', limit=1)] == ['S1']
+
+    conn = sqlite3.connect(db_path)
+    scores = SessionScores(conn).for_sessions(['S1', 'S2', 'S3'], scorer='semantic')
+    conn.close()
+    # Only people in the people table get rows
+    assert set(scores['S3']) == {'Max Ghenis', 'Daphne Hansell'}
+
+    encoder.encoded.clear()
+    scorer.profiles = {**PROFILES, 'Max Ghenis': {**PROFILES['Max Ghenis'], 'cash transfers': 1.0}}
+    scorer.score_all_sessions()
+    assert encoder.encoded == ['cash transfers']
@@ -0,0 +1,131 @@
+"""
+Tests for the per-person session_scores table.
+"""
+import json
+import pytest
+import dual_scorer
+from export_to_json import export_database
+from optimal_scheduler import OptimalScheduler
+from session_scores import SessionScores, migrate_person_columns
+from tests.conftest import make_session
+
+
+@pytest.fixture
+def sessions():
+    return [
+        make_session('S1', description='Microsimulation of the child tax credit'),
+        make_session('S2', description='Medicaid expansion and health insurance'),
+        make_session('S3', description='Urban planning methods', start_time='1:45 PM'),
+    ]
+
+
+def test_write_and_read_scores(conn):
+    """Test bulk writes, per-session lookups and upserts."""
+    scores = SessionScores(conn)
+    scores.write('dual', [('S1', 'Max Ghenis', 90, 'CTC'), ('S1', 'Daphne Hansell', 40, None),
+                          ('S2', 'Max Ghenis', 70, None)])
+    scores.write('dual', [('S1', 'Max Ghenis', 95, 'CTC policy')])
+
+    assert scores.for_sessions(['S1', 'S2', 'S3']) == {
+        'S1': {'Max Ghenis': 95, 'Daphne Hansell': 40},
+        'S2': {'Max Ghenis': 70},
+        'S3': {},
+    }
+    assert scores.for_sessions(['S1'], scorer='other') == {'S1': {}}
+    top = scores.top_sessions('Max Ghenis', limit=1)
+    assert [(row['session_id'], row['score'], row['rationale']) for row in top] == [('S1', 95, 'CTC policy')]
+
+
+def test_explanations_are_stored_with_scores(conn):
+    """Test that explanations round-trip, and older tables gain the column."""
+    conn.execute('DROP TABLE session_scores')
+    conn.execute('''
+        CREATE TABLE session_scores (
+            session_id TEXT NOT NULL, person_id TEXT NOT NULL, scorer TEXT NOT NULL,
+            score REAL NOT NULL, rationale TEXT,
+            PRIMARY KEY (session_id, person_id, scorer)
+        ) WITHOUT ROWID
+    ''')
+    scores = SessionScores(conn)
+    scores.write('dual', [('S1', 'Max Ghenis', 90, 'CTC', {'rule': 'general/1', 'terms': ['ctc']}),
+                          ('S2', 'Max Ghenis', 70, None)])
+
+    assert scores.details(['S1', 'S2']) == {
+        'S1': {'Max Ghenis': {'score': 90, 'rationale': 'CTC',
+                              'explanation': {'rule': 'general/1', 'terms': ['ctc']}}},
+        'S2': {'Max Ghenis': {'score': 70, 'rationale': None, 'explanation': None}},
+    }
+    assert scores.top_sessions('Max Ghenis', limit=1)[0]['explanation'] == {'rule': 'general/1', 'terms': ['ctc']}
+
+
+def test_top_sessions_uses_index(conn):
+    """Test that a person's top-N query is served by the score index, sorting only ties."""
+    SessionScores(conn)
+    plan = ' '.join(row[-1] for row in conn.execute('''
+        EXPLAIN QUERY PLAN
+        SELECT ss.session_id, ss.score FROM session_scores ss
+        JOIN sessions s ON s.session_id = ss.session_id
+        WHERE ss.scorer = 'dual' AND ss.person_id = 'Max Ghenis' AND ss.score >= 60
+        ORDER BY ss.score DESC, s.general_score DESC, ss.session_id LIMIT 10
+    '''))
+    assert 'idx_session_scores_person' in plan
+    assert 'TEMP B-TREE FOR ORDER BY' not in plan
+
+
+def test_top_sessions_break_ties_by_general_score(conn):
+    """Test that equal person scores go to the higher general score, as the dual report did."""
+    conn.executemany('UPDATE sessions SET general_score = ? WHERE session_id = ?', [(50, 'S1'), (80, 'S3')])
+    scores = SessionScores(conn)
+    scores.write('dual', [('S1', 'Max Ghenis', 90, None), ('S2', 'Max Ghenis', 95, None),
+                          ('S3', 'Max Ghenis', 90, None)])
+    assert [row['session_id'] for row in scores.top_sessions('Max Ghenis')] == ['S2', 'S3', 'S1']
+
+
+def test_dual_scorer_scores_everyone_in_people(db_path, conn):
+    """Test that dual scores cover the whole team, including new members."""
+    assert dual_scorer.score_all_sessions(db_path) == 3
+    scores = SessionScores(conn)
+    assert set(scores.for_sessions(['S1'])['S1']) == {'Max Ghenis', 'Pavel Makarchuk', 'Daphne Hansell'}
+    top = scores.top_sessions('Daphne Hansell', limit=3)
+    assert [row['score'] for row in top] == sorted((row['score'] for row in top), reverse=True)
+    assert top[-1]['session_id'] == 'S3'
+
+    conn.execute("INSERT INTO people (name, role) VALUES ('New Analyst', 'Analyst')")
+    conn.commit()
+    assert dual_scorer.score_all_sessions(db_path) == 3
+    assert 'New Analyst' in scores.for_sessions(['S1'])['S1']
+
+
+def test_migrate_person_columns(db_path, conn):
+    """Test that older per-person columns are moved into session_scores."""
+    conn.execute('ALTER TABLE sessions ADD COLUMN max_score REAL DEFAULT 0')
+    conn.execute('ALTER TABLE sessions ADD COLUMN daphne_score REAL')
+    conn.execute("UPDATE sessions SET max_score = 80, daphne_score = 55 WHERE session_id = 'S1'")
+    conn.commit()
+
+    assert migrate_person_columns(conn) == 4
+    columns = {row[1] for row in conn.execute('PRAGMA table_info(sessions)')}
+    assert not columns & {'max_score', 'daphne_score'}
+    assert SessionScores(conn).for_sessions(['S1'])['S1'] == {'Max Ghenis': 80, 'Daphne Hansell': 55}
+
+
+def test_scheduler_and_export_read_person_scores(db_path, tmp_path):
+    """Test that the scheduler and JSON export pick up session_scores."""
+    dual_scorer.score_all_sessions(db_path)
+
+    sessions = OptimalScheduler(db_path).get_sessions_for_slot('2025-11-13', '10:15 AM', '11:45 AM')
+    by_id = {session['session_id']: session for session in sessions}
+    assert OptimalScheduler.person_score(by_id['S1'], 'Pavel Makarchuk') == 100
+    assert OptimalScheduler.person_score(by_id['S1'], 'Nobody') == by_id['S1']['general_score']
+
+    export_database(db_path, str(tmp_path / 'data'))
+    exported = {s['session_id']: s for s in json.load(open(tmp_path / 'data' / 'sessions.json'))}
+    assert 'Max Ghenis' in exported['S1']['recommended_for']
+    assert exported['S3']['recommended_for'] == []
+
+    # Explanations are read from the database, as the scorers stored them
+    explanation = exported['S1']['person_explanations']['Pavel Makarchuk']
+    assert explanation['rule'] == 'Pavel Makarchuk/0' and explanation['terms'] == ['microsimulation']
+    assert explanation['rationale'] == dual_scorer.score_for_person(exported['S1'], 'Pavel Makarchuk')[1]
+    assert exported['S1']['general_explanation']['rule'] == 'general/0'
+    assert exported['S1']['relevance_explanation'] is None
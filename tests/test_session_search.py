@@ -0,0 +1,87 @@
+"""
+Tests for the FTS5 full-text search mirrors.
+"""
+import sqlite3
+import pytest
+from networking_recommendations import get_networking_recommendations
+from scraper import APPAMScraper
+from session_search import SessionSearch, rebuild, terms
+from smart_rescorer import get_top_sessions_for_review
+from tests.conftest import make_session
+
+
+@pytest.fixture
+def sessions():
+    return [
+        make_session('S1', title='Taxes and Poverty', description='Child tax credits and the EITC',
+                     papers=['Refundable credits in Ohio'], presenters=['Jane Roe']),
+        make_session('S2', title='Medicaid Expansion', description='Health insurance coverage',
+                     papers=['Medicaid and poverty'], presenters=['Ann Lee']),
+        make_session('S3', title='Syntax of Zoning', description='Housing supply'),
+    ]
+
+
+def test_terms_quotes_input():
+    """Test that plain terms become a safe OR of quoted phrases."""
+    assert terms(['tax', 'child "tax" credit']) == '("tax" OR "child ""tax"" credit")'
+    assert terms(['medic'], prefix=True) == '("medic"*)'
+    with pytest.raises(ValueError):
+        terms([' '])
+
+
+def test_search_ranks_and_snippets(conn):
+    """Test ranked session, paper and presenter queries."""
+    search = SessionSearch(conn)
+    sessions = search.sessions('poverty OR credits')
+    assert [row['session_id'] for row in sessions] == ['S1']
+    assert sessions[0]['snippet'] == 'Taxes and [Poverty]'
+
+    assert [row['session_id'] for row in search.sessions(terms(['tax'], prefix=True))] == ['S1']
+    assert [row['session_id'] for row in search.papers('poverty')] == ['S2']
+    assert [row['name'] for row in search.presenters('ann*')] == ['Ann Lee']
+    assert search.session_ids('poverty', include_papers=True) == {'S1', 'S2'}
+
+
+def test_triggers_keep_mirrors_in_sync(db_path, conn):
+    """Test inserts, text edits, re-saves and deletes through the triggers."""
+    APPAMScraper(db_path=db_path).save_sessions([
+        make_session('S3', title='Syntax of Zoning', description='Housing vouchers'),
+        make_session('S4', title='SNAP Take-Up'),
+    ])
+    conn.execute("UPDATE sessions SET general_score = 50")
+    conn.execute("DELETE FROM sessions WHERE session_id = 'S2'")
+    conn.commit()
+
+    search = SessionSearch(conn)
+    assert search.session_ids('vouchers') == {'S3'}
+    assert search.session_ids('supply') == set()
+    assert search.session_ids('snap') == {'S4'}
+    assert search.session_ids('medicaid') == set()
+    conn.execute("INSERT INTO sessions_fts(sessions_fts) VALUES ('integrity-check')")
+
+    rebuild(conn)
+    assert search.session_ids('vouchers') == {'S3'}
+
+
+def test_existing_database_is_indexed(db_path, conn):
+    """Test that mirrors added to an existing database index its rows."""
+    for table in ('sessions_fts', 'papers_fts', 'presenters_fts'):
+        conn.execute(f'DROP TABLE {table}')
+    conn.commit()
+
+    assert SessionSearch(conn).session_ids('medicaid') == {'S2'}
+    reopened = sqlite3.connect(db_path)
+    assert SessionSearch(reopened).session_ids('zoning') == {'S3'}
+    reopened.close()
+
+
+def test_consumers_filter_in_sqlite(db_path, conn):
+    """Test title topics for networking and FTS filtering for review."""
+    conn.execute('UPDATE sessions SET general_score = 80, relevance_score = 10')
+    conn.commit()
+
+    topics = {p['name']: sorted(p['topics']) for p in get_networking_recommendations(db_path)}
+    assert topics == {'Jane Roe': ['Poverty', 'Tax Policy'], 'Ann Lee': ['Health Policy']}
+
+    assert [s['session_id'] for s in get_top_sessions_for_review(db_path, query='housing')] == ['S3']
+    assert len(get_top_sessions_for_review(db_path)) == 3
@@ -0,0 +1,117 @@
+"""
+Tests for the batched session writer.
+"""
+import sqlite3
+import pytest
+from html_store import HtmlStore
+from session_writer import SessionWriter
+from tests.conftest import make_session
+
+
+def presenters_of(conn, session_id):
+    return sorted(row[0] for row in conn.execute('''
+        SELECT p.name FROM presenters p
+        JOIN session_presenters sp ON p.id = sp.presenter_id
+        WHERE sp.session_id = ?
+    ''', (session_id,)))
+
+
+def test_write_batch(conn):
+    """Test that a batch writes sessions, presenters, papers, locations and slots."""
+    writer = SessionWriter(conn)
+    written = writer.write_batch([
+        make_session('S1', ['Alice Smith', 'Bob Jones'], ['Alice Smith - Paper One']),
+        make_session('S2', ['Bob Jones'], location='Room 202'),
+    ])
+
+    assert written == 2
+    assert conn.execute('SELECT COUNT(*) FROM sessions').fetchone()[0] == 2
+    assert conn.execute('SELECT COUNT(*) FROM presenters').fetchone()[0] == 2
+    assert conn.execute('SELECT COUNT(*) FROM locations').fetchone()[0] == 2
+    assert conn.execute('SELECT COUNT(*) FROM time_slots').fetchone()[0] == 1
+    assert presenters_of(conn, 'S1') == ['Alice Smith', 'Bob Jones']
+    assert presenters_of(conn, 'S2') == ['Bob Jones']
+    assert conn.execute('SELECT title FROM papers WHERE session_id = ?', ('S1',)).fetchall() == [
+        ('Alice Smith - Paper One',)
+    ]
+
+
+def test_presenter_ids_are_not_selected_per_name(conn):
+    """Test that known presenters are resolved from memory."""
+    writer = SessionWriter(conn)
+    writer.write_batch([make_session('S1', ['Alice Smith', 'Bob Jones'])])
+
+    statements = []
+    conn.set_trace_callback(statements.append)
+    writer.write_batch([make_session(f'S{i}', ['Alice Smith', 'Bob Jones']) for i in range(2, 12)])
+    conn.set_trace_callback(None)
+
+    assert not [s for s in statements if 'FROM presenters' in s]
+    assert presenters_of(conn, 'S11') == ['Alice Smith', 'Bob Jones']
+
+
+def test_presenters_added_by_another_connection(conn, tmp_path):
+    """Test that names inserted elsewhere resolve to their existing IDs."""
+    writer = SessionWriter(conn)
+    writer.write_batch([make_session('S1', ['Alice Smith'])])
+
+    other = sqlite3.connect(str(tmp_path / 'test.db'))
+    other.execute("INSERT INTO presenters (name) VALUES ('Bob Jones')")
+    other.commit()
+    other.close()
+
+    writer.write_batch([make_session('S2', ['Bob Jones'])])
+
+    assert conn.execute('SELECT COUNT(*) FROM presenters').fetchone()[0] == 2
+    assert presenters_of(conn, 'S2') == ['Bob Jones']
+
+
+def test_rewrite_replaces_links_and_keeps_scores(conn):
+    """Test that re-saving a session replaces its links but keeps its score."""
+    writer = SessionWriter(conn)
+    writer.write_batch([make_session('S1', ['Alice Smith'], ['Paper One'])])
+    conn.execute("UPDATE sessions SET relevance_score = 42 WHERE session_id = 'S1'")
+    conn.commit()
+
+    writer.write_batch([make_session('S1', ['Bob Jones'], ['Paper Two'], raw_html=None)])
+
+    assert presenters_of(conn, 'S1') == ['Bob Jones']
+    assert conn.execute('SELECT title FROM papers').fetchall() == [('Paper Two',)]
+    assert conn.execute("SELECT relevance_score FROM sessions").fetchone() == (42,)
+    assert HtmlStore(conn).get('S1') == '<html>S1</html>'
+
+
+def test_duplicate_session_in_batch_keeps_last(conn):
+    """Test that a session repeated within a batch is written once."""
+    SessionWriter(conn).write_batch([
+        make_session('S1', papers=['Paper One']),
+        make_session('S1', papers=['Paper Two'], title='Updated'),
+    ])
+
+    assert conn.execute('SELECT title FROM sessions').fetchall() == [('Updated',)]
+    assert conn.execute('SELECT title FROM papers').fetchall() == [('Paper Two',)]
+
+
+def test_failed_batch_rolls_back(conn):
+    """Test that a bad session rolls back its whole batch."""
+    writer = SessionWriter(conn)
+
+    with pytest.raises(sqlite3.IntegrityError):
+        writer.write_batch([make_session('S1', ['Alice Smith']), make_session('S2', title=None)])
+
+    assert conn.execute('SELECT COUNT(*) FROM sessions').fetchone()[0] == 0
+    assert conn.execute('SELECT COUNT(*) FROM presenters').fetchone()[0] == 0
+
+    writer.write_batch([make_session('S1', ['Alice Smith'])])
+    assert presenters_of(conn, 'S1') == ['Alice Smith']
+
+
+def test_add_flushes_every_batch_size(conn):
+    """Test that queued sessions are written in batches and on exit."""
+    with SessionWriter(conn, batch_size=3) as writer:
+        for i in range(4):
+            writer.add(make_session(f'S{i}'))
+        assert conn.execute('SELECT COUNT(*) FROM sessions').fetchone()[0] == 3
+        assert len(writer.pending) == 1
+
+    assert conn.execute('SELECT COUNT(*) FROM sessions').fetchone()[0] == 4
@@ -0,0 +1,92 @@
+"""
+Tests for exact per-slot assignment.
+"""
+import itertools
+import random
+import time
+
+import pytest
+
+import slot_matching
+from optimal_scheduler import OptimalScheduler
+from slot_matching import hungarian, match_slot
+
+
+def brute_force(scores, booth_values):
+    """Best value over every way of sending people to distinct sessions or the booth."""
+    n = len(scores)
+    m = len(scores[0]) if n else 0
+    best = None
+    for choice in itertools.product([None] + list(range(m)), repeat=n):
+        chosen = [s for s in choice if s is not None]
+        if len(chosen) != len(set(chosen)):
+            continue
+        value = booth_values[n - len(chosen)] + sum(scores[p][s] for p, s in enumerate(choice) if s is not None)
+        best = value if best is None else max(best, value)
+    return best
+
+
+def random_case(rng, n, m):
+    return [[rng.choice([0, 10, 20, 40, 60, 80, 95]) for _ in range(m)] for _ in range(n)]
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_match_slot_is_exact(seed):
+    """Test against brute force, for the scheduler's tables and non-concave ones."""
+    rng = random.Random(seed)
+    n, m = rng.randint(1, 4), rng.randint(0, 4)
+    scores = random_case(rng, n, m)
+    scheduler = OptimalScheduler(db_path=None)
+    concave = [scheduler.booth_value_for(k, n) for k in range(n + 1)]
+    bumpy = [rng.randint(-200, 200) for _ in range(n + 1)]
+    for booth_values in (concave, bumpy):
+        sessions, value = match_slot(scores, booth_values)
+        assert value == brute_force(scores, booth_values)
+        chosen = [s for s in sessions if s is not None]
+        assert len(chosen) == len(set(chosen))
+
+
+def test_hungarian_matches_scipy():
+    """Test the pure-Python fallback finds assignments as good as scipy's."""
+    pytest.importorskip('scipy')
+    rng = random.Random(0)
+    for _ in range(20):
+        n = rng.randint(1, 8)
+        m = n + rng.randint(0, 5)
+        weights = [[rng.randint(-50, 100) for _ in range(m)] for _ in range(n)]
+        ours = hungarian(weights)
+        theirs = slot_matching.max_weight_assignment(weights)
+        assert len(set(ours)) == n
+        assert sum(weights[p][c] for p, c in enumerate(ours)) == sum(weights[p][c] for p, c in enumerate(theirs))
+
+
+def test_match_slot_without_scipy(monkeypatch):
+    """Test the Hungarian fallback is used when scipy isn't installed."""
+    monkeypatch.setattr(slot_matching, 'linear_sum_assignment', None)
+    scores = [[10, 90], [80, 70], [60, 0]]
+    booth_values = [-1000, 0, 5, 5]
+    sessions, value = match_slot(scores, booth_values)
+    assert value == brute_force(scores, booth_values) == 170
+    assert sessions == [1, 0, None]
+
+
+def test_large_team_slot():
+    """Test a team of 50 over 300 sessions: everyone's best session, one person at the booth."""
+    pytest.importorskip('scipy')
+    scheduler = OptimalScheduler(db_path=None)
+    scheduler.people = [f'Person {i}' for i in range(50)]
+    scheduler.availability = {}
+    sessions = [{'session_id': str(i), 'general_score': 0,
+                 'person_scores': {person: (100 if i == j * 6 else i % 50) for j, person in enumerate(scheduler.people)}}
+                for i in range(300)]
+
+    start = time.perf_counter()
+    assignment, value = scheduler.assign_slot_optimal('2025-11-14', '9:00am', '10:30am', sessions)
+    elapsed = time.perf_counter() - start
+
+    assert value['people_at_booth'] == 1
+    # Everyone but the one at the booth gets their 100
+    assert value['session_value'] == 49 * 100
+    chosen = [s['session_id'] for s in assignment.values() if s is not None]
+    assert len(chosen) == len(set(chosen)) == 49
+    assert elapsed < 1.0
@@ -0,0 +1,114 @@
+"""
+Tests for the canonical time parser and the stored start_ts/end_ts columns.
+"""
+import sqlite3
+from datetime import datetime
+
+
+import booth_value_calculator
+from optimal_scheduler import OptimalScheduler
+from scheduler import ConferenceScheduler
+from scraper import APPAMScraper
+from session_writer import SessionWriter
+from time_utils import clock_minutes, day_number, ensure_time_columns, timestamp, to_datetime
+from tests.conftest import make_session
+
+
+def test_clock_minutes():
+    """Test both time styles the site uses, and text that isn't a time."""
+    assert clock_minutes('9:00am') == clock_minutes('9:00 AM') == 540
+    assert clock_minutes('12:30pm') == 750
+    assert clock_minutes('12:00 a.m.') == 0
+    assert clock_minutes('TBA') is None
+    assert clock_minutes('13:00pm') is None
+    assert clock_minutes(None) is None
+
+
+def test_timestamp():
+    """Test minutes since the epoch, round trips, and caching."""
+    assert day_number('1970-01-02') == 1
+    assert day_number('2025-02-30') is None
+    assert timestamp('1970-01-02', '12:30am') == 24 * 60 + 30
+    assert to_datetime(timestamp('2025-11-14', '1:45 PM')) == datetime(2025, 11, 14, 13, 45)
+    # Later times are larger, across noon and across days
+    assert timestamp('2025-11-13', '8:30am') < timestamp('2025-11-13', '10:15am') < timestamp('2025-11-13', '1:00pm')
+    assert timestamp('2025-11-13', '11:59pm') < timestamp('2025-11-14', '12:00am')
+    assert timestamp('', '9:00am') is None
+    assert timestamp('2025-11-13', 'TBA') is None
+
+    clock_minutes.cache_clear()
+    for _ in range(3):
+        timestamp('2025-11-13', '9:00am')
+    assert clock_minutes.cache_info().misses == 1
+
+
+def test_writer_stores_timestamps(db_path):
+    """Test start_ts/end_ts on insert and update, and NULL for unparseable times."""
+    conn = sqlite3.connect(db_path)
+    writer = SessionWriter(conn)
+    writer.write_batch([make_session('S1'), make_session('S2', start_time='TBA', end_time='')])
+    writer.write_batch([make_session('S1', start_time='9:00am')])
+    rows = dict((row[0], row[1:]) for row in conn.execute('SELECT session_id, start_ts, end_ts FROM sessions'))
+    conn.close()
+    assert rows['S1'] == (timestamp('2025-11-13', '9:00am'), timestamp('2025-11-13', '11:45 AM'))
+    assert rows['S2'] == (None, None)
+
+
+def test_ensure_time_columns_backfills_old_databases(tmp_path):
+    """Test adding, filling and indexing the columns on a database from before them."""
+    conn = sqlite3.connect(str(tmp_path / 'old.db'))
+    conn.execute('CREATE TABLE sessions (session_id TEXT PRIMARY KEY, date TEXT, start_time TEXT, end_time TEXT)')
+    conn.executemany('INSERT INTO sessions VALUES (?, ?, ?, ?)', [
+        ('S1', '2025-11-13', '10:15am', '11:45am'),
+        ('S2', '2025-11-13', '8:30 AM', '10:00 AM'),
+        ('S3', '', '', ''),
+    ])
+    assert ensure_time_columns(conn) == 2
+    assert ensure_time_columns(conn) == 0
+    assert 'idx_sessions_time' in {row[1] for row in conn.execute('PRAGMA index_list(sessions)')}
+
+    # Sorting on the text puts '10:15am' first; on start_ts it doesn't
+    order = [row[0] for row in conn.execute(
+        'SELECT session_id FROM sessions ORDER BY start_ts IS NULL, start_ts, date, start_time')]
+    assert order == ['S2', 'S1', 'S3']
+    conn.close()
+
+
+def test_time_slots_are_chronological(db_path):
+    """Test that slot lists sort by time, not by text."""
+    APPAMScraper(db_path=db_path).save_sessions([
+        make_session('S1', start_time='10:15am', end_time='11:45am'),
+        make_session('S2', start_time='8:30am', end_time='10:00am'),
+        make_session('S3', start_time='1:45 PM', end_time='3:15 PM'),
+    ])
+    scheduler = ConferenceScheduler(db_path)
+    assert [slot['start_time'] for slot in scheduler.get_time_slots()] == ['8:30am', '10:15am', '1:45 PM']
+    assert scheduler.parse_time('2025-11-13', '1:45 PM') == datetime(2025, 11, 13, 13, 45)
+
+
+def test_slot_lookups_match_the_snapshot(db_path):
+    """Test that slot lists and lookups group sessions by parsed times, as the snapshot does."""
+    APPAMScraper(db_path=db_path).save_sessions([
+        make_session('S1', start_time='10:15 AM', end_time='11:45 AM'),
+        make_session('S2', start_time='10:15am', end_time='11:45am'),
+        make_session('S3', start_time='TBA', end_time=''),
+        make_session('S4', start_time='TBA', end_time=''),
+    ])
+    snapshot = OptimalScheduler(db_path).load_snapshot()
+    for scheduler in (ConferenceScheduler(db_path), OptimalScheduler(db_path)):
+        slots = scheduler.get_time_slots()
+        assert len(slots) == len(snapshot) == 2
+        for slot in slots:
+            sessions = scheduler.get_sessions_for_slot(slot['date'], slot['start_time'], slot['end_time'])
+            expected = snapshot.slot(slot['date'], slot['start_time'], slot['end_time']).session_ids
+            assert sorted(session['session_id'] for session in sessions) == sorted(expected)
+
+
+def test_booth_value_calculator():
+    """Test the booth traffic multipliers, which parse times with clock_minutes."""
+    assert booth_value_calculator.parse_time('1:45pm') == 13
+    assert booth_value_calculator.parse_time('TBA') == 12
+    assert booth_value_calculator.get_booth_traffic_multiplier('2025-11-13', '8:30 AM') == 2.0
+    assert booth_value_calculator.get_booth_traffic_multiplier('2025-11-13', '12:15pm') == 2.5
+    assert booth_value_calculator.get_booth_traffic_multiplier('2025-11-13', '7:00pm') == 0.5
+    assert booth_value_calculator.get_booth_traffic_multiplier('2025-11-13', 'TBA') == 1.0
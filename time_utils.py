@@ -0,0 +1,112 @@
+"""
+One parser for the conference's dates and times.
+
+The site writes times as '9:00am' or '10:15 AM', and the scrapers store
+dates as 'YYYY-MM-DD'. timestamp() turns a (date, time) pair into integer
+minutes since the Unix epoch, in the conference's local time (no time
+zone), caching each distinct date and time it parses. Sessions store these
+as start_ts and end_ts, indexed, so sorting, slot grouping and
+availability compare integers instead of strings: ORDER BY start_time
+puts '10:15am' before '8:30am'.
+
+Times that don't parse ('TBA', '') give None, and sessions with them keep
+NULL timestamps.
+"""
+import re
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+
+
+EPOCH = date(1970, 1, 1)
+MINUTES_PER_DAY = 24 * 60
+
+CLOCK_PATTERN = re.compile(r'^\s*(\d{1,2}):(\d{2})\s*([ap])\.?m\.?\s*$', re.IGNORECASE)
+DATE_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+# One row per time slot, in order. Sessions share a slot when their
+# start_ts and end_ts match or, if the start doesn't parse, their text
+# times do, as conference_snapshot.slot_key groups them
+TIME_SLOTS_QUERY = '''
+    SELECT MIN(date) AS date, MIN(start_time) AS start_time, MIN(end_time) AS end_time, start_ts, end_ts
+    FROM sessions
+    WHERE date != '' AND start_time != ''
+    GROUP BY start_ts, end_ts,
+             CASE WHEN start_ts IS NULL THEN date END,
+             CASE WHEN start_ts IS NULL THEN start_time END,
+             CASE WHEN start_ts IS NULL THEN end_time END
+    ORDER BY start_ts IS NULL, start_ts, end_ts, date, start_time
+'''
+
+
+@lru_cache(maxsize=1024)
+def clock_minutes(time_str):
+    """Minutes after midnight for '9:00am' or '2:30 PM' style times; None if unparseable."""
+    match = CLOCK_PATTERN.match(time_str or '')
+    if not match:
+        return None
+    hour, minute, half = int(match.group(1)), int(match.group(2)), match.group(3).lower()
+    if not 1 <= hour <= 12 or minute > 59:
+        return None
+    return (hour % 12 + (12 if half == 'p' else 0)) * 60 + minute
+
+
+@lru_cache(maxsize=256)
+def day_number(date_str):
+    """Days since the epoch for a 'YYYY-MM-DD' date; None if unparseable."""
+    if not DATE_PATTERN.match(date_str or ''):
+        return None
+    try:
+        return (date.fromisoformat(date_str) - EPOCH).days
+    except ValueError:
+        return None
+
+
+def timestamp(date_str, time_str):
+    """Minutes since the epoch for a date and a time of day; None if either is unparseable."""
+    day, minutes = day_number(date_str), clock_minutes(time_str)
+    if day is None or minutes is None:
+        return None
+    return day * MINUTES_PER_DAY + minutes
+
+
+def slot_condition(date_str, start_time, end_time):
+    """
+    SQL condition and parameters for the sessions in a time slot, matched
+    on start_ts/end_ts, or on the text times when the start doesn't parse.
+    """
+    start_ts = timestamp(date_str, start_time)
+    if start_ts is None:
+        return 'start_ts IS NULL AND date = ? AND start_time = ? AND end_time = ?', (date_str, start_time, end_time)
+    end_ts = timestamp(date_str, end_time)
+    if end_ts is None:
+        return 'start_ts = ? AND end_ts IS NULL', (start_ts,)
+    return 'start_ts = ? AND end_ts = ?', (start_ts, end_ts)
+
+
+def to_datetime(ts):
+    """The naive datetime for a timestamp()."""
+    return datetime(EPOCH.year, EPOCH.month, EPOCH.day) + timedelta(minutes=ts)
+
+
+def ensure_time_columns(conn):
+    """
+    Add the indexed start_ts/end_ts columns to sessions if missing, and
+    fill them for rows that have none yet. Returns how many rows were
+    filled.
+    """
+    columns = {row[1] for row in conn.execute('PRAGMA table_info(sessions)')}
+    with conn:
+        for column in ('start_ts', 'end_ts'):
+            if column not in columns:
+                conn.execute(f'ALTER TABLE sessions ADD COLUMN {column} INTEGER')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_sessions_time ON sessions(start_ts, end_ts)')
+
+        rows = conn.execute('''
+            SELECT session_id, date, start_time, end_time FROM sessions
+            WHERE start_ts IS NULL AND date != '' AND start_time != ''
+        ''').fetchall()
+        updates = [(timestamp(day, start), timestamp(day, end), session_id)
+                   for session_id, day, start, end in rows]
+        updates = [update for update in updates if update[0] is not None]
+        conn.executemany('UPDATE sessions SET start_ts = ?, end_ts = ? WHERE session_id = ?', updates)
+    return len(updates)